@@ -130,6 +130,10 @@ def _init_middleware(app):
     # Request logging middleware
     request_logger = RequestLogger(app)
     
+    # İstek/metrik loglarını arka planda toplu yazan pipeline
+    from app.services.log_service import PerformanceService
+    PerformanceService.init_app(app)
+    
     app.logger.info('Middleware initialized successfully')
 
 
@@ -9,6 +9,7 @@ from slugify import slugify
 import re
 
 from app.extensions import db
+from app.core.pagination import paginate_query
 from app.models.user import Role
 from app.models.course import Course, Topic, Category, Enrollment, EnrollmentStatus
 from app.api.decorators import teacher_required, admin_required
@@ -125,17 +126,12 @@ class CourseList(Resource):
         # Order by featured first, then by creation date
         query = query.order_by(Course.is_featured.desc(), Course.created_at.desc())
         
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        result = paginate_query(query, page, per_page)
         
         return {
             'success': True,
-            'data': [course.to_dict() for course in pagination.items],
-            'meta': {
-                'page': page,
-                'per_page': per_page,
-                'total': pagination.total,
-                'total_pages': pagination.pages
-            }
+            'data': [course.to_dict() for course in result.items],
+            'meta': result.to_dict()
         }, 200
     
     @jwt_required()
@@ -11,6 +11,7 @@ from app.extensions import db
 from app.models.course import Topic, Enrollment
 from app.models.question import Question
 from app.models.exam import Exam, ExamQuestion, ExamResult, ExamAnswer, ExamResultStatus
+from app.modules.exams.answer_key import AnswerKeyService
 from app.api.decorators import teacher_required
 
 exams_ns = Namespace('exams', description='Exam management operations')
@@ -277,6 +278,7 @@ class ExamDetail(Resource):
             exam.calculate_total_points()
         
         db.session.commit()
+        AnswerKeyService.invalidate(exam.id)
         
         return {
             'success': True,
@@ -312,6 +314,7 @@ class ExamDetail(Resource):
         
         db.session.delete(exam)
         db.session.commit()
+        AnswerKeyService.invalidate(exam_id)
         
         return {
             'success': True,
@@ -873,6 +876,7 @@ class ExamQuestions(Resource):
         exam.total_points = (exam.total_points or 0) + question.points
         
         db.session.commit()
+        AnswerKeyService.invalidate(exam_id)
         
         return {
             'success': True,
@@ -938,6 +942,7 @@ class ExamQuestionDetail(Resource):
                 db.session.add(answer)
         
         db.session.commit()
+        AnswerKeyService.invalidate(exam_id)
         
         return {
             'success': True,
@@ -969,6 +974,7 @@ class ExamQuestionDetail(Resource):
         
         db.session.delete(question)
         db.session.commit()
+        AnswerKeyService.invalidate(exam_id)
         
         return {
             'success': True,
@@ -998,6 +1004,9 @@ class ExamPublish(Resource):
         exam.is_published = True
         db.session.commit()
         
+        # Cevap anahtarını yayın anında derle (teslimlerde DB okunmaz)
+        AnswerKeyService.publish(exam.id)
+        
         return {
             'success': True,
             'message': 'Exam published successfully'
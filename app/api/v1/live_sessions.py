@@ -8,6 +8,7 @@ from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 from app.extensions import db
+from app.core.pagination import paginate_query
 from app.models.live_session import LiveSession, SessionAttendance, SessionStatus
 from app.models.course import Enrollment
 from app.api.decorators import require_roles, teacher_required
@@ -61,16 +62,13 @@ class LiveSessionList(Resource):
         
         query = query.order_by(LiveSession.scheduled_start.asc())
         
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        result = paginate_query(query, page, per_page)
         
         return {
             'success': True,
             'data': {
-                'items': [s.to_dict() for s in pagination.items],
-                'total': pagination.total,
-                'page': page,
-                'per_page': per_page,
-                'total_pages': pagination.pages
+                'items': [s.to_dict() for s in result.items],
+                **result.to_dict()
             }
         }
     
@@ -10,6 +10,8 @@ from app.extensions import db
 from app.models.course import Topic
 from app.models.question import Question, Answer, QuestionAttempt, QuestionType, DifficultyLevel
 from app.api.decorators import teacher_required
+from app.modules.exams.answer_key import AnswerKeyService
+from app.services.performance_aggregate_service import PerformanceAggregateService
 
 questions_ns = Namespace('questions', description='Question management operations')
 
@@ -319,6 +321,7 @@ class QuestionDetail(Resource):
                 db.session.add(answer)
         
         db.session.commit()
+        AnswerKeyService.invalidate(question.exam_id)
         
         return {
             'success': True,
@@ -354,6 +357,7 @@ class QuestionDetail(Resource):
             }, 403
         
         topic = question.topic
+        exam_id = question.exam_id
         
         db.session.delete(question)
         
@@ -361,6 +365,7 @@ class QuestionDetail(Resource):
         topic.total_questions = max(0, (topic.total_questions or 0) - 1)
         
         db.session.commit()
+        AnswerKeyService.invalidate(exam_id)
         
         return {
             'success': True,
@@ -420,6 +425,9 @@ class AnswerQuestion(Resource):
         # Update question statistics
         question.record_attempt(is_correct)
         
+        # Update per-student performance aggregates
+        PerformanceAggregateService.record_attempt(attempt, question)
+        
         db.session.commit()
         
         # Get correct answers for response
@@ -7,6 +7,7 @@ from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_current_user
 
 from app.extensions import db
+from app.core.pagination import paginate_query
 from app.models.user import User, Role
 from app.api.decorators import admin_required, super_admin_required
 
@@ -94,17 +95,12 @@ class UserList(Resource):
         query = query.order_by(User.created_at.desc())
         
         # Paginate
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        result = paginate_query(query, page, per_page)
         
         return {
             'success': True,
-            'data': [user.to_dict() for user in pagination.items],
-            'meta': {
-                'page': page,
-                'per_page': per_page,
-                'total': pagination.total,
-                'total_pages': pagination.pages
-            }
+            'data': [user.to_dict() for user in result.items],
+            'meta': result.to_dict()
         }, 200
     
     @jwt_required()
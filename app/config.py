@@ -30,10 +30,21 @@ class Config:
     JWT_HEADER_NAME = 'Authorization'
     JWT_HEADER_TYPE = 'Bearer'
     
+    # Token iptal önbelleği (süreç içi Bloom filtresi, Redis pub/sub ile güncel)
+    TOKEN_REVOCATION_CACHE_ENABLED = os.getenv('TOKEN_REVOCATION_CACHE_ENABLED', 'True').lower() == 'true'
+    TOKEN_REVOCATION_FILTER_CAPACITY = int(os.getenv('TOKEN_REVOCATION_FILTER_CAPACITY', 100000))
+    TOKEN_REVOCATION_FILTER_ERROR_RATE = float(os.getenv('TOKEN_REVOCATION_FILTER_ERROR_RATE', 0.001))
+    TOKEN_REVOCATION_REBUILD_SECONDS = int(os.getenv('TOKEN_REVOCATION_REBUILD_SECONDS', 300))
+    
     # Redis
     REDIS_URL = os.getenv('REDIS_URL', 'redis://localhost:6379/0')
     REDIS_ENABLED = os.getenv('REDIS_ENABLED', 'True').lower() == 'true'
     
+    # Cache (L1: süreç içi LRU, L2: Redis)
+    CACHE_L1_MAX_SIZE = int(os.getenv('CACHE_L1_MAX_SIZE', 2048))
+    CACHE_L1_TTL = int(os.getenv('CACHE_L1_TTL', 30))
+    USER_SNAPSHOT_TTL = int(os.getenv('USER_SNAPSHOT_TTL', 60))  # Auth yolundaki kullanıcı görüntüsü
+    
     # Celery
     CELERY_BROKER_URL = os.getenv('CELERY_BROKER_URL', 'redis://localhost:6379/1')
     CELERY_RESULT_BACKEND = os.getenv('CELERY_RESULT_BACKEND', 'redis://localhost:6379/2')
@@ -56,11 +67,33 @@ class Config:
     MAIL_USERNAME = os.getenv('MAIL_USERNAME')
     MAIL_PASSWORD = os.getenv('MAIL_PASSWORD')
     MAIL_DEFAULT_SENDER = os.getenv('MAIL_DEFAULT_SENDER')
+    MAIL_TIMEOUT = int(os.getenv('MAIL_TIMEOUT', 30))
+    BULK_EMAIL_CHUNK_SIZE = int(os.getenv('BULK_EMAIL_CHUNK_SIZE', 100))
+    NOTIFICATION_BULK_CHUNK_SIZE = int(os.getenv('NOTIFICATION_BULK_CHUNK_SIZE', 500))
     
     # Pagination
     DEFAULT_PAGE_SIZE = int(os.getenv('DEFAULT_PAGE_SIZE', 20))
     MAX_PAGE_SIZE = int(os.getenv('MAX_PAGE_SIZE', 100))
     
+    # Video ilerleme heartbeat'lerinin DB'ye yazılma aralığı (debounce)
+    PROGRESS_COMMIT_INTERVAL_SECONDS = int(os.getenv('PROGRESS_COMMIT_INTERVAL_SECONDS', 30))
+    
+    # Request/metric log pipeline (arka planda toplu INSERT)
+    LOG_PIPELINE_ASYNC = os.getenv('LOG_PIPELINE_ASYNC', 'True').lower() == 'true'
+    LOG_PIPELINE_CAPACITY = int(os.getenv('LOG_PIPELINE_CAPACITY', 10000))
+    LOG_PIPELINE_FLUSH_SIZE = int(os.getenv('LOG_PIPELINE_FLUSH_SIZE', 500))
+    LOG_PIPELINE_FLUSH_INTERVAL_MS = int(os.getenv('LOG_PIPELINE_FLUSH_INTERVAL_MS', 1000))
+    # Başarılı ve hızlı isteklerin örnekleme oranı (yavaş/hatalı olanlar hep tutulur;
+    # tutulanlar 1 / oran ağırlığıyla yazılır, rollup sayıları yansız kalır)
+    REQUEST_LOG_SAMPLE_RATE = float(os.getenv('REQUEST_LOG_SAMPLE_RATE', 1.0))
+    METRIC_SAMPLE_RATE = float(os.getenv('METRIC_SAMPLE_RATE', 1.0))
+
+    # Retention işleri (PK aralığında parçalı silme/anonimleştirme)
+    RETENTION_CHUNK_SIZE = int(os.getenv('RETENTION_CHUNK_SIZE', 5000))
+    RETENTION_TIME_BUDGET_SECONDS = int(os.getenv('RETENTION_TIME_BUDGET_SECONDS', 300))
+    RETENTION_MAX_REPLICA_LAG_SECONDS = float(os.getenv('RETENTION_MAX_REPLICA_LAG_SECONDS', 10))
+    RETENTION_PAUSE_SECONDS = float(os.getenv('RETENTION_PAUSE_SECONDS', 0.05))
+    
     # Rate Limiting
     RATELIMIT_ENABLED = os.getenv('RATELIMIT_ENABLED', 'True').lower() == 'true'
     RATELIMIT_DEFAULT = os.getenv('RATELIMIT_DEFAULT', '200/minute')
@@ -85,6 +118,10 @@ class Config:
     # AI Mock Settings
     AI_MOCK_DELAY_MIN = float(os.getenv('AI_MOCK_DELAY_MIN', 0.3))
     AI_MOCK_DELAY_MAX = float(os.getenv('AI_MOCK_DELAY_MAX', 1.0))
+    
+    # Toplu AI işleme (worker içi paralellik, sağlayıcı dakikalık istek limiti)
+    AI_BATCH_CONCURRENCY = int(os.getenv('AI_BATCH_CONCURRENCY', 4))
+    AI_PROVIDER_MAX_RPM = int(os.getenv('AI_PROVIDER_MAX_RPM', 60))
 
 
 class DevelopmentConfig(Config):
@@ -127,6 +164,8 @@ class TestingConfig(Config):
     )
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(seconds=5)
     RATELIMIT_ENABLED = False
+    REDIS_ENABLED = os.getenv('REDIS_ENABLED', 'False').lower() == 'true'
+    LOG_PIPELINE_ASYNC = False  # Testler senkron yazım yolunu kullanır
     
     # Testing: Mock Provider + hızlı yanıt (delay yok)
     AI_PROVIDER = 'mock'
@@ -79,7 +79,11 @@ from app.core.permissions import (
     get_current_user_id,
     get_current_user_role,
     get_role_permissions,
+    role_has_permission,
+    role_has_flat_permission,
     ROLE_PERMISSIONS,
+    ROLE_PERMISSION_SETS,
+    ROLE_FLAT_PERMISSION_SETS,
 )
 
 from app.core.audit import (
@@ -214,7 +218,11 @@ __all__ = [
     'get_current_user_id',
     'get_current_user_role',
     'get_role_permissions',
+    'role_has_permission',
+    'role_has_flat_permission',
     'ROLE_PERMISSIONS',
+    'ROLE_PERMISSION_SETS',
+    'ROLE_FLAT_PERMISSION_SETS',
     
     # === Audit ===
     'AuditLog',
@@ -333,8 +333,14 @@ class AuditService:
         Audit logları filtreli olarak getirir.
         
         Returns:
-            {'items': [...], 'total': int, 'page': int, 'per_page': int}
+            {'items': [...], 'total': int, 'page': int, 'per_page': int,
+             'next_cursor': str}
+        
+        Audit tablosu büyük olduğundan toplam sayı varsayılan olarak planner
+        tahminidir; ``?cursor=`` ile derin sayfalar OFFSET'siz gezilir.
         """
+        from app.core.pagination import paginate_query, TOTAL_ESTIMATE
+        
         query = AuditLog.query
         
         if user_id:
@@ -356,16 +362,11 @@ class AuditService:
         
         # Sıralama ve sayfalama
         query = query.order_by(AuditLog.created_at.desc())
-        total = query.count()
-        
-        items = query.offset((page - 1) * per_page).limit(per_page).all()
+        result = paginate_query(query, page, per_page, default_total=TOTAL_ESTIMATE)
         
         return {
-            'items': [item.to_dict() for item in items],
-            'total': total,
-            'page': page,
-            'per_page': per_page,
-            'total_pages': (total + per_page - 1) // per_page
+            'items': [item.to_dict() for item in result.items],
+            **result.to_dict()
         }
     
     @classmethod
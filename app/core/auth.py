@@ -44,7 +44,7 @@ from flask_jwt_extended import (
 
 from app.core.exceptions import AuthenticationError, AuthorizationError
 from app.core.jwt_service import JWTService
-from app.core.permissions import Permission, ROLE_PERMISSIONS, RoleLevel
+from app.core.permissions import Permission, RoleLevel, role_has_flat_permission
 
 logger = logging.getLogger(__name__)
 
@@ -64,7 +64,7 @@ def require_auth(f: Callable = None, *, optional: bool = False, fresh: bool = Fa
     Example:
         @require_auth
         def protected_route():
-            user = g.current_user
+            user = get_current_user()  # ORM nesnesi gerektiğinde
             ...
         
         @require_auth(fresh=True)
@@ -81,13 +81,13 @@ def require_auth(f: Callable = None, *, optional: bool = False, fresh: bool = Fa
                 else:
                     verify_jwt_in_request(optional=optional)
                 
-                # Kullanıcıyı g'ye ekle
-                user = get_current_user()
+                # Kullanıcı görüntüsünü g'ye ekle (ORM nesnesi yüklenmez)
+                user = get_current_user_snapshot()
                 if user:
-                    g.current_user = user
+                    claims = get_jwt()
                     g.current_user_id = user.id
-                    g.user_role = get_jwt().get('role', 'student')
-                    g.user_permissions = get_jwt().get('permissions', [])
+                    g.user_role = claims.get('role', 'student')
+                    g.user_permissions = claims.get('permissions', [])
                 elif not optional:
                     raise AuthenticationError('Oturum açmanız gerekiyor')
                 
@@ -131,11 +131,11 @@ def require_verified_email(f: Callable) -> Callable:
     """
     @wraps(f)
     def wrapper(*args, **kwargs):
-        user = getattr(g, 'current_user', None)
+        user = get_current_user_snapshot()
         if not user:
             raise AuthenticationError('Oturum açmanız gerekiyor')
         
-        if not getattr(user, 'email_verified', False):
+        if not user.is_verified:
             raise AuthorizationError(
                 'Bu işlem için e-posta adresinizi doğrulamanız gerekiyor'
             )
@@ -153,11 +153,11 @@ def require_active_user(f: Callable) -> Callable:
     """
     @wraps(f)
     def wrapper(*args, **kwargs):
-        user = getattr(g, 'current_user', None)
+        user = get_current_user_snapshot()
         if not user:
             raise AuthenticationError('Oturum açmanız gerekiyor')
         
-        if not getattr(user, 'is_active', True):
+        if not user.is_active:
             raise AuthorizationError('Hesabınız devre dışı bırakılmış')
         
         return f(*args, **kwargs)
@@ -381,7 +381,7 @@ def require_owner_or_role(
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(*args, **kwargs):
-            user = getattr(g, 'current_user', None)
+            user = get_current_user_snapshot()
             if not user:
                 raise AuthenticationError('Oturum açmanız gerekiyor')
             
@@ -424,7 +424,7 @@ def require_owner(owner_field: str = 'user_id', id_param: str = None):
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(*args, **kwargs):
-            user = getattr(g, 'current_user', None)
+            user = get_current_user_snapshot()
             if not user:
                 raise AuthenticationError('Oturum açmanız gerekiyor')
             
@@ -470,7 +470,7 @@ def require_self_or_admin(id_param: str = 'user_id'):
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(*args, **kwargs):
-            user = getattr(g, 'current_user', None)
+            user = get_current_user_snapshot()
             if not user:
                 raise AuthenticationError('Oturum açmanız gerekiyor')
             
@@ -507,7 +507,7 @@ def require_course_access(permission_type: str = 'read'):
     def decorator(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(*args, **kwargs):
-            user = getattr(g, 'current_user', None)
+            user = get_current_user_snapshot()
             if not user:
                 raise AuthenticationError('Oturum açmanız gerekiyor')
             
@@ -555,13 +555,21 @@ def require_course_access(permission_type: str = 'read'):
 # HELPER FUNCTIONS
 # =========================================================================
 
-def _has_permission(permission: str) -> bool:
+def _permission_context():
     """
-    Mevcut kullanıcının belirli bir permission'a sahip olup olmadığını kontrol eder.
+    İstek başına (rol, kullanıcıya özel permission kümesi) çiftini döner.
+    
+    JWT claim'leri bir kez okunup `g` içinde tutulur; aynı istekteki
+    sonraki kontroller (iç içe decorator'lar) yeniden ayrıştırma yapmaz.
     """
+    context = getattr(g, '_permission_context', None)
+    if context is not None:
+        return context
+    
+    claims = None
+    
     # g.user_permissions'tan kontrol
     user_permissions = getattr(g, 'user_permissions', None)
-    
     if user_permissions is None:
         # JWT'den al
         try:
@@ -570,65 +578,97 @@ def _has_permission(permission: str) -> bool:
         except Exception:
             user_permissions = []
     
-    # Permission kontrolü
-    if permission in user_permissions:
-        return True
-    
-    # Rol bazlı permission kontrolü
     user_role = getattr(g, 'user_role', None)
     if user_role is None:
         try:
-            claims = get_jwt()
+            claims = claims if claims is not None else get_jwt()
             user_role = claims.get('role', 'student')
         except Exception:
             user_role = 'student'
     
-    # Super admin her şeye erişebilir
-    if user_role == 'super_admin':
-        return True
+    context = (user_role, frozenset(user_permissions or ()))
+    g._permission_context = context
+    return context
+
+
+def _has_permission(permission: str) -> bool:
+    """
+    Mevcut kullanıcının belirli bir permission'a sahip olup olmadığını kontrol eder.
     
-    # Rol permission'larını kontrol et
-    role_perms = ROLE_PERMISSIONS.get(user_role, [])
-    return any(
-        (p.value if isinstance(p, Permission) else p) == permission
-        for p in role_perms
-    )
+    Rolün düz permission listesi önceden kümeye çevrilmiştir; kontrol O(1)
+    küme üyeliğidir. Hiyerarşi ve `resource:manage` kapsamı burada
+    uygulanmaz (bkz. `permissions.check_permission`).
+    """
+    user_role, user_permissions = _permission_context()
+    return role_has_flat_permission(user_role, permission, user_permissions)
 
 
-def get_current_user():
+def get_current_user_snapshot():
     """
-    Mevcut oturum açmış kullanıcıyı döner.
+    Mevcut kullanıcının önbellekli görüntüsünü döner.
+    
+    Decorator'lar bunu kullanır; istek başına bir kez, çoğunlukla
+    veritabanına gitmeden çözülür.
     
     Returns:
-        User instance veya None
+        UserSnapshot (aktif kullanıcı) veya None
     """
-    if hasattr(g, 'current_user'):
-        return g.current_user
+    if hasattr(g, 'current_user_snapshot'):
+        return g.current_user_snapshot
     
+    snapshot = None
     try:
         verify_jwt_in_request(optional=True)
         user_id = get_jwt_identity()
         
         if user_id:
-            from app.modules.users.models import User
-            user = User.query.filter_by(id=user_id, is_active=True).first()
-            g.current_user = user
-            return user
+            from app.services.user_snapshot_service import UserSnapshotService
+            snapshot = UserSnapshotService.get(user_id)
+            if snapshot is not None and not snapshot.is_active:
+                snapshot = None
     except Exception:
         pass
     
-    return None
+    g.current_user_snapshot = snapshot
+    return snapshot
+
+
+def get_current_user():
+    """
+    Mevcut oturum açmış kullanıcıyı döner.
+    
+    ORM nesnesi yalnızca route gerçekten ihtiyaç duyduğunda yüklenir;
+    aktiflik kontrolü önbellekli görüntü üzerinden yapılır.
+    
+    Returns:
+        User instance veya None
+    """
+    if hasattr(g, 'current_user'):
+        return g.current_user
+    
+    snapshot = get_current_user_snapshot()
+    if snapshot is None:
+        return None
+    
+    from app.extensions import db
+    from app.modules.users.models import User
+    
+    user = db.session.get(User, snapshot.id)
+    if user is not None and not user.is_active:
+        user = None
+    g.current_user = user
+    return user
 
 
 def get_current_user_id() -> Optional[int]:
     """Mevcut kullanıcı ID'sini döner."""
-    user = get_current_user()
-    return user.id if user else None
+    snapshot = get_current_user_snapshot()
+    return snapshot.id if snapshot else None
 
 
 def is_authenticated() -> bool:
     """Kullanıcı oturum açmış mı?"""
-    return get_current_user() is not None
+    return get_current_user_snapshot() is not None
 
 
 def has_role(role: str) -> bool:
@@ -657,9 +697,9 @@ def is_admin() -> bool:
 
 def is_owner(resource, owner_field: str = 'user_id') -> bool:
     """Kullanıcı kaynağın sahibi mi?"""
-    user = get_current_user()
-    if not user:
+    user_id = get_current_user_id()
+    if not user_id:
         return False
     
     owner_id = getattr(resource, owner_field, None)
-    return owner_id == user.id
+    return owner_id == user_id
@@ -1,13 +1,46 @@
 """
 Pagination utilities.
 
-Offset-based ve cursor-based pagination desteği sağlar.
+Offset-based ve cursor-based (keyset) pagination desteği sağlar.
+
+Keyset cursor'lar opak ve imzalıdır; sorgunun ``order_by`` sütunlarının
+son satırdaki değerlerini (ve eşitlik bozucu olarak primary key'i) taşır.
+``?cursor=...`` verildiğinde OFFSET yerine ``WHERE (created_at, id) < (...)``
+ile seek yapılır, bu yüzden derin sayfalar da ilk sayfa kadar ucuzdur.
+NULL olabilen sıralama sütunlarında NULL en büyük değer sayılır (PostgreSQL
+varsayılanı: ASC NULLS LAST, DESC NULLS FIRST) ve seek koşulu buna göre kurulur.
+
+Toplam sayı modu (``?total=exact|estimate|none``):
+    exact    : COUNT(*) (varsayılan)
+    estimate : PostgreSQL planner tahmini (EXPLAIN), küçük sonuçlarda exact
+    none     : Sayım yapılmaz; has_next bir fazla satır çekilerek bulunur
 """
 
+import enum
+import hashlib
+import json
+from datetime import date, datetime
+from decimal import Decimal
 from typing import Any, Dict, List, Tuple, Optional
 from dataclasses import dataclass
-from flask import request
+from flask import current_app, has_app_context, has_request_context, request
+from itsdangerous import BadSignature, URLSafeSerializer
+from sqlalchemy import and_, inspect as sa_inspect, or_, tuple_
 from sqlalchemy.orm import Query
+from sqlalchemy.sql import operators
+
+from app.core.exceptions import ValidationError
+
+
+TOTAL_EXACT = 'exact'
+TOTAL_ESTIMATE = 'estimate'
+TOTAL_NONE = 'none'
+TOTAL_MODES = (TOTAL_EXACT, TOTAL_ESTIMATE, TOTAL_NONE)
+
+# Planner tahmini bu değerin altındaysa gerçek COUNT zaten ucuzdur.
+ESTIMATE_EXACT_THRESHOLD = 1000
+
+_CURSOR_SALT = 'pagination-cursor'
 
 
 @dataclass
@@ -16,6 +49,8 @@ class PaginationParams:
     page: int = 1
     per_page: int = 20
     max_per_page: int = 100
+    cursor: Optional[str] = None
+    total: Optional[str] = None
     
     @classmethod
     def from_request(cls, max_per_page: int = 100) -> 'PaginationParams':
@@ -31,19 +66,29 @@ class PaginationParams:
         except (ValueError, TypeError):
             per_page = 20
         
-        return cls(page=page, per_page=per_page, max_per_page=max_per_page)
+        total = request.args.get('total')
+        
+        return cls(
+            page=page,
+            per_page=per_page,
+            max_per_page=max_per_page,
+            cursor=request.args.get('cursor') or None,
+            total=total if total in TOTAL_MODES else None
+        )
 
 
 @dataclass
 class PaginationResult:
     """Pagination sonucu."""
     items: List[Any]
-    page: int
+    page: Optional[int]
     per_page: int
-    total: int
-    total_pages: int
+    total: Optional[int]
+    total_pages: Optional[int]
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    total_mode: str = TOTAL_EXACT
     
     def to_dict(self) -> Dict[str, Any]:
         """Dict'e çevir."""
@@ -52,54 +97,296 @@ class PaginationResult:
             'per_page': self.per_page,
             'total': self.total,
             'total_pages': self.total_pages,
+            'total_mode': self.total_mode,
             'has_next': self.has_next,
-            'has_prev': self.has_prev
+            'has_prev': self.has_prev,
+            'next_cursor': self.next_cursor
         }
 
 
+# =============================================================================
+# Keyset cursor
+# =============================================================================
+
+def _serializer() -> URLSafeSerializer:
+    return URLSafeSerializer(current_app.config['SECRET_KEY'], salt=_CURSOR_SALT)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    if isinstance(value, date):
+        return {'$d': value.isoformat()}
+    if isinstance(value, Decimal):
+        return {'$dec': str(value)}
+    if isinstance(value, enum.Enum):
+        return value.name
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if '$dt' in value:
+            return datetime.fromisoformat(value['$dt'])
+        if '$d' in value:
+            return date.fromisoformat(value['$d'])
+        if '$dec' in value:
+            return Decimal(value['$dec'])
+    return value
+
+
+def _is_entity_column(mapper, model, element) -> bool:
+    """Sütun, modelin kendi tablosunda aynı adla eşlenmiş bir sütun mu?"""
+    key = getattr(element, 'key', None)
+    if key is None or getattr(element, 'table', None) is not model.__table__:
+        return False
+    return mapper.columns.get(key) is element._deannotate()
+
+
+def _keyset_columns(query: Query) -> Optional[List[Tuple[Any, bool]]]:
+    """
+    Sorgunun sıralamasını (sütun, azalan_mı) listesine çevirir.
+    
+    Primary key sıralamada yoksa eşitlik bozucu olarak eklenir.
+    Sıralama düz model sütunlarından oluşmuyorsa None döner (offset'e düşülür).
+    """
+    descriptions = query.column_descriptions
+    if len(descriptions) != 1 or descriptions[0].get('entity') is None:
+        return None
+    model = descriptions[0]['entity']
+    if descriptions[0].get('type') is not model:
+        return None
+    
+    mapper = sa_inspect(model)
+    
+    columns = []
+    for clause in query._order_by_clauses:
+        descending = False
+        element = clause
+        modifier = getattr(clause, 'modifier', None)
+        if modifier in (operators.desc_op, operators.asc_op):
+            descending = modifier is operators.desc_op
+            element = clause.element
+        if not _is_entity_column(mapper, model, element):
+            # Join edilen tablo/alias sütunu: cursor değeri satırdan okunamaz
+            return None
+        columns.append((element, descending))
+    
+    keys = {col.key for col, _ in columns}
+    last_descending = columns[-1][1] if columns else False
+    for pk in mapper.primary_key:
+        if not _is_entity_column(mapper, model, pk):
+            return None
+        if pk.key not in keys:
+            columns.append((pk, last_descending))
+    return columns
+
+
+def _order_signature(columns: List[Tuple[Any, bool]]) -> str:
+    raw = ','.join(f'{col.table.name}.{col.key}:{int(desc_)}' for col, desc_ in columns)
+    return hashlib.sha1(raw.encode()).hexdigest()[:10]
+
+
+def encode_cursor(item: Any, columns: List[Tuple[Any, bool]]) -> str:
+    """Son satırdan imzalı, opak bir cursor üretir."""
+    values = [getattr(item, col.key, None) for col, _ in columns]
+    payload = {
+        'o': _order_signature(columns),
+        'v': [_encode_value(value) for value in values]
+    }
+    return _serializer().dumps(payload)
+
+
+def decode_cursor(cursor: str, columns: List[Tuple[Any, bool]]) -> List[Any]:
+    """Cursor'ı doğrular ve sütun değerlerini döner."""
+    try:
+        payload = _serializer().loads(cursor)
+    except BadSignature:
+        raise ValidationError('Geçersiz sayfalama cursor\'ı', field='cursor')
+    if payload.get('o') != _order_signature(columns) or len(payload.get('v', [])) != len(columns):
+        raise ValidationError('Cursor bu sıralama ile uyumsuz', field='cursor')
+    return [_decode_value(value) for value in payload['v']]
+
+
+def _order_clause(col, descending: bool):
+    """Sütunun sıralama ifadesi; NULL olabilen sütunlarda NULL en büyük sayılır."""
+    if not col.nullable:
+        return col.desc() if descending else col.asc()
+    return col.desc().nulls_first() if descending else col.asc().nulls_last()
+
+
+def _equal_condition(col, value: Any):
+    return col.is_(None) if value is None else col == value
+
+
+def _step_condition(col, descending: bool, value: Any):
+    """Sıralamada ``value``'dan sonra gelen değerler; yoksa None."""
+    if not col.nullable:
+        return col < value if descending else col > value
+    if value is None:
+        # NULL en büyük: artanda sonrası yok, azalanda tüm NULL olmayanlar
+        return col.isnot(None) if descending else None
+    if descending:
+        return col < value
+    return or_(col > value, col.is_(None))
+
+
+def _seek_condition(columns: List[Tuple[Any, bool]], values: List[Any]):
+    """``(c1, c2, ...) > (v1, v2, ...)`` karşılığı seek koşulu (yön ve NULL duyarlı)."""
+    directions = {desc_ for _, desc_ in columns}
+    if len(directions) == 1 and not any(col.nullable for col, _ in columns):
+        # Tek yönlü sıralama: row-value karşılaştırması index'i doğrudan kullanır.
+        row = tuple_(*[col for col, _ in columns])
+        if directions.pop():
+            return row < tuple_(*values)
+        return row > tuple_(*values)
+    
+    clauses = []
+    for i, (col, descending) in enumerate(columns):
+        step = _step_condition(col, descending, values[i])
+        if step is None:
+            continue
+        equal_prefix = [_equal_condition(columns[j][0], values[j]) for j in range(i)]
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+# =============================================================================
+# Total count
+# =============================================================================
+
+def estimate_count(query: Query) -> Optional[int]:
+    """
+    PostgreSQL planner'ından satır sayısı tahmini alır.
+    
+    Diğer veritabanlarında veya EXPLAIN başarısız olursa None döner.
+    EXPLAIN bir savepoint içinde çalışır; hata yalnızca onu geri alır,
+    çağıranın transaction'ı (ve ardından gelen COUNT) sağlam kalır.
+    """
+    session = query.session
+    bind = session.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return None
+    
+    # IN (...) gibi genişleyen parametreler sürücüye gitmeden açılmalı
+    compiled = query.order_by(None).statement.compile(
+        dialect=bind.dialect, compile_kwargs={'render_postcompile': True}
+    )
+    try:
+        with session.begin_nested():
+            plan = session.connection().exec_driver_sql(
+                f'EXPLAIN (FORMAT JSON) {compiled}', compiled.params
+            ).scalar()
+    except Exception:
+        return None
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_query(query: Query, mode: str = TOTAL_EXACT) -> Optional[int]:
+    """Toplam sayıyı istenen modda hesaplar."""
+    if mode == TOTAL_NONE:
+        return None
+    if mode == TOTAL_ESTIMATE:
+        estimate = estimate_count(query)
+        if estimate is not None and estimate >= ESTIMATE_EXACT_THRESHOLD:
+            return estimate
+    return query.order_by(None).count()
+
+
+def _request_arg(name: str) -> Optional[str]:
+    if has_request_context():
+        return request.args.get(name) or None
+    return None
+
+
 def paginate_query(
     query: Query,
     page: int = 1,
-    per_page: int = 20
+    per_page: int = 20,
+    cursor: Optional[str] = None,
+    total: Optional[str] = None,
+    default_total: str = TOTAL_EXACT
 ) -> PaginationResult:
     """
     SQLAlchemy query'sini paginate eder.
     
+    Sıralama düz model sütunlarından oluşuyorsa her sayfa ``next_cursor``
+    döner; istemci bunu ``?cursor=`` ile geri gönderdiğinde OFFSET yerine
+    keyset seek kullanılır. ``cursor``/``total`` verilmezse request
+    parametrelerinden okunur. Cursor'lı sayfalarda istemci ``total``
+    belirtmediyse sayım yapılmaz (toplam ilk sayfada döndü).
+    
     Args:
         query: SQLAlchemy Query objesi
-        page: Sayfa numarası (1-indexed)
+        page: Sayfa numarası (1-indexed, cursor yoksa kullanılır)
         per_page: Sayfa başına öğe sayısı
+        cursor: Önceki sayfanın ``next_cursor`` değeri
+        total: 'exact' | 'estimate' | 'none'
+        default_total: İstemci belirtmezse ilk sayfada kullanılacak toplam modu
     
     Returns:
         PaginationResult
     
     Kullanım:
-        query = User.query.filter_by(is_active=True)
+        query = User.query.filter_by(is_active=True).order_by(User.created_at.desc())
         result = paginate_query(query, page=1, per_page=20)
+        result = paginate_query(query, per_page=20, cursor=result.next_cursor)
     """
-    # Toplam sayıyı hesapla
-    total = query.count()
+    cursor = cursor or _request_arg('cursor')
+    if cursor:
+        # Derin sayfalarda COUNT(*) keyset'in kazandırdığını geri alır
+        default_total = TOTAL_NONE
+    total_mode = total or _request_arg('total') or default_total
+    if total_mode not in TOTAL_MODES:
+        total_mode = default_total
     
-    # Toplam sayfa sayısı
-    total_pages = (total + per_page - 1) // per_page if per_page > 0 else 0
+    columns = _keyset_columns(query)
+    if columns is not None:
+        # PK eşitlik bozucusu dahil tam ve deterministik sıralama
+        query = query.order_by(None).order_by(
+            *[_order_clause(col, descending) for col, descending in columns]
+        )
+    elif cursor:
+        raise ValidationError('Bu liste cursor ile sayfalanamaz', field='cursor')
     
-    # Sayfa sınırlarını kontrol et
-    page = max(1, min(page, total_pages)) if total_pages > 0 else 1
+    # Toplam sayıyı hesapla (filtrelerle, seek koşulu olmadan)
+    total_count = count_query(query, total_mode)
+    total_pages = None
+    if total_count is not None:
+        total_pages = (total_count + per_page - 1) // per_page if per_page > 0 else 0
+    
+    if cursor:
+        values = decode_cursor(cursor, columns)
+        page_query = query.filter(_seek_condition(columns, values))
+        page = None
+    else:
+        # Sayfa sınırlarını yalnızca kesin sayımda kontrol et
+        if total_mode == TOTAL_EXACT and total_pages is not None:
+            page = max(1, min(page, total_pages)) if total_pages > 0 else 1
+        page = max(1, page)
+        page_query = query.offset((page - 1) * per_page)
     
-    # Offset hesapla
-    offset = (page - 1) * per_page
+    # +1 fazla çek: has_next sayıma ihtiyaç duymadan bulunur
+    items = page_query.limit(per_page + 1).all()
+    has_next = len(items) > per_page
+    items = items[:per_page]
     
-    # Verileri çek
-    items = query.offset(offset).limit(per_page).all()
+    next_cursor = None
+    if has_next and columns is not None and items and has_app_context():
+        next_cursor = encode_cursor(items[-1], columns)
     
     return PaginationResult(
         items=items,
         page=page,
         per_page=per_page,
-        total=total,
+        total=total_count,
         total_pages=total_pages,
-        has_next=page < total_pages,
-        has_prev=page > 1
+        has_next=has_next,
+        has_prev=bool(cursor) or (page or 1) > 1,
+        next_cursor=next_cursor,
+        total_mode=total_mode
     )
 
 
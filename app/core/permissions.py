@@ -26,7 +26,7 @@ Kullanım:
 
 from enum import Enum
 from functools import wraps
-from typing import List, Optional, Callable, Any, Union
+from typing import Dict, FrozenSet, Iterable, List, Optional, Callable, Any, Union
 
 from flask import g, request, has_request_context
 from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request, get_jwt
@@ -237,6 +237,57 @@ ROLE_PERMISSIONS = {
 }
 
 
+ROLE_HIERARCHY = ('student', 'teacher', 'admin', 'super_admin')
+
+
+def _permission_value(permission: Union[Permission, str]) -> str:
+    return permission.value if isinstance(permission, Permission) else permission
+
+
+def _manage_permission(permission_value: str) -> str:
+    """`resource:action` için `resource:manage`."""
+    return f"{permission_value.split(':', 1)[0]}:manage"
+
+
+def expand_permissions(values: Iterable[str]) -> FrozenSet[str]:
+    """
+    Permission kümesine `resource:manage` kapsamındaki tüm permission'ları ekler.
+    """
+    values = set(values)
+    values.update(
+        p.value for p in Permission
+        if _manage_permission(p.value) in values
+    )
+    return frozenset(values)
+
+
+def _build_role_permission_sets():
+    """Rol -> (hiyerarşik permission listesi, genişletilmiş frozenset) tabloları."""
+    hierarchical: Dict[str, tuple] = {}
+    effective: Dict[str, FrozenSet[str]] = {}
+    inherited: list = []
+    for role in ROLE_HIERARCHY:
+        for perm in ROLE_PERMISSIONS.get(role, []):
+            if perm not in inherited:
+                inherited.append(perm)
+        hierarchical[role] = tuple(inherited)
+        effective[role] = expand_permissions(_permission_value(p) for p in inherited)
+    # Super admin her şeye erişebilir
+    effective['super_admin'] = frozenset(p.value for p in Permission)
+    return hierarchical, effective
+
+
+# Başlangıçta bir kez hesaplanır; kontroller O(1) küme üyeliğidir
+_ROLE_HIERARCHY_PERMISSIONS, ROLE_PERMISSION_SETS = _build_role_permission_sets()
+
+# Decorator'ların (auth._has_permission) kullandığı düz rol kümeleri:
+# hiyerarşi ve manage genişletmesi yok, yalnızca rolün kendi listesi
+ROLE_FLAT_PERMISSION_SETS: Dict[str, FrozenSet[str]] = {
+    role: frozenset(_permission_value(p) for p in perms)
+    for role, perms in ROLE_PERMISSIONS.items()
+}
+
+
 def get_role_permissions(role_name: str) -> List[Permission]:
     """
     Bir rolün tüm permission'larını döner (hiyerarşik).
@@ -247,23 +298,47 @@ def get_role_permissions(role_name: str) -> List[Permission]:
     Returns:
         Permission listesi
     """
-    permissions = set()
+    return list(_ROLE_HIERARCHY_PERMISSIONS.get(role_name, ()))
+
+
+def role_has_permission(
+    role_name: Optional[str],
+    required_permission: Union[Permission, str],
+    granted: FrozenSet[str] = None
+) -> bool:
+    """
+    Rol (ve varsa kullanıcıya özel `granted` kümesi) permission'ı karşılıyor mu?
     
-    # Hiyerarşi sırası
-    hierarchy = ['student', 'teacher', 'admin', 'super_admin']
+    Enum dışı permission adları için de `resource:manage` kuralı uygulanır.
+    """
+    if role_name == 'super_admin':
+        return True
     
-    try:
-        role_index = hierarchy.index(role_name)
-    except ValueError:
-        return list(permissions)
+    permission_value = _permission_value(required_permission)
+    role_set = ROLE_PERMISSION_SETS.get(role_name, frozenset())
+    if permission_value in role_set or (granted and permission_value in granted):
+        return True
     
-    # Alt rollerin permission'larını da ekle
-    for i in range(role_index + 1):
-        role = hierarchy[i]
-        if role in ROLE_PERMISSIONS:
-            permissions.update(ROLE_PERMISSIONS[role])
+    manage_permission = _manage_permission(permission_value)
+    return manage_permission in role_set or bool(granted and manage_permission in granted)
+
+
+def role_has_flat_permission(
+    role_name: Optional[str],
+    required_permission: Union[Permission, str],
+    granted: FrozenSet[str] = None
+) -> bool:
+    """
+    Rolün kendi (düz) listesi veya kullanıcıya özel `granted` kümesi
+    permission'ı birebir içeriyor mu? Super admin her şeye erişir.
+    """
+    if role_name == 'super_admin':
+        return True
     
-    return list(permissions)
+    permission_value = _permission_value(required_permission)
+    if granted and permission_value in granted:
+        return True
+    return permission_value in ROLE_FLAT_PERMISSION_SETS.get(role_name, frozenset())
 
 
 def get_current_user():
@@ -347,25 +422,8 @@ def check_permission(required_permission: Union[Permission, str]) -> bool:
     if not current_role:
         return False
     
-    user_permissions = get_role_permissions(current_role)
-    
-    # String veya Enum olabilir
-    permission_value = required_permission.value if isinstance(required_permission, Permission) else required_permission
-    
-    # Manage permission'ı varsa alt permission'lar da geçerli
-    resource = permission_value.split(':')[0] if ':' in permission_value else permission_value
-    manage_permission = f"{resource}:manage"
-    
-    for perm in user_permissions:
-        perm_value = perm.value if isinstance(perm, Permission) else perm
-        if perm_value == permission_value or perm_value == manage_permission:
-            return True
-    
-    # Super admin her şeye erişebilir
-    if current_role == 'super_admin':
-        return True
-    
-    return False
+    # Manage permission'ı varsa alt permission'lar da geçerli (ön hesaplı kümede)
+    return role_has_permission(current_role, required_permission)
 
 
 def check_ownership(entity: Any, owner_field: str = 'user_id') -> bool:
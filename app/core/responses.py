@@ -226,11 +226,12 @@ def validation_error_response(
 
 def paginated_response(
     items: List[Any],
-    page: int,
-    per_page: int,
-    total: int,
+    page: int = None,
+    per_page: int = None,
+    total: int = None,
     message: str = None,
-    meta: Dict[str, Any] = None
+    meta: Dict[str, Any] = None,
+    pagination: Any = None
 ) -> tuple:
     """
     Sayfalanmış API response'u oluşturur.
@@ -242,6 +243,8 @@ def paginated_response(
         total: Toplam öğe sayısı
         message: Opsiyonel mesaj
         meta: Ek metadata
+        pagination: paginate_query sonucu (PaginationResult); verilirse
+            page/per_page/total ile cursor bilgisi buradan alınır
     
     Returns:
         Tuple of (response_dict, 200)
@@ -260,29 +263,45 @@ def paginated_response(
                 "has_next": true,
                 "has_prev": false,
                 "next_page": 2,
-                "prev_page": null
+                "prev_page": null,
+                "next_cursor": "eyJvIjoi...",
+                "total_mode": "exact"
             }
         }
     """
-    total_pages = (total + per_page - 1) // per_page if per_page > 0 else 0
+    if pagination is not None:
+        page = pagination.page
+        per_page = pagination.per_page
+        total = pagination.total
+        has_next = pagination.has_next
+        has_prev = pagination.has_prev
+        total_pages = pagination.total_pages
+    else:
+        total_pages = (total + per_page - 1) // per_page if per_page > 0 else 0
+        has_next = page < total_pages
+        has_prev = page > 1
     
-    pagination = {
+    page_info = {
         'page': page,
         'per_page': per_page,
         'total': total,
         'total_pages': total_pages,
-        'has_next': page < total_pages,
-        'has_prev': page > 1,
-        'next_page': page + 1 if page < total_pages else None,
-        'prev_page': page - 1 if page > 1 else None
+        'has_next': has_next,
+        'has_prev': has_prev,
+        'next_page': page + 1 if page and has_next else None,
+        'prev_page': page - 1 if page and page > 1 else None
     }
     
+    if pagination is not None:
+        page_info['next_cursor'] = pagination.next_cursor
+        page_info['total_mode'] = pagination.total_mode
+    
     response = {
         'success': True,
         'timestamp': datetime.utcnow().isoformat() + 'Z',
         'request_id': _get_request_id(),
         'data': items,
-        'pagination': pagination
+        'pagination': page_info
     }
     
     if message:
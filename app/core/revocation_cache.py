@@ -0,0 +1,264 @@
+"""
+Revocation Cache.
+
+TokenBlacklistService için süreç içi iptal önbelleği: iptal edilen JTI'lar
+için Bloom filtresi ve kullanıcı token version'ları.
+
+Her süreç Redis `token:revocations` kanalına abone olur; abonelik
+kurulduktan sonra mevcut blacklist anahtarları SCAN ile filtreye yüklenir
+ve önbellek "hazır" olur. Hazırken:
+    - Filtrede olmayan JTI iptal edilmemiştir (ağ çağrısı yok)
+    - Filtrede olan JTI Redis'te doğrulanır (yanlış pozitif olabilir)
+    - Token version'ları yerelden okunur, kanal olaylarıyla güncellenir
+
+Bağlantı koparsa önbellek hazır olmaktan çıkar ve tüm kontroller yeniden
+Redis/veritabanına gider. Başka süreçteki bir iptal, yayın gecikmesi
+(tipik olarak milisaniyeler) kadar sonra görülür.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from app.utils.bloom import BloomFilter
+from app.utils.cache import LocalCache
+
+logger = logging.getLogger(__name__)
+
+
+class RevocationCache:
+    """
+    Pub/sub ile güncel tutulan JTI Bloom filtresi + token version önbelleği.
+
+    Usage:
+        revocations = RevocationCache()
+        revocations.start(redis_url)
+        if revocations.might_be_revoked(jti):
+            ...  # Redis'te doğrula
+    """
+
+    CHANNEL = 'token:revocations'
+
+    def __init__(
+        self,
+        blacklist_prefix: str = 'token:blacklist:',
+        capacity: int = 100000,
+        error_rate: float = 0.001,
+        rebuild_interval: float = 300,
+        version_ttl: int = 300,
+        retry_interval: float = 5.0
+    ):
+        self.blacklist_prefix = blacklist_prefix
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.rebuild_interval = rebuild_interval
+        self.retry_interval = retry_interval
+
+        self._filter = BloomFilter(capacity, error_rate)
+        self._versions = LocalCache(max_size=capacity, default_ttl=version_ttl)
+        self._ready = False
+        self._synced_at: Optional[float] = None
+        self._redis_url: Optional[str] = None
+        self._start_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+
+        self._counters = {
+            'negative_hits': 0,
+            'filter_positives': 0,
+            'events': 0,
+            'rebuilds': 0,
+            'disconnects': 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._thread is not None
+            and self._pid == os.getpid()
+            and self._thread.is_alive()
+        )
+
+    @property
+    def ready(self) -> bool:
+        """Filtre senkron mu (negatif cevaplara güvenilebilir mi)."""
+        return self._ready and self._pid == os.getpid()
+
+    def start(self, redis_url: str) -> None:
+        """Abonelik thread'ini başlatır (idempotent, fork sonrası yeniden)."""
+        if self.running:
+            return
+        with self._start_lock:
+            if self.running:
+                return
+
+            self._ready = False
+            self._redis_url = redis_url
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run, name='token-revocations', daemon=True
+            )
+            self._thread.start()
+
+    def stop(self, timeout: float = 2.0) -> None:
+        self._stop.set()
+        self._ready = False
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def might_be_revoked(self, jti: str) -> bool:
+        """
+        False ise token kesinlikle iptal edilmemiştir.
+
+        Önbellek hazır değilse her zaman True döner (kesin kaynağa git).
+        """
+        if not self.ready:
+            return True
+        if jti in self._filter:
+            self._counters['filter_positives'] += 1
+            return True
+        self._counters['negative_hits'] += 1
+        return False
+
+    def get_version(self, user_id) -> Optional[int]:
+        """Yerel token version'ı; hazır değilse veya bilinmiyorsa None."""
+        if not self.ready:
+            return None
+        return self._versions.get(str(user_id), None)
+
+    def store_version(self, user_id, version: int) -> None:
+        """Redis'ten okunan version'ı önbelleğe yazar (asla geriye almaz)."""
+        if not self.ready:
+            return
+        key = str(user_id)
+        current = self._versions.get(key, None)
+        if current is None or version > current:
+            self._versions.set(key, version)
+
+    # ------------------------------------------------------------------
+    # Events
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def revoked_event(cls, jti: str) -> str:
+        return json.dumps({'jti': jti})
+
+    @classmethod
+    def version_event(cls, user_id, version: int) -> str:
+        return json.dumps({'user_id': str(user_id), 'version': version})
+
+    def apply(self, payload: str) -> None:
+        """Kanal olayını (veya yerel iptali) önbelleğe uygular."""
+        try:
+            event = json.loads(payload)
+        except (TypeError, ValueError):
+            logger.warning(f'Invalid revocation event: {payload!r}')
+            return
+
+        self._counters['events'] += 1
+        if event.get('jti'):
+            self._filter.add(event['jti'])
+        elif event.get('user_id') is not None:
+            key = str(event['user_id'])
+            current = self._versions.get(key, None)
+            version = int(event.get('version') or 0)
+            if current is None or version > current:
+                self._versions.set(key, version)
+
+    def rebuild(self, client) -> int:
+        """
+        Blacklist anahtarlarından yeni filtre kurar ve eskisiyle değiştirir.
+
+        Süresi dolan JTI'lar böylece filtreden düşer. Returns: yüklenen JTI sayısı.
+        """
+        fresh = BloomFilter(self.capacity, self.error_rate)
+        offset = len(self.blacklist_prefix)
+        for key in client.scan_iter(match=f'{self.blacklist_prefix}*', count=1000):
+            if isinstance(key, bytes):
+                key = key.decode()
+            fresh.add(key[offset:])
+
+        self._filter = fresh
+        self._synced_at = time.monotonic()
+        self._counters['rebuilds'] += 1
+        if fresh.saturated:
+            logger.warning(
+                f'Revocation filter over capacity ({len(fresh)} > {self.capacity}); '
+                f'false positive rate is above target'
+            )
+        return len(fresh)
+
+    # ------------------------------------------------------------------
+    # Subscriber thread
+    # ------------------------------------------------------------------
+
+    def _subscribe(self, client):
+        pubsub = client.pubsub()
+        pubsub.subscribe(self.CHANNEL)
+        # Abonelik onaylanmadan SCAN yapılırsa aradaki iptaller kaçabilir
+        while not self._stop.is_set():
+            message = pubsub.get_message(timeout=1.0)
+            if message and message['type'] == 'subscribe':
+                return pubsub
+        return pubsub
+
+    def _run(self) -> None:
+        import redis
+
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                client = redis.from_url(
+                    self._redis_url,
+                    decode_responses=True,
+                    socket_connect_timeout=1.0,
+                    health_check_interval=30
+                )
+                pubsub = self._subscribe(client)
+                self.rebuild(client)
+                self._versions.clear()
+                self._ready = True
+
+                while not self._stop.is_set():
+                    if time.monotonic() - self._synced_at >= self.rebuild_interval:
+                        self.rebuild(client)
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message['type'] == 'message':
+                        self.apply(message['data'])
+            except Exception as e:  # abonelik thread'i asla ölmemeli
+                if self._ready:
+                    self._counters['disconnects'] += 1
+                self._ready = False
+                logger.warning(f'Revocation subscriber disconnected: {e}')
+                self._stop.wait(self.retry_interval)
+            finally:
+                self._ready = False
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'ready': self.ready,
+            'running': self.running,
+            'filter_size': len(self._filter),
+            'capacity': self.capacity,
+            'cached_versions': len(self._versions),
+            **self._counters,
+        }
@@ -14,6 +14,9 @@ Redis Key Patterns:
     - token:blacklist:{jti} - Blacklist'teki token
     - token:version:{user_id} - Kullanıcının token version'ı
     - token:sessions:{user_id} - Kullanıcının aktif oturumları
+
+Redis Channels:
+    - token:revocations - İptal/version olayları (süreç içi RevocationCache)
 """
 
 import json
@@ -23,6 +26,8 @@ from typing import Any, Dict, List, Optional
 
 from flask import current_app
 
+from app.core.revocation_cache import RevocationCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -46,6 +51,9 @@ class TokenBlacklistService:
     _redis_check_time = None
     _REDIS_CHECK_INTERVAL = 60  # Saniyede bir yeniden kontrol et
     
+    # Süreç içi iptal önbelleği (Bloom filtresi + token version'ları)
+    _revocations: Optional[RevocationCache] = None
+    
     # =========================================================================
     # BLACKLIST OPERATIONS
     # =========================================================================
@@ -94,6 +102,7 @@ class TokenBlacklistService:
             }
             
             redis.setex(key, ttl, json.dumps(data))
+            cls._publish(redis, RevocationCache.revoked_event(jti))
             
             logger.info(f'Token blacklisted: {jti[:8]}... reason={reason}')
             return True
@@ -113,6 +122,11 @@ class TokenBlacklistService:
         Returns:
             True eğer token blacklist'teyse
         """
+        # Yerel filtrede yoksa kesinlikle iptal edilmemiştir (ağ çağrısı yok)
+        revocations = cls._revocation_cache()
+        if revocations is not None and not revocations.might_be_revoked(jti):
+            return False
+        
         redis = cls._get_redis()
         
         if redis:
@@ -163,6 +177,12 @@ class TokenBlacklistService:
         Returns:
             Token version numarası
         """
+        revocations = cls._revocation_cache()
+        if revocations is not None:
+            cached = revocations.get_version(user_id)
+            if cached is not None:
+                return cached
+        
         redis = cls._get_redis()
         if not redis:
             return 0
@@ -170,7 +190,10 @@ class TokenBlacklistService:
         try:
             key = f'{cls.VERSION_PREFIX}{user_id}'
             version = redis.get(key)
-            return int(version) if version else 0
+            version = int(version) if version else 0
+            if revocations is not None:
+                revocations.store_version(user_id, version)
+            return version
         except Exception as e:
             logger.error(f'Failed to get token version: {e}')
             return 0
@@ -198,8 +221,12 @@ class TokenBlacklistService:
             
             # TTL ayarla (uzun süreli)
             redis.expire(key, 60 * 60 * 24 * 365)  # 1 yıl
+            cls._publish(redis, RevocationCache.version_event(user_id, new_version))
             
             logger.info(f'Token version incremented for user {user_id}: {new_version}')
+            
+            from app.services.user_snapshot_service import UserSnapshotService
+            UserSnapshotService.invalidate(user_id)
             return new_version
             
         except Exception as e:
@@ -418,6 +445,42 @@ class TokenBlacklistService:
     # PRIVATE METHODS
     # =========================================================================
     
+    @classmethod
+    def _revocation_cache(cls) -> Optional[RevocationCache]:
+        """
+        Süreç içi iptal önbelleğini döner (ilk çağrıda abonelik başlar).
+        
+        Redis kapalıysa veya TOKEN_REVOCATION_CACHE_ENABLED=False ise None.
+        """
+        config = current_app.config
+        if not config.get('REDIS_ENABLED', True) or not config.get(
+            'TOKEN_REVOCATION_CACHE_ENABLED', True
+        ):
+            return None
+        
+        if cls._revocations is None:
+            cls._revocations = RevocationCache(
+                blacklist_prefix=cls.BLACKLIST_PREFIX,
+                capacity=config.get('TOKEN_REVOCATION_FILTER_CAPACITY', 100000),
+                error_rate=config.get('TOKEN_REVOCATION_FILTER_ERROR_RATE', 0.001),
+                rebuild_interval=config.get('TOKEN_REVOCATION_REBUILD_SECONDS', 300)
+            )
+        
+        if not cls._revocations.running:
+            cls._revocations.start(config.get('REDIS_URL', 'redis://localhost:6379/0'))
+        return cls._revocations
+    
+    @classmethod
+    def _publish(cls, redis, event: str) -> None:
+        """İptal olayını yerel önbelleğe uygular ve diğer süreçlere yayınlar."""
+        if cls._revocations is not None:
+            cls._revocations.apply(event)
+        try:
+            redis.publish(RevocationCache.CHANNEL, event)
+        except Exception as e:
+            # Abonelerin filtreleri bir sonraki yeniden kurulumda (SCAN) düzelir
+            logger.error(f'Failed to publish revocation event: {e}')
+    
     @classmethod
     def _get_redis(cls):
         """Redis client'ı döner. Redis yoksa veya devre dışıysa hızlıca None döner."""
@@ -99,6 +99,7 @@ def init_extensions(app):
         'CACHE_DEFAULT_TIMEOUT': 300
     }
     cache.init_app(app, config=cache_config)
+    _init_cache_service(app)
     
     # JWT callbacks
     _setup_jwt_callbacks(app)
@@ -106,6 +107,32 @@ def init_extensions(app):
     app.logger.info('Extensions initialized successfully')
 
 
+def _init_cache_service(app):
+    """
+    Connect CacheService (L1 LRU + Redis L2) and size the local tiers.
+    
+    Redis kapalıysa CacheService yalnızca süreç içi L1 ile çalışır.
+    """
+    from app.services.cache_service import CacheService
+    from app.utils.cache import cache_manager
+    
+    local_max_size = app.config.get('CACHE_L1_MAX_SIZE', 2048)
+    local_ttl = app.config.get('CACHE_L1_TTL', 30)
+    cache_manager.tiered.configure(local_max_size=local_max_size, local_ttl=local_ttl)
+    
+    redis_client = None
+    if app.config.get('REDIS_ENABLED', False):
+        import redis
+        redis_client = redis.from_url(
+            app.config.get('REDIS_URL', 'redis://localhost:6379/0'),
+            decode_responses=True,
+            socket_connect_timeout=0.5,
+            socket_timeout=1.0,
+            retry_on_timeout=False
+        )
+    CacheService.init_redis(redis_client, local_max_size=local_max_size, local_ttl=local_ttl)
+
+
 def _setup_jwt_callbacks(app):
     """
     Setup JWT callbacks for token handling.
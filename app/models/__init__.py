@@ -11,7 +11,7 @@ from app.models.course import Course, Category, Topic, Enrollment
 from app.models.content import Video, Document, VideoProgress
 from app.models.question import Question, Answer, QuestionAttempt
 from app.models.exam import Exam, ExamStatus, ExamType, ExamAttempt, AttemptStatus, AttemptAnswer
-from app.models.evaluation import Evaluation, StudentProgress
+from app.models.evaluation import Evaluation, StudentProgress, StudentPerformanceAggregate
 from app.models.live_session import LiveSession, SessionAttendance
 from app.models.ai import AIUsageLog, AIQuota, AIConfiguration, AIViolation
 from app.models.package import (
@@ -86,6 +86,7 @@ __all__ = [
     # Evaluation models
     'Evaluation',
     'StudentProgress',
+    'StudentPerformanceAggregate',
     
     # Live Session models
     'LiveSession',
@@ -22,7 +22,8 @@ class AIUsageLog(db.Model):
     response_summary = db.Column(db.String(500), nullable=True)
     processing_time_ms = db.Column(db.Integer, nullable=True)
     is_mock = db.Column(db.Boolean, default=True)
-    created_at = db.Column(db.DateTime, default=datetime.utcnow, index=True)
+    # PostgreSQL'de aylık bölüm anahtarı (bkz. PartitionService)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False, index=True)
     
     # Relationships
     user = db.relationship('User', backref=db.backref('ai_usage_logs', lazy='dynamic'))
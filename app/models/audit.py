@@ -84,7 +84,7 @@ class AuditLog(db.Model):
     
     Design Considerations:
     - Immutable: Logs should never be updated or deleted in production
-    - Partitioned: Consider partitioning by created_at for large deployments
+    - Partitioned: Monthly range partitions on created_at in PostgreSQL (PartitionService)
     - Archived: Old logs should be archived, not deleted
     """
     
@@ -513,6 +513,7 @@ def cleanup_old_logs(days_to_keep: int = 90):
     Delete audit logs older than specified days.
     
     Note: In production, consider archiving instead of deleting.
+    Deletes in primary-key chunks with short transactions (RetentionService).
     
     Args:
         days_to_keep: Number of days to keep logs
@@ -521,16 +522,17 @@ def cleanup_old_logs(days_to_keep: int = 90):
         int: Number of logs deleted
     """
     from datetime import timedelta
+    from app.services.partition_service import PartitionService
+    from app.services.retention_service import RetentionService
     
     cutoff = datetime.utcnow() - timedelta(days=days_to_keep)
     
-    result = AuditLog.query.filter(
-        AuditLog.created_at < cutoff
-    ).delete()
-    
-    db.session.commit()
+    PartitionService.drop_before(AuditLog.__tablename__, cutoff)
+    result = RetentionService.delete(
+        f'audit_logs:older_than_{days_to_keep}d', AuditLog, [AuditLog.created_at < cutoff]
+    )
     
-    return result
+    return result['affected']
 
 
 # ==================== SECURITY EVENTS ====================
@@ -881,6 +883,10 @@ class RequestLog(db.Model):
     duration_ms = db.Column(db.Float, nullable=False)
     is_slow = db.Column(db.Boolean, default=False, index=True)
     
+    # Örnekleme ağırlığı: bu satırın temsil ettiği istek sayısı
+    # (1 / REQUEST_LOG_SAMPLE_RATE; her zaman tutulan satırlarda 1)
+    sample_weight = db.Column(db.Float, default=1.0, nullable=False)
+    
     # User context
     user_id = db.Column(db.Integer, nullable=True, index=True)
     ip_address = db.Column(db.String(45), nullable=True)
@@ -974,3 +980,85 @@ class AggregatedMetric(db.Model):
             'error_rate': self.error_rate,
         }
 
+
+
+# ==================== REQUEST ROLLUPS ====================
+
+class RequestRollup(db.Model):
+    """
+    Dakikalık/saatlik request özetleri.
+    
+    RequestLog satırlarından artımlı olarak üretilir
+    (endpoint + method + status başına):
+    - count, sum, min, max süre
+    - Sabit sınırlı gecikme histogramı (p50/p95/p99 tahmini için)
+    
+    Dashboard sorguları ham log tablosu yerine bu tabloyu okur.
+    """
+    
+    __tablename__ = 'request_rollups'
+    __table_args__ = (
+        db.UniqueConstraint(
+            'granularity', 'bucket_start', 'endpoint', 'http_method', 'status_code',
+            name='uq_request_rollup_bucket'
+        ),
+        db.Index('ix_request_rollup_granularity_bucket', 'granularity', 'bucket_start'),
+        {'extend_existing': True}
+    )
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    
+    # Period
+    granularity = db.Column(db.String(10), nullable=False)  # minute, hour
+    bucket_start = db.Column(db.DateTime, nullable=False)
+    
+    # Dimensions
+    endpoint = db.Column(db.String(200), nullable=False)
+    http_method = db.Column(db.String(10), nullable=False)
+    status_code = db.Column(db.Integer, nullable=False)
+    
+    # Aggregated values
+    count = db.Column(db.Integer, default=0, nullable=False)
+    sum_ms = db.Column(db.Float, default=0, nullable=False)
+    min_ms = db.Column(db.Float, nullable=True)
+    max_ms = db.Column(db.Float, nullable=True)
+    slow_count = db.Column(db.Integer, default=0, nullable=False)
+    histogram = db.Column(db.JSON, nullable=False)  # LATENCY_BUCKETS_MS sayaçları
+    
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<RequestRollup {self.granularity} {self.bucket_start} {self.endpoint}>'
+    
+    def to_dict(self):
+        return {
+            'granularity': self.granularity,
+            'bucket_start': self.bucket_start.isoformat() if self.bucket_start else None,
+            'endpoint': self.endpoint,
+            'http_method': self.http_method,
+            'status_code': self.status_code,
+            'count': self.count,
+            'avg_ms': round(self.sum_ms / self.count, 2) if self.count else 0,
+            'min_ms': self.min_ms,
+            'max_ms': self.max_ms,
+            'slow_count': self.slow_count,
+        }
+
+
+class JobCheckpoint(db.Model):
+    """
+    Artımlı arka plan işleri için kaldığı yer kaydı.
+    
+    Örn. request rollup işi en son işlenen RequestLog.id'yi saklar.
+    """
+    
+    __tablename__ = 'job_checkpoints'
+    __table_args__ = {'extend_existing': True}
+    
+    name = db.Column(db.String(100), primary_key=True)
+    last_id = db.Column(db.BigInteger, default=0, nullable=False)
+    state = db.Column(db.JSON, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<JobCheckpoint {self.name} {self.last_id}>'
@@ -220,6 +220,7 @@ class Enrollment(db.Model):
     
     # Progress
     progress_percent = db.Column(db.Numeric(5, 2), default=0)
+    completed_lessons = db.Column(db.Integer, default=0, nullable=False)  # Tamamlanan yayındaki video sayısı
     last_accessed_at = db.Column(db.DateTime)
     
     # Payment info
@@ -288,6 +289,7 @@ class Enrollment(db.Model):
             } if self.course else None,
             'status': self.status,
             'progress_percent': float(self.progress_percent) if self.progress_percent else 0,
+            'completed_lessons': self.completed_lessons or 0,
             'enrolled_at': self.enrolled_at.isoformat() if self.enrolled_at else None,
             'completed_at': self.completed_at.isoformat() if self.completed_at else None,
             'last_accessed_at': self.last_accessed_at.isoformat() if self.last_accessed_at else None,
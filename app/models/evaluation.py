@@ -293,3 +293,47 @@ class StudentProgress(db.Model):
             'streak_days': self.streak_days,
             'last_activity_at': self.last_activity_at.isoformat() if self.last_activity_at else None,
         }
+
+
+class StudentPerformanceAggregate(db.Model):
+    """
+    Öğrenci performans özeti (öğrenci x konu x boyut x gün).
+
+    Her QuestionAttempt yazılırken artımlı güncellenir; performans
+    analizleri attempt taramak yerine bu tablodan okunur.
+
+    Boyutlar: topic (değer ''), difficulty, question_type, bloom_level, hour.
+    """
+    
+    __tablename__ = 'student_performance_aggregates'
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
+    topic_id = db.Column(db.Integer, nullable=False, default=0)  # 0 = konusuz soru
+    dimension = db.Column(db.String(20), nullable=False)
+    dimension_value = db.Column(db.String(50), nullable=False, default='')
+    day = db.Column(db.Date, nullable=False)
+    
+    # Sayaçlar
+    attempt_count = db.Column(db.Integer, nullable=False, default=0)
+    correct_count = db.Column(db.Integer, nullable=False, default=0)
+    time_spent_sum = db.Column(db.Integer, nullable=False, default=0)
+    correct_time_sum = db.Column(db.Integer, nullable=False, default=0)
+    timed_count = db.Column(db.Integer, nullable=False, default=0)
+    timed_correct_count = db.Column(db.Integer, nullable=False, default=0)
+    
+    # Günün son N sonucu ('1' doğru, '0' yanlış; en eskiden en yeniye)
+    recent_results = db.Column(db.String(50), nullable=False, default='')
+    
+    last_attempt_at = db.Column(db.DateTime)
+    
+    __table_args__ = (
+        db.UniqueConstraint(
+            'user_id', 'topic_id', 'dimension', 'dimension_value', 'day',
+            name='uq_student_performance_aggregate'
+        ),
+        db.Index('ix_student_performance_user_day', 'user_id', 'dimension', 'day'),
+    )
+    
+    def __repr__(self):
+        return f'<StudentPerformanceAggregate User:{self.user_id} {self.dimension}={self.dimension_value}>'
@@ -126,9 +126,7 @@ def list_users():
     
     return paginated_response(
         items=[u.to_dict() for u in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -352,9 +350,7 @@ def list_pending_approvals():
     
     return paginated_response(
         items=[item.to_dict() for item in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -464,9 +460,7 @@ def list_packages():
     
     return paginated_response(
         items=[p.to_dict(include_stats=True) for p in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -701,9 +695,7 @@ def list_announcements():
     
     return paginated_response(
         items=[a.to_dict(include_stats=True) for a in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -794,9 +786,7 @@ def list_admin_logs():
     
     return paginated_response(
         items=[log.to_dict() for log in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -851,6 +841,56 @@ def clear_cache():
     return success_response(message='Önbellek temizlendi')
 
 
+@admin_bp.route('/system/cache/stats', methods=['GET'])
+@jwt_required()
+@require_role('admin', 'super_admin')
+@handle_exceptions
+def get_cache_stats():
+    """
+    Önbellek istatistikleri (L1 doluluğu, önek bazında hit/miss).
+    """
+    from app.services.cache_service import CacheService
+    from app.utils.cache import cache_manager
+    
+    return success_response(data={
+        'cache_service': CacheService.get_stats(),
+        'cache_manager': cache_manager.get_stats(),
+    })
+
+
+@admin_bp.route('/system/log-pipeline/stats', methods=['GET'])
+@jwt_required()
+@require_role('admin', 'super_admin')
+@handle_exceptions
+def get_log_pipeline_stats():
+    """
+    İstek/metrik log tamponu istatistikleri (bekleyen, yazılan, düşürülen).
+    """
+    from app.services.log_service import PerformanceService
+    
+    return success_response(data=PerformanceService.get_pipeline_stats())
+
+
+@admin_bp.route('/system/performance', methods=['GET'])
+@jwt_required()
+@require_role('admin', 'super_admin')
+@handle_exceptions
+def get_performance_stats():
+    """
+    Request performans istatistikleri (dakikalık/saatlik rollup'lardan).
+    
+    Query params:
+        hours: Son kaç saat (varsayılan 24)
+        source: rollup | raw
+    """
+    from app.services.log_service import PerformanceService
+    
+    hours = min(request.args.get('hours', 24, type=int), 24 * 90)
+    source = request.args.get('source', 'rollup')
+    
+    return success_response(data=PerformanceService.get_performance_stats(hours, source=source))
+
+
 @admin_bp.route('/system/health', methods=['GET'])
 @jwt_required()
 @require_role('admin', 'super_admin')
@@ -16,7 +16,7 @@ from app.common.base_service import BaseService
 from app.core.exceptions import (
     NotFoundError, ValidationError, AuthorizationError, ConflictError
 )
-from app.core.pagination import PaginationResult, paginate_query
+from app.core.pagination import PaginationResult, paginate_query, TOTAL_ESTIMATE
 
 from app.modules.admin.models import (
     SystemSetting, SettingCategory, SettingType,
@@ -1305,7 +1305,7 @@ class AdminActionService:
         
         query = query.order_by(desc(AdminActionLog.created_at))
         
-        return paginate_query(query, page, per_page)
+        return paginate_query(query, page, per_page, default_total=TOTAL_ESTIMATE)
 
 
 # =============================================================================
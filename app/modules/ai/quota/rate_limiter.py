@@ -1,34 +1,46 @@
 """
 AI Quota - Redis-based Rate Limiter.
 
-Sliding window rate limiting implementasyonu.
+GCRA rate limiting implementasyonu (tek Lua script çağrısı, anahtar başına
+O(1) bellek). Algoritma ve yerel fallback `app.utils.rate_limiter` ile
+ortaktır.
 """
 
-import time
-from datetime import datetime
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 
 from app.modules.ai.core.interfaces import RateLimiterInterface, AIFeature
 from app.modules.ai.core.constants import QUOTA_LIMITS
+from app.utils.rate_limiter import (
+    GCRALimiter,
+    InMemoryRateLimiter,
+    RateLimit,
+    MODE_FORCE,
+    MODE_PEEK,
+)
 
 
 class RedisRateLimiter(RateLimiterInterface):
     """
     Redis tabanlı rate limiter.
     
-    Sliding window algoritması ile rate limiting uygular.
-    - Cooldown süreleri
+    GCRA algoritması ile rate limiting uygular.
+    - Cooldown süreleri (1 istek / cooldown)
     - Feature bazlı limitler
     - Dakika/saat bazlı limitler
+    
+    Kontrol ve kayıt, ilgili tüm limitleri tek round trip'te değerlendirir.
     """
     
+    PER_MINUTE = 30
+    PER_HOUR = 200
+    
     def __init__(self, redis_client=None):
         """
         Args:
             redis_client: Redis client instance. None ise in-memory fallback kullanılır.
         """
         self._redis = redis_client
-        self._memory_store: Dict[str, list] = {}
+        self._limiter = GCRALimiter(lambda: self._redis, fallback=InMemoryRateLimiter())
     
     @property
     def is_redis_available(self) -> bool:
@@ -41,6 +53,24 @@ class RedisRateLimiter(RateLimiterInterface):
         except Exception:
             return False
     
+    def _limits(
+        self,
+        user_id: int,
+        feature: AIFeature,
+        role: str,
+        include_hour: bool = False
+    ) -> List[RateLimit]:
+        limits = QUOTA_LIMITS.get(role, QUOTA_LIMITS['student'])
+        cooldown = limits.get('cooldown_seconds', 30)
+        
+        specs = []
+        if cooldown > 0:
+            specs.append(RateLimit(f"rate:cooldown:{user_id}:{feature.value}", 1, cooldown))
+        specs.append(RateLimit(f"rate:minute:{user_id}", self.PER_MINUTE, 60))
+        if include_hour:
+            specs.append(RateLimit(f"rate:hour:{user_id}", self.PER_HOUR, 3600))
+        return specs
+    
     def is_allowed(
         self,
         user_id: int,
@@ -59,34 +89,24 @@ class RedisRateLimiter(RateLimiterInterface):
             (izinli_mi, kalan_bekleme_süresi_saniye)
         """
         limits = QUOTA_LIMITS.get(role, QUOTA_LIMITS['student'])
-        cooldown = limits.get('cooldown_seconds', 30)
         
         # Cooldown = 0 ise rate limit yok
-        if cooldown <= 0:
+        if limits.get('cooldown_seconds', 30) <= 0:
             return True, None
         
-        # Son istek zamanını kontrol et
-        key = f"rate:last:{user_id}:{feature.value}"
-        last_request = self._get_timestamp(key)
-        
-        if last_request:
-            elapsed = time.time() - last_request
-            if elapsed < cooldown:
-                wait_time = int(cooldown - elapsed) + 1
-                return False, wait_time
-        
-        # Dakikalık limit kontrolü (30 istek/dakika)
-        minute_key = f"rate:minute:{user_id}"
-        minute_count = self._get_sliding_window_count(minute_key, 60)
-        if minute_count >= 30:
-            return False, 60 - self._get_oldest_request_age(minute_key, 60)
+        allowed, decisions = self._limiter.check(
+            self._limits(user_id, feature, role), mode=MODE_PEEK
+        )
+        if allowed:
+            return True, None
         
-        return True, None
+        return False, max(d.retry_after or 0 for d in decisions)
     
     def record_request(
         self,
         user_id: int,
-        feature: AIFeature
+        feature: AIFeature,
+        role: str = 'student'
     ) -> None:
         """
         İsteği kaydet.
@@ -94,20 +114,11 @@ class RedisRateLimiter(RateLimiterInterface):
         Args:
             user_id: Kullanıcı ID
             feature: AI özelliği
+            role: Kullanıcı rolü
         """
-        now = time.time()
-        
-        # Son istek zamanını güncelle
-        key = f"rate:last:{user_id}:{feature.value}"
-        self._set_timestamp(key, now, ttl=300)  # 5 dakika TTL
-        
-        # Dakikalık pencereye ekle
-        minute_key = f"rate:minute:{user_id}"
-        self._add_to_sliding_window(minute_key, now, window_size=60)
-        
-        # Saatlik pencereye ekle
-        hour_key = f"rate:hour:{user_id}"
-        self._add_to_sliding_window(hour_key, now, window_size=3600)
+        self._limiter.check(
+            self._limits(user_id, feature, role, include_hour=True), mode=MODE_FORCE
+        )
     
     def get_rate_status(self, user_id: int, role: str = 'student') -> Dict[str, Any]:
         """
@@ -123,122 +134,21 @@ class RedisRateLimiter(RateLimiterInterface):
         limits = QUOTA_LIMITS.get(role, QUOTA_LIMITS['student'])
         cooldown = limits.get('cooldown_seconds', 30)
         
-        minute_key = f"rate:minute:{user_id}"
-        hour_key = f"rate:hour:{user_id}"
-        
-        minute_count = self._get_sliding_window_count(minute_key, 60)
-        hour_count = self._get_sliding_window_count(hour_key, 3600)
+        _, (minute, hour) = self._limiter.check([
+            RateLimit(f"rate:minute:{user_id}", self.PER_MINUTE, 60, cost=0),
+            RateLimit(f"rate:hour:{user_id}", self.PER_HOUR, 3600, cost=0),
+        ], mode=MODE_PEEK)
         
         return {
             'user_id': user_id,
             'role': role,
             'cooldown_seconds': cooldown,
             'requests': {
-                'last_minute': minute_count,
-                'last_hour': hour_count
+                'last_minute': self.PER_MINUTE - minute.remaining,
+                'last_hour': self.PER_HOUR - hour.remaining
             },
             'limits': {
-                'per_minute': 30,
-                'per_hour': 200
+                'per_minute': self.PER_MINUTE,
+                'per_hour': self.PER_HOUR
             }
         }
-    
-    # Private methods
-    def _get_timestamp(self, key: str) -> Optional[float]:
-        """Timestamp al."""
-        if self.is_redis_available:
-            try:
-                value = self._redis.get(key)
-                return float(value) if value else None
-            except Exception:
-                pass
-        
-        data = self._memory_store.get(key)
-        if data and isinstance(data, dict):
-            if time.time() < data.get('expires', 0):
-                return data.get('timestamp')
-        return None
-    
-    def _set_timestamp(self, key: str, timestamp: float, ttl: int = 300) -> None:
-        """Timestamp set et."""
-        if self.is_redis_available:
-            try:
-                self._redis.setex(key, ttl, str(timestamp))
-                return
-            except Exception:
-                pass
-        
-        self._memory_store[key] = {
-            'timestamp': timestamp,
-            'expires': time.time() + ttl
-        }
-    
-    def _get_sliding_window_count(self, key: str, window_size: int) -> int:
-        """Sliding window içindeki istek sayısı."""
-        now = time.time()
-        cutoff = now - window_size
-        
-        if self.is_redis_available:
-            try:
-                # ZREMRANGEBYSCORE ile eski kayıtları temizle
-                self._redis.zremrangebyscore(key, '-inf', cutoff)
-                # ZCARD ile sayı al
-                return self._redis.zcard(key)
-            except Exception:
-                pass
-        
-        # Memory fallback
-        requests = self._memory_store.get(key, [])
-        if isinstance(requests, list):
-            valid_requests = [r for r in requests if r > cutoff]
-            self._memory_store[key] = valid_requests
-            return len(valid_requests)
-        
-        return 0
-    
-    def _add_to_sliding_window(self, key: str, timestamp: float, window_size: int) -> None:
-        """Sliding window'a istek ekle."""
-        if self.is_redis_available:
-            try:
-                pipe = self._redis.pipeline()
-                # Yeni istek ekle
-                pipe.zadd(key, {str(timestamp): timestamp})
-                # Eski kayıtları temizle
-                pipe.zremrangebyscore(key, '-inf', timestamp - window_size)
-                # TTL ayarla
-                pipe.expire(key, window_size * 2)
-                pipe.execute()
-                return
-            except Exception:
-                pass
-        
-        # Memory fallback
-        if key not in self._memory_store or not isinstance(self._memory_store[key], list):
-            self._memory_store[key] = []
-        
-        self._memory_store[key].append(timestamp)
-        
-        # Eski kayıtları temizle
-        cutoff = timestamp - window_size
-        self._memory_store[key] = [r for r in self._memory_store[key] if r > cutoff]
-    
-    def _get_oldest_request_age(self, key: str, window_size: int) -> int:
-        """En eski isteğin yaşını al."""
-        now = time.time()
-        cutoff = now - window_size
-        
-        if self.is_redis_available:
-            try:
-                oldest = self._redis.zrange(key, 0, 0, withscores=True)
-                if oldest:
-                    return int(now - oldest[0][1])
-            except Exception:
-                pass
-        
-        requests = self._memory_store.get(key, [])
-        if isinstance(requests, list) and requests:
-            valid_requests = [r for r in requests if r > cutoff]
-            if valid_requests:
-                return int(now - min(valid_requests))
-        
-        return 0
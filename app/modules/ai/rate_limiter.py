@@ -8,6 +8,7 @@ Token bazlı, kullanıcı bazlı ve global limitleri yönetir.
 ===========
 - RPM (Requests per minute) limiting
 - TPM (Tokens per minute) limiting
+  (GCRA; tüm dakikalık limitler tek Redis script çağrısında)
 - Daily request limiting
 - User-based quotas
 - Cost-based limiting
@@ -26,15 +27,16 @@ KULLANIM:
     ai_rate_limiter.record_usage(user_id, tokens_used=450, cost_usd=0.001)
 """
 
-import time
 import threading
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from collections import defaultdict
 from enum import Enum
 
+from app.utils.rate_limiter import GCRALimiter, RateLimit, MODE_FORCE, MODE_PEEK
+
 logger = logging.getLogger(__name__)
 
 
@@ -109,74 +111,6 @@ class LimitCheckResult:
     is_warning: bool = False  # Soft limit aşıldı
 
 
-# =============================================================================
-# SLIDING WINDOW COUNTER
-# =============================================================================
-
-class SlidingWindowCounter:
-    """
-    Sliding window rate limiter.
-    
-    Dakikalık pencereler kullanarak rate limiting yapar.
-    """
-    
-    def __init__(self, window_size_seconds: int = 60):
-        self.window_size = window_size_seconds
-        self._counters: Dict[str, Dict[int, int]] = defaultdict(dict)
-        self._lock = threading.RLock()
-    
-    def _get_window_key(self) -> int:
-        """Mevcut zaman penceresi key'i."""
-        return int(time.time() // self.window_size)
-    
-    def increment(self, key: str, amount: int = 1) -> int:
-        """Counter'ı artır ve mevcut değeri döndür."""
-        with self._lock:
-            window = self._get_window_key()
-            
-            if window not in self._counters[key]:
-                # Eski pencereleri temizle
-                self._cleanup(key)
-                self._counters[key][window] = 0
-            
-            self._counters[key][window] += amount
-            return self.get_count(key)
-    
-    def get_count(self, key: str) -> int:
-        """Mevcut penceredeki toplam sayı."""
-        with self._lock:
-            current_window = self._get_window_key()
-            previous_window = current_window - 1
-            
-            current_count = self._counters[key].get(current_window, 0)
-            previous_count = self._counters[key].get(previous_window, 0)
-            
-            # Önceki pencerenin kalan kısmını hesapla
-            elapsed = time.time() % self.window_size
-            weight = 1 - (elapsed / self.window_size)
-            
-            return current_count + int(previous_count * weight)
-    
-    def _cleanup(self, key: str) -> None:
-        """Eski pencereleri temizle."""
-        current_window = self._get_window_key()
-        cutoff = current_window - 2  # Son 2 pencereyi tut
-        
-        windows_to_remove = [
-            w for w in self._counters[key].keys()
-            if w < cutoff
-        ]
-        
-        for window in windows_to_remove:
-            del self._counters[key][window]
-    
-    def reset(self, key: str) -> None:
-        """Belirli key'i sıfırla."""
-        with self._lock:
-            if key in self._counters:
-                self._counters[key].clear()
-
-
 # =============================================================================
 # DAILY COUNTER
 # =============================================================================
@@ -256,12 +190,12 @@ class AIRateLimiter:
     Tüm AI isteklerinin rate limiting'ini yönetir.
     """
     
-    def __init__(self, config: RateLimitConfig = None):
+    def __init__(self, config: RateLimitConfig = None, redis_client=None):
         self.config = config or RateLimitConfig()
         
-        # Minute-based counters
-        self._rpm_counter = SlidingWindowCounter(window_size_seconds=60)
-        self._tpm_counter = SlidingWindowCounter(window_size_seconds=60)
+        # Minute-based limits (GCRA; Redis yoksa aynı algoritma yerelde)
+        self._redis = redis_client
+        self._limiter = GCRALimiter(self._get_redis)
         
         # Daily counters
         self._daily_counter = DailyCounter()
@@ -302,6 +236,42 @@ class AIRateLimiter:
         
         return True, None
     
+    def _get_redis(self):
+        """Redis client (verilmediyse uygulamanın paylaşılan istemcisi)."""
+        if self._redis is not None:
+            return self._redis
+        from app.services.cache_service import CacheService
+        return CacheService._redis
+    
+    def _minute_limits(
+        self,
+        user_id: int,
+        requests: int = 1,
+        tokens: int = 0
+    ) -> List[Tuple[RateLimit, LimitType, str]]:
+        """Dakikalık limitler (global/kullanıcı RPM ve TPM) ve ret mesajları."""
+        limits = [
+            (RateLimit("ai:rpm:global", self.config.rpm_limit, 60, requests),
+             LimitType.RPM, "Rate limit aşıldı. Lütfen bir dakika bekleyin."),
+            (RateLimit(f"ai:rpm:user:{user_id}", self.config.rpm_per_user, 60, requests),
+             LimitType.RPM, "Çok hızlı istek gönderiyorsunuz. Lütfen bekleyin."),
+        ]
+        if tokens > 0:
+            limits += [
+                (RateLimit("ai:tpm:global", self.config.tpm_limit, 60, tokens),
+                 LimitType.TPM, "Token limiti aşıldı. Lütfen bekleyin."),
+                (RateLimit(f"ai:tpm:user:{user_id}", self.config.tpm_per_user, 60, tokens),
+                 LimitType.TPM, "Kişisel token limitiniz doldu. Lütfen bekleyin."),
+            ]
+        return limits
+    
+    def _minute_usage(self, keys: List[Tuple[str, int]]) -> List[int]:
+        """Anahtarların dakikalık kullanımı (tüketmeden)."""
+        _, decisions = self._limiter.check(
+            [RateLimit(key, limit, 60, cost=0) for key, limit in keys], mode=MODE_PEEK
+        )
+        return [d.limit - d.remaining for d in decisions]
+    
     def check_all_limits(
         self,
         user_id: int,
@@ -309,57 +279,22 @@ class AIRateLimiter:
         estimated_cost: float = 0.0
     ) -> LimitCheckResult:
         """Tüm limitleri kontrol et."""
-        # Global RPM
-        global_rpm = self._rpm_counter.get_count("global")
-        if global_rpm >= self.config.rpm_limit:
-            return LimitCheckResult(
-                allowed=False,
-                limit_type=LimitType.RPM,
-                current_usage=global_rpm,
-                limit_value=self.config.rpm_limit,
-                retry_after_seconds=60,
-                message="Rate limit aşıldı. Lütfen bir dakika bekleyin."
-            )
-        
-        # User RPM
-        user_rpm_key = f"user:{user_id}:rpm"
-        user_rpm = self._rpm_counter.get_count(user_rpm_key)
-        if user_rpm >= self.config.rpm_per_user:
-            return LimitCheckResult(
-                allowed=False,
-                limit_type=LimitType.RPM,
-                current_usage=user_rpm,
-                limit_value=self.config.rpm_per_user,
-                retry_after_seconds=60,
-                message="Çok hızlı istek gönderiyorsunuz. Lütfen bekleyin."
-            )
-        
-        # Global TPM
-        if estimated_tokens > 0:
-            global_tpm = self._tpm_counter.get_count("global_tokens")
-            if global_tpm + estimated_tokens > self.config.tpm_limit:
-                return LimitCheckResult(
-                    allowed=False,
-                    limit_type=LimitType.TPM,
-                    current_usage=global_tpm,
-                    limit_value=self.config.tpm_limit,
-                    retry_after_seconds=60,
-                    message="Token limiti aşıldı. Lütfen bekleyin."
-                )
-        
-        # User TPM
-        if estimated_tokens > 0:
-            user_tpm_key = f"user:{user_id}:tpm"
-            user_tpm = self._tpm_counter.get_count(user_tpm_key)
-            if user_tpm + estimated_tokens > self.config.tpm_per_user:
-                return LimitCheckResult(
-                    allowed=False,
-                    limit_type=LimitType.TPM,
-                    current_usage=user_tpm,
-                    limit_value=self.config.tpm_per_user,
-                    retry_after_seconds=60,
-                    message="Kişisel token limitiniz doldu. Lütfen bekleyin."
-                )
+        # Global/kullanıcı RPM ve TPM tek çağrıda
+        minute_limits = self._minute_limits(user_id, 1, estimated_tokens)
+        allowed, decisions = self._limiter.check(
+            [spec for spec, _, _ in minute_limits], mode=MODE_PEEK
+        )
+        if not allowed:
+            for (spec, limit_type, message), decision in zip(minute_limits, decisions):
+                if not decision.allowed:
+                    return LimitCheckResult(
+                        allowed=False,
+                        limit_type=limit_type,
+                        current_usage=spec.limit - decision.remaining,
+                        limit_value=spec.limit,
+                        retry_after_seconds=decision.retry_after or 60,
+                        message=message
+                    )
         
         # Daily user requests
         user_daily = self._daily_counter.get_usage(f"user:{user_id}")
@@ -423,13 +358,11 @@ class AIRateLimiter:
         
         Her başarılı AI isteğinden sonra çağrılmalı.
         """
-        # Global counters
-        self._rpm_counter.increment("global")
-        self._tpm_counter.increment("global_tokens", tokens_used)
-        
-        # User counters
-        self._rpm_counter.increment(f"user:{user_id}:rpm")
-        self._tpm_counter.increment(f"user:{user_id}:tpm", tokens_used)
+        # Global ve kullanıcı dakikalık limitleri (gerçekleşen kullanım)
+        self._limiter.check(
+            [spec for spec, _, _ in self._minute_limits(user_id, 1, tokens_used)],
+            mode=MODE_FORCE
+        )
         
         # Daily tracking
         self._daily_counter.record(
@@ -454,8 +387,10 @@ class AIRateLimiter:
     def get_user_stats(self, user_id: int) -> Dict[str, Any]:
         """Kullanıcı istatistiklerini al."""
         daily = self._daily_counter.get_usage(f"user:{user_id}")
-        rpm = self._rpm_counter.get_count(f"user:{user_id}:rpm")
-        tpm = self._tpm_counter.get_count(f"user:{user_id}:tpm")
+        rpm, tpm = self._minute_usage([
+            (f"ai:rpm:user:{user_id}", self.config.rpm_per_user),
+            (f"ai:tpm:user:{user_id}", self.config.tpm_per_user),
+        ])
         
         return {
             'user_id': user_id,
@@ -484,8 +419,10 @@ class AIRateLimiter:
     
     def get_global_stats(self) -> Dict[str, Any]:
         """Global istatistikleri al."""
-        global_rpm = self._rpm_counter.get_count("global")
-        global_tpm = self._tpm_counter.get_count("global_tokens")
+        global_rpm, global_tpm = self._minute_usage([
+            ("ai:rpm:global", self.config.rpm_limit),
+            ("ai:tpm:global", self.config.tpm_limit),
+        ])
         global_daily = self._daily_counter.get_usage("global")
         
         return {
@@ -530,8 +467,7 @@ class AIRateLimiter:
     
     def reset_user(self, user_id: int) -> None:
         """Kullanıcı limitlerini sıfırla (admin)."""
-        self._rpm_counter.reset(f"user:{user_id}:rpm")
-        self._tpm_counter.reset(f"user:{user_id}:tpm")
+        self._limiter.reset([f"ai:rpm:user:{user_id}", f"ai:tpm:user:{user_id}"])
         logger.info(f"Rate limits reset for user {user_id}")
     
     def update_config(self, new_config: RateLimitConfig) -> None:
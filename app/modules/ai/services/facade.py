@@ -173,7 +173,7 @@ class AIServiceFacade:
                 raise AIQuotaExceededError(message=quota_error)
             
             # 6. Rate limit kaydı
-            self._rate_limiter.record_request(user_id, feature)
+            self._rate_limiter.record_request(user_id, feature, role)
             
             # 7. Request audit log
             ai_audit_logger.log_request(user_id, ai_request, ip_address)
@@ -62,9 +62,7 @@ def list_videos():
     
     return paginated_response(
         items=[v.to_dict() for v in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -86,9 +84,7 @@ def list_my_videos():
     
     return paginated_response(
         items=[v.to_dict(include_approval=True) for v in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -302,9 +298,7 @@ def list_video_versions(video_id: int):
     
     return paginated_response(
         items=[v.to_dict() for v in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -354,9 +348,7 @@ def list_documents():
     
     return paginated_response(
         items=[d.to_dict() for d in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -378,9 +370,7 @@ def list_my_documents():
     
     return paginated_response(
         items=[d.to_dict(include_approval=True) for d in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -589,9 +579,7 @@ def list_document_versions(document_id: int):
     
     return paginated_response(
         items=[v.to_dict() for v in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
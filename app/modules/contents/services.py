@@ -9,10 +9,14 @@ from typing import Dict, Any, List, Optional, Type, Union
 from datetime import datetime
 import json
 
+from flask import current_app
+from sqlalchemy.orm.attributes import set_committed_value
+
 from app.extensions import db
 from app.common.base_service import BaseService
 from app.core.exceptions import NotFoundError, ValidationError, ForbiddenError
 from app.core.pagination import PaginationResult, paginate_query
+from app.services.cache_service import CacheService
 from app.modules.contents.models import (
     Video, Document, ContentProgress, ContentType, VideoStatus,
     ContentStatus, ContentCategory, ContentVersion, ContentApproval,
@@ -292,6 +296,9 @@ class ApprovalService:
         
         db.session.commit()
         
+        if auto_publish and isinstance(content, Video):
+            ProgressService.invalidate_course_videos()
+        
         return approval
     
     @classmethod
@@ -361,6 +368,9 @@ class ApprovalService:
         db.session.add(approval)
         db.session.commit()
         
+        if isinstance(content, Video):
+            ProgressService.invalidate_course_videos()
+        
         return approval
     
     @classmethod
@@ -385,6 +395,9 @@ class ApprovalService:
         db.session.add(approval)
         db.session.commit()
         
+        if isinstance(content, Video):
+            ProgressService.invalidate_course_videos()
+        
         return approval
     
     @classmethod
@@ -555,6 +568,7 @@ class VideoService(BaseService[Video]):
         cls._update_course_duration(data.get('topic_id'))
         
         db.session.commit()
+        ProgressService.invalidate_course_videos()
         return video
     
     @classmethod
@@ -596,6 +610,10 @@ class VideoService(BaseService[Video]):
         video.updated_at = datetime.utcnow()
         db.session.commit()
         
+        # Konu/durum değişmiş olabilir
+        if {'topic_id', 'content_status', 'is_deleted'} & data.keys():
+            ProgressService.invalidate_course_videos()
+        
         return video
     
     @classmethod
@@ -667,6 +685,7 @@ class VideoService(BaseService[Video]):
         
         cls._update_course_duration(video.topic_id)
         db.session.commit()
+        ProgressService.invalidate_course_videos()
     
     @classmethod
     def restore(cls, video_id: int, restored_by_id: int) -> Video:
@@ -947,6 +966,12 @@ class ProgressService(BaseService[ContentProgress]):
     
     model = ContentProgress
     
+    # Kurs -> yayındaki video ID'leri önbelleği (içerik değişince geçersiz kılınır)
+    COURSE_VIDEOS_KEY = 'course_video_ids:{course_id}'
+    VIDEO_COURSE_KEY = 'video_course:{video_id}'
+    COURSE_VIDEOS_TAG = 'course_videos'
+    COURSE_VIDEOS_TTL = 600
+    
     @classmethod
     def get_user_progress(cls, user_id: int, course_id: int = None) -> Dict[str, Any]:
         """Kullanıcının ilerleme özetini döner."""
@@ -970,16 +995,28 @@ class ProgressService(BaseService[ContentProgress]):
         user_id: int,
         video_id: int,
         position: int,
-        progress_percentage: float
+        progress_percentage: float,
+        force: bool = False
     ) -> ContentProgress:
-        """Video izleme ilerlemesini günceller."""
+        """
+        Video izleme ilerlemesini günceller.
+        
+        Heartbeat'ler debounce edilir: yeni kayıt, tamamlanmaya geçiş veya
+        son yazımdan PROGRESS_COMMIT_INTERVAL_SECONDS geçmişse commit edilir;
+        aradaki güncellemeler yalnızca dönen nesnede kalır (oturumu
+        kirletmez, sonraki bir flush/commit yazmaz).
+        
+        Args:
+            force: Debounce'u atla (oturum sonu gibi son pozisyon yazımları)
+        """
         progress = ContentProgress.query.filter_by(
             user_id=user_id,
             content_type=ContentType.VIDEO,
             content_id=video_id
         ).first()
         
-        if not progress:
+        is_new = progress is None
+        if is_new:
             progress = ContentProgress(
                 user_id=user_id,
                 content_type=ContentType.VIDEO,
@@ -987,21 +1024,71 @@ class ProgressService(BaseService[ContentProgress]):
             )
             db.session.add(progress)
         
+        percentage = min(100.0, max(0.0, progress_percentage))
+        # %95+ ise tamamlandı say
+        completing = percentage >= 95 and not progress.is_completed
+        
+        if not (force or is_new or completing or cls._progress_commit_due(progress)):
+            set_committed_value(progress, 'last_position', position)
+            set_committed_value(progress, 'progress_percentage', percentage)
+            return progress
+        
         progress.last_position = position
-        progress.progress_percentage = min(100.0, max(0.0, progress_percentage))
-        progress.update_access()
+        progress.progress_percentage = percentage
         
-        # %95+ ise tamamlandı say
-        if progress.progress_percentage >= 95:
-            progress.mark_completed()
+        newly_completed = False
+        if completing:
+            newly_completed = cls._claim_completion(progress, is_new)
         
+        if not is_new:  # yeni kayıtta erişim alanları kolon varsayılanlarından gelir
+            progress.update_access()
         db.session.commit()
         
         # Kurs ilerlemesini güncelle
-        cls._update_enrollment_progress(user_id, video_id)
+        cls._update_enrollment_progress(user_id, video_id, newly_completed)
         
         return progress
     
+    @classmethod
+    def _claim_completion(cls, progress: ContentProgress, is_new: bool) -> bool:
+        """
+        Tamamlanmaya geçişi tek bir isteğe verir.
+        
+        Mevcut satırda koşullu UPDATE (is_completed = false) kullanılır;
+        eşzamanlı heartbeat'lerden yalnızca rowcount == 1 alan geçişi sayar,
+        böylece kurs sayacı iki kez artmaz.
+        
+        Returns:
+            bool: Geçiş bu istekte mi gerçekleşti
+        """
+        if is_new:
+            progress.mark_completed()
+            return True
+        
+        completed_at = datetime.utcnow()
+        claimed = ContentProgress.query.filter(
+            ContentProgress.id == progress.id,
+            ContentProgress.is_completed == False
+        ).update({
+            'is_completed': True,
+            'completed_at': completed_at,
+            'progress_percentage': 100.0,
+        }, synchronize_session=False) == 1
+        
+        # Satır DB'de zaten tamamlandı; nesneyi yeniden yazmadan eşitle
+        set_committed_value(progress, 'is_completed', True)
+        if claimed:
+            set_committed_value(progress, 'completed_at', completed_at)
+        progress.progress_percentage = 100.0
+        return claimed
+    
+    @classmethod
+    def _progress_commit_due(cls, progress: ContentProgress) -> bool:
+        """Son yazımdan bu yana debounce aralığı geçti mi."""
+        interval = current_app.config.get('PROGRESS_COMMIT_INTERVAL_SECONDS', 30)
+        last = progress.last_accessed_at
+        return last is None or (datetime.utcnow() - last).total_seconds() >= interval
+    
     @classmethod
     def mark_document_completed(cls, user_id: int, document_id: int) -> ContentProgress:
         """Dokümanı tamamlandı olarak işaretler."""
@@ -1025,48 +1112,86 @@ class ProgressService(BaseService[ContentProgress]):
         return progress
     
     @classmethod
-    def _update_enrollment_progress(cls, user_id: int, video_id: int):
-        """Kullanıcının kurs kaydı ilerlemesini günceller."""
-        from app.modules.courses.models import Enrollment
-        from app.modules.contents.models import Video
+    def get_course_video_ids(cls, course_id: int) -> frozenset:
+        """Kurstaki yayında ve silinmemiş video ID'leri (önbellekli)."""
+        from app.modules.courses.models import Topic
         
-        video = Video.query.get(video_id)
-        if not video or not video.topic:
+        def load():
+            rows = db.session.query(Video.id).join(
+                Topic, Topic.id == Video.topic_id
+            ).filter(
+                Topic.course_id == course_id,
+                Video.is_deleted == False,
+                Video.content_status == ContentStatus.PUBLISHED
+            ).all()
+            return sorted(video_id for video_id, in rows)
+        
+        return frozenset(CacheService.get_or_set(
+            cls.COURSE_VIDEOS_KEY.format(course_id=course_id),
+            load,
+            ttl=cls.COURSE_VIDEOS_TTL,
+            tags=[cls.COURSE_VIDEOS_TAG]
+        ))
+    
+    @classmethod
+    def _get_video_course_id(cls, video_id: int) -> Optional[int]:
+        """Videonun kurs ID'si (önbellekli)."""
+        from app.modules.courses.models import Topic
+        
+        return CacheService.get_or_set(
+            cls.VIDEO_COURSE_KEY.format(video_id=video_id),
+            lambda: db.session.query(Topic.course_id).join(
+                Video, Video.topic_id == Topic.id
+            ).filter(Video.id == video_id).scalar(),
+            ttl=cls.COURSE_VIDEOS_TTL,
+            tags=[cls.COURSE_VIDEOS_TAG]
+        )
+    
+    @classmethod
+    def invalidate_course_videos(cls) -> None:
+        """
+        Kurs video kümelerini geçersiz kılar (video oluşturma, yayın,
+        arşiv, silme, taşıma). Tek etiket nesli artırımıdır (O(1)).
+        """
+        CacheService.delete_by_tag(cls.COURSE_VIDEOS_TAG)
+    
+    @classmethod
+    def _update_enrollment_progress(cls, user_id: int, video_id: int, newly_completed: bool = False):
+        """
+        Kullanıcının kurs kaydı ilerlemesini günceller.
+        
+        Kurs videoları yeniden sayılmaz: `completed_lessons` yalnızca yayındaki
+        bir video tamamlanmaya geçtiğinde bir artırılır. Sonradan yayından
+        kalkan videolar için oran kümedeki video sayısıyla sınırlanır.
+        """
+        from app.models.course import Enrollment, EnrollmentStatus
+        
+        course_id = cls._get_video_course_id(video_id)
+        if not course_id:
             return
         
-        course = video.topic.course
-        if not course:
+        video_ids = cls.get_course_video_ids(course_id)
+        if not newly_completed or video_id not in video_ids:
+            Enrollment.query.filter_by(
+                user_id=user_id, course_id=course_id
+            ).update({'last_accessed_at': datetime.utcnow()}, synchronize_session=False)
+            db.session.commit()
             return
         
         enrollment = Enrollment.query.filter_by(
             user_id=user_id,
-            course_id=course.id
-        ).first()
+            course_id=course_id
+        ).with_for_update().first()
         
         if not enrollment:
+            db.session.rollback()
             return
         
-        # Kurstaki tüm videoları say
-        all_video_ids = []
-        for topic in course.topics:
-            all_video_ids.extend([v.id for v in topic.videos if not v.is_deleted])
-        
-        if not all_video_ids:
-            return
-        
-        # Tamamlanan videoları say
-        completed_count = ContentProgress.query.filter(
-            ContentProgress.user_id == user_id,
-            ContentProgress.content_type == ContentType.VIDEO,
-            ContentProgress.content_id.in_(all_video_ids),
-            ContentProgress.is_completed == True
-        ).count()
-        
-        enrollment.completed_lessons = completed_count
-        enrollment.progress_percentage = (completed_count / len(all_video_ids)) * 100
+        enrollment.completed_lessons = (enrollment.completed_lessons or 0) + 1
+        enrollment.progress_percent = min(100.0, enrollment.completed_lessons / len(video_ids) * 100)
         enrollment.last_accessed_at = datetime.utcnow()
         
-        if enrollment.progress_percentage >= 100:
-            enrollment.complete()
+        if enrollment.progress_percent >= 100 and enrollment.status != EnrollmentStatus.COMPLETED.value:
+            enrollment.mark_completed()
         
         db.session.commit()
@@ -73,9 +73,7 @@ def list_courses():
     
     return paginated_response(
         items=[c.to_dict() for c in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -276,7 +274,5 @@ def my_courses():
     
     return paginated_response(
         items=[e.to_dict() for e in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
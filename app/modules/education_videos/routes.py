@@ -9,6 +9,7 @@ from functools import wraps
 
 from app.extensions import db
 from app.core.responses import success_response, error_response, paginated_response
+from app.core.pagination import paginate_query
 from app.core.decorators import super_admin_required
 from app.core.exceptions import AuthorizationError
 from app.models.education_video import (
@@ -170,15 +171,13 @@ def list_videos():
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    result = paginate_query(query, page, per_page)
     
-    videos = [v.to_dict(include_stats=True) for v in pagination.items]
+    videos = [v.to_dict(include_stats=True) for v in result.items]
     
     return paginated_response(
         items=videos,
-        page=page,
-        per_page=per_page,
-        total=pagination.total,
+        pagination=result,
         message='Videolar listelendi'
     )
 
@@ -234,14 +233,12 @@ def list_videos_by_grade(grade_level):
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    videos = [v.to_dict(include_stats=True) for v in pagination.items]
+    result = paginate_query(query, page, per_page)
+    videos = [v.to_dict(include_stats=True) for v in result.items]
     
     return paginated_response(
         items=videos,
-        page=page,
-        per_page=per_page,
-        total=pagination.total,
+        pagination=result,
         message=f'{GRADE_LABELS[grade]} videoları'
     )
 
@@ -309,14 +306,12 @@ def list_videos_by_education_level(education_level):
     page = request.args.get('page', 1, type=int)
     per_page = min(request.args.get('per_page', 20, type=int), 100)
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
-    videos = [v.to_dict(include_stats=True) for v in pagination.items]
+    result = paginate_query(query, page, per_page)
+    videos = [v.to_dict(include_stats=True) for v in result.items]
     
     return paginated_response(
         items=videos,
-        page=page,
-        per_page=per_page,
-        total=pagination.total,
+        pagination=result,
         message=f'{EDUCATION_LEVEL_LABELS[level]} videoları'
     )
 
@@ -602,10 +597,10 @@ def get_my_progress():
     query = VideoWatchHistory.query.filter_by(user_id=current_user_id)\
         .order_by(VideoWatchHistory.last_watched_at.desc())
     
-    pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+    result = paginate_query(query, page, per_page)
     
     items = []
-    for history in pagination.items:
+    for history in result.items:
         item = history.to_dict()
         if history.video:
             item['video'] = history.video.to_dict()
@@ -613,9 +608,7 @@ def get_my_progress():
     
     return paginated_response(
         items=items,
-        page=page,
-        per_page=per_page,
-        total=pagination.total
+        pagination=result
     )
 
 
@@ -48,9 +48,7 @@ def list_assignments():
     
     return paginated_response(
         items=[a.to_dict() for a in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -154,9 +152,7 @@ def list_submissions(assignment_id: int):
     
     return paginated_response(
         items=[s.to_dict() for s in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -198,9 +194,7 @@ def my_submissions():
     
     return paginated_response(
         items=[s.to_dict() for s in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -225,9 +219,7 @@ def list_coaching_notes():
     
     return paginated_response(
         items=[n.to_dict() for n in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -287,9 +279,7 @@ def list_performance_reviews():
     
     return paginated_response(
         items=[r.to_dict() for r in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -0,0 +1,221 @@
+"""
+Exams Module - Derlenmiş Cevap Anahtarı.
+
+Sınav yayınlanırken bir kez derlenen, değiştirilemez cevap anahtarı.
+
+Her teslimde ORM satırlarından doğru seçenekleri, normalize edilmiş kısa
+cevap alternatiflerini ve puan ağırlıklarını yeniden çıkarmak yerine
+değerlendirme bu anahtar üzerinden yapılır. Toplu teslim anlarında
+(sınav bitişi) puanlama DB'ye gitmeden, yalnızca CPU ile yürür.
+
+Önbellek katmanları:
+- Süreç içi: derlenmiş nesne (sürüm karşılaştırmalı)
+- CacheService: L1 LRU + Redis, nesil tabanlı geçersiz kılma
+  (başka süreçteki soru güncellemesi birkaç saniye içinde görülür)
+"""
+
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Dict, Any, Mapping, Optional, Tuple
+import hashlib
+import json
+
+from sqlalchemy.orm import selectinload
+
+from app.core.exceptions import NotFoundError
+from app.modules.exams.models import Exam, Question, QuestionType
+from app.services.cache_service import CacheService
+from app.utils.cache import LocalCache
+
+
+@dataclass(frozen=True)
+class QuestionKey:
+    """Tek sorunun derlenmiş cevap anahtarı."""
+
+    id: int
+    question_type: QuestionType
+    points: float
+    correct_ids: Tuple[int, ...] = ()
+    option_ids: Tuple[int, ...] = ()
+    # DeterministicGrader: '|' ile ayrılmış, normalize edilmiş alternatifler
+    accepted_texts: Tuple[str, ...] = ()
+    # AttemptService: strip().lower() ile birebir karşılaştırma
+    plain_text: str = ''
+
+    @classmethod
+    def from_question(cls, question: Question) -> 'QuestionKey':
+        """ORM sorusundan anahtar üret (question.answers yüklenir)."""
+        from app.modules.exams.grading_service import DeterministicGrader
+
+        answers = sorted(question.answers, key=lambda a: a.id)
+        correct_text = question.correct_answer_text or ''
+
+        return cls(
+            id=question.id,
+            question_type=question.question_type,
+            points=float(question.points or 0),
+            correct_ids=tuple(a.id for a in answers if a.is_correct),
+            option_ids=tuple(a.id for a in answers),
+            accepted_texts=tuple(
+                DeterministicGrader._normalize_text(text.strip())
+                for text in correct_text.split('|')
+            ),
+            plain_text=correct_text.strip().lower(),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'question_type': self.question_type.value,
+            'points': self.points,
+            'correct_ids': list(self.correct_ids),
+            'option_ids': list(self.option_ids),
+            'accepted_texts': list(self.accepted_texts),
+            'plain_text': self.plain_text,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'QuestionKey':
+        return cls(
+            id=data['id'],
+            question_type=QuestionType(data['question_type']),
+            points=data['points'],
+            correct_ids=tuple(data['correct_ids']),
+            option_ids=tuple(data['option_ids']),
+            accepted_texts=tuple(data['accepted_texts']),
+            plain_text=data['plain_text'],
+        )
+
+
+@dataclass(frozen=True)
+class ExamAnswerKey:
+    """
+    Sınavın derlenmiş cevap anahtarı.
+
+    Sorular sınavdaki sırasıyla tutulur; version içerikten üretilen
+    kısa bir özettir ve aynı içerik için her süreçte aynıdır.
+    """
+
+    exam_id: int
+    version: str
+    pass_score: float
+    questions: Tuple[QuestionKey, ...]
+    by_id: Mapping[int, QuestionKey] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(
+            self, 'by_id', MappingProxyType({q.id: q for q in self.questions})
+        )
+
+    @property
+    def total_points(self) -> float:
+        return sum(q.points for q in self.questions)
+
+    @property
+    def has_essay(self) -> bool:
+        return any(q.question_type == QuestionType.ESSAY for q in self.questions)
+
+    @classmethod
+    def build(cls, exam_id: int, pass_score: float, questions) -> 'ExamAnswerKey':
+        """Soru anahtarlarından sürümü hesaplayarak anahtar üret."""
+        questions = tuple(questions)
+        payload = json.dumps(
+            [pass_score, [q.to_dict() for q in questions]],
+            sort_keys=True
+        )
+        version = hashlib.sha1(payload.encode()).hexdigest()[:12]
+        return cls(exam_id, version, pass_score, questions)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'exam_id': self.exam_id,
+            'version': self.version,
+            'pass_score': self.pass_score,
+            'questions': [q.to_dict() for q in self.questions],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ExamAnswerKey':
+        return cls(
+            exam_id=data['exam_id'],
+            version=data['version'],
+            pass_score=data['pass_score'],
+            questions=tuple(QuestionKey.from_dict(q) for q in data['questions']),
+        )
+
+
+class AnswerKeyService:
+    """
+    Cevap anahtarı derleme ve önbellek servisi.
+
+    Anahtar ExamService.publish'te (ve v1 yayınlama route'unda) derlenir;
+    soru/seçenek/sınav satırlarını yazan her yol (QuestionService,
+    ExamService.update, v1 exams/questions route'ları) commit sonrası
+    geçersiz kılar.
+    Önbellekte yoksa (ör. eski yayınlanmış sınav) ilk istekte derlenir.
+    """
+
+    # Kısa tutulur: geçersiz kılma kaçırılsa bile eski anahtar en fazla
+    # birkaç dakika yaşar
+    CACHE_TTL = 15 * 60
+
+    # exam_id -> derlenmiş ExamAnswerKey (sürüm CacheService ile doğrulanır)
+    _compiled = LocalCache(max_size=256, default_ttl=CACHE_TTL)
+
+    @staticmethod
+    def cache_key(exam_id: int) -> str:
+        return f'exam:{exam_id}:answer_key'
+
+    @classmethod
+    def compile(cls, exam_id: int) -> ExamAnswerKey:
+        """Anahtarı DB'den derle (sorular + seçenekler, iki sorgu)."""
+        exam = Exam.query.options(
+            selectinload(Exam.questions).selectinload(Question.answers)
+        ).filter_by(id=exam_id).first()
+
+        if not exam:
+            raise NotFoundError('Sınav', exam_id)
+
+        return ExamAnswerKey.build(
+            exam.id,
+            float(exam.pass_score or 0),
+            (QuestionKey.from_question(q) for q in exam.questions)
+        )
+
+    @classmethod
+    def publish(cls, exam_id: int) -> ExamAnswerKey:
+        """Anahtarı derle ve iki katmana yaz."""
+        key = cls.compile(exam_id)
+        CacheService.set(cls.cache_key(exam_id), key.to_dict(), ttl=cls.CACHE_TTL)
+        cls._compiled.set(str(exam_id), key)
+        return key
+
+    @classmethod
+    def get(cls, exam_id: int) -> ExamAnswerKey:
+        """
+        Sınavın cevap anahtarını döner.
+
+        Sıcak yolda DB okuması yapılmaz: CacheService (L1/Redis) kaydının
+        sürümü süreç içi derlenmiş nesneyle aynıysa o nesne döner. Önbellekte
+        yoksa anahtar tek seferde (single-flight) derlenir; derleme sırasında
+        sınav geçersiz kılınırsa sonuç önbelleğe yazılmaz.
+        """
+        data = CacheService.get_or_set(
+            cls.cache_key(exam_id),
+            lambda: cls.compile(exam_id).to_dict(),
+            ttl=cls.CACHE_TTL
+        )
+
+        compiled: Optional[ExamAnswerKey] = cls._compiled.get(str(exam_id), None)
+        if compiled is not None and compiled.version == data.get('version'):
+            return compiled
+
+        compiled = ExamAnswerKey.from_dict(data)
+        cls._compiled.set(str(exam_id), compiled)
+        return compiled
+
+    @classmethod
+    def invalidate(cls, exam_id: int) -> None:
+        """Sınavın anahtarını tüm süreçlerde geçersiz kıl."""
+        cls._compiled.delete(str(exam_id))
+        CacheService.invalidate(f'exam:{exam_id}')
@@ -40,7 +40,7 @@ DEĞERLENDİRME KURALLARI:
 - Boşluk doldurma: Normalize edilmiş metin karşılaştırması
 """
 
-from typing import Dict, Any, List, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union
 from datetime import datetime
 from decimal import Decimal, ROUND_HALF_UP
 import re
@@ -51,6 +51,7 @@ from app.modules.exams.models import (
     Question, Answer, AttemptAnswer, ExamAttempt,
     QuestionType, AttemptStatus
 )
+from app.modules.exams.answer_key import AnswerKeyService, ExamAnswerKey, QuestionKey
 
 
 class GradingRules:
@@ -88,10 +89,18 @@ class DeterministicGrader:
     """
     
     @classmethod
-    def grade_attempt(cls, attempt: ExamAttempt) -> Dict[str, Any]:
+    def grade_attempt(
+        cls,
+        attempt: ExamAttempt,
+        answer_key: Optional[ExamAnswerKey] = None
+    ) -> Dict[str, Any]:
         """
         Sınav girişini değerlendir.
         
+        Puanlama sınavın derlenmiş cevap anahtarına göre bellekte yapılır;
+        DB'den yalnızca girişin cevapları tek sorguda okunur ve sonuçlar
+        tek bir toplu UPDATE ile yazılır.
+        
         Returns:
             {
                 'total_points': float,
@@ -101,19 +110,18 @@ class DeterministicGrader:
                 'question_results': [...]
             }
         """
-        exam = attempt.exam
+        key = answer_key or AnswerKeyService.get(attempt.exam_id)
         question_results = []
         total_points = Decimal('0')
         earned_points = Decimal('0')
         
-        for question in exam.questions:
+        answers = cls.load_attempt_answers(attempt.id)
+        updates = []
+        
+        for question in key.questions:
             total_points += Decimal(str(question.points))
             
-            # Öğrencinin cevabını bul
-            answer = AttemptAnswer.query.filter_by(
-                attempt_id=attempt.id,
-                question_id=question.id
-            ).first()
+            answer = answers.get(question.id)
             
             # Soruyu değerlendir
             result = cls._grade_question(question, answer)
@@ -121,10 +129,16 @@ class DeterministicGrader:
             
             earned_points += Decimal(str(result['points_earned']))
             
-            # Cevabı güncelle
             if answer:
-                answer.is_correct = result['is_correct']
-                answer.points_earned = float(result['points_earned'])
+                updates.append({
+                    'id': answer.id,
+                    'is_correct': result['is_correct'],
+                    'points_earned': float(result['points_earned']),
+                })
+        
+        # Cevapları tek seferde güncelle (executemany)
+        if updates:
+            db.session.bulk_update_mappings(AttemptAnswer, updates)
         
         # Yüzdeyi hesapla
         if total_points > 0:
@@ -135,7 +149,7 @@ class DeterministicGrader:
             percentage = 0.0
         
         # Geçti/kaldı
-        passed = percentage >= exam.pass_score
+        passed = percentage >= key.pass_score
         
         return {
             'total_points': float(total_points),
@@ -145,17 +159,42 @@ class DeterministicGrader:
             'question_results': question_results,
             'grading_method': 'DETERMINISTIC',  # AI olmadığını belirt
             'grading_rules_version': '1.0.0',
+            'answer_key_version': key.version,
         }
     
+    @classmethod
+    def load_attempt_answers(cls, attempt_id: int) -> Dict[int, Any]:
+        """
+        Girişin tüm cevaplarını tek sorguda yükle.
+        
+        ORM nesnesi yerine yalnızca puanlamada kullanılan kolonlar okunur;
+        satırlar AttemptAnswer ile aynı öznitelik adlarını taşır.
+        
+        Returns:
+            {question_id: satır(id, question_id, selected_answer_ids, answer_text)}
+        """
+        rows = db.session.query(
+            AttemptAnswer.id,
+            AttemptAnswer.question_id,
+            AttemptAnswer.selected_answer_ids,
+            AttemptAnswer.answer_text,
+        ).filter(AttemptAnswer.attempt_id == attempt_id).all()
+        return {row.question_id: row for row in rows}
+    
     @classmethod
     def _grade_question(
         cls,
-        question: Question,
+        question: Union[QuestionKey, Question],
         answer: Optional[AttemptAnswer]
     ) -> Dict[str, Any]:
         """
         Tek soruyu değerlendir.
+        
+        ORM sorusu verilirse önce cevap anahtarına derlenir.
         """
+        if isinstance(question, Question):
+            question = QuestionKey.from_question(question)
+        
         result = {
             'question_id': question.id,
             'question_type': question.question_type.value,
@@ -195,7 +234,7 @@ class DeterministicGrader:
     @classmethod
     def _grade_single_choice(
         cls,
-        question: Question,
+        question: QuestionKey,
         answer: AttemptAnswer,
         result: Dict
     ) -> Dict[str, Any]:
@@ -205,13 +244,13 @@ class DeterministicGrader:
         KURAL: Doğru cevap seçildi = tam puan
         """
         selected_ids = answer.selected_answer_ids or []
-        correct_answers = [a for a in question.answers if a.is_correct]
+        correct_ids = question.correct_ids
         
-        if not correct_answers:
+        if not correct_ids:
             result['feedback'] = 'Sistem hatası: Doğru cevap tanımlanmamış'
             return result
         
-        correct_id = correct_answers[0].id
+        correct_id = correct_ids[0]
         
         if len(selected_ids) == 1 and selected_ids[0] == correct_id:
             result['is_correct'] = True
@@ -232,7 +271,7 @@ class DeterministicGrader:
     @classmethod
     def _grade_multiple_choice(
         cls,
-        question: Question,
+        question: QuestionKey,
         answer: AttemptAnswer,
         result: Dict
     ) -> Dict[str, Any]:
@@ -247,8 +286,8 @@ class DeterministicGrader:
         - Tüm doğrular seçilmeli VE yanlış seçilmemeli
         """
         selected_ids = set(answer.selected_answer_ids or [])
-        correct_ids = {a.id for a in question.answers if a.is_correct}
-        all_ids = {a.id for a in question.answers}
+        correct_ids = set(question.correct_ids)
+        all_ids = set(question.option_ids)
         wrong_ids = all_ids - correct_ids
         
         # Seçilen doğrular ve yanlışlar
@@ -303,7 +342,7 @@ class DeterministicGrader:
     @classmethod
     def _grade_true_false(
         cls,
-        question: Question,
+        question: QuestionKey,
         answer: AttemptAnswer,
         result: Dict
     ) -> Dict[str, Any]:
@@ -313,13 +352,13 @@ class DeterministicGrader:
         KURAL: Tam eşleşme gerekli
         """
         selected_ids = answer.selected_answer_ids or []
-        correct_answers = [a for a in question.answers if a.is_correct]
+        correct_ids = question.correct_ids
         
-        if not correct_answers:
+        if not correct_ids:
             result['feedback'] = 'Sistem hatası: Doğru cevap tanımlanmamış'
             return result
         
-        correct_id = correct_answers[0].id
+        correct_id = correct_ids[0]
         
         is_correct = (len(selected_ids) == 1 and selected_ids[0] == correct_id)
         result['is_correct'] = is_correct
@@ -336,7 +375,7 @@ class DeterministicGrader:
     @classmethod
     def _grade_short_answer(
         cls,
-        question: Question,
+        question: QuestionKey,
         answer: AttemptAnswer,
         result: Dict
     ) -> Dict[str, Any]:
@@ -346,19 +385,12 @@ class DeterministicGrader:
         KURAL: Normalize edilmiş metin karşılaştırması
         """
         given_text = answer.answer_text or ''
-        correct_text = question.correct_answer_text or ''
         
-        # Metinleri normalize et
+        # Metni normalize et; kabul edilebilir cevaplar ('|' ile ayrılmış)
+        # anahtar derlenirken normalize edildi
         given_normalized = cls._normalize_text(given_text)
-        correct_normalized = cls._normalize_text(correct_text)
         
-        # Birden fazla kabul edilebilir cevap (virgülle ayrılmış)
-        acceptable_answers = [
-            cls._normalize_text(ans.strip())
-            for ans in correct_text.split('|')
-        ]
-        
-        is_correct = given_normalized in acceptable_answers
+        is_correct = given_normalized in question.accepted_texts
         
         result['is_correct'] = is_correct
         result['points_earned'] = question.points if is_correct else 0
@@ -374,7 +406,7 @@ class DeterministicGrader:
     @classmethod
     def _grade_fill_blank(
         cls,
-        question: Question,
+        question: QuestionKey,
         answer: AttemptAnswer,
         result: Dict
     ) -> Dict[str, Any]:
@@ -389,7 +421,7 @@ class DeterministicGrader:
     @classmethod
     def _handle_essay(
         cls,
-        question: Question,
+        question: QuestionKey,
         answer: AttemptAnswer,
         result: Dict
     ) -> Dict[str, Any]:
@@ -498,14 +530,13 @@ class ManualGrader:
         # Tüm cevapları kontrol et
         all_answers = AttemptAnswer.query.filter_by(attempt_id=attempt.id).all()
         
-        # Essay soruları değerlendirilmiş mi?
+        answers_by_question = {a.question_id: a for a in all_answers}
+        
+        # Essay soruları değerlendirilmiş mi? (cevap anahtarından, DB'siz)
         exam = attempt.exam
-        for question in exam.questions:
+        for question in AnswerKeyService.get(exam.id).questions:
             if question.question_type == QuestionType.ESSAY:
-                answer = next(
-                    (a for a in all_answers if a.question_id == question.id),
-                    None
-                )
+                answer = answers_by_question.get(question.id)
                 if answer and answer.graded_by is None:
                     raise ValueError(
                         f'Soru {question.id} henüz değerlendirilmedi'
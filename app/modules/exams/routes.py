@@ -28,7 +28,7 @@ from app.modules.exams.schemas import (
 from app.models.user import User
 from app.core.responses import success_response, created_response, no_content_response, paginated_response, error_response
 from app.core.decorators import require_role, validate_json, handle_exceptions
-from app.core.pagination import PaginationParams
+from app.core.pagination import PaginationParams, paginate_query
 
 
 # =============================================================================
@@ -111,13 +111,11 @@ def list_exams():
     query = query.order_by(Exam.created_at.desc())
     
     # Sayfalama
-    pagination = query.paginate(page=params.page, per_page=params.per_page, error_out=False)
+    result = paginate_query(query, params.page, params.per_page)
     
     return paginated_response(
-        items=[e.to_dict() for e in pagination.items],
-        page=params.page,
-        per_page=params.per_page,
-        total=pagination.total
+        items=[e.to_dict() for e in result.items],
+        pagination=result
     )
 
 
@@ -567,9 +565,7 @@ def my_attempts():
     
     return paginated_response(
         items=[a.to_dict() for a in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -595,9 +591,7 @@ def exam_submissions(exam_id: int):
     
     return paginated_response(
         items=[a.to_dict() for a in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -1266,9 +1260,7 @@ def list_pending_gradings():
     
     return paginated_response(
         items=items,
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total,
+        pagination=result,
         message='Değerlendirilmeyi bekleyen sınavlar (AI kullanılmaz)'
     )
 
@@ -13,11 +13,12 @@ from sqlalchemy.orm import joinedload, selectinload
 from app.extensions import db
 from app.common.base_service import BaseService
 from app.core.exceptions import NotFoundError, ValidationError, AuthorizationError, ConflictError
-from app.core.pagination import PaginationResult, paginate_query
+from app.core.pagination import PaginationResult, paginate_query, TOTAL_ESTIMATE
 from app.modules.exams.models import (
     Exam, Question, Answer, ExamAttempt, AttemptAnswer,
     ExamStatus, AttemptStatus, QuestionType, GradeLevel, ExamType
 )
+from app.modules.exams.answer_key import AnswerKeyService, QuestionKey
 
 
 class ExamService(BaseService[Exam]):
@@ -120,6 +121,9 @@ class ExamService(BaseService[Exam]):
                 setattr(exam, key, value)
         
         db.session.commit()
+        
+        # Geçme notu anahtarın parçası
+        AnswerKeyService.invalidate(exam.id)
         return exam
     
     @classmethod
@@ -134,6 +138,9 @@ class ExamService(BaseService[Exam]):
         exam.status = ExamStatus.PUBLISHED
         db.session.commit()
         
+        # Cevap anahtarını yayın anında derle (teslimlerde DB okunmaz)
+        AnswerKeyService.publish(exam.id)
+        
         return exam
     
     @classmethod
@@ -200,6 +207,7 @@ class QuestionService(BaseService[Question]):
             exam.total_points += data.get('points', 1.0)
         
         db.session.commit()
+        AnswerKeyService.invalidate(question.exam_id)
         return question
     
     @classmethod
@@ -228,6 +236,7 @@ class QuestionService(BaseService[Question]):
                 db.session.add(answer)
         
         db.session.commit()
+        AnswerKeyService.invalidate(question.exam_id)
         return question
     
     @classmethod
@@ -246,6 +255,7 @@ class QuestionService(BaseService[Question]):
             exam.total_points = max(0, exam.total_points - points)
         
         db.session.commit()
+        AnswerKeyService.invalidate(exam_id)
 
 
 class AttemptService(BaseService[ExamAttempt]):
@@ -409,18 +419,24 @@ class AttemptService(BaseService[ExamAttempt]):
     
     @classmethod
     def _grade_attempt(cls, attempt: ExamAttempt) -> Dict[str, Any]:
-        """Sınavı değerlendirir."""
-        exam = attempt.exam
+        """
+        Sınavı değerlendirir.
+        
+        Doğru cevaplar ve puanlar derlenmiş cevap anahtarından okunur;
+        girişin cevapları tek sorguda yüklenir, sonuçlar toplu yazılır.
+        """
+        from app.modules.exams.grading_service import DeterministicGrader
+        
+        key = AnswerKeyService.get(attempt.exam_id)
+        answers = DeterministicGrader.load_attempt_answers(attempt.id)
         total_points = 0
         earned_points = 0
+        updates = []
         
-        for question in exam.questions:
+        for question in key.questions:
             total_points += question.points
             
-            answer = AttemptAnswer.query.filter_by(
-                attempt_id=attempt.id,
-                question_id=question.id
-            ).first()
+            answer = answers.get(question.id)
             
             if not answer:
                 continue
@@ -428,32 +444,34 @@ class AttemptService(BaseService[ExamAttempt]):
             # Otomatik değerlendirilebilir tipler
             if question.question_type in [QuestionType.SINGLE_CHOICE, QuestionType.MULTIPLE_CHOICE, QuestionType.TRUE_FALSE]:
                 is_correct = cls._check_choice_answer(question, answer)
-                answer.is_correct = is_correct
-                answer.points_earned = question.points if is_correct else 0
-                earned_points += answer.points_earned
             
             elif question.question_type == QuestionType.SHORT_ANSWER:
                 # Basit metin karşılaştırma
                 is_correct = cls._check_text_answer(question, answer)
-                answer.is_correct = is_correct
-                answer.points_earned = question.points if is_correct else 0
-                earned_points += answer.points_earned
             
-            # Essay için manuel değerlendirme gerekli
+            else:
+                # Essay için manuel değerlendirme gerekli
+                continue
+            
+            points_earned = question.points if is_correct else 0
+            earned_points += points_earned
+            updates.append({
+                'id': answer.id,
+                'is_correct': is_correct,
+                'points_earned': points_earned,
+            })
+        
+        if updates:
+            db.session.bulk_update_mappings(AttemptAnswer, updates)
         
         # Sonuçları kaydet
         attempt.submitted_at = datetime.utcnow()
         attempt.score = earned_points
         attempt.percentage = (earned_points / total_points * 100) if total_points > 0 else 0
-        attempt.passed = attempt.percentage >= exam.pass_score
+        attempt.passed = attempt.percentage >= key.pass_score
         
         # Essay sorusu yoksa otomatik tamamla
-        has_essay = any(
-            q.question_type == QuestionType.ESSAY 
-            for q in exam.questions
-        )
-        
-        if has_essay:
+        if key.has_essay:
             attempt.status = AttemptStatus.SUBMITTED
         else:
             attempt.status = AttemptStatus.GRADED
@@ -462,7 +480,7 @@ class AttemptService(BaseService[ExamAttempt]):
         db.session.commit()
         
         # Sınav istatistiklerini güncelle
-        ExamService.update_statistics(exam.id)
+        ExamService.update_statistics(attempt.exam_id)
         
         return {
             'attempt_id': attempt.id,
@@ -474,27 +492,21 @@ class AttemptService(BaseService[ExamAttempt]):
         }
     
     @classmethod
-    def _check_choice_answer(cls, question: Question, answer: AttemptAnswer) -> bool:
+    def _check_choice_answer(cls, question: QuestionKey, answer: AttemptAnswer) -> bool:
         """Seçmeli soruyu kontrol eder."""
         if not answer.selected_answer_ids:
             return False
         
-        correct_ids = [a.id for a in question.answers if a.is_correct]
-        selected_ids = answer.selected_answer_ids
-        
-        return set(correct_ids) == set(selected_ids)
+        return set(question.correct_ids) == set(answer.selected_answer_ids)
     
     @classmethod
-    def _check_text_answer(cls, question: Question, answer: AttemptAnswer) -> bool:
+    def _check_text_answer(cls, question: QuestionKey, answer: AttemptAnswer) -> bool:
         """Metin cevabını kontrol eder."""
-        if not answer.answer_text or not question.correct_answer_text:
+        if not answer.answer_text or not question.plain_text:
             return False
         
         # Basit normalize karşılaştırma
-        given = answer.answer_text.strip().lower()
-        correct = question.correct_answer_text.strip().lower()
-        
-        return given == correct
+        return answer.answer_text.strip().lower() == question.plain_text
     
     @classmethod
     def get_result(cls, attempt_id: int, user_id: int) -> Dict[str, Any]:
@@ -564,7 +576,8 @@ class AttemptService(BaseService[ExamAttempt]):
         
         query = query.order_by(ExamAttempt.submitted_at.desc())
         
-        return paginate_query(query, page, per_page)
+        # Toplu sınavlarda giriş tablosu büyük; varsayılan sayım tahmini
+        return paginate_query(query, page, per_page, default_total=TOTAL_ESTIMATE)
     
     @classmethod
     def grade_attempt(
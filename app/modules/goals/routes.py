@@ -14,7 +14,7 @@ from app.models.goal import Goal, GoalType, GoalStatus
 from app.models.user import User
 from app.core.responses import success_response, created_response, error_response, paginated_response
 from app.core.decorators import require_role, handle_exceptions
-from app.core.pagination import PaginationParams
+from app.core.pagination import PaginationParams, paginate_query
 
 
 @goals_bp.route('', methods=['GET'])
@@ -70,13 +70,11 @@ def list_goals():
     query = query.order_by(Goal.due_date.asc().nullslast(), Goal.created_at.desc())
     
     # Sayfalama
-    pagination = query.paginate(page=params.page, per_page=params.per_page, error_out=False)
+    result = paginate_query(query, params.page, params.per_page)
     
     return paginated_response(
-        items=[g.to_dict() for g in pagination.items],
-        page=params.page,
-        per_page=params.per_page,
-        total=pagination.total
+        items=[g.to_dict() for g in result.items],
+        pagination=result
     )
 
 
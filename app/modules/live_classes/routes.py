@@ -47,9 +47,7 @@ def list_sessions():
     
     return paginated_response(
         items=[s.to_dict() for s in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -212,9 +210,7 @@ def list_attendances(session_id: int):
     
     return paginated_response(
         items=[a.to_dict() for a in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -234,9 +230,7 @@ def my_sessions():
     
     return paginated_response(
         items=[a.to_dict() for a in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
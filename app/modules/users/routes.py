@@ -85,9 +85,7 @@ def list_users():
     
     return paginated_response(
         items=[u.to_dict() for u in result.items],
-        page=result.page,
-        per_page=result.per_page,
-        total=result.total
+        pagination=result
     )
 
 
@@ -17,6 +17,7 @@ from app.core.exceptions import ConflictError, ValidationError, AuthorizationErr
 from app.core.security import hash_password
 from app.core.pagination import PaginationResult, paginate_query
 from app.modules.users.models import User, Role, Permission
+from app.services.user_snapshot_service import UserSnapshotService
 
 
 def generate_temp_password(length: int = 12) -> str:
@@ -170,6 +171,7 @@ class UserService(BaseService[User]):
                 setattr(user, key, value)
         
         db.session.commit()
+        UserSnapshotService.invalidate(user.id)
         
         return user
     
@@ -206,6 +208,7 @@ class UserService(BaseService[User]):
         user = cls.get_or_404(user_id)
         user.is_active = True
         db.session.commit()
+        UserSnapshotService.invalidate(user.id)
         return user
     
     @classmethod
@@ -214,6 +217,14 @@ class UserService(BaseService[User]):
         user = cls.get_or_404(user_id)
         user.is_active = False
         db.session.commit()
+        UserSnapshotService.invalidate(user.id)
+        return user
+    
+    @classmethod
+    def soft_delete(cls, id: int) -> User:
+        """Kullanıcıyı soft delete yapar."""
+        user = super().soft_delete(id)
+        UserSnapshotService.invalidate(user.id)
         return user
     
     # =========================================================================
@@ -602,6 +613,7 @@ class RoleService(BaseService[Role]):
             role.name = data['name']
         
         db.session.commit()
+        UserSnapshotService.invalidate_all()
         return role
     
     @classmethod
@@ -642,6 +654,7 @@ class RoleService(BaseService[Role]):
         if permission not in role.permissions:
             role.permissions.append(permission)
             db.session.commit()
+            UserSnapshotService.invalidate_all()
         
         return role
     
@@ -659,6 +672,7 @@ class RoleService(BaseService[Role]):
         if permission in role.permissions:
             role.permissions.remove(permission)
             db.session.commit()
+            UserSnapshotService.invalidate_all()
         
         return role
     
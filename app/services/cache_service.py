@@ -10,6 +10,8 @@ import json
 import hashlib
 import logging
 
+from app.utils.cache import TieredCache
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,12 +19,13 @@ class CacheService:
     """
     Önbellekleme servisi.
     
-    Redis veya in-memory önbellekleme sağlar.
+    İki katmanlı önbellek: süreç içi sınırlı LRU (L1) + Redis (L2).
+    Redis yoksa yalnızca L1 kullanılır (TTL'li ve boyutu sınırlı).
     """
     
     _instance = None
     _redis = None
-    _local_cache = {}
+    _tiered = TieredCache(lambda: CacheService._redis)
     
     def __new__(cls):
         if cls._instance is None:
@@ -30,9 +33,22 @@ class CacheService:
         return cls._instance
     
     @classmethod
-    def init_redis(cls, redis_client):
-        """Redis istemcisini başlatır."""
+    def init_redis(
+        cls,
+        redis_client,
+        local_max_size: int = None,
+        local_ttl: int = None
+    ):
+        """
+        Redis istemcisini başlatır.
+        
+        Args:
+            redis_client: Redis istemcisi (decode_responses=True)
+            local_max_size: L1 önbellekteki maksimum anahtar sayısı
+            local_ttl: L1 önbellekte tutulma süresi (saniye)
+        """
         cls._redis = redis_client
+        cls._tiered.configure(local_max_size=local_max_size, local_ttl=local_ttl)
     
     @classmethod
     def get(cls, key: str) -> Optional[Any]:
@@ -46,12 +62,7 @@ class CacheService:
             Önbellekteki değer veya None
         """
         try:
-            if cls._redis:
-                value = cls._redis.get(key)
-                if value:
-                    return json.loads(value)
-            else:
-                return cls._local_cache.get(key)
+            return cls._tiered.get(key)
         except Exception as e:
             logger.error(f'Cache get error: {str(e)}')
         
@@ -78,19 +89,9 @@ class CacheService:
             bool: Başarılı mı
         """
         try:
-            serialized = json.dumps(value)
-            
-            if cls._redis:
-                cls._redis.setex(key, ttl, serialized)
-                
-                # Tag'leri kaydet
-                if tags:
-                    for tag in tags:
-                        cls._redis.sadd(f'cache_tag:{tag}', key)
-            else:
-                cls._local_cache[key] = value
-            
-            return True
+            # Tag'ler değerle birlikte nesil numarası olarak saklanır;
+            # ayrı bir tag kümesi tutulmaz.
+            return cls._tiered.set(key, value, ttl, tags=tags)
             
         except Exception as e:
             logger.error(f'Cache set error: {str(e)}')
@@ -100,10 +101,7 @@ class CacheService:
     def delete(cls, key: str) -> bool:
         """Önbellekten siler."""
         try:
-            if cls._redis:
-                cls._redis.delete(key)
-            else:
-                cls._local_cache.pop(key, None)
+            cls._tiered.delete(key)
             return True
         except Exception as e:
             logger.error(f'Cache delete error: {str(e)}')
@@ -111,47 +109,42 @@ class CacheService:
     
     @classmethod
     def delete_pattern(cls, pattern: str) -> int:
-        """Pattern'e uyan anahtarları siler."""
+        """
+        Pattern'e uyan anahtarları siler.
+        
+        'course:5:*' gibi kalıplar O(1) nesil artırımıyla geçersiz kılınır;
+        diğer kalıplar SCAN/UNLINK ile parça parça silinir (KEYS kullanılmaz).
+        """
         try:
-            if cls._redis:
-                keys = cls._redis.keys(pattern)
-                if keys:
-                    return cls._redis.delete(*keys)
-            else:
-                count = 0
-                import fnmatch
-                for key in list(cls._local_cache.keys()):
-                    if fnmatch.fnmatch(key, pattern):
-                        del cls._local_cache[key]
-                        count += 1
-                return count
+            return cls._tiered.delete_pattern(pattern)
         except Exception as e:
             logger.error(f'Cache delete pattern error: {str(e)}')
         return 0
     
     @classmethod
-    def delete_by_tag(cls, tag: str) -> int:
-        """Tag'e göre siler."""
+    def invalidate(cls, namespace: str) -> int:
+        """
+        Bir isim alanındaki tüm anahtarları geçersiz kılar (örn. 'course:5').
+        
+        Returns:
+            int: Yeni nesil numarası
+        """
         try:
-            if cls._redis:
-                tag_key = f'cache_tag:{tag}'
-                keys = cls._redis.smembers(tag_key)
-                if keys:
-                    cls._redis.delete(*keys)
-                    cls._redis.delete(tag_key)
-                    return len(keys)
+            return cls._tiered.invalidate(namespace)
         except Exception as e:
-            logger.error(f'Cache delete by tag error: {str(e)}')
+            logger.error(f'Cache invalidate error: {str(e)}')
         return 0
     
+    @classmethod
+    def delete_by_tag(cls, tag: str) -> int:
+        """Tag'e göre siler (tag neslini artırır, O(1))."""
+        return cls.invalidate(f'tag:{tag}')
+    
     @classmethod
     def exists(cls, key: str) -> bool:
         """Anahtarın var olup olmadığını kontrol eder."""
         try:
-            if cls._redis:
-                return bool(cls._redis.exists(key))
-            else:
-                return key in cls._local_cache
+            return cls._tiered.exists(key)
         except:
             return False
     
@@ -159,10 +152,9 @@ class CacheService:
     def clear(cls) -> bool:
         """Tüm önbelleği temizler."""
         try:
+            cls._tiered.local.clear()
             if cls._redis:
                 cls._redis.flushdb()
-            else:
-                cls._local_cache.clear()
             return True
         except Exception as e:
             logger.error(f'Cache clear error: {str(e)}')
@@ -173,23 +165,27 @@ class CacheService:
         cls,
         key: str,
         factory: Callable[[], Any],
-        ttl: int = 300
+        ttl: int = 300,
+        tags: list = None
     ) -> Any:
         """
         Önbellekte varsa döner, yoksa factory'den alıp kaydeder.
         
+        Aynı anahtar için eşzamanlı cache miss'lerde factory yalnızca bir kez
+        çalışır (stampede koruması); diğer istekler üretilen değeri bekler.
+        
         Args:
             key: Önbellek anahtarı
             factory: Değer üretecek fonksiyon
             ttl: Yaşam süresi
+            tags: İlişkili etiketler
         """
-        value = cls.get(key)
-        
-        if value is None:
-            value = factory()
-            cls.set(key, value, ttl)
-        
-        return value
+        return cls._tiered.get_or_set(key, factory, ttl, tags)
+    
+    @classmethod
+    def get_stats(cls) -> dict:
+        """L1 doluluğu ve anahtar önekine göre hit/miss sayaçları."""
+        return cls._tiered.get_stats()
     
     @classmethod
     def make_key(cls, *args, **kwargs) -> str:
@@ -214,18 +210,13 @@ def cached(ttl: int = 300, key_prefix: str = None, tags: list = None):
             prefix = key_prefix or func.__name__
             key = f'{prefix}:{CacheService.make_key(*args, **kwargs)}'
             
-            # Önbellekten dene
-            result = CacheService.get(key)
-            if result is not None:
-                return result
-            
-            # Fonksiyonu çağır
-            result = func(*args, **kwargs)
-            
-            # Önbelleğe kaydet
-            CacheService.set(key, result, ttl, tags)
-            
-            return result
+            # Önbellekten dene, yoksa tek seferde üret (single-flight)
+            return CacheService.get_or_set(
+                key,
+                lambda: func(*args, **kwargs),
+                ttl,
+                tags
+            )
         
         # Önbellek temizleme yardımcısı
         wrapper.cache_clear = lambda: CacheService.delete_pattern(
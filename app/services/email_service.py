@@ -2,14 +2,39 @@
 Email Service - E-posta gönderim servisi.
 
 Bu servis e-posta gönderim işlemlerini yönetir.
+
+Toplu gönderim (`send_batch`) alıcıları tek SMTP bağlantısı üzerinden
+gönderir; şablon parti başına bir kez render edilir, geçici hatalarda
+yalnızca ilgili alıcı yeniden denenir.
 """
 
 from typing import List, Optional, Dict, Any
-from flask import current_app, render_template
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+from flask import current_app, render_template, render_template_string
 import logging
+import smtplib
+import time
 
 logger = logging.getLogger(__name__)
 
+# Bağlantı koparsa/sunucu geçici hata verirse alıcı yeniden denenir
+TRANSIENT_SMTP_ERRORS = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    smtplib.SMTPHeloError,
+)
+
+
+def is_transient_smtp_error(error: Exception) -> bool:
+    """Bağlantı/soket hataları ve 4xx SMTP yanıtları geçicidir."""
+    if isinstance(error, TRANSIENT_SMTP_ERRORS):
+        return True
+    if isinstance(error, smtplib.SMTPException):
+        code = getattr(error, 'smtp_code', None)
+        return isinstance(code, int) and 400 <= code < 500
+    return isinstance(error, OSError)
+
 
 class EmailService:
     """
@@ -185,25 +210,156 @@ class EmailService:
         html: str = None
     ) -> Dict[str, Any]:
         """
-        Toplu e-posta gönderir.
+        Toplu e-posta gönderir (tek SMTP bağlantısı).
         
         Returns:
             Dict: Başarılı/başarısız gönderimlerin sayısı
         """
-        success = 0
-        failed = 0
-        failed_emails = []
-        
-        for recipient in recipients:
-            if cls.send_email(to=recipient, subject=subject, body=body, html=html):
-                success += 1
-            else:
-                failed += 1
-                failed_emails.append(recipient)
+        result = cls.send_batch(recipients, subject, html=html, body=body)
         
         return {
             'total': len(recipients),
-            'success': success,
+            'success': result['sent'],
+            'failed': len(result['failed']) + len(result['retry']),
+            'failed_emails': result['failed'] + result['retry']
+        }
+    
+    # =========================================================================
+    # Toplu gönderim (SMTP bağlantı yeniden kullanımı)
+    # =========================================================================
+    
+    @classmethod
+    def _open_smtp(cls) -> smtplib.SMTP:
+        """MAIL_* ayarlarıyla SMTP bağlantısı açar."""
+        config = current_app.config
+        smtp = smtplib.SMTP(
+            config.get('MAIL_SERVER', 'localhost'),
+            config.get('MAIL_PORT', 25),
+            timeout=config.get('MAIL_TIMEOUT', 30)
+        )
+        try:
+            if config.get('MAIL_USE_TLS'):
+                smtp.starttls()
+            if config.get('MAIL_USERNAME'):
+                smtp.login(config['MAIL_USERNAME'], config.get('MAIL_PASSWORD') or '')
+        except Exception:
+            smtp.close()
+            raise
+        return smtp
+    
+    @classmethod
+    def _close_smtp(cls, smtp: Optional[smtplib.SMTP]) -> None:
+        if smtp is None:
+            return
+        try:
+            smtp.quit()
+        except Exception:
+            smtp.close()
+    
+    @classmethod
+    def send_batch(
+        cls,
+        recipients: List[str],
+        subject: str,
+        html: str = None,
+        body: str = None,
+        template_string: str = None,
+        context: Dict[str, Any] = None,
+        max_attempts: int = 2
+    ) -> Dict[str, Any]:
+        """
+        Alıcıları tek SMTP bağlantısıyla, her birine ayrı mesaj olarak gönderir.
+        
+        Şablon verilirse parti için bir kez render edilir. Bağlantı koparsa
+        yeniden açılır ve yalnızca o alıcı tekrar denenir (`max_attempts`).
+        Kalıcı hatalar (ör. reddedilen adres) tekrar denenmez. Bağlantı
+        açılamazsa (sunucu kapalı, kimlik doğrulama reddi) hata partiye aittir:
+        o anki alıcı dahil kalanların hepsi sonraki denemeye bırakılır;
+        kalıcı bağlantı hataları (ör. 535) yeniden denenmez.
+        
+        Returns:
+            sent, failed (kalıcı), retry (geçici hatası sürenler),
+            connections, duration_ms, per_second
+        """
+        started = time.monotonic()
+        if template_string is not None:
+            html = render_template_string(template_string, **(context or {}))
+        sender = current_app.config.get('MAIL_DEFAULT_SENDER')
+        
+        sent = 0
+        failed: List[str] = []
+        retry: List[str] = []
+        connections = 0
+        smtp = None
+        connect_error = None
+        
+        try:
+            for index, recipient in enumerate(recipients):
+                attempts = 0
+                while True:
+                    attempts += 1
+                    if smtp is None:
+                        try:
+                            smtp = cls._open_smtp()
+                            connections += 1
+                        except (smtplib.SMTPException, OSError, ValueError) as e:
+                            if is_transient_smtp_error(e) and attempts < max_attempts:
+                                continue
+                            connect_error = e
+                            break
+                    try:
+                        smtp.send_message(cls._build_message(sender, recipient, subject, html, body))
+                        sent += 1
+                        break
+                    except (smtplib.SMTPException, OSError, ValueError) as e:
+                        if not is_transient_smtp_error(e):
+                            # Adres reddi vb. kalıcı hata; bağlantı kullanılabilir kalır
+                            logger.error(f'Email to {recipient} failed: {e}')
+                            failed.append(recipient)
+                            break
+                        cls._close_smtp(smtp)
+                        smtp = None
+                        if attempts >= max_attempts:
+                            logger.warning(f'Email to {recipient} deferred: {e}')
+                            retry.append(recipient)
+                            break
+                if connect_error is not None:
+                    # Sunucuya bağlanılamıyor; bu alıcı dahil kalanlar sonraki denemeye
+                    logger.error(f'Email batch stopped, SMTP connection failed: {connect_error}')
+                    retry.extend(recipients[index:])
+                    break
+        finally:
+            cls._close_smtp(smtp)
+        
+        duration = time.monotonic() - started
+        result = {
+            'sent': sent,
             'failed': failed,
-            'failed_emails': failed_emails
+            'retry': retry,
+            'connections': connections,
+            'duration_ms': round(duration * 1000, 2),
+            'per_second': round(sent / duration, 2) if duration > 0 else float(sent),
         }
+        logger.info(f'Email batch: {len(recipients)} recipients, {result}')
+        return result
+    
+    @classmethod
+    def _build_message(
+        cls,
+        sender: Optional[str],
+        recipient: str,
+        subject: str,
+        html: Optional[str],
+        body: Optional[str]
+    ) -> EmailMessage:
+        msg = EmailMessage()
+        msg['Subject'] = subject
+        msg['To'] = recipient
+        if sender:
+            msg['From'] = sender
+        msg['Date'] = formatdate(localtime=False)
+        msg['Message-ID'] = make_msgid()
+        msg.set_content(body or '')
+        if html:
+            msg.add_alternative(html, subtype='html')
+        return msg
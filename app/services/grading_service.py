@@ -14,6 +14,7 @@ import logging
 from app.extensions import db
 from app.models.question import Question, QuestionAttempt, QuestionType
 from app.models.exam import Exam, ExamResult, ExamAnswer, ExamQuestion, ExamResultStatus
+from app.services.performance_aggregate_service import PerformanceAggregateService
 
 logger = logging.getLogger(__name__)
 
@@ -344,6 +345,9 @@ class GradingService:
         # Soru istatistiklerini güncelle
         question.record_attempt(result.is_correct, time_spent_seconds)
         
+        # Öğrenci performans özetlerini güncelle
+        PerformanceAggregateService.record_attempt(attempt, question)
+        
         db.session.commit()
         
         return result, attempt
@@ -372,12 +376,15 @@ class GradingService:
         if not attempt:
             raise ValueError(f'Attempt {attempt_id} not found')
         
+        was_correct = attempt.is_correct
         attempt.points_earned = min(points, attempt.max_points)
         attempt.is_correct = points >= attempt.max_points * 0.5  # %50+ = doğru sayılır
         attempt.feedback = feedback
         attempt.graded_by = grader_id
         attempt.graded_at = datetime.utcnow()
         
+        PerformanceAggregateService.record_regrade(attempt, was_correct)
+        
         db.session.commit()
         
         # Eğer sınav cevabıysa, sınav sonucunu da güncelle
@@ -9,6 +9,7 @@ Production-ready logging and reporting services for:
 """
 
 import hashlib
+import random
 import traceback
 import sys
 import platform
@@ -27,6 +28,7 @@ from app.models.audit import (
     ErrorLog, ErrorSeverity,
     RequestLog, AggregatedMetric
 )
+from app.utils.batch_writer import BatchWriter
 
 
 # ==================== SECURITY SERVICE ====================
@@ -322,6 +324,71 @@ class PerformanceService:
         'external_api': 2000, # 2 seconds
     }
     
+    # Asenkron yazım: istek yolunda commit yok, arka planda toplu INSERT.
+    # Kapalıyken (testler) eski senkron add + commit yolu kullanılır.
+    async_enabled = False
+    request_sample_rate = 1.0
+    metric_sample_rate = 1.0
+    
+    _request_writer = BatchWriter(RequestLog.__table__, name='request_logs')
+    _metric_writer = BatchWriter(PerformanceMetric.__table__, name='performance_metrics')
+    
+    @classmethod
+    def init_app(cls, app):
+        """
+        Log pipeline'ını yapılandırır ve flusher'ları başlatır.
+        
+        Config:
+            LOG_PIPELINE_ASYNC: Arka planda toplu yazım (varsayılan True)
+            LOG_PIPELINE_CAPACITY: Tampon kapasitesi (satır)
+            LOG_PIPELINE_FLUSH_SIZE: Bu kadar satır birikince yaz
+            LOG_PIPELINE_FLUSH_INTERVAL_MS: En geç bu aralıkta yaz
+            REQUEST_LOG_SAMPLE_RATE: Başarılı ve hızlı isteklerin örnekleme oranı
+            METRIC_SAMPLE_RATE: Hızlı ve hatasız metriklerin örnekleme oranı
+        """
+        cls.async_enabled = app.config.get('LOG_PIPELINE_ASYNC', True)
+        cls.request_sample_rate = float(app.config.get('REQUEST_LOG_SAMPLE_RATE', 1.0))
+        cls.metric_sample_rate = float(app.config.get('METRIC_SAMPLE_RATE', 1.0))
+        
+        for writer in (cls._request_writer, cls._metric_writer):
+            writer.configure(
+                capacity=app.config.get('LOG_PIPELINE_CAPACITY', 10000),
+                flush_size=app.config.get('LOG_PIPELINE_FLUSH_SIZE', 500),
+                flush_interval=app.config.get('LOG_PIPELINE_FLUSH_INTERVAL_MS', 1000) / 1000
+            )
+            if cls.async_enabled:
+                writer.start(app)
+    
+    @classmethod
+    def flush(cls) -> int:
+        """Tamponlardaki tüm kayıtları hemen yazar."""
+        return cls._request_writer.flush() + cls._metric_writer.flush()
+    
+    @classmethod
+    def get_pipeline_stats(cls) -> Dict[str, Any]:
+        """Tampon doluluğu, yazılan/düşürülen/örneklenmeyen sayaçları."""
+        return {
+            'async_enabled': cls.async_enabled,
+            'sample_rates': {
+                'request': cls.request_sample_rate,
+                'metric': cls.metric_sample_rate,
+            },
+            'sampled_out': {
+                'request': cls._request_writer.get_stats()['sampled_out'],
+                'metric': cls._metric_writer.get_stats()['sampled_out'],
+            },
+            'request_logs': cls._request_writer.get_stats(),
+            'performance_metrics': cls._metric_writer.get_stats(),
+        }
+    
+    @classmethod
+    def _keep(cls, writer: BatchWriter, rate: float, important: bool) -> bool:
+        """Yavaş/hatalı kayıtlar her zaman tutulur, diğerleri örneklenir."""
+        if important or rate >= 1.0 or random.random() < rate:
+            return True
+        writer.record_sampled_out()
+        return False
+    
     @classmethod
     def record_metric(
         cls,
@@ -339,6 +406,8 @@ class PerformanceService:
     ) -> Optional[PerformanceMetric]:
         """
         Performans metriği kaydeder.
+        
+        Asenkron modda kayıt tampona eklenir ve None döner.
         """
         try:
             type_str = metric_type.value if isinstance(metric_type, MetricType) else str(metric_type)
@@ -347,38 +416,47 @@ class PerformanceService:
             threshold = cls.SLOW_THRESHOLDS.get(type_str, 1000)
             is_slow = duration_ms > threshold
             
+            # Log slow requests
+            if is_slow:
+                current_app.logger.warning(
+                    f"Slow {type_str}: {metric_name} took {duration_ms:.2f}ms",
+                    extra={'endpoint': endpoint, 'duration_ms': duration_ms}
+                )
+            
+            important = is_slow or bool(details and 'error' in details) or (status_code or 0) >= 400
+            if not cls._keep(cls._metric_writer, cls.metric_sample_rate, important):
+                return None
+            
             # Get request context
             request_id = None
             if has_request_context():
                 request_id = getattr(g, 'request_id', None)
             
-            metric = PerformanceMetric(
-                metric_type=type_str,
-                metric_name=metric_name,
-                request_id=request_id,
-                endpoint=endpoint,
-                http_method=http_method,
-                duration_ms=duration_ms,
-                is_slow=is_slow,
-                status_code=status_code,
-                query_count=query_count,
-                cache_hits=cache_hits,
-                cache_misses=cache_misses,
-                user_id=user_id,
-                details=details,
-                created_at=datetime.utcnow()
-            )
+            row = {
+                'metric_type': type_str,
+                'metric_name': metric_name,
+                'request_id': request_id,
+                'endpoint': endpoint,
+                'http_method': http_method,
+                'duration_ms': duration_ms,
+                'is_slow': is_slow,
+                'status_code': status_code,
+                'query_count': query_count,
+                'cache_hits': cache_hits,
+                'cache_misses': cache_misses,
+                'user_id': user_id,
+                'details': details,
+                'created_at': datetime.utcnow(),
+            }
             
+            if cls.async_enabled:
+                cls._metric_writer.enqueue(row, important=important)
+                return None
+            
+            metric = PerformanceMetric(**row)
             db.session.add(metric)
             db.session.commit()
             
-            # Log slow requests
-            if is_slow:
-                current_app.logger.warning(
-                    f"Slow {type_str}: {metric_name} took {duration_ms:.2f}ms",
-                    extra={'endpoint': endpoint, 'duration_ms': duration_ms}
-                )
-            
             return metric
             
         except Exception as e:
@@ -396,8 +474,24 @@ class PerformanceService:
         response_size: int = None,
         user_id: int = None
     ) -> Optional[RequestLog]:
-        """HTTP request kaydeder."""
+        """
+        HTTP request kaydeder.
+        
+        Yavaş ve hatalı (>= 400) istekler her zaman tutulur; başarılı ve
+        hızlı istekler REQUEST_LOG_SAMPLE_RATE oranında örneklenir ve
+        1 / oran ağırlığıyla yazılır.
+        Asenkron modda kayıt tampona eklenir ve None döner.
+        """
         try:
+            is_slow = duration_ms > cls.SLOW_THRESHOLDS['request']
+            important = is_slow or status_code >= 400
+            if not cls._keep(cls._request_writer, cls.request_sample_rate, important):
+                return None
+            
+            # Örneklenen satır, atlanan kardeşlerini de temsil eder (rollup'lar için)
+            rate = cls.request_sample_rate
+            sample_weight = 1.0 if important or rate >= 1.0 else 1.0 / rate
+            
             request_id = getattr(g, 'request_id', None) if has_request_context() else None
             ip_address = None
             user_agent = None
@@ -406,25 +500,30 @@ class PerformanceService:
             if has_request_context():
                 ip_address = cls._get_client_ip()
                 user_agent = request.headers.get('User-Agent', '')[:500]
-                full_url = request.url
+                full_url = request.url[:500]
             
-            is_slow = duration_ms > cls.SLOW_THRESHOLDS['request']
+            row = {
+                'request_id': request_id or 'unknown',
+                'http_method': http_method,
+                'endpoint': endpoint,
+                'full_url': full_url,
+                'query_params': None,
+                'status_code': status_code,
+                'response_size': response_size,
+                'duration_ms': duration_ms,
+                'is_slow': is_slow,
+                'sample_weight': sample_weight,
+                'user_id': user_id,
+                'ip_address': ip_address,
+                'user_agent': user_agent,
+                'created_at': datetime.utcnow(),
+            }
             
-            log = RequestLog(
-                request_id=request_id or 'unknown',
-                http_method=http_method,
-                endpoint=endpoint,
-                full_url=full_url,
-                status_code=status_code,
-                response_size=response_size,
-                duration_ms=duration_ms,
-                is_slow=is_slow,
-                user_id=user_id,
-                ip_address=ip_address,
-                user_agent=user_agent,
-                created_at=datetime.utcnow()
-            )
+            if cls.async_enabled:
+                cls._request_writer.enqueue(row, important=important)
+                return None
             
+            log = RequestLog(**row)
             db.session.add(log)
             db.session.commit()
             
@@ -474,8 +573,24 @@ class PerformanceService:
         }
     
     @classmethod
-    def get_performance_stats(cls, hours: int = 24) -> Dict[str, Any]:
-        """Performans istatistiklerini getirir."""
+    def get_performance_stats(cls, hours: int = 24, source: str = 'rollup') -> Dict[str, Any]:
+        """
+        Performans istatistiklerini getirir.
+        
+        Varsayılan olarak dakikalık/saatlik rollup tablosu okunur (p50/p95/p99
+        dahil). Rollup işi geçmiş log'ları henüz işleyip bitirmemişse ya da
+        source='raw' ise ham RequestLog tablosu taranır.
+        """
+        from app.services.rollup_service import RequestRollupService
+        
+        if source == 'rollup' and RequestRollupService.is_available():
+            return RequestRollupService.get_stats(hours)
+        
+        return cls._get_raw_performance_stats(hours)
+    
+    @classmethod
+    def _get_raw_performance_stats(cls, hours: int = 24) -> Dict[str, Any]:
+        """Ham RequestLog tablosundan istatistikler."""
         since = datetime.utcnow() - timedelta(hours=hours)
         
         # Request stats
@@ -529,6 +644,7 @@ class PerformanceService:
                 {'endpoint': e, 'avg_duration_ms': round(d, 2), 'count': c}
                 for e, d, c in slowest_endpoints
             ],
+            'source': 'raw',
         }
     
     @classmethod
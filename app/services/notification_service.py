@@ -4,14 +4,34 @@ Notification Service - Bildirim servisi.
 Bu servis uygulama içi bildirimleri yönetir.
 """
 
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Iterable
 from datetime import datetime
+import json
 import logging
 
+from flask import current_app
+
 from app.extensions import db
+from app.services.cache_service import CacheService
 
 logger = logging.getLogger(__name__)
 
+# Sayaç sürümünü artırır ve önbelleği siler (bir sonraki okuma DB'den sayar)
+_INVALIDATE_UNREAD_SCRIPT = """
+redis.call('INCR', KEYS[2])
+redis.call('EXPIRE', KEYS[2], ARGV[1])
+return redis.call('DEL', KEYS[1])
+"""
+
+# Sürüm, DB sayımından önce okunan sürümle aynıysa önbelleği doldurur;
+# arada commit edilen bir yazma sürümü artırdıysa bayat sayım yazılmaz
+_FILL_IF_VERSION_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '') == ARGV[1] then
+    return redis.call('SET', KEYS[1], ARGV[2], 'EX', ARGV[3], 'NX')
+end
+return false
+"""
+
 
 class NotificationType:
     """Bildirim tipleri."""
@@ -33,6 +53,12 @@ class NotificationService:
     Uygulama içi ve push bildirimleri yönetir.
     """
     
+    UNREAD_COUNT_KEY = 'notifications:unread:{user_id}'
+    UNREAD_VERSION_KEY = 'notifications:unread_version:{user_id}'
+    UNREAD_COUNT_TTL = 300
+    UNREAD_VERSION_TTL = 86400
+    BULK_CHUNK_SIZE = 500
+    
     @classmethod
     def create_notification(
         cls,
@@ -62,11 +88,12 @@ class NotificationService:
             message=message,
             notification_type=notification_type,
             action_url=action_url,
-            data=data or {}
+            data=json.dumps(data) if data else None
         )
         
         db.session.add(notification)
         db.session.commit()
+        cls._invalidate_unread_counts([user_id])
         
         # Real-time bildirim gönder (WebSocket)
         cls._send_realtime_notification(user_id, notification.to_dict())
@@ -80,30 +107,69 @@ class NotificationService:
         title: str,
         message: str,
         notification_type: str = NotificationType.INFO,
-        action_url: str = None
+        action_url: str = None,
+        data: Dict[str, Any] = None
     ) -> int:
         """
-        Birden fazla kullanıcıya bildirim gönderir.
+        Birden fazla kullanıcıya bildirim gönderir (senkron).
+        
+        Parça başına tek çok satırlı INSERT ve tek commit yapılır. Büyük
+        kitleler için `notify_users_async` kullanılmalı.
         
         Returns:
             int: Gönderilen bildirim sayısı
         """
+        user_ids = cls._unique_ids(user_ids)
+        chunk_size = cls._chunk_size()
         count = 0
-        for user_id in user_ids:
+        
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
             try:
-                cls.create_notification(
-                    user_id=user_id,
-                    title=title,
-                    message=message,
-                    notification_type=notification_type,
-                    action_url=action_url
-                )
-                count += 1
+                count += cls.bulk_create(chunk, title, message, notification_type, action_url, data)
             except Exception as e:
-                logger.error(f'Notification failed for user {user_id}: {str(e)}')
+                db.session.rollback()
+                logger.error(f'Bulk notification failed for {len(chunk)} users: {str(e)}')
         
         return count
     
+    @classmethod
+    def notify_users_async(
+        cls,
+        user_ids: Iterable[int],
+        title: str,
+        message: str,
+        notification_type: str = NotificationType.INFO,
+        action_url: str = None,
+        data: Dict[str, Any] = None
+    ) -> Dict[str, Any]:
+        """
+        Bildirimleri parçalara bölüp Celery task'larına dağıtır.
+        
+        Task'lara yalnızca kullanıcı ID'leri gider; istek thread'inde
+        INSERT/commit yapılmaz.
+        
+        Returns:
+            total_recipients, batches (parça başına alıcı sayısı ve task ID)
+        """
+        from app.tasks.notification_tasks import send_notification_batch_task
+        
+        user_ids = cls._unique_ids(user_ids)
+        chunk_size = cls._chunk_size()
+        batches = []
+        
+        for start in range(0, len(user_ids), chunk_size):
+            chunk = user_ids[start:start + chunk_size]
+            result = send_notification_batch_task.delay(
+                chunk, title, message, notification_type, action_url, data
+            )
+            batches.append({'recipients': len(chunk), 'task_id': result.id})
+        
+        return {
+            'total_recipients': len(user_ids),
+            'batches': batches
+        }
+    
     @classmethod
     def notify_course_students(
         cls,
@@ -113,16 +179,166 @@ class NotificationService:
         notification_type: str = NotificationType.COURSE,
         action_url: str = None
     ) -> int:
-        """Kurstaki tüm öğrencilere bildirim gönderir."""
-        from app.modules.courses.models import Enrollment, EnrollmentStatus
+        """
+        Kurstaki tüm aktif öğrencilere bildirimi kuyruğa alır.
         
-        enrollments = Enrollment.query.filter_by(
-            course_id=course_id,
-            status=EnrollmentStatus.ACTIVE
-        ).all()
+        Yalnızca user_id kolonu okunur (Enrollment nesneleri yüklenmez).
+        
+        Returns:
+            int: Kuyruğa alınan alıcı sayısı
+        """
+        from app.models.course import Enrollment, EnrollmentStatus
+        
+        user_ids = [
+            user_id for user_id, in db.session.query(Enrollment.user_id).filter(
+                Enrollment.course_id == course_id,
+                Enrollment.status == EnrollmentStatus.ACTIVE.value
+            )
+        ]
+        
+        result = cls.notify_users_async(user_ids, title, message, notification_type, action_url)
+        return result['total_recipients']
+    
+    @classmethod
+    def bulk_create(
+        cls,
+        user_ids: List[int],
+        title: str,
+        message: str,
+        notification_type: str = NotificationType.INFO,
+        action_url: str = None,
+        data: Dict[str, Any] = None
+    ) -> int:
+        """
+        Aynı bildirimi bir parça kullanıcıya tek çok satırlı INSERT ile yazar.
         
-        user_ids = [e.user_id for e in enrollments]
-        return cls.notify_users(user_ids, title, message, notification_type, action_url)
+        Returns:
+            int: Yazılan bildirim sayısı
+        """
+        return cls.create_many([
+            {
+                'user_id': user_id,
+                'title': title,
+                'message': message,
+                'notification_type': notification_type,
+                'action_url': action_url,
+                'data': data,
+            }
+            for user_id in user_ids
+        ])
+    
+    @classmethod
+    def create_many(cls, notifications: List[Dict[str, Any]], commit: bool = True) -> int:
+        """
+        Farklı içerikli bildirimleri parça başına tek çok satırlı INSERT ile yazar.
+        
+        Args:
+            notifications: user_id, title, message ve opsiyonel
+                notification_type, action_url, data içeren sözlükler
+            commit: False ise çağıranın transaction'ında kalır; çağıran
+                commit sonrası `publish_created` çağırmalıdır
+        
+        Returns:
+            int: Yazılan bildirim sayısı
+        """
+        from app.modules.users.models import Notification
+        
+        if not notifications:
+            return 0
+        
+        now = datetime.utcnow()
+        rows = [
+            {
+                'user_id': item['user_id'],
+                'title': item['title'],
+                'message': item['message'],
+                'notification_type': item.get('notification_type') or NotificationType.INFO,
+                'action_url': item.get('action_url'),
+                'data': json.dumps(item['data']) if item.get('data') else None,
+                'is_read': False,
+                'created_at': now,
+                'updated_at': now,
+            }
+            for item in notifications
+        ]
+        
+        chunk_size = cls._chunk_size()
+        for start in range(0, len(rows), chunk_size):
+            db.session.execute(
+                db.insert(Notification.__table__).values(rows[start:start + chunk_size])
+            )
+        
+        if commit:
+            db.session.commit()
+            cls.publish_created(notifications)
+        
+        return len(rows)
+    
+    @classmethod
+    def publish_created(cls, notifications: List[Dict[str, Any]]) -> None:
+        """
+        Commit edilmiş toplu bildirimler için okunmamış sayaç önbelleğini
+        (tek pipeline) geçersiz kılar ve real-time bildirim gönderir.
+        """
+        cls._invalidate_unread_counts([item['user_id'] for item in notifications])
+        
+        created_at = datetime.utcnow().isoformat()
+        for item in notifications:
+            cls._send_realtime_notification(item['user_id'], {
+                'title': item['title'],
+                'message': item['message'],
+                'notification_type': item.get('notification_type') or NotificationType.INFO,
+                'action_url': item.get('action_url'),
+                'data': item.get('data') or {},
+                'is_read': False,
+                'created_at': created_at,
+            })
+    
+    @classmethod
+    def _unique_ids(cls, user_ids: Iterable[int]) -> List[int]:
+        """Sırayı koruyarak tekrar eden ID'leri atar."""
+        return list(dict.fromkeys(int(user_id) for user_id in user_ids))
+    
+    @classmethod
+    def _chunk_size(cls) -> int:
+        try:
+            return current_app.config.get('NOTIFICATION_BULK_CHUNK_SIZE', cls.BULK_CHUNK_SIZE)
+        except RuntimeError:
+            return cls.BULK_CHUNK_SIZE
+    
+    # =========================================================================
+    # Okunmamış Sayaç Önbelleği
+    # =========================================================================
+    
+    @classmethod
+    def _unread_key(cls, user_id: int) -> str:
+        return cls.UNREAD_COUNT_KEY.format(user_id=user_id)
+    
+    @classmethod
+    def _unread_version_key(cls, user_id: int) -> str:
+        return cls.UNREAD_VERSION_KEY.format(user_id=user_id)
+    
+    @classmethod
+    def _invalidate_unread_counts(cls, user_ids: List[int]) -> None:
+        """
+        Commit sonrası sayaç önbelleklerini tek pipeline ile siler ve
+        sürümlerini artırır; devam eden okumaların bayat doldurması reddedilir.
+        """
+        redis = CacheService._redis
+        if not redis or not user_ids:
+            return
+        
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for user_id in cls._unique_ids(user_ids):
+                pipe.eval(
+                    _INVALIDATE_UNREAD_SCRIPT, 2,
+                    cls._unread_key(user_id), cls._unread_version_key(user_id),
+                    cls.UNREAD_VERSION_TTL
+                )
+            pipe.execute()
+        except Exception as e:
+            logger.warning(f'Unread count cache invalidation failed: {str(e)}')
     
     @classmethod
     def get_user_notifications(
@@ -155,6 +371,7 @@ class NotificationService:
             notification.is_read = True
             notification.read_at = datetime.utcnow()
             db.session.commit()
+            cls._invalidate_unread_counts([user_id])
             return True
         
         return False
@@ -173,17 +390,45 @@ class NotificationService:
         })
         
         db.session.commit()
+        cls._invalidate_unread_counts([user_id])
         return count
     
     @classmethod
     def get_unread_count(cls, user_id: int) -> int:
-        """Okunmamış bildirim sayısını döner."""
+        """
+        Okunmamış bildirim sayısını döner (Redis sayaç önbelleği).
+        
+        Önbellek, sayımdan önce okunan sürüm değişmediyse doldurulur.
+        """
         from app.modules.users.models import Notification
         
-        return Notification.query.filter_by(
+        redis = CacheService._redis
+        key = cls._unread_key(user_id)
+        version = ''
+        if redis:
+            try:
+                cached, version = redis.mget(key, cls._unread_version_key(user_id))
+                if cached is not None:
+                    return int(cached)
+            except Exception as e:
+                logger.warning(f'Unread count cache read failed: {str(e)}')
+                redis = None
+        
+        count = Notification.query.filter_by(
             user_id=user_id,
             is_read=False
         ).count()
+        
+        if redis:
+            try:
+                redis.eval(
+                    _FILL_IF_VERSION_SCRIPT, 2, key, cls._unread_version_key(user_id),
+                    version or '', count, cls.UNREAD_COUNT_TTL
+                )
+            except Exception as e:
+                logger.warning(f'Unread count cache write failed: {str(e)}')
+        
+        return count
     
     @classmethod
     def delete_notification(cls, notification_id: int, user_id: int) -> bool:
@@ -198,6 +443,7 @@ class NotificationService:
         if notification:
             db.session.delete(notification)
             db.session.commit()
+            cls._invalidate_unread_counts([user_id])
             return True
         
         return False
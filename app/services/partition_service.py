@@ -0,0 +1,257 @@
+"""
+Partition Service - Zaman bölümlü (range partitioned) log tabloları.
+
+PostgreSQL'de yalnızca eklenen, her istekte yazılan log tabloları
+`created_at` üzerinden RANGE bölümlüdür (bkz. `partition_log_tables`
+migration'ı):
+
+- request_logs, performance_metrics: günlük bölümler
+- audit_logs, ai_usage_logs: aylık bölümler
+
+Bu servis gelecek bölümleri önceden oluşturur ve saklama süresi dolan
+bölümleri DETACH + DROP ile kaldırır; retention satır silmek yerine
+metadata işlemine dönüşür. Zaman aralıklı sorgular yalnızca ilgili
+bölümlere dokunur (partition pruning).
+
+Her tablonun bir DEFAULT bölümü (`<tablo>_default`) vardır: bakım görevi
+durup önceden oluşturulan bölümler tükenirse INSERT'ler hata vermek yerine
+oraya düşer. Görev yeniden çalıştığında eksik dönemlerin bölümleri
+oluşturulur ve satırlar DEFAULT bölümden bu bölümlere taşınır.
+
+SQLite (geliştirme) ve bölümlenmemiş tablolarda tüm işlemler etkisizdir;
+retention parçalı DELETE yoluna (RetentionService) düşer.
+"""
+
+import logging
+import re
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+from app.extensions import db
+
+logger = logging.getLogger(__name__)
+
+INTERVAL_DAY = 'day'
+INTERVAL_MONTH = 'month'
+
+_UPPER_BOUND_RE = re.compile(r"TO \('([^']+)'\)")
+
+
+def period_start(moment: datetime, interval: str) -> datetime:
+    """Anın düştüğü bölümün başlangıcı."""
+    if interval == INTERVAL_MONTH:
+        return datetime(moment.year, moment.month, 1)
+    return datetime(moment.year, moment.month, moment.day)
+
+
+def next_period(start: datetime, interval: str) -> datetime:
+    """Bir sonraki bölümün başlangıcı."""
+    if interval == INTERVAL_MONTH:
+        if start.month == 12:
+            return datetime(start.year + 1, 1, 1)
+        return datetime(start.year, start.month + 1, 1)
+    return start + timedelta(days=1)
+
+
+def partition_name(table: str, start: datetime, interval: str) -> str:
+    """Ör. request_logs_p20261016, audit_logs_p202610."""
+    suffix = start.strftime('%Y%m' if interval == INTERVAL_MONTH else '%Y%m%d')
+    return f'{table}_p{suffix}'
+
+
+def default_partition_name(table: str) -> str:
+    """Ör. request_logs_default."""
+    return f'{table}_default'
+
+
+def missing_periods(
+    interval: str,
+    covered_until: datetime,
+    now: datetime,
+    precreate: int,
+    spilled_from: Optional[datetime] = None
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Oluşturulması gereken (başlangıç, bitiş) aralıkları.
+
+    Şimdiki dönemden itibaren `precreate` ileri dönem kapsanır; DEFAULT
+    bölüme düşmüş satırlar varsa en eskisinin döneminden başlanır. Mevcut
+    bölümlerin kapsadığı (`covered_until` öncesi) dönemler atlanır.
+    """
+    current = period_start(now, interval)
+    target = current
+    for _ in range(precreate + 1):
+        target = next_period(target, interval)
+
+    start = current
+    if spilled_from is not None:
+        start = min(start, period_start(spilled_from, interval))
+    start = max(start, covered_until)
+
+    periods = []
+    while start < target:
+        end = next_period(start, interval)
+        periods.append((start, end))
+        start = end
+    return periods
+
+
+def parse_upper_bound(bound_expr: str) -> Optional[datetime]:
+    """`FOR VALUES FROM (...) TO ('...')` ifadesinden üst sınır; DEFAULT için None."""
+    match = _UPPER_BOUND_RE.search(bound_expr or '')
+    if not match:
+        return None
+    return datetime.fromisoformat(match.group(1).split('+')[0])
+
+
+class PartitionService:
+    """Log tablolarının bölüm yönetimi."""
+
+    # Tablo -> bölüm aralığı
+    TABLES: Dict[str, str] = {
+        'request_logs': INTERVAL_DAY,
+        'performance_metrics': INTERVAL_DAY,
+        'audit_logs': INTERVAL_MONTH,
+        'ai_usage_logs': INTERVAL_MONTH,
+    }
+
+    # Önceden oluşturulacak bölüm sayısı
+    PRECREATE = {
+        INTERVAL_DAY: 7,
+        INTERVAL_MONTH: 2,
+    }
+
+    @classmethod
+    def is_partitioned(cls, table: str) -> bool:
+        """Tablo PostgreSQL'de bölümlü mü? (SQLite'ta her zaman False)"""
+        if table not in cls.TABLES or db.session.get_bind().dialect.name != 'postgresql':
+            return False
+        return bool(db.session.execute(text(
+            'SELECT 1 FROM pg_partitioned_table pt '
+            'JOIN pg_class c ON c.oid = pt.partrelid '
+            'WHERE c.relname = :table AND pg_table_is_visible(c.oid)'
+        ), {'table': table}).scalar())
+
+    @classmethod
+    def list_partitions(cls, table: str) -> List[Tuple[str, Optional[datetime]]]:
+        """(bölüm adı, üst sınır) listesi; DEFAULT bölümün üst sınırı None."""
+        rows = db.session.execute(text(
+            'SELECT child.relname, pg_get_expr(child.relpartbound, child.oid) '
+            'FROM pg_inherits i '
+            'JOIN pg_class parent ON parent.oid = i.inhparent '
+            'JOIN pg_class child ON child.oid = i.inhrelid '
+            'WHERE parent.relname = :table AND pg_table_is_visible(parent.oid)'
+        ), {'table': table}).all()
+        return [(name, parse_upper_bound(bound)) for name, bound in rows]
+
+    @classmethod
+    def ensure_partitions(cls, table: str, now: datetime = None) -> List[str]:
+        """
+        DEFAULT bölümü ve şimdiki + sonraki `PRECREATE` bölümü oluşturur.
+
+        DEFAULT bölümde satır varsa (bakım görevi geride kalmış) eksik
+        dönemlerin bölümleri de oluşturulur ve satırlar oraya taşınır.
+
+        Returns:
+            List[str]: Yeni oluşturulan bölümler
+        """
+        if not cls.is_partitioned(table):
+            return []
+
+        interval = cls.TABLES[table]
+        default = default_partition_name(table)
+        db.session.execute(text(
+            f'CREATE TABLE IF NOT EXISTS "{default}" PARTITION OF "{table}" DEFAULT'
+        ))
+
+        # Migration'da eklenen eski tablo (legacy) bölümü de dahil kapsanan son an
+        bounds = [upper for _, upper in cls.list_partitions(table) if upper is not None]
+        covered_until = max(bounds) if bounds else datetime.min
+        spilled_from = db.session.execute(
+            text(f'SELECT min(created_at) FROM "{default}"')
+        ).scalar()
+        if spilled_from is not None:
+            logger.warning(
+                f'{table}: rows since {spilled_from.isoformat()} landed in the default '
+                f'partition; maintain_log_partitions fell behind'
+            )
+
+        created = []
+        for start, end in missing_periods(
+            interval, covered_until, now or datetime.utcnow(),
+            cls.PRECREATE[interval], spilled_from
+        ):
+            name = partition_name(table, start, interval)
+            if spilled_from is not None:
+                moved = cls._create_from_default(table, name, start, end)
+                if moved:
+                    logger.warning(f'Moved {moved} rows from {default} into {name}')
+            else:
+                db.session.execute(text(
+                    f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF "{table}" '
+                    f"FOR VALUES FROM ('{start.isoformat(' ')}') TO ('{end.isoformat(' ')}')"
+                ))
+            created.append(name)
+
+        db.session.commit()
+        if created:
+            logger.info(f'Created partitions for {table}: {created}')
+        return created
+
+    @classmethod
+    def _create_from_default(cls, table: str, name: str, start: datetime, end: datetime) -> int:
+        """
+        Bölümü ayrı tablo olarak kurar, aralıktaki satırları DEFAULT
+        bölümden taşır ve ATTACH eder (DEFAULT çakışma denetimi geçer).
+
+        Returns:
+            int: Taşınan satır sayısı
+        """
+        params = {'start': start, 'end': end}
+        db.session.execute(text(
+            f'CREATE TABLE "{name}" (LIKE "{table}" INCLUDING DEFAULTS INCLUDING CONSTRAINTS)'
+        ))
+        moved = db.session.execute(text(
+            f'WITH moved AS ('
+            f'DELETE FROM "{default_partition_name(table)}" '
+            f'WHERE created_at >= :start AND created_at < :end RETURNING *'
+            f') INSERT INTO "{name}" SELECT * FROM moved'
+        ), params).rowcount
+        db.session.execute(text(
+            f'ALTER TABLE "{table}" ATTACH PARTITION "{name}" '
+            f"FOR VALUES FROM ('{start.isoformat(' ')}') TO ('{end.isoformat(' ')}')"
+        ))
+        return moved
+
+    @classmethod
+    def drop_before(cls, table: str, cutoff: datetime) -> List[str]:
+        """
+        Tamamı `cutoff`'tan eski bölümleri kaldırır (DETACH + DROP).
+
+        Sınırı kesen bölümdeki eski satırlar çağıranın parçalı DELETE'ine kalır.
+
+        Returns:
+            List[str]: Kaldırılan bölümler
+        """
+        if not cls.is_partitioned(table):
+            return []
+
+        dropped = []
+        for name, upper in sorted(cls.list_partitions(table), key=lambda p: p[1] or datetime.max):
+            if upper is None or upper > cutoff:
+                continue
+            db.session.execute(text(f'ALTER TABLE "{table}" DETACH PARTITION "{name}"'))
+            db.session.execute(text(f'DROP TABLE "{name}"'))
+            db.session.commit()
+            dropped.append(name)
+
+        if dropped:
+            logger.info(f'Dropped partitions for {table}: {dropped}')
+        return dropped
+
+    @classmethod
+    def maintain(cls, now: datetime = None) -> Dict[str, List[str]]:
+        """Tüm bölümlü tablolar için ileri bölümleri oluşturur."""
+        return {table: cls.ensure_partitions(table, now) for table in cls.TABLES}
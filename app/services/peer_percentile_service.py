@@ -0,0 +1,410 @@
+"""
+Peer Percentile Service - Akran yüzdelik indeksi.
+
+Kurs + periyot başına öğrenci başarı oranları Redis sorted set'inde
+(ZSET) tutulur; yüzdelik ve sıra ZCOUNT/ZCARD ile O(log n) hesaplanır.
+
+- Tam yeniden inşa: performans özet tablosundan (StudentPerformanceAggregate)
+  tek GROUP BY ile okunur, geçici anahtara yazılıp RENAME ile atomik
+  olarak değiştirilir. Periyodik görev kayan pencereyi tazeler. İnşa kısa
+  bir Redis kilidiyle tekilleştirilir; inşa sürerken eski indekse yazılan
+  öğrenciler kaydedilir ve RENAME'den sonra yeniden hesaplanır.
+- Artımlı tazeleme: attempt commit edilince (öğrenci, konu) kirli kümeye
+  eklenir; dakikalık görev yalnızca kirli öğrencilerin skorlarını günceller.
+  Skor ve toplam güncellemesi tek Lua betiğiyle atomiktir.
+
+Redis yoksa aynı indeks süreç içinde sıralı dizi (bisect) olarak tutulur.
+"""
+
+import bisect
+import logging
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.models.course import Topic
+from app.models.evaluation import StudentPerformanceAggregate
+from app.services.cache_service import CacheService
+
+logger = logging.getLogger(__name__)
+
+# Eski skorları okuyup yenilerini yazar ve toplamı tek adımda düzeltir
+# (eşzamanlı tazelemeler aynı eski skoru iki kez düşemez).
+# İnşa kilidi varsa öğrenciler ayrıca "inşa sırasında yazılanlar" kümesine eklenir.
+# KEYS: indeks, meta, inşa kilidi, yazılanlar
+# ARGV: user_id, skor ('' = indeksten çıkar) çiftleri, son eleman yazılanlar TTL'i
+_APPLY_SCORES_SCRIPT = """
+local delta = 0
+local building = redis.call('EXISTS', KEYS[3]) == 1
+for i = 1, #ARGV - 1, 2 do
+    if building then
+        redis.call('SADD', KEYS[4], ARGV[i])
+    end
+    local old = redis.call('ZSCORE', KEYS[1], ARGV[i])
+    if old then
+        delta = delta - tonumber(old)
+    end
+    if ARGV[i + 1] == '' then
+        redis.call('ZREM', KEYS[1], ARGV[i])
+    else
+        redis.call('ZADD', KEYS[1], ARGV[i + 1], ARGV[i])
+        delta = delta + tonumber(ARGV[i + 1])
+    end
+end
+redis.call('HINCRBYFLOAT', KEYS[2], 'sum', string.format('%.17g', delta))
+if building then
+    redis.call('EXPIRE', KEYS[4], ARGV[#ARGV])
+end
+return tostring(delta)
+"""
+
+# Kilidi yalnızca sahibi bırakır
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+# İşlem commit edilene kadar bekleyen kirli işaretler (session.info'da)
+_PENDING_DIRTY = 'peer_percentile_dirty'
+
+
+class PeerPercentileService:
+    """Kurs bazlı akran yüzdelik indeksi."""
+
+    PREFIX = 'peers:'
+    INDEX_KEY = PREFIX + '{course_id}:{days}d'
+    META_KEY = PREFIX + '{course_id}:{days}d:meta'
+    LOCK_KEY = PREFIX + '{course_id}:{days}d:rebuild'
+    APPLIED_KEY = PREFIX + '{course_id}:{days}d:applied'
+    DIRTY_KEY = PREFIX + 'dirty'
+
+    PERIOD_DAYS = 30
+    MIN_ATTEMPTS = 10            # İndekse girmek için en az soru
+    INDEX_TTL = 3600 * 3         # Yeniden inşa edilmeyen indeks düşer
+    REFRESH_BATCH = 1000
+    REBUILD_LOCK_TTL = 60        # Takılan inşa kilidi bu kadar sonra düşer
+
+    # Redis yoksa: key -> {'scores': sıralı liste, 'users': {user_id: skor}, 'sum': float}
+    _local: Dict[str, Dict[str, Any]] = {}
+    _local_dirty: set = set()
+    _lock = threading.Lock()
+
+    @classmethod
+    def _get_redis(cls):
+        """Redis client döner."""
+        return CacheService._redis
+
+    @classmethod
+    def _keys(cls, course_id: int, days: int) -> Tuple[str, str]:
+        return (
+            cls.INDEX_KEY.format(course_id=course_id, days=days),
+            cls.META_KEY.format(course_id=course_id, days=days),
+        )
+
+    @classmethod
+    def _build_keys(cls, course_id: int, days: int) -> Tuple[str, str]:
+        return (
+            cls.LOCK_KEY.format(course_id=course_id, days=days),
+            cls.APPLIED_KEY.format(course_id=course_id, days=days),
+        )
+
+    # =========================================================================
+    # Skor hesaplama
+    # =========================================================================
+
+    @classmethod
+    def _compute_scores(
+        cls,
+        course_id: int,
+        days: int,
+        user_ids: Iterable[int] = None
+    ) -> Dict[int, Optional[float]]:
+        """
+        Öğrenci başına başarı oranı (özet tablodan tek GROUP BY).
+
+        `user_ids` verilirse eşiği geçemeyenler None döner (indeksten çıkarılır).
+        """
+        model = StudentPerformanceAggregate
+        since = (datetime.utcnow() - timedelta(days=days)).date()
+
+        query = db.session.query(
+            model.user_id,
+            func.sum(model.attempt_count).label('total'),
+            func.sum(model.correct_count).label('correct')
+        ).filter(
+            model.dimension == 'topic',
+            model.day >= since,
+            model.topic_id.in_(
+                db.session.query(Topic.id).filter(Topic.course_id == course_id)
+            )
+        )
+        if user_ids is not None:
+            user_ids = list(user_ids)
+            query = query.filter(model.user_id.in_(user_ids))
+
+        scores: Dict[int, Optional[float]] = {user_id: None for user_id in user_ids or []}
+        for row in query.group_by(model.user_id).having(
+            func.sum(model.attempt_count) >= cls.MIN_ATTEMPTS
+        ):
+            scores[row.user_id] = (row.correct / row.total * 100) if row.total else 0
+        return scores
+
+    # =========================================================================
+    # İndeks yazma
+    # =========================================================================
+
+    @classmethod
+    def rebuild(cls, course_id: int, days: int = None) -> int:
+        """
+        Kursun indeksini baştan kurar.
+
+        Redis'te başka bir süreç aynı indeksi kuruyorsa hiçbir şey yapmaz.
+
+        Returns:
+            int: İndeksteki öğrenci sayısı (inşa atlandıysa 0)
+        """
+        days = days or cls.PERIOD_DAYS
+        index_key, meta_key = cls._keys(course_id, days)
+
+        redis_client = cls._get_redis()
+        if redis_client is None:
+            scores = {u: s for u, s in cls._compute_scores(course_id, days).items() if s is not None}
+            with cls._lock:
+                cls._local[index_key] = {
+                    'scores': sorted(scores.values()),
+                    'users': dict(scores),
+                    'sum': sum(scores.values()),
+                    'built_at': time.time(),
+                }
+            return len(scores)
+
+        lock_key, applied_key = cls._build_keys(course_id, days)
+        token = uuid.uuid4().hex
+        if not redis_client.set(lock_key, token, nx=True, ex=cls.REBUILD_LOCK_TTL):
+            return 0
+
+        try:
+            # Kilit alındıktan sonra yapılan tazelemeler applied_key'e düşer
+            redis_client.delete(applied_key)
+            scores = {u: s for u, s in cls._compute_scores(course_id, days).items() if s is not None}
+
+            tmp_key = f'{index_key}:tmp'
+            pipe = redis_client.pipeline(transaction=True)
+            pipe.delete(tmp_key)
+            items = list(scores.items())
+            for i in range(0, len(items), 5000):
+                pipe.zadd(tmp_key, {str(u): s for u, s in items[i:i + 5000]})
+            if items:
+                pipe.rename(tmp_key, index_key)
+                pipe.expire(index_key, cls.INDEX_TTL)
+            else:
+                pipe.delete(index_key)
+            pipe.hset(meta_key, mapping={'sum': sum(scores.values()), 'built_at': time.time()})
+            pipe.expire(meta_key, cls.INDEX_TTL)
+            pipe.smembers(applied_key)
+            pipe.delete(applied_key)
+            applied = pipe.execute()[-2]
+        finally:
+            redis_client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+
+        # Okunan anlık görüntüden sonra eski indekse yazılan skorlar RENAME ile
+        # ezildi; bu öğrenciler güncel verilerle yeniden yazılır
+        if applied:
+            user_ids = [int(m.decode() if isinstance(m, bytes) else m) for m in applied]
+            cls._apply_scores(course_id, days, cls._compute_scores(course_id, days, user_ids))
+        return len(scores)
+
+    @classmethod
+    def mark_dirty(cls, user_id: int, topic_id: int) -> None:
+        """
+        Attempt sonrası öğrencinin skorunun tazelenmesini işaretler.
+
+        İşaret, mevcut DB işlemi commit edildikten sonra yazılır; tazeleme
+        görevi henüz görünmeyen attempt'lerle eski skoru hesaplamaz.
+        Rollback olursa işaret düşer.
+        """
+        if not topic_id:
+            return
+        db.session.info.setdefault(_PENDING_DIRTY, set()).add(f'{user_id}:{topic_id}')
+
+    @classmethod
+    def _mark_dirty_members(cls, members: Iterable[str]) -> None:
+        members = list(members)
+        redis_client = cls._get_redis()
+        if redis_client is None:
+            with cls._lock:
+                cls._local_dirty.update(members)
+            return
+        try:
+            redis_client.sadd(cls.DIRTY_KEY, *members)
+        except Exception as e:
+            logger.warning(f'Peer index dirty mark error: {e}')
+
+    @classmethod
+    def _pop_dirty(cls, limit: int) -> List[str]:
+        redis_client = cls._get_redis()
+        if redis_client is None:
+            with cls._lock:
+                members = [cls._local_dirty.pop() for _ in range(min(limit, len(cls._local_dirty)))]
+            return members
+        members = redis_client.spop(cls.DIRTY_KEY, limit) or []
+        return [m.decode() if isinstance(m, bytes) else m for m in members]
+
+    @classmethod
+    def refresh_dirty(cls, days: int = None, limit: int = None) -> Dict[str, int]:
+        """
+        Kirli öğrencilerin skorlarını mevcut indekslerde günceller.
+
+        İndeksi hiç kurulmamış kurslar atlanır (ilk okumada kurulur).
+        İşleme başarısız olursa çekilen işaretler kümeye geri yazılır.
+        """
+        days = days or cls.PERIOD_DAYS
+        members = cls._pop_dirty(limit or cls.REFRESH_BATCH)
+        if not members:
+            return {'users': 0, 'courses': 0}
+
+        try:
+            pairs = [tuple(int(part) for part in m.split(':')) for m in members]
+            topic_courses = dict(db.session.query(Topic.id, Topic.course_id).filter(
+                Topic.id.in_({topic_id for _, topic_id in pairs})
+            ))
+
+            by_course: Dict[int, set] = {}
+            for user_id, topic_id in pairs:
+                course_id = topic_courses.get(topic_id)
+                if course_id:
+                    by_course.setdefault(course_id, set()).add(user_id)
+
+            updated = 0
+            for course_id, user_ids in by_course.items():
+                if not cls._index_exists(course_id, days):
+                    continue
+                scores = cls._compute_scores(course_id, days, user_ids)
+                cls._apply_scores(course_id, days, scores)
+                updated += len(scores)
+        except Exception as e:
+            # Tekrar uygulamak zararsız (skorlar yeniden hesaplanır)
+            cls._mark_dirty_members(members)
+            logger.error(f'Peer index refresh error: {e}')
+            return {'users': 0, 'courses': 0}
+
+        return {'users': updated, 'courses': len(by_course)}
+
+    @classmethod
+    def _index_exists(cls, course_id: int, days: int) -> bool:
+        index_key, meta_key = cls._keys(course_id, days)
+        redis_client = cls._get_redis()
+        if redis_client is None:
+            index = cls._local.get(index_key)
+            return bool(index) and time.time() - index['built_at'] < cls.INDEX_TTL
+        return bool(redis_client.exists(meta_key))
+
+    @classmethod
+    def _apply_scores(cls, course_id: int, days: int, scores: Dict[int, Optional[float]]) -> None:
+        """Skorları indekse yazar; None olanları çıkarır. Toplamı düzeltir."""
+        index_key, meta_key = cls._keys(course_id, days)
+        redis_client = cls._get_redis()
+
+        if redis_client is None:
+            with cls._lock:
+                index = cls._local.get(index_key)
+                if index is None:
+                    return
+                for user_id, score in scores.items():
+                    old = index['users'].pop(user_id, None)
+                    if old is not None:
+                        del index['scores'][bisect.bisect_left(index['scores'], old)]
+                        index['sum'] -= old
+                    if score is not None:
+                        bisect.insort(index['scores'], score)
+                        index['users'][user_id] = score
+                        index['sum'] += score
+            return
+
+        args = []
+        for user_id, score in scores.items():
+            args += [str(user_id), '' if score is None else repr(float(score))]
+        if args:
+            lock_key, applied_key = cls._build_keys(course_id, days)
+            redis_client.eval(
+                _APPLY_SCORES_SCRIPT, 4, index_key, meta_key, lock_key, applied_key,
+                *args, cls.REBUILD_LOCK_TTL
+            )
+
+    # =========================================================================
+    # Okuma
+    # =========================================================================
+
+    @classmethod
+    def get_position(
+        cls,
+        course_id: int,
+        user_score: float,
+        days: int = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Skorun kurs içindeki konumu (O(log n)).
+
+        Returns:
+            below, total, average, top; indeks boşsa None
+        """
+        days = days or cls.PERIOD_DAYS
+        redis_client = cls._get_redis()
+        if not cls._index_exists(course_id, days):
+            cls.rebuild(course_id, days)
+        elif redis_client is None:
+            # Süreç içi indekste arka plan görevi yok; kirlileri okumada işle
+            cls.refresh_dirty(days)
+
+        index_key, meta_key = cls._keys(course_id, days)
+
+        if redis_client is None:
+            with cls._lock:
+                index = cls._local.get(index_key)
+                if not index or not index['scores']:
+                    return None
+                scores = index['scores']
+                return {
+                    'below': bisect.bisect_left(scores, user_score),
+                    'total': len(scores),
+                    'average': index['sum'] / len(scores),
+                    'top': scores[-1],
+                }
+
+        pipe = redis_client.pipeline(transaction=False)
+        pipe.zcount(index_key, '-inf', f'({user_score}')
+        pipe.zcard(index_key)
+        pipe.zrange(index_key, -1, -1, withscores=True)
+        pipe.hget(meta_key, 'sum')
+        below, total, top, score_sum = pipe.execute()
+
+        if not total:
+            return None
+        return {
+            'below': below,
+            'total': total,
+            'average': float(score_sum or 0) / total,
+            'top': top[0][1] if top else 0,
+        }
+
+
+@event.listens_for(Session, 'after_commit')
+def _flush_pending_dirty(session):
+    members = session.info.pop(_PENDING_DIRTY, None)
+    if members:
+        PeerPercentileService._mark_dirty_members(members)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_pending_dirty(session, previous_transaction):
+    # Savepoint geri alımları dış işlemin işaretlerini düşürmez
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_DIRTY, None)
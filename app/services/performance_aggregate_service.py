@@ -0,0 +1,332 @@
+"""
+Performance Aggregate Service - Öğrenci performans özetleri.
+
+QuestionAttempt her yazıldığında öğrenci x konu x boyut x gün satırlarını
+(StudentPerformanceAggregate) artımlı günceller. PerformanceAnalyticsService
+raporları attempt taramak yerine bu satırlar üzerinde GROUP BY ile üretir;
+maliyet öğrencinin konu/boyut sayısıyla orantılıdır, attempt sayısıyla değil.
+
+Gün kovası sayesinde `days` periyotları korunur (gün çözünürlüğünde).
+"""
+
+from datetime import date, datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, tuple_
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.evaluation import StudentPerformanceAggregate
+from app.models.course import Topic
+
+DIMENSION_TOPIC = 'topic'
+DIMENSION_DIFFICULTY = 'difficulty'
+DIMENSION_QUESTION_TYPE = 'question_type'
+DIMENSION_BLOOM_LEVEL = 'bloom_level'
+DIMENSION_HOUR = 'hour'
+
+SUM_COLUMNS = (
+    'attempt_count', 'correct_count', 'time_spent_sum',
+    'correct_time_sum', 'timed_count', 'timed_correct_count',
+)
+
+
+def _enum_value(value: Any) -> Optional[str]:
+    return getattr(value, 'value', value)
+
+
+def attempt_dimensions(question) -> List[Tuple[str, str]]:
+    """Bir sorunun düştüğü (boyut, değer) çiftleri (saat hariç)."""
+    return [
+        (DIMENSION_TOPIC, ''),
+        (DIMENSION_DIFFICULTY, _enum_value(getattr(question, 'difficulty', None)) or 'medium'),
+        (DIMENSION_QUESTION_TYPE, _enum_value(getattr(question, 'question_type', None)) or ''),
+        (DIMENSION_BLOOM_LEVEL, _enum_value(getattr(question, 'bloom_level', None)) or 'understand'),
+    ]
+
+
+class PerformanceAggregateService:
+    """Öğrenci performans özet tablosunu yöneten servis."""
+
+    # Gün satırında saklanan son sonuç sayısı (konu trendi için)
+    RECENT_WINDOW = 20
+
+    # =========================================================================
+    # Yazma
+    # =========================================================================
+
+    @classmethod
+    def record_attempt(cls, attempt, question=None) -> None:
+        """
+        Yeni bir QuestionAttempt'i özet satırlarına işler.
+
+        Çağıran commit eder; attempt ile aynı işlemde yazılır.
+        """
+        question = question or attempt.question
+        created_at = attempt.created_at or datetime.utcnow()
+        attempt.created_at = created_at
+
+        topic_id = getattr(question, 'topic_id', None) or 0
+        cls._apply(
+            user_id=attempt.user_id,
+            topic_id=topic_id,
+            day=created_at.date(),
+            keys=attempt_dimensions(question) + [(DIMENSION_HOUR, str(created_at.hour))],
+            is_correct=bool(attempt.is_correct),
+            time_spent=attempt.time_spent_seconds,
+            at=created_at,
+        )
+
+        # Akran yüzdelik indeksinde öğrencinin skorunu tazelenecek işaretle
+        # (işaret çağıranın commit'inden sonra yazılır)
+        from app.services.peer_percentile_service import PeerPercentileService
+        PeerPercentileService.mark_dirty(attempt.user_id, topic_id)
+
+    @classmethod
+    def record_regrade(cls, attempt, was_correct: bool, question=None) -> None:
+        """Manuel değerlendirmede doğru/yanlış değişimini özetlere yansıtır."""
+        is_correct = bool(attempt.is_correct)
+        if bool(was_correct) == is_correct or attempt.created_at is None:
+            return
+
+        question = question or attempt.question
+        delta = 1 if is_correct else -1
+        time_spent = attempt.time_spent_seconds or 0
+
+        StudentPerformanceAggregate.query.filter(
+            StudentPerformanceAggregate.user_id == attempt.user_id,
+            StudentPerformanceAggregate.topic_id == (getattr(question, 'topic_id', None) or 0),
+            StudentPerformanceAggregate.day == attempt.created_at.date(),
+            tuple_(
+                StudentPerformanceAggregate.dimension,
+                StudentPerformanceAggregate.dimension_value
+            ).in_(attempt_dimensions(question) + [(DIMENSION_HOUR, str(attempt.created_at.hour))])
+        ).update({
+            'correct_count': StudentPerformanceAggregate.correct_count + delta,
+            'correct_time_sum': StudentPerformanceAggregate.correct_time_sum + delta * time_spent,
+            'timed_correct_count': StudentPerformanceAggregate.timed_correct_count + (
+                delta if attempt.time_spent_seconds else 0
+            ),
+        }, synchronize_session=False)
+
+    @classmethod
+    def _apply(
+        cls,
+        user_id: int,
+        topic_id: int,
+        day: date,
+        keys: List[Tuple[str, str]],
+        is_correct: bool,
+        time_spent: Optional[int],
+        at: datetime,
+        _retried: bool = False
+    ) -> None:
+        existing = {
+            (row.dimension, row.dimension_value): row
+            for row in StudentPerformanceAggregate.query.filter(
+                StudentPerformanceAggregate.user_id == user_id,
+                StudentPerformanceAggregate.topic_id == topic_id,
+                StudentPerformanceAggregate.day == day,
+                StudentPerformanceAggregate.dimension.in_({d for d, _ in keys})
+            ).with_for_update()
+        }
+
+        missing = [key for key in keys if key not in existing]
+        if missing:
+            try:
+                with db.session.begin_nested():
+                    for dimension, value in missing:
+                        row = StudentPerformanceAggregate(
+                            user_id=user_id, topic_id=topic_id, day=day,
+                            dimension=dimension, dimension_value=value,
+                            **{column: 0 for column in SUM_COLUMNS},
+                            recent_results=''
+                        )
+                        db.session.add(row)
+                        existing[(dimension, value)] = row
+            except IntegrityError:
+                # Eşzamanlı bir istek aynı satırı ekledi; kilitleyip bir kez
+                # yeniden dene. İkinci çakışma gerçek bir hatadır.
+                if _retried:
+                    raise
+                return cls._apply(
+                    user_id, topic_id, day, keys, is_correct, time_spent, at, _retried=True
+                )
+
+        for key in keys:
+            row = existing[key]
+            row.attempt_count += 1
+            row.correct_count += 1 if is_correct else 0
+            if time_spent:
+                row.time_spent_sum += time_spent
+                row.timed_count += 1
+                if is_correct:
+                    row.correct_time_sum += time_spent
+                    row.timed_correct_count += 1
+            if key[0] == DIMENSION_TOPIC:
+                recent = (row.recent_results or '') + ('1' if is_correct else '0')
+                row.recent_results = recent[-cls.RECENT_WINDOW:]
+            row.last_attempt_at = at
+
+    @classmethod
+    def rebuild_for_user(cls, user_id: int) -> int:
+        """
+        Öğrencinin özetlerini attempt'lerden yeniden üretir (backfill/onarım).
+
+        Returns:
+            int: İşlenen attempt sayısı
+        """
+        from app.models.question import Question, QuestionAttempt
+
+        StudentPerformanceAggregate.query.filter_by(user_id=user_id).delete(
+            synchronize_session=False
+        )
+
+        aggregates: Dict[tuple, Dict[str, Any]] = {}
+        processed = 0
+        attempts = db.session.query(QuestionAttempt, Question).join(
+            Question, QuestionAttempt.question_id == Question.id
+        ).filter(
+            QuestionAttempt.user_id == user_id
+        ).order_by(QuestionAttempt.created_at, QuestionAttempt.id)
+
+        for attempt, question in attempts.yield_per(1000):
+            created_at = attempt.created_at or datetime.utcnow()
+            topic_id = getattr(question, 'topic_id', None) or 0
+            keys = attempt_dimensions(question) + [(DIMENSION_HOUR, str(created_at.hour))]
+            for dimension, value in keys:
+                row = aggregates.setdefault(
+                    (topic_id, dimension, value, created_at.date()),
+                    {column: 0 for column in SUM_COLUMNS}
+                )
+                cls._accumulate(row, dimension, bool(attempt.is_correct),
+                                attempt.time_spent_seconds, created_at)
+            processed += 1
+
+        rows = [
+            {
+                'user_id': user_id, 'topic_id': topic_id, 'dimension': dimension,
+                'dimension_value': value, 'day': day,
+                'recent_results': '', **data,
+            }
+            for (topic_id, dimension, value, day), data in aggregates.items()
+        ]
+        if rows:
+            db.session.execute(StudentPerformanceAggregate.__table__.insert(), rows)
+        db.session.commit()
+        return processed
+
+    @classmethod
+    def _accumulate(
+        cls,
+        row: Dict[str, Any],
+        dimension: str,
+        is_correct: bool,
+        time_spent: Optional[int],
+        at: datetime
+    ) -> None:
+        row['attempt_count'] += 1
+        row['correct_count'] += 1 if is_correct else 0
+        if time_spent:
+            row['time_spent_sum'] += time_spent
+            row['timed_count'] += 1
+            if is_correct:
+                row['correct_time_sum'] += time_spent
+                row['timed_correct_count'] += 1
+        if dimension == DIMENSION_TOPIC:
+            recent = row.get('recent_results', '') + ('1' if is_correct else '0')
+            row['recent_results'] = recent[-cls.RECENT_WINDOW:]
+        row['last_attempt_at'] = at
+
+    # =========================================================================
+    # Okuma
+    # =========================================================================
+
+    @classmethod
+    def _base_query(
+        cls,
+        columns: Iterable,
+        user_id: int,
+        dimension: str,
+        start_date: datetime,
+        end_date: datetime,
+        course_id: int = None
+    ):
+        query = db.session.query(*columns).filter(
+            StudentPerformanceAggregate.user_id == user_id,
+            StudentPerformanceAggregate.dimension == dimension,
+            StudentPerformanceAggregate.day >= start_date.date(),
+            StudentPerformanceAggregate.day <= end_date.date()
+        )
+        if course_id:
+            query = query.filter(StudentPerformanceAggregate.topic_id.in_(
+                db.session.query(Topic.id).filter(Topic.course_id == course_id)
+            ))
+        return query
+
+    @classmethod
+    def summarize(
+        cls,
+        user_id: int,
+        dimension: str,
+        start_date: datetime,
+        end_date: datetime,
+        course_id: int = None,
+        by_topic: bool = False,
+        by_value: bool = True,
+        by_day: bool = False
+    ) -> List[Any]:
+        """
+        Boyut satırlarını gruplayarak toplar.
+
+        Returns:
+            (topic_id?, dimension_value?, day?, <SUM_COLUMNS>) satırları
+        """
+        model = StudentPerformanceAggregate
+        group_columns = []
+        if by_topic:
+            group_columns.append(model.topic_id)
+        if by_value:
+            group_columns.append(model.dimension_value)
+        if by_day:
+            group_columns.append(model.day)
+
+        sums = [
+            func.coalesce(func.sum(getattr(model, column)), 0).label(column)
+            for column in SUM_COLUMNS
+        ]
+        query = cls._base_query(
+            group_columns + sums, user_id, dimension, start_date, end_date, course_id
+        )
+        if group_columns:
+            query = query.group_by(*group_columns)
+        return query.all()
+
+    @classmethod
+    def recent_results_by_topic(
+        cls,
+        user_id: int,
+        topic_ids: Iterable[int],
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[int, str]:
+        """
+        Konu başına en yeni `RECENT_WINDOW` sonuç (en yeni en sonda).
+
+        Her gün satırı o günün son sonuçlarını tuttuğu için yeni günlerden
+        eskiye doğru birleştirmek son N attempt'i verir.
+        """
+        model = StudentPerformanceAggregate
+        rows = cls._base_query(
+            [model.topic_id, model.recent_results], user_id, DIMENSION_TOPIC,
+            start_date, end_date
+        ).filter(
+            model.topic_id.in_(list(topic_ids))
+        ).order_by(model.topic_id, model.day.desc())
+
+        results: Dict[int, str] = {}
+        for topic_id, recent in rows:
+            current = results.get(topic_id, '')
+            if len(current) < cls.RECENT_WINDOW:
+                results[topic_id] = ((recent or '') + current)[-cls.RECENT_WINDOW:]
+        return results
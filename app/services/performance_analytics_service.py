@@ -15,10 +15,19 @@ import logging
 
 from sqlalchemy import func, and_, or_
 from app.extensions import db
-from app.models.question import Question, QuestionAttempt, QuestionType, DifficultyLevel
+from app.models.question import Question, QuestionAttempt, QuestionType
 from app.models.exam import Exam, ExamResult, ExamResultStatus
 from app.models.evaluation import StudentProgress
 from app.models.course import Topic
+from app.services.performance_aggregate_service import (
+    PerformanceAggregateService,
+    DIMENSION_TOPIC,
+    DIMENSION_DIFFICULTY,
+    DIMENSION_QUESTION_TYPE,
+    DIMENSION_BLOOM_LEVEL,
+    DIMENSION_HOUR,
+)
+from app.services.peer_percentile_service import PeerPercentileService
 
 logger = logging.getLogger(__name__)
 
@@ -233,19 +242,13 @@ class PerformanceAnalyticsService:
         start_date: datetime,
         end_date: datetime
     ) -> Dict[str, Any]:
-        """Soru istatistiklerini hesaplar."""
-        query = QuestionAttempt.query.filter(
-            QuestionAttempt.user_id == user_id,
-            QuestionAttempt.created_at >= start_date,
-            QuestionAttempt.created_at <= end_date
+        """Soru istatistiklerini hesaplar (özet tablodan)."""
+        rows = PerformanceAggregateService.summarize(
+            user_id, DIMENSION_TOPIC, start_date, end_date, course_id, by_value=False
         )
+        row = rows[0] if rows else None
         
-        if course_id:
-            query = query.join(Question).join(Topic).filter(Topic.course_id == course_id)
-        
-        attempts = query.all()
-        
-        if not attempts:
+        if not row or not row.attempt_count:
             return {
                 'total_attempted': 0,
                 'total_correct': 0,
@@ -254,9 +257,9 @@ class PerformanceAnalyticsService:
                 'average_time': 0
             }
         
-        total = len(attempts)
-        correct = sum(1 for a in attempts if a.is_correct)
-        total_time = sum(a.time_spent_seconds or 0 for a in attempts)
+        total = row.attempt_count
+        correct = row.correct_count
+        total_time = row.time_spent_sum
         
         return {
             'total_attempted': total,
@@ -318,68 +321,64 @@ class PerformanceAnalyticsService:
         start_date: datetime,
         end_date: datetime
     ) -> List[TopicPerformance]:
-        """Konu bazlı performansları hesaplar."""
-        # Kurs varsa o kurstaki tüm topicler, yoksa tüm attemptlerdeki topicler
-        if course_id:
-            topics = Topic.query.filter_by(course_id=course_id).all()
-        else:
-            topic_ids = db.session.query(
-                Question.topic_id
-            ).join(QuestionAttempt).filter(
-                QuestionAttempt.user_id == user_id,
-                QuestionAttempt.created_at >= start_date
-            ).distinct().all()
-            topics = Topic.query.filter(Topic.id.in_([t[0] for t in topic_ids])).all()
+        """
+        Konu bazlı performansları hesaplar.
+        
+        Konu başına sorgu yerine özet tablodan boyut başına tek GROUP BY
+        okunur (konu, zorluk, soru tipi, Bloom ve son sonuçlar).
+        """
+        topic_rows = PerformanceAggregateService.summarize(
+            user_id, DIMENSION_TOPIC, start_date, end_date, course_id,
+            by_topic=True, by_value=False
+        )
+        topic_rows = [row for row in topic_rows if row.attempt_count and row.topic_id]
+        if not topic_rows:
+            return []
+        
+        topics = {
+            topic.id: topic
+            for topic in Topic.query.filter(Topic.id.in_([row.topic_id for row in topic_rows]))
+        }
+        
+        question_counts = cls._count_published_questions(topics.keys())
+        
+        breakdowns = {
+            dimension: cls._get_topic_breakdowns(
+                user_id, dimension, course_id, start_date, end_date
+            )
+            for dimension in (DIMENSION_DIFFICULTY, DIMENSION_QUESTION_TYPE, DIMENSION_BLOOM_LEVEL)
+        }
+        
+        trend_end = datetime.utcnow()
+        recent_results = PerformanceAggregateService.recent_results_by_topic(
+            user_id, topics.keys(), trend_end - timedelta(days=14), trend_end
+        )
         
         performances = []
         
-        for topic in topics:
-            # Topic'e ait attemptler
-            attempts = QuestionAttempt.query.join(Question).filter(
-                QuestionAttempt.user_id == user_id,
-                Question.topic_id == topic.id,
-                QuestionAttempt.created_at >= start_date,
-                QuestionAttempt.created_at <= end_date
-            ).all()
-            
-            if not attempts:
+        for row in topic_rows:
+            topic = topics.get(row.topic_id)
+            if not topic:
                 continue
             
-            total_questions = Question.query.filter_by(
-                topic_id=topic.id, is_published=True
-            ).count()
-            
-            attempted = len(attempts)
-            correct = sum(1 for a in attempts if a.is_correct)
-            avg_time = statistics.mean([a.time_spent_seconds or 0 for a in attempts])
-            
-            # Zorluk breakdown
-            difficulty_breakdown = cls._get_difficulty_breakdown(attempts)
-            
-            # Soru tipi breakdown
-            type_breakdown = cls._get_question_type_breakdown(attempts)
-            
-            # Bloom level breakdown
-            bloom_breakdown = cls._get_bloom_level_breakdown(attempts)
-            
-            # Trend
-            topic_trend = cls._calculate_topic_trend(user_id, topic.id)
-            
+            attempted = row.attempt_count
+            correct = row.correct_count
+            avg_time = row.time_spent_sum / attempted
             success_rate = (correct / attempted * 100) if attempted > 0 else 0
             
             performances.append(TopicPerformance(
                 topic_id=topic.id,
                 topic_title=topic.title,
-                total_questions=total_questions,
+                total_questions=question_counts.get(topic.id, 0),
                 attempted_questions=attempted,
                 correct_count=correct,
                 average_score=success_rate,
                 average_time_seconds=avg_time,
-                difficulty_breakdown=difficulty_breakdown,
-                question_type_breakdown=type_breakdown,
-                bloom_level_breakdown=bloom_breakdown,
+                difficulty_breakdown=breakdowns[DIMENSION_DIFFICULTY].get(topic.id, {}),
+                question_type_breakdown=breakdowns[DIMENSION_QUESTION_TYPE].get(topic.id, {}),
+                bloom_level_breakdown=breakdowns[DIMENSION_BLOOM_LEVEL].get(topic.id, {}),
                 performance_level=PerformanceLevel.from_score(success_rate),
-                trend=topic_trend
+                trend=cls._calculate_topic_trend(recent_results.get(topic.id, ''))
             ))
         
         # Performansa göre sırala
@@ -388,52 +387,36 @@ class PerformanceAnalyticsService:
         return performances
     
     @classmethod
-    def _get_difficulty_breakdown(cls, attempts: List[QuestionAttempt]) -> Dict[str, float]:
-        """Zorluk seviyesine göre başarı oranı."""
-        breakdown = defaultdict(lambda: {'correct': 0, 'total': 0})
-        
-        for attempt in attempts:
-            difficulty = attempt.question.difficulty or DifficultyLevel.MEDIUM.value
-            breakdown[difficulty]['total'] += 1
-            if attempt.is_correct:
-                breakdown[difficulty]['correct'] += 1
-        
-        return {
-            diff: (data['correct'] / data['total'] * 100) if data['total'] > 0 else 0
-            for diff, data in breakdown.items()
-        }
-    
-    @classmethod
-    def _get_question_type_breakdown(cls, attempts: List[QuestionAttempt]) -> Dict[str, float]:
-        """Soru tipine göre başarı oranı."""
-        breakdown = defaultdict(lambda: {'correct': 0, 'total': 0})
-        
-        for attempt in attempts:
-            q_type = attempt.question.question_type
-            breakdown[q_type]['total'] += 1
-            if attempt.is_correct:
-                breakdown[q_type]['correct'] += 1
-        
-        return {
-            q_type: (data['correct'] / data['total'] * 100) if data['total'] > 0 else 0
-            for q_type, data in breakdown.items()
-        }
+    def _count_published_questions(cls, topic_ids) -> Dict[int, int]:
+        """Konu başına yayınlanmış soru sayısı (tek GROUP BY)."""
+        return dict(
+            db.session.query(Question.topic_id, func.count(Question.id)).filter(
+                Question.topic_id.in_(list(topic_ids)),
+                Question.is_published == True
+            ).group_by(Question.topic_id).all()
+        )
     
     @classmethod
-    def _get_bloom_level_breakdown(cls, attempts: List[QuestionAttempt]) -> Dict[str, float]:
-        """Bloom seviyesine göre başarı oranı."""
-        breakdown = defaultdict(lambda: {'correct': 0, 'total': 0})
-        
-        for attempt in attempts:
-            bloom = attempt.question.bloom_level or 'understand'
-            breakdown[bloom]['total'] += 1
-            if attempt.is_correct:
-                breakdown[bloom]['correct'] += 1
-        
-        return {
-            bloom: (data['correct'] / data['total'] * 100) if data['total'] > 0 else 0
-            for bloom, data in breakdown.items()
-        }
+    def _get_topic_breakdowns(
+        cls,
+        user_id: int,
+        dimension: str,
+        course_id: int,
+        start_date: datetime,
+        end_date: datetime
+    ) -> Dict[int, Dict[str, float]]:
+        """Konu başına bir boyutun (zorluk, tip, Bloom) başarı oranları."""
+        breakdowns = defaultdict(dict)
+        
+        for row in PerformanceAggregateService.summarize(
+            user_id, dimension, start_date, end_date, course_id, by_topic=True
+        ):
+            if row.attempt_count:
+                breakdowns[row.topic_id][row.dimension_value] = (
+                    row.correct_count / row.attempt_count * 100
+                )
+        
+        return breakdowns
     
     @classmethod
     def _calculate_trend(
@@ -487,22 +470,22 @@ class PerformanceAnalyticsService:
         return TrendDirection.STABLE, trend_data
     
     @classmethod
-    def _calculate_topic_trend(cls, user_id: int, topic_id: int) -> TrendDirection:
-        """Konu için trend hesaplar."""
-        recent = QuestionAttempt.query.join(Question).filter(
-            QuestionAttempt.user_id == user_id,
-            Question.topic_id == topic_id,
-            QuestionAttempt.created_at >= datetime.utcnow() - timedelta(days=14)
-        ).order_by(QuestionAttempt.created_at.desc()).limit(20).all()
+    def _calculate_topic_trend(cls, recent_results: str) -> TrendDirection:
+        """
+        Konu için trend hesaplar.
         
-        if len(recent) < 10:
+        Args:
+            recent_results: Son 14 günün en fazla 20 sonucu ('1'/'0', en yeni sonda)
+        """
+        if len(recent_results) < 10:
             return TrendDirection.STABLE
         
-        first_half = recent[len(recent)//2:]
-        second_half = recent[:len(recent)//2]
+        half = len(recent_results) // 2
+        first_half = recent_results[:len(recent_results) - half]
+        second_half = recent_results[len(recent_results) - half:]
         
-        first_rate = sum(1 for a in first_half if a.is_correct) / len(first_half) * 100
-        second_rate = sum(1 for a in second_half if a.is_correct) / len(second_half) * 100
+        first_rate = first_half.count('1') / len(first_half) * 100
+        second_rate = second_half.count('1') / len(second_half) * 100
         
         diff = second_rate - first_rate
         
@@ -527,12 +510,16 @@ class PerformanceAnalyticsService:
         
         # Konu bazlı
         topic_stats = cls._get_area_stats(user_id, 'topic', course_id, start_date, end_date)
+        topics = {
+            topic.id: topic
+            for topic in Topic.query.filter(Topic.id.in_(list(topic_stats)))
+        } if topic_stats else {}
         for topic_id, stats in topic_stats.items():
             if stats['total'] < cls.MIN_SAMPLE_SIZE:
                 continue
             
             score = stats['success_rate']
-            topic = Topic.query.get(topic_id)
+            topic = topics.get(topic_id)
             
             if score >= cls.STRENGTH_THRESHOLD:
                 strengths.append(StrengthWeakness(
@@ -634,44 +621,30 @@ class PerformanceAnalyticsService:
         start_date: datetime,
         end_date: datetime
     ) -> Dict[str, Dict]:
-        """Alan bazlı istatistikleri hesaplar."""
-        query = QuestionAttempt.query.join(Question).filter(
-            QuestionAttempt.user_id == user_id,
-            QuestionAttempt.created_at >= start_date,
-            QuestionAttempt.created_at <= end_date
+        """Alan bazlı istatistikleri hesaplar (özet tablodan)."""
+        if area not in (
+            DIMENSION_TOPIC, DIMENSION_DIFFICULTY, DIMENSION_QUESTION_TYPE, DIMENSION_BLOOM_LEVEL
+        ):
+            return {}
+        
+        is_topic = area == DIMENSION_TOPIC
+        rows = PerformanceAggregateService.summarize(
+            user_id, area, start_date, end_date, course_id,
+            by_topic=is_topic, by_value=not is_topic
         )
         
-        if course_id:
-            query = query.join(Topic).filter(Topic.course_id == course_id)
-        
-        attempts = query.all()
-        
-        stats = defaultdict(lambda: {'correct': 0, 'total': 0})
-        
-        for attempt in attempts:
-            if area == 'topic':
-                key = attempt.question.topic_id
-            elif area == 'difficulty':
-                key = attempt.question.difficulty or 'medium'
-            elif area == 'question_type':
-                key = attempt.question.question_type
-            elif area == 'bloom_level':
-                key = attempt.question.bloom_level or 'understand'
-            else:
+        stats = {}
+        for row in rows:
+            key = row.topic_id if is_topic else row.dimension_value
+            if not row.attempt_count or (is_topic and not key):
                 continue
-            
-            stats[key]['total'] += 1
-            if attempt.is_correct:
-                stats[key]['correct'] += 1
-        
-        return {
-            key: {
-                'total': data['total'],
-                'correct': data['correct'],
-                'success_rate': (data['correct'] / data['total'] * 100) if data['total'] > 0 else 0
+            stats[key] = {
+                'total': row.attempt_count,
+                'correct': row.correct_count,
+                'success_rate': row.correct_count / row.attempt_count * 100
             }
-            for key, data in stats.items()
-        }
+        
+        return stats
     
     @classmethod
     def _analyze_learning_patterns(
@@ -680,26 +653,21 @@ class PerformanceAnalyticsService:
         start_date: datetime,
         end_date: datetime
     ) -> List[LearningPattern]:
-        """Öğrenme paternlerini analiz eder."""
+        """Öğrenme paternlerini analiz eder (saat ve gün özetlerinden)."""
         patterns = []
         
-        attempts = QuestionAttempt.query.filter(
-            QuestionAttempt.user_id == user_id,
-            QuestionAttempt.created_at >= start_date,
-            QuestionAttempt.created_at <= end_date
-        ).all()
+        hour_rows = PerformanceAggregateService.summarize(
+            user_id, DIMENSION_HOUR, start_date, end_date
+        )
+        hour_stats = {
+            int(row.dimension_value): {'correct': row.correct_count, 'total': row.attempt_count}
+            for row in hour_rows if row.attempt_count
+        }
         
-        if not attempts:
+        if not hour_stats:
             return patterns
         
         # Saat dilimine göre analiz
-        hour_stats = defaultdict(lambda: {'correct': 0, 'total': 0})
-        for attempt in attempts:
-            hour = attempt.created_at.hour
-            hour_stats[hour]['total'] += 1
-            if attempt.is_correct:
-                hour_stats[hour]['correct'] += 1
-        
         best_hours = sorted(
             hour_stats.items(),
             key=lambda x: (x[1]['correct'] / x[1]['total'] if x[1]['total'] > 0 else 0),
@@ -715,14 +683,19 @@ class PerformanceAnalyticsService:
                   for h, s in hour_stats.items()}
         ))
         
-        # Süre analizi
-        avg_time = statistics.mean([a.time_spent_seconds or 0 for a in attempts if a.time_spent_seconds])
+        # Süre analizi: doğru ve yanlış cevapların ortalama süreleri
+        timed = sum(row.timed_count for row in hour_rows)
+        timed_correct = sum(row.timed_correct_count for row in hour_rows)
+        time_sum = sum(row.time_spent_sum for row in hour_rows)
+        correct_time_sum = sum(row.correct_time_sum for row in hour_rows)
+        avg_time = time_sum / timed if timed else 0
         if avg_time:
-            fast_correct = sum(1 for a in attempts if a.is_correct and (a.time_spent_seconds or 0) < avg_time)
-            slow_correct = sum(1 for a in attempts if a.is_correct and (a.time_spent_seconds or 0) >= avg_time)
+            timed_wrong = timed - timed_correct
+            avg_correct_time = correct_time_sum / timed_correct if timed_correct else 0
+            avg_wrong_time = (time_sum - correct_time_sum) / timed_wrong if timed_wrong else 0
             
             insights = []
-            if fast_correct > slow_correct:
+            if timed_correct and (not timed_wrong or avg_correct_time < avg_wrong_time):
                 insights.append("Hızlı cevaplarınız daha başarılı. Güveninizi koruyun!")
             else:
                 insights.append("Yavaş düşündüğünüzde daha başarılısınız. Acele etmeyin!")
@@ -732,18 +705,21 @@ class PerformanceAnalyticsService:
                 insights=insights,
                 data={
                     'average_time': avg_time,
-                    'fast_correct': fast_correct,
-                    'slow_correct': slow_correct
+                    'average_correct_time': avg_correct_time,
+                    'average_wrong_time': avg_wrong_time
                 }
             ))
         
         # Günlük çalışma süresi
-        daily_attempts = defaultdict(int)
-        for attempt in attempts:
-            day = attempt.created_at.date()
-            daily_attempts[day] += 1
+        daily_attempts = [
+            row.attempt_count
+            for row in PerformanceAggregateService.summarize(
+                user_id, DIMENSION_TOPIC, start_date, end_date, by_value=False, by_day=True
+            )
+            if row.attempt_count
+        ]
         
-        avg_daily = statistics.mean(daily_attempts.values()) if daily_attempts else 0
+        avg_daily = statistics.mean(daily_attempts) if daily_attempts else 0
         
         patterns.append(LearningPattern(
             pattern_type='daily_activity',
@@ -810,7 +786,12 @@ class PerformanceAnalyticsService:
         user_id: int,
         course_id: int
     ) -> Dict[str, Any]:
-        """Akranlarla karşılaştırma verir."""
+        """
+        Akranlarla karşılaştırma verir.
+        
+        Skorlar periyodik/artımlı tazelenen kurs indeksinden okunur
+        (bkz. PeerPercentileService); attempt tablosu taranmaz.
+        """
         # Kullanıcının skoru
         user_stats = cls._get_question_stats(
             user_id, course_id,
@@ -819,41 +800,27 @@ class PerformanceAnalyticsService:
         )
         user_score = user_stats['success_rate']
         
-        # Tüm kullanıcıların skorları (aynı kurs)
-        all_scores = db.session.query(
-            QuestionAttempt.user_id,
-            func.count().label('total'),
-            func.sum(func.cast(QuestionAttempt.is_correct, db.Integer)).label('correct')
-        ).join(Question).join(Topic).filter(
-            Topic.course_id == course_id,
-            QuestionAttempt.created_at >= datetime.utcnow() - timedelta(days=30)
-        ).group_by(QuestionAttempt.user_id).having(
-            func.count() >= 10  # Minimum 10 soru
-        ).all()
-        
-        if not all_scores:
-            return {'percentile': 50, 'rank': 1, 'total_students': 1}
+        # Kurs indeksi (Redis ZSET) üzerinden O(log n) konum
+        position = PeerPercentileService.get_position(course_id, user_score)
         
-        scores = [
-            (s.correct / s.total * 100) if s.total > 0 else 0
-            for s in all_scores
-        ]
-        scores.sort()
+        if not position:
+            return {'percentile': 50, 'rank': 1, 'total_students': 1}
         
         # Yüzdelik dilim
-        below = sum(1 for s in scores if s < user_score)
-        percentile = (below / len(scores)) * 100 if scores else 50
+        below = position['below']
+        total = position['total']
+        percentile = (below / total) * 100
         
         # Sıralama
-        rank = len(scores) - below
+        rank = total - below
         
         return {
             'percentile': round(percentile, 1),
             'rank': rank,
-            'total_students': len(scores),
+            'total_students': total,
             'user_score': round(user_score, 1),
-            'average_score': round(statistics.mean(scores), 1) if scores else 0,
-            'top_score': round(max(scores), 1) if scores else 0
+            'average_score': round(position['average'], 1),
+            'top_score': round(position['top'], 1)
         }
     
     @classmethod
@@ -713,64 +713,170 @@ class ReportingService:
     
     @classmethod
     def _get_exam_question_analysis(cls, exam_id: int) -> List[Dict]:
-        """Sınav soru analizi."""
-        from app.models.exam import ExamAnswer, ExamQuestion
-        
-        exam_questions = ExamQuestion.query.filter_by(exam_id=exam_id).all()
-        
+        """
+        Sınav soru (madde) analizi.
+
+        Tüm cevaplar tek bir join sorgusuyla (cevap + girişin toplam puanı)
+        okunur; başarı oranı, üst/alt %27 ayırt edicilik, nokta-çift serili
+        korelasyon ve çeldirici dağılımı bellekte hesaplanır.
+
+        Sonuç, sınavın teslim filigranına (teslim sayısı + son teslim/
+        değerlendirme zamanı) bağlı anahtarla önbelleğe alınır; yeni bir
+        teslim ya da değerlendirme geldiğinde anahtar kendiliğinden değişir.
+        """
+        from app.models.exam import AttemptAnswer, ExamAnswer, ExamQuestion
+
+        statuses = [ExamResultStatus.SUBMITTED, ExamResultStatus.GRADED]
+
+        count, last_submitted, last_graded = db.session.query(
+            func.count(ExamResult.id),
+            func.max(ExamResult.submitted_at),
+            func.max(ExamResult.graded_at)
+        ).filter(
+            ExamResult.exam_id == exam_id,
+            ExamResult.status.in_(statuses)
+        ).one()
+
+        watermark = ':'.join(
+            str(value.timestamp() if value else 0)
+            for value in (last_submitted, last_graded)
+        )
+        cache_key = f"report:exam:{exam_id}:items:{count}:{watermark}"
+        cached = CacheService.get(cache_key)
+        if cached is not None:
+            return cached
+
+        questions = db.session.query(
+            ExamQuestion.id,
+            ExamQuestion.order,
+            ExamQuestion.points,
+            ExamQuestion.question_type
+        ).filter(
+            ExamQuestion.exam_id == exam_id
+        ).order_by(ExamQuestion.order, ExamQuestion.id).all()
+
+        options: Dict[int, List[Any]] = {}
+        for option in db.session.query(
+            ExamAnswer.id, ExamAnswer.question_id, ExamAnswer.is_correct
+        ).join(
+            ExamQuestion, ExamAnswer.question_id == ExamQuestion.id
+        ).filter(
+            ExamQuestion.exam_id == exam_id
+        ).order_by(ExamAnswer.order, ExamAnswer.id):
+            options.setdefault(option.question_id, []).append(option)
+
+        # Soru başına (doğru mu, girişin yüzdesi, seçilen seçenekler)
+        responses: Dict[int, List[tuple]] = {}
+        rows = db.session.query(
+            AttemptAnswer.question_id,
+            AttemptAnswer.is_correct,
+            AttemptAnswer.selected_answer_ids,
+            ExamResult.score,
+            ExamResult.max_score
+        ).join(
+            ExamResult, AttemptAnswer.attempt_id == ExamResult.id
+        ).filter(
+            ExamResult.exam_id == exam_id,
+            ExamResult.status.in_(statuses)
+        )
+        for row in rows:
+            total_score = (row.score or 0) / row.max_score if row.max_score else 0
+            responses.setdefault(row.question_id, []).append(
+                (bool(row.is_correct), total_score, row.selected_answer_ids or [])
+            )
+
         result = []
-        for eq in exam_questions:
-            answers = ExamAnswer.query.filter_by(question_id=eq.question_id).join(
-                ExamResult
-            ).filter(
-                ExamResult.exam_id == exam_id,
-                ExamResult.status.in_([
-                    ExamResultStatus.SUBMITTED.value,
-                    ExamResultStatus.GRADED.value
-                ])
-            ).all()
-            
+        for question in questions:
+            answers = responses.get(question.id, [])
             total = len(answers)
-            correct = sum(1 for a in answers if a.is_correct)
-            
+            correct = sum(1 for is_correct, _, _ in answers if is_correct)
+            pairs = [(is_correct, score) for is_correct, score, _ in answers]
+
             result.append({
-                'question_id': eq.question_id,
-                'order': eq.order_index,
-                'points': eq.effective_points,
+                'question_id': question.id,
+                'order': question.order,
+                'points': question.points,
                 'attempts': total,
                 'correct': correct,
                 'success_rate': round(correct / total * 100, 1) if total > 0 else 0,
-                'discrimination': cls._calculate_discrimination_index(answers) if total >= 10 else None
+                'discrimination': cls._calculate_discrimination_index(pairs) if total >= 10 else None,
+                'point_biserial': cls._calculate_point_biserial(pairs) if total >= 10 else None,
+                'distractors': cls._get_distractor_frequencies(
+                    options.get(question.id, []), answers
+                )
             })
-        
+
+        CacheService.set(cache_key, result, ttl=cls.CACHE_TTL_LONG)
         return result
-    
+
     @classmethod
-    def _calculate_discrimination_index(cls, answers) -> float:
+    def _calculate_discrimination_index(cls, pairs: List[tuple]) -> float:
         """
         Ayırt edicilik indeksi hesaplar.
         Yüksek performanslı ve düşük performanslı gruplar arasındaki fark.
+
+        Args:
+            pairs: (doğru mu, girişin toplam puan oranı) çiftleri
         """
-        # ExamResult'ları skora göre sırala
-        results_with_answers = [
-            (a, a.exam_result.score / a.exam_result.max_score if a.exam_result.max_score > 0 else 0)
-            for a in answers
-        ]
-        results_with_answers.sort(key=lambda x: x[1], reverse=True)
-        
-        n = len(results_with_answers)
+        n = len(pairs)
         if n < 10:
             return 0
-        
-        top_27 = int(n * 0.27) or 1
-        bottom_27 = int(n * 0.27) or 1
-        
-        top_correct = sum(1 for a, _ in results_with_answers[:top_27] if a.is_correct)
-        bottom_correct = sum(1 for a, _ in results_with_answers[-bottom_27:] if a.is_correct)
-        
-        discrimination = (top_correct / top_27) - (bottom_correct / bottom_27)
-        
+
+        ranked = sorted(pairs, key=lambda pair: pair[1], reverse=True)
+        group = int(n * 0.27) or 1
+
+        top_correct = sum(1 for is_correct, _ in ranked[:group] if is_correct)
+        bottom_correct = sum(1 for is_correct, _ in ranked[-group:] if is_correct)
+
+        discrimination = (top_correct / group) - (bottom_correct / group)
+
         return round(discrimination, 2)
+
+    @classmethod
+    def _calculate_point_biserial(cls, pairs: List[tuple]) -> Optional[float]:
+        """
+        Nokta-çift serili korelasyon (maddeyi doğru yapmak ile toplam puan).
+
+        r = (M1 - M0) / s * sqrt(p * q)
+        """
+        n = len(pairs)
+        scores = [score for _, score in pairs]
+        right = [score for is_correct, score in pairs if is_correct]
+        if not n or not right or len(right) == n:
+            return None
+
+        stdev = statistics.pstdev(scores)
+        if stdev == 0:
+            return None
+
+        wrong = [score for is_correct, score in pairs if not is_correct]
+        p = len(right) / n
+        r = (statistics.mean(right) - statistics.mean(wrong)) / stdev * (p * (1 - p)) ** 0.5
+
+        return round(r, 2)
+
+    @classmethod
+    def _get_distractor_frequencies(cls, options: List[Any], answers: List[tuple]) -> List[Dict]:
+        """Seçenek başına seçilme sayısı ve oranı (çeldirici analizi)."""
+        if not options:
+            return []
+
+        counts = {option.id: 0 for option in options}
+        for _, _, selected in answers:
+            for answer_id in selected:
+                if answer_id in counts:
+                    counts[answer_id] += 1
+
+        total = len(answers)
+        return [
+            {
+                'answer_id': option.id,
+                'is_correct': bool(option.is_correct),
+                'count': counts[option.id],
+                'rate': round(counts[option.id] / total * 100, 1) if total else 0
+            }
+            for option in options
+        ]
     
     # =========================================================================
     # Institution Overview
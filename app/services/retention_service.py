@@ -0,0 +1,247 @@
+"""
+Retention Service - Parçalı (chunked) veri saklama işleri.
+
+Log tablolarındaki eski satırlar tek dev DELETE/UPDATE ya da `.all()` ile
+belleğe yükleme yerine birincil anahtar aralıklarında küçük parçalarla işlenir:
+
+- Aralık, koşulu sağlayan satırların MIN(id)/MAX(id) değerlerinden bulunur;
+  her parça `id >= lo AND id < hi AND <koşul>` ile set-based çalışır ve
+  kendi kısa işleminde commit edilir (kilitler ve WAL patlaması kısa kalır).
+- İlerleme JobCheckpoint'te (`retention:<ad>`) parçayla aynı işlemde saklanır;
+  yarıda kalan iş bir sonraki çalıştırmada kaldığı id'den devam eder. Ad,
+  saklama süresini de içerir; farklı koşullu işler checkpoint paylaşmaz.
+  Checkpoint satırı her parça boyunca kilitlenir (FOR UPDATE).
+- Zaman bütçesi dolunca iş durur; PostgreSQL'de replika gecikmesi eşiği
+  aşarsa parçalar arasında beklenir.
+"""
+
+import logging
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from flask import current_app, has_app_context
+from sqlalchemy import and_, func, text
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.audit import JobCheckpoint
+
+logger = logging.getLogger(__name__)
+
+
+class RetentionService:
+    """PK aralığı üzerinde parçalı silme/güncelleme motoru."""
+
+    CHECKPOINT_PREFIX = 'retention:'
+
+    # Varsayılanlar (RETENTION_* config anahtarlarıyla ezilebilir)
+    CHUNK_SIZE = 5000
+    TIME_BUDGET_SECONDS = 300
+    MAX_REPLICA_LAG_SECONDS = 10
+    PAUSE_SECONDS = 0.05
+    LAG_WAIT_SECONDS = 2
+
+    @classmethod
+    def _setting(cls, name: str, default: Any) -> Any:
+        if has_app_context():
+            return current_app.config.get(f'RETENTION_{name}', default)
+        return default
+
+    # =========================================================================
+    # Genel API
+    # =========================================================================
+
+    @classmethod
+    def delete(cls, name: str, model, criteria: Iterable, **options) -> Dict[str, Any]:
+        """Koşulu sağlayan satırları parça parça siler."""
+        table = model.__table__
+
+        def apply(range_clause):
+            return db.session.execute(
+                table.delete().where(range_clause)
+            ).rowcount
+
+        return cls.run(name, model, criteria, apply, **options)
+
+    @classmethod
+    def update(
+        cls,
+        name: str,
+        model,
+        criteria: Iterable,
+        values: Dict[str, Any],
+        **options
+    ) -> Dict[str, Any]:
+        """Koşulu sağlayan satırları parça parça günceller (set-based)."""
+        table = model.__table__
+
+        def apply(range_clause):
+            return db.session.execute(
+                table.update().where(range_clause).values(**values)
+            ).rowcount
+
+        return cls.run(name, model, criteria, apply, **options)
+
+    @classmethod
+    def run(
+        cls,
+        name: str,
+        model,
+        criteria: Iterable,
+        apply_chunk: Callable[[Any], int],
+        chunk_size: int = None,
+        time_budget: float = None,
+        max_replica_lag: float = None
+    ) -> Dict[str, Any]:
+        """
+        Koşulu sağlayan satırları id aralıkları halinde işler.
+
+        Args:
+            name: Checkpoint adı (işe özgü)
+            model: Tek sütunlu tam sayı PK'li model
+            criteria: Saklama koşulları (ör. created_at < cutoff)
+            apply_chunk: Aralık koşulunu alıp etkilenen satır sayısını döndürür
+
+        Returns:
+            affected, chunks, completed, last_id, elapsed_seconds
+        """
+        chunk_size = chunk_size or cls._setting('CHUNK_SIZE', cls.CHUNK_SIZE)
+        time_budget = time_budget or cls._setting('TIME_BUDGET_SECONDS', cls.TIME_BUDGET_SECONDS)
+        if max_replica_lag is None:
+            max_replica_lag = cls._setting('MAX_REPLICA_LAG_SECONDS', cls.MAX_REPLICA_LAG_SECONDS)
+        pause = cls._setting('PAUSE_SECONDS', cls.PAUSE_SECONDS)
+
+        criteria = list(criteria)
+        pk = model.__table__.c.id
+        started = time.monotonic()
+        deadline = started + time_budget
+
+        min_id, max_id = db.session.query(func.min(pk), func.max(pk)).filter(*criteria).one()
+
+        checkpoint_name = cls.CHECKPOINT_PREFIX + name
+        cls._ensure_checkpoint(checkpoint_name)
+
+        affected = 0
+        chunks = 0
+        completed = min_id is None
+        position = None
+
+        while not completed:
+            # Checkpoint satırı parça boyunca kilitli tutulur; aynı işin
+            # beat ve devam (resume) çalıştırmaları aynı aralığı işleyemez
+            checkpoint = cls._lock_checkpoint(checkpoint_name)
+            last_id = checkpoint.last_id or 0
+            if position is not None and last_id < position:
+                # Başka bir çalıştırma turu bitirip checkpoint'i sıfırladı
+                db.session.commit()
+                completed = True
+                break
+
+            lo = max(min_id, last_id)
+            if lo > max_id:
+                # Checkpoint aralığın ötesinde (satırlar başka yoldan
+                # silinmiş olabilir); tur tamamlanmış sayılır
+                completed = True
+                break
+
+            hi = lo + chunk_size
+            affected += apply_chunk(and_(pk >= lo, pk < hi, *criteria)) or 0
+            chunks += 1
+
+            checkpoint.last_id = hi
+            checkpoint.state = {'max_id': max_id, 'affected': affected}
+            db.session.commit()
+            position = hi
+
+            if hi > max_id:
+                completed = True
+                break
+            if not cls._throttle(deadline, max_replica_lag, pause):
+                break
+
+        checkpoint = cls._lock_checkpoint(checkpoint_name)
+        if completed and (position is None or checkpoint.last_id == position):
+            # Tam tur bitti; sonraki çalıştırma baştan tarar
+            checkpoint.last_id = 0
+            checkpoint.state = {'completed_at': datetime.utcnow().isoformat(), 'affected': affected}
+        last_id = checkpoint.last_id
+        db.session.commit()
+
+        result = {
+            'affected': affected,
+            'chunks': chunks,
+            'completed': completed,
+            'last_id': last_id,
+            'elapsed_seconds': round(time.monotonic() - started, 3),
+        }
+        logger.info(f'Retention {name}: {result}')
+        return result
+
+    # =========================================================================
+    # Checkpoint
+    # =========================================================================
+
+    @classmethod
+    def _ensure_checkpoint(cls, checkpoint_name: str) -> None:
+        """Checkpoint satırı yoksa oluşturur (eşzamanlı oluşturmaya dayanıklı)."""
+        if db.session.get(JobCheckpoint, checkpoint_name) is not None:
+            return
+        try:
+            db.session.add(JobCheckpoint(name=checkpoint_name, last_id=0))
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+
+    @classmethod
+    def _lock_checkpoint(cls, checkpoint_name: str) -> JobCheckpoint:
+        """Checkpoint satırını SELECT ... FOR UPDATE ile güncel haliyle okur."""
+        return db.session.query(JobCheckpoint).filter(
+            JobCheckpoint.name == checkpoint_name
+        ).with_for_update().populate_existing().one()
+
+    # =========================================================================
+    # Kısma (throttle)
+    # =========================================================================
+
+    @classmethod
+    def _throttle(cls, deadline: float, max_replica_lag: float, pause: float) -> bool:
+        """
+        Sonraki parçadan önce bekler.
+
+        Returns:
+            bool: Devam edilebilir mi (zaman bütçesi doldu ise False)
+        """
+        if pause:
+            time.sleep(pause)
+
+        if max_replica_lag:
+            lag = cls.replica_lag_seconds()
+            while lag is not None and lag > max_replica_lag:
+                if time.monotonic() + cls.LAG_WAIT_SECONDS >= deadline:
+                    return False
+                logger.info(f'Retention paused: replica lag {lag:.1f}s')
+                time.sleep(cls.LAG_WAIT_SECONDS)
+                lag = cls.replica_lag_seconds()
+
+        return time.monotonic() < deadline
+
+    @classmethod
+    def replica_lag_seconds(cls) -> Optional[float]:
+        """
+        Primary'den görülen en büyük replika gecikmesi (saniye).
+
+        Yalnızca PostgreSQL'de ölçülür; diğer veritabanlarında None döner.
+        """
+        if db.session.get_bind().dialect.name != 'postgresql':
+            return None
+        try:
+            lag = db.session.execute(text(
+                'SELECT EXTRACT(EPOCH FROM MAX(replay_lag)) FROM pg_stat_replication'
+            )).scalar()
+            db.session.commit()
+            return float(lag or 0)
+        except Exception as e:
+            db.session.rollback()
+            logger.warning(f'Replica lag check failed: {e}')
+            return None
@@ -0,0 +1,376 @@
+"""
+Rollup Service - Request log özetleri.
+
+RequestLog tablosunu dakikalık ve saatlik özet satırlarına (RequestRollup)
+artımlı olarak işler. Her satır endpoint + method + status başına
+count/sum/min/max ve sabit sınırlı bir gecikme histogramı tutar; p50/p95/p99
+histogramlar birleştirilerek tahmin edilir.
+
+Artımlılık: en son işlenen RequestLog.id JobCheckpoint'te saklanır. Geç
+commit edilen satırları kaçırmamak için `SAFETY_LAG_SECONDS`'tan yeni bir
+satıra ulaşıldığında o turda durulur. Checkpoint satırı tur boyunca
+kilitlenir (FOR UPDATE); eşzamanlı turlar aynı satırları iki kez saymaz.
+İlk geriye dönük işleme (last_id=0'dan) bitene kadar rollup'lar eksiktir;
+bir tur kuyruğu ilk kez tükettiğinde checkpoint state'ine `backfilled_at`
+yazılır ve okuyucular ancak bundan sonra rollup'lara geçer.
+
+Örnekleme: REQUEST_LOG_SAMPLE_RATE < 1 iken her satır `sample_weight`
+kadar isteği temsil eder; count, sum ve histogram bu ağırlıkla artar
+(kovalar tam sayıya yuvarlanır, min/max örneklenen satırlardandır).
+"""
+
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import tuple_
+from sqlalchemy.exc import IntegrityError
+
+from app.extensions import db
+from app.models.audit import JobCheckpoint, RequestLog, RequestRollup
+
+
+# Histogram üst sınırları (ms); son kova sınırsızdır
+LATENCY_BUCKETS_MS = (
+    5, 10, 25, 50, 75, 100, 150, 200, 300, 500,
+    750, 1000, 1500, 2000, 3000, 5000, 10000,
+)
+
+GRANULARITY_MINUTE = 'minute'
+GRANULARITY_HOUR = 'hour'
+
+RollupKey = Tuple[str, datetime, str, str, int]
+
+
+def empty_histogram() -> List[int]:
+    return [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+
+def bucket_index(duration_ms: float) -> int:
+    """Sürenin düştüğü histogram kovası."""
+    return bisect_left(LATENCY_BUCKETS_MS, duration_ms)
+
+
+def merge_histograms(target: List[int], source: Iterable[int]) -> List[int]:
+    for i, value in enumerate(source):
+        target[i] += value
+    return target
+
+
+def histogram_percentile(
+    histogram: List[int],
+    quantile: float,
+    min_ms: float = None,
+    max_ms: float = None
+) -> Optional[float]:
+    """
+    Histogramdan yüzdelik tahmini (kova içinde doğrusal ara değer).
+
+    Tahmin, bilinen min/max ile sınırlandırılır.
+    """
+    total = sum(histogram)
+    if not total:
+        return None
+
+    rank = quantile * total
+    cumulative = 0
+    for i, count in enumerate(histogram):
+        if not count:
+            continue
+        if cumulative + count >= rank:
+            lower = LATENCY_BUCKETS_MS[i - 1] if i > 0 else 0.0
+            upper = LATENCY_BUCKETS_MS[i] if i < len(LATENCY_BUCKETS_MS) else (max_ms or lower)
+            if min_ms is not None:
+                lower = max(lower, min_ms)
+            if max_ms is not None:
+                upper = min(upper, max_ms)
+            fraction = (rank - cumulative) / count
+            return round(lower + (upper - lower) * fraction, 2)
+        cumulative += count
+
+    return max_ms
+
+
+def truncate(moment: datetime, granularity: str) -> datetime:
+    if granularity == GRANULARITY_HOUR:
+        return moment.replace(minute=0, second=0, microsecond=0)
+    return moment.replace(second=0, microsecond=0)
+
+
+class RequestRollupService:
+    """Request log'larını artımlı özetleyen servis."""
+
+    CHECKPOINT_NAME = 'request_rollups'
+
+    # Bir turda işlenecek en fazla satır
+    BATCH_SIZE = 50000
+
+    # Bu kadar yeni satırlara henüz dokunma (geç commit güvenliği)
+    SAFETY_LAG_SECONDS = 30
+
+    # Dakikalık satırlar kısa, saatlik satırlar uzun saklanır
+    RETENTION = {
+        GRANULARITY_MINUTE: timedelta(days=2),
+        GRANULARITY_HOUR: timedelta(days=90),
+    }
+
+    @classmethod
+    def run(cls, batch_size: int = None, now: datetime = None) -> Dict[str, Any]:
+        """
+        Yeni RequestLog satırlarını rollup tablosuna işler.
+
+        Returns:
+            İşlenen satır sayısı, yeni checkpoint ve güncellenen kova sayısı
+        """
+        now = now or datetime.utcnow()
+        batch_size = batch_size or cls.BATCH_SIZE
+        fresh_after = now - timedelta(seconds=cls.SAFETY_LAG_SECONDS)
+
+        checkpoint = cls._lock_checkpoint()
+
+        rows = db.session.query(
+            RequestLog.id,
+            RequestLog.created_at,
+            RequestLog.endpoint,
+            RequestLog.http_method,
+            RequestLog.status_code,
+            RequestLog.duration_ms,
+            RequestLog.is_slow,
+            RequestLog.sample_weight,
+        ).filter(
+            RequestLog.id > checkpoint.last_id
+        ).order_by(RequestLog.id).limit(batch_size).all()
+
+        aggregates: Dict[RollupKey, Dict[str, Any]] = {}
+        last_id = checkpoint.last_id
+        processed = 0
+
+        for row in rows:
+            if row.created_at >= fresh_after:
+                break
+            for granularity in (GRANULARITY_MINUTE, GRANULARITY_HOUR):
+                key = (
+                    granularity,
+                    truncate(row.created_at, granularity),
+                    row.endpoint,
+                    row.http_method,
+                    row.status_code,
+                )
+                cls._accumulate(
+                    aggregates, key, row.duration_ms, row.is_slow, row.sample_weight
+                )
+            last_id = row.id
+            processed += 1
+
+        if aggregates:
+            cls._merge(aggregates)
+
+        caught_up = processed < batch_size
+        state = checkpoint.state or {}
+        if caught_up and 'backfilled_at' not in state:
+            checkpoint.state = {**state, 'backfilled_at': now.isoformat()}
+
+        checkpoint.last_id = last_id
+        checkpoint.updated_at = now
+        db.session.commit()
+
+        return {
+            'processed': processed,
+            'last_id': last_id,
+            'buckets': len(aggregates),
+            'caught_up': caught_up,
+        }
+
+    @classmethod
+    def _lock_checkpoint(cls) -> JobCheckpoint:
+        """Checkpoint satırını (yoksa oluşturup) SELECT ... FOR UPDATE ile okur."""
+        if db.session.get(JobCheckpoint, cls.CHECKPOINT_NAME) is None:
+            try:
+                db.session.add(JobCheckpoint(name=cls.CHECKPOINT_NAME, last_id=0))
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+
+        return db.session.query(JobCheckpoint).filter(
+            JobCheckpoint.name == cls.CHECKPOINT_NAME
+        ).with_for_update().populate_existing().one()
+
+    @classmethod
+    def _accumulate(
+        cls,
+        aggregates: Dict[RollupKey, Dict[str, Any]],
+        key: RollupKey,
+        duration_ms: float,
+        is_slow: bool,
+        weight: float = 1.0
+    ) -> None:
+        weight = weight or 1.0
+        agg = aggregates.get(key)
+        if agg is None:
+            agg = aggregates[key] = {
+                'count': 0.0, 'sum_ms': 0.0, 'min_ms': duration_ms,
+                'max_ms': duration_ms, 'slow_count': 0.0,
+                'histogram': [0.0] * len(empty_histogram()),
+            }
+        agg['count'] += weight
+        agg['sum_ms'] += duration_ms * weight
+        agg['min_ms'] = min(agg['min_ms'], duration_ms)
+        agg['max_ms'] = max(agg['max_ms'], duration_ms)
+        agg['slow_count'] += weight if is_slow else 0
+        agg['histogram'][bucket_index(duration_ms)] += weight
+
+    @staticmethod
+    def _rounded(agg: Dict[str, Any]) -> Dict[str, Any]:
+        """Ağırlıklı sayaçları tam sayı sütunlara yuvarlar."""
+        return {
+            **agg,
+            'count': int(round(agg['count'])),
+            'slow_count': int(round(agg['slow_count'])),
+            'histogram': [int(round(value)) for value in agg['histogram']],
+        }
+
+    @classmethod
+    def _merge(cls, aggregates: Dict[RollupKey, Dict[str, Any]]) -> None:
+        """Mevcut kovaları tek sorguda okuyup birleştirir, yenileri ekler."""
+        key_columns = (
+            RequestRollup.granularity,
+            RequestRollup.bucket_start,
+            RequestRollup.endpoint,
+            RequestRollup.http_method,
+            RequestRollup.status_code,
+        )
+        keys = list(aggregates)
+        existing = {}
+        for i in range(0, len(keys), 500):
+            chunk = keys[i:i + 500]
+            for rollup in RequestRollup.query.filter(tuple_(*key_columns).in_(chunk)):
+                existing[(
+                    rollup.granularity, rollup.bucket_start, rollup.endpoint,
+                    rollup.http_method, rollup.status_code
+                )] = rollup
+
+        new_rows = []
+        for key, agg in aggregates.items():
+            agg = cls._rounded(agg)
+            rollup = existing.get(key)
+            if rollup is None:
+                granularity, bucket_start, endpoint, http_method, status_code = key
+                new_rows.append({
+                    'granularity': granularity,
+                    'bucket_start': bucket_start,
+                    'endpoint': endpoint,
+                    'http_method': http_method,
+                    'status_code': status_code,
+                    'updated_at': datetime.utcnow(),
+                    **agg,
+                })
+                continue
+
+            rollup.count += agg['count']
+            rollup.sum_ms += agg['sum_ms']
+            rollup.min_ms = min(v for v in (rollup.min_ms, agg['min_ms']) if v is not None)
+            rollup.max_ms = max(v for v in (rollup.max_ms, agg['max_ms']) if v is not None)
+            rollup.slow_count += agg['slow_count']
+            rollup.histogram = merge_histograms(list(rollup.histogram), agg['histogram'])
+
+        if new_rows:
+            db.session.execute(RequestRollup.__table__.insert(), new_rows)
+
+    @classmethod
+    def prune(cls, now: datetime = None) -> Dict[str, int]:
+        """Saklama süresi dolan rollup satırlarını siler."""
+        now = now or datetime.utcnow()
+        deleted = {}
+        for granularity, retention in cls.RETENTION.items():
+            deleted[granularity] = RequestRollup.query.filter(
+                RequestRollup.granularity == granularity,
+                RequestRollup.bucket_start < now - retention
+            ).delete(synchronize_session=False)
+        db.session.commit()
+        return deleted
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """Rollup işi ilk geriye dönük işlemeyi tamamladı mı?"""
+        checkpoint = db.session.get(JobCheckpoint, cls.CHECKPOINT_NAME)
+        return checkpoint is not None and 'backfilled_at' in (checkpoint.state or {})
+
+    @classmethod
+    def get_stats(cls, hours: int = 24, now: datetime = None) -> Dict[str, Any]:
+        """
+        Son X saatin request istatistikleri (rollup'lardan).
+
+        6 saate kadar dakikalık, daha uzun aralıklarda saatlik kovalar okunur.
+        """
+        now = now or datetime.utcnow()
+        granularity = GRANULARITY_MINUTE if hours <= 6 else GRANULARITY_HOUR
+        since = truncate(now - timedelta(hours=hours), granularity)
+
+        rows = db.session.query(
+            RequestRollup.endpoint,
+            RequestRollup.status_code,
+            RequestRollup.count,
+            RequestRollup.sum_ms,
+            RequestRollup.min_ms,
+            RequestRollup.max_ms,
+            RequestRollup.slow_count,
+            RequestRollup.histogram,
+        ).filter(
+            RequestRollup.granularity == granularity,
+            RequestRollup.bucket_start >= since
+        ).all()
+
+        total = 0
+        sum_ms = 0.0
+        min_ms = None
+        max_ms = None
+        slow_count = 0
+        error_count = 0
+        histogram = empty_histogram()
+        status_dist: Dict[str, int] = {}
+        endpoints: Dict[str, List[float]] = {}
+
+        for row in rows:
+            total += row.count
+            sum_ms += row.sum_ms
+            slow_count += row.slow_count
+            if row.min_ms is not None:
+                min_ms = row.min_ms if min_ms is None else min(min_ms, row.min_ms)
+            if row.max_ms is not None:
+                max_ms = row.max_ms if max_ms is None else max(max_ms, row.max_ms)
+            if row.status_code >= 500:
+                error_count += row.count
+            status_dist[str(row.status_code)] = status_dist.get(str(row.status_code), 0) + row.count
+            merge_histograms(histogram, row.histogram)
+
+            endpoint = endpoints.setdefault(row.endpoint, [0.0, 0])
+            endpoint[0] += row.sum_ms
+            endpoint[1] += row.count
+
+        slowest = sorted(
+            (
+                {'endpoint': e, 'avg_duration_ms': round(s / c, 2), 'count': c}
+                for e, (s, c) in endpoints.items() if c
+            ),
+            key=lambda item: item['avg_duration_ms'],
+            reverse=True
+        )[:10]
+
+        return {
+            'period_hours': hours,
+            'total_requests': total,
+            'avg_duration_ms': round(sum_ms / total, 2) if total else 0,
+            'max_duration_ms': round(max_ms or 0, 2),
+            'min_duration_ms': round(min_ms or 0, 2),
+            'p50_duration_ms': histogram_percentile(histogram, 0.50, min_ms, max_ms),
+            'p95_duration_ms': histogram_percentile(histogram, 0.95, min_ms, max_ms),
+            'p99_duration_ms': histogram_percentile(histogram, 0.99, min_ms, max_ms),
+            'slow_request_count': slow_count,
+            'slow_request_rate': round(slow_count / max(total, 1) * 100, 2),
+            'error_count': error_count,
+            'error_rate': round(error_count / max(total, 1) * 100, 2),
+            'status_distribution': status_dist,
+            'slowest_endpoints': slowest,
+            'source': 'rollup',
+            'granularity': granularity,
+        }
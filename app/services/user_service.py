@@ -4,7 +4,9 @@ User Service.
 
 from typing import Optional, List
 from app.extensions import db
+from app.core.pagination import paginate_query
 from app.models.user import User, Role
+from app.services.user_snapshot_service import UserSnapshotService
 
 
 class UserService:
@@ -95,9 +97,9 @@ class UserService:
         
         query = query.order_by(User.created_at.desc())
         
-        pagination = query.paginate(page=page, per_page=per_page, error_out=False)
+        result = paginate_query(query, page, per_page)
         
-        return pagination.items, pagination.total, pagination.pages
+        return result.items, result.total, result.total_pages
     
     def update_user(self, user: User, **kwargs) -> User:
         """Update user attributes."""
@@ -106,6 +108,7 @@ class UserService:
                 setattr(user, key, value)
         
         db.session.commit()
+        UserSnapshotService.invalidate(user.id)
         return user
     
     def change_password(self, user: User, new_password: str) -> User:
@@ -123,6 +126,7 @@ class UserService:
         
         user.role_id = role.id
         db.session.commit()
+        UserSnapshotService.invalidate(user.id)
         
         return user
     
@@ -130,12 +134,14 @@ class UserService:
         """Deactivate user (soft delete)."""
         user.is_active = False
         db.session.commit()
+        UserSnapshotService.invalidate(user.id)
         return user
     
     def activate_user(self, user: User) -> User:
         """Activate user."""
         user.is_active = True
         db.session.commit()
+        UserSnapshotService.invalidate(user.id)
         return user
     
     def get_students_by_teacher(self, teacher_id: int) -> List[User]:
@@ -0,0 +1,182 @@
+"""
+User Snapshot Service.
+
+Kimlik doğrulama yolunda tam ORM `User` yerine kullanılan küçük,
+önbelleklenmiş kullanıcı görüntüsü.
+"""
+
+from typing import Any, Dict, Iterable, Optional
+
+from flask import current_app
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.services.cache_service import CacheService
+
+# Oturumda değişen/silinen kullanıcıların ID'leri (commit sonrası geçersiz kılınır)
+_PENDING_INVALIDATIONS = 'user_snapshot_invalidations'
+
+
+class UserSnapshot:
+    """
+    Yetkilendirme için gereken kullanıcı alanları.
+
+    Salt okunur kabul edilir; güncel ORM nesnesi gerektiğinde
+    `app.core.auth.get_current_user()` kullanılır.
+    """
+
+    __slots__ = (
+        'id', 'role', 'permissions', 'organization_id',
+        'is_active', 'is_verified', 'token_version'
+    )
+
+    def __init__(
+        self,
+        id: int,
+        role: str,
+        permissions: Iterable[str] = (),
+        organization_id: Optional[int] = None,
+        is_active: bool = True,
+        is_verified: bool = False,
+        token_version: int = 0
+    ):
+        self.id = id
+        self.role = role
+        self.permissions = frozenset(permissions)
+        self.organization_id = organization_id
+        self.is_active = is_active
+        self.is_verified = is_verified
+        self.token_version = token_version
+
+    @property
+    def role_name(self) -> str:
+        """`permissions.get_current_user_role` uyumluluğu."""
+        return self.role
+
+    @classmethod
+    def from_user(cls, user, token_version: int = 0) -> 'UserSnapshot':
+        return cls(
+            id=user.id,
+            role=user.role.name if user.role else 'student',
+            permissions=user.get_permissions(),
+            organization_id=user.organization_id,
+            is_active=bool(user.is_active and not user.is_deleted),
+            is_verified=bool(user.is_verified),
+            token_version=token_version
+        )
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'UserSnapshot':
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {name: getattr(self, name) for name in self.__slots__}
+        data['permissions'] = sorted(self.permissions)
+        return data
+
+    def __repr__(self):
+        return f'<UserSnapshot {self.id} {self.role}>'
+
+
+class UserSnapshotService:
+    """
+    Kullanıcı görüntüsü önbelleği (L1 LRU + Redis, kısa TTL).
+
+    ORM üzerinden güncellenen veya silinen her `User` satırının görüntüsü
+    commit sonrası otomatik geçersiz kılınır (deaktivasyon, silme, rol
+    değişikliği hangi servisten yapılırsa yapılsın). ORM dışı toplu
+    UPDATE'lerden sonra `invalidate`, rol yetkileri değiştiğinde
+    `invalidate_all` çağrılmalıdır. Diğer süreçlerin L1 kopyaları en fazla
+    L1 TTL kadar eski kalabilir.
+    """
+
+    KEY = 'user_snapshot:{user_id}'
+    TAG = 'user_snapshots'
+    DEFAULT_TTL = 60
+
+    @classmethod
+    def _key(cls, user_id: int) -> str:
+        return cls.KEY.format(user_id=user_id)
+
+    @classmethod
+    def _ttl(cls) -> int:
+        try:
+            return current_app.config.get('USER_SNAPSHOT_TTL', cls.DEFAULT_TTL)
+        except RuntimeError:
+            return cls.DEFAULT_TTL
+
+    @classmethod
+    def _load(cls, user_id: int) -> Optional[Dict[str, Any]]:
+        from app.models.user import User
+        from app.core.token_blacklist import TokenBlacklistService
+
+        user = db.session.get(User, user_id)
+        if user is None:
+            return None
+
+        snapshot = UserSnapshot.from_user(
+            user, TokenBlacklistService.get_token_version(user_id)
+        )
+        return snapshot.to_dict()
+
+    @classmethod
+    def get(cls, user_id: int) -> Optional[UserSnapshot]:
+        """
+        Kullanıcı görüntüsünü döner (yoksa veritabanından bir kez yükler).
+
+        Returns:
+            UserSnapshot veya kullanıcı yoksa None
+        """
+        try:
+            user_id = int(user_id)
+        except (TypeError, ValueError):
+            return None
+
+        data = CacheService.get_or_set(
+            cls._key(user_id),
+            lambda: cls._load(user_id),
+            ttl=cls._ttl(),
+            tags=[cls.TAG]
+        )
+        return UserSnapshot.from_dict(data) if data else None
+
+    @classmethod
+    def invalidate(cls, user_id: int) -> None:
+        """Tek kullanıcının görüntüsünü siler (güncelleme/deaktivasyon)."""
+        CacheService.delete(cls._key(user_id))
+
+    @classmethod
+    def invalidate_all(cls) -> None:
+        """
+        Tüm görüntüleri geçersiz kılar (rol yetkileri değiştiğinde).
+
+        Tek etiket nesli artırımıdır (O(1)); anahtarlar taranmaz.
+        """
+        CacheService.delete_by_tag(cls.TAG)
+
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changed_users(session, flush_context):
+    from app.models.user import User
+
+    # after_flush'ta dirty/deleted listeleri hâlâ flush öncesi durumu gösterir
+    user_ids = {
+        obj.id for obj in (*session.dirty, *session.deleted)
+        if isinstance(obj, User) and obj.id is not None
+    }
+    if user_ids:
+        session.info.setdefault(_PENDING_INVALIDATIONS, set()).update(user_ids)
+
+
+@event.listens_for(Session, 'after_commit')
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop(_PENDING_INVALIDATIONS, ()):
+        UserSnapshotService.invalidate(user_id)
+
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_changed_users(session, previous_transaction):
+    # Savepoint geri alımları dış işlemin kayıtlarını düşürmez
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_INVALIDATIONS, None)
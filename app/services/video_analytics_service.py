@@ -55,13 +55,22 @@ class VideoAnalyticsService:
     # Redis key prefixes
     PREFIX = 'video_analytics:'
     VIEW_COUNT_KEY = PREFIX + 'views:{video_id}'
-    UNIQUE_VIEWS_KEY = PREFIX + 'unique_views:{video_id}'
+    UNIQUE_VIEWS_KEY = PREFIX + 'unique_hll:{video_id}'  # HyperLogLog
+    # Eski tekil izleyici SET'i; okumada HLL'ye taşınıp silinir
+    LEGACY_UNIQUE_VIEWS_KEY = PREFIX + 'unique_views:{video_id}'
+    LEGACY_MIGRATE_BATCH = 1000
+    # DB'ye yazılmayı bekleyen video ID'leri (ZSET, skor: ilk işaretlenme zamanı)
+    DIRTY_VIDEOS_KEY = PREFIX + 'dirty_since'
     DAILY_VIEWS_KEY = PREFIX + 'daily:{video_id}:{date}'
     HOURLY_VIEWS_KEY = PREFIX + 'hourly:{video_id}:{date}:{hour}'
-    WATCH_SESSION_KEY = PREFIX + 'session:{session_id}'
+    WATCH_SESSION_KEY = PREFIX + 'watch:{session_id}'          # Hash (oturum skalerleri)
+    WATCH_EVENTS_KEY = PREFIX + 'watch_events:{session_id}'    # Stream (olaylar)
     USER_HISTORY_KEY = PREFIX + 'history:{user_id}'
     POPULAR_VIDEOS_KEY = PREFIX + 'popular:{period}'
     REALTIME_VIEWERS_KEY = PREFIX + 'realtime:{video_id}'
+    # Biten oturumların izleme aralıkları (List, birleştirme task'ını bekler)
+    ENGAGEMENT_PENDING_KEY = PREFIX + 'engagement_pending'
+    ENGAGEMENT_KEY = PREFIX + 'engagement:{video_id}'          # Hash (bin sayaçları)
     
     # TTL values
     SESSION_TTL = 3600 * 2      # 2 saat
@@ -70,6 +79,16 @@ class VideoAnalyticsService:
     HISTORY_TTL = 86400 * 30    # 30 gün
     REALTIME_TTL = 60           # 1 dakika
     
+    # Oturum başına tutulan en fazla olay (stream MAXLEN, yaklaşık)
+    SESSION_EVENTS_MAXLEN = 5000
+    
+    # Isı haritası: video süresinin %1'lik bölmeleri
+    ENGAGEMENT_BINS = 100
+    # Bu olaylardan sonra video oynuyor kabul edilir
+    PLAYING_EVENTS = frozenset({'play', 'resume', 'progress', 'seek'})
+    # Ardışık olaylar arası pozisyon artışı bu hızı aşarsa atlama sayılır
+    MAX_PLAYBACK_RATE = 2.0
+    
     @classmethod
     def _get_redis(cls):
         """Redis client döner."""
@@ -99,6 +118,10 @@ class VideoAnalyticsService:
         """
         Video izlenme sayacını artırır.
         
+        Tüm sayaçlar tek bir pipeline ile (tek gidiş-dönüş) güncellenir;
+        video ID'si dirty kümesine eklenir ve DB'ye periyodik
+        `sync_all_to_database` görevi yazar (write-behind).
+        
         Args:
             video_id: Video ID
             user_id: Kullanıcı ID (unique views için)
@@ -113,40 +136,39 @@ class VideoAnalyticsService:
             # Redis yoksa DB'ye doğrudan yaz
             return cls._increment_db_view_count(video_id)
         
-        # Toplam view count
-        view_key = cls.VIEW_COUNT_KEY.format(video_id=video_id)
-        total_views = redis.incr(view_key)
-        
-        # Günlük view count
-        daily_key = cls.DAILY_VIEWS_KEY.format(
-            video_id=video_id,
-            date=cls._get_today()
-        )
-        redis.incr(daily_key)
-        redis.expire(daily_key, cls.DAILY_TTL)
-        
-        # Saatlik view count
+        today = cls._get_today()
+        daily_key = cls.DAILY_VIEWS_KEY.format(video_id=video_id, date=today)
         hourly_key = cls.HOURLY_VIEWS_KEY.format(
             video_id=video_id,
-            date=cls._get_today(),
+            date=today,
             hour=cls._get_current_hour()
         )
-        redis.incr(hourly_key)
-        redis.expire(hourly_key, cls.HOURLY_TTL)
         
-        # Unique views (user bazlı)
-        if user_id and increment_unique:
-            unique_key = cls.UNIQUE_VIEWS_KEY.format(video_id=video_id)
-            redis.sadd(unique_key, user_id)
+        pipe = redis.pipeline(transaction=False)
         
-        # Real-time viewers
-        cls._update_realtime_viewers(video_id, user_id, 'add')
+        # Toplam view count (sonuç listesinde ilk eleman)
+        pipe.incr(cls.VIEW_COUNT_KEY.format(video_id=video_id))
         
-        # Periyodik olarak DB'ye sync et
-        if total_views % 10 == 0:  # Her 10 izlenmede bir
-            cls._sync_to_database(video_id, total_views)
+        # Günlük / saatlik view count
+        pipe.incr(daily_key)
+        pipe.expire(daily_key, cls.DAILY_TTL)
+        pipe.incr(hourly_key)
+        pipe.expire(hourly_key, cls.HOURLY_TTL)
+        
+        if user_id:
+            # Unique views (HyperLogLog: video başına ~12KB, sabit boyut)
+            if increment_unique:
+                pipe.pfadd(cls.UNIQUE_VIEWS_KEY.format(video_id=video_id), user_id)
+            
+            # Real-time viewers
+            realtime_key = cls.REALTIME_VIEWERS_KEY.format(video_id=video_id)
+            pipe.sadd(realtime_key, user_id)
+            pipe.expire(realtime_key, cls.REALTIME_TTL)
         
-        return total_views
+        # DB senkronizasyonu için işaretle (NX: ilk işaretlenme zamanı korunur)
+        pipe.zadd(cls.DIRTY_VIDEOS_KEY, {video_id: time.time()}, nx=True)
+        
+        return int(pipe.execute()[0])
     
     @classmethod
     def get_view_count(cls, video_id: int) -> int:
@@ -172,8 +194,57 @@ class VideoAnalyticsService:
         if not redis:
             return 0
         
+        legacy_key = cls.LEGACY_UNIQUE_VIEWS_KEY.format(video_id=video_id)
+        if redis.exists(legacy_key):
+            cls._migrate_legacy_unique_views(redis, video_id)
+        
+        unique_key = cls.UNIQUE_VIEWS_KEY.format(video_id=video_id)
+        return redis.pfcount(unique_key)
+    
+    @classmethod
+    def _migrate_legacy_unique_views(cls, redis, video_id: int) -> int:
+        """Eski SET üyelerini HLL'ye ekler (PFADD idempotent) ve SET'i siler."""
+        legacy_key = cls.LEGACY_UNIQUE_VIEWS_KEY.format(video_id=video_id)
         unique_key = cls.UNIQUE_VIEWS_KEY.format(video_id=video_id)
-        return redis.scard(unique_key)
+        
+        migrated = 0
+        batch = []
+        for member in redis.sscan_iter(legacy_key, count=cls.LEGACY_MIGRATE_BATCH):
+            batch.append(member)
+            if len(batch) >= cls.LEGACY_MIGRATE_BATCH:
+                redis.pfadd(unique_key, *batch)
+                migrated += len(batch)
+                batch = []
+        if batch:
+            redis.pfadd(unique_key, *batch)
+            migrated += len(batch)
+        
+        redis.delete(legacy_key)
+        return migrated
+    
+    @classmethod
+    def migrate_legacy_unique_views(cls) -> Dict[str, int]:
+        """
+        Tüm eski tekil izleyici SET'lerini HLL'ye taşır (deploy sonrası bir kez).
+        
+        Okuma yolu da taşıma yaptığı için zorunlu değildir; sayaçları okunmayan
+        videoların eski SET'lerini temizler.
+        """
+        redis = cls._get_redis()
+        result = {'videos': 0, 'members': 0}
+        if not redis:
+            return result
+        
+        pattern = cls.LEGACY_UNIQUE_VIEWS_KEY.format(video_id='*')
+        prefix = pattern[:-1]
+        for key in redis.scan_iter(match=pattern, count=cls.LEGACY_MIGRATE_BATCH):
+            try:
+                video_id = int(key[len(prefix):])
+            except ValueError:
+                continue
+            result['members'] += cls._migrate_legacy_unique_views(redis, video_id)
+            result['videos'] += 1
+        return result
     
     @classmethod
     def get_daily_views(cls, video_id: int, days: int = 7) -> Dict[str, int]:
@@ -258,7 +329,7 @@ class VideoAnalyticsService:
         return 0
     
     @classmethod
-    def _sync_to_database(cls, video_id: int, count: int):
+    def _sync_to_database(cls, video_id: int, count: int) -> bool:
         """Redis'teki count'u veritabanına senkronize eder."""
         from app.modules.contents.models import Video
         
@@ -267,9 +338,11 @@ class VideoAnalyticsService:
             if video:
                 video.view_count = count
                 db.session.commit()
+            return True
         except Exception as e:
             db.session.rollback()
             current_app.logger.error(f'View count sync error: {str(e)}')
+            return False
     
     # =========================================================================
     # Watch Session Operations
@@ -285,32 +358,35 @@ class VideoAnalyticsService:
         """
         Yeni izleme oturumu başlatır.
         
+        Oturum skalerleri bir Redis hash'inde tutulur; olaylar ayrı, üst
+        sınırlı bir stream'e yazılır.
+        
         Returns:
             Session ID
         """
         import secrets
         
         session_id = secrets.token_urlsafe(16)
-        now = datetime.utcnow()
-        
-        session_data = {
-            'session_id': session_id,
-            'video_id': video_id,
-            'user_id': user_id,
-            'youtube_video_id': youtube_video_id,
-            'started_at': now.isoformat(),
-            'last_activity': now.isoformat(),
-            'current_position': 0,
-            'total_watched': 0,
-            'is_completed': False,
-            'events': []
-        }
+        now = datetime.utcnow().isoformat()
         
         redis = cls._get_redis()
         
         if redis:
             key = cls.WATCH_SESSION_KEY.format(session_id=session_id)
-            redis.setex(key, cls.SESSION_TTL, json.dumps(session_data))
+            pipe = redis.pipeline(transaction=False)
+            pipe.hset(key, mapping={
+                'session_id': session_id,
+                'video_id': video_id,
+                'user_id': user_id,
+                'youtube_video_id': youtube_video_id or '',
+                'started_at': now,
+                'last_activity': now,
+                'current_position': 0,
+                'total_watched': 0,
+                'is_completed': 0,
+            })
+            pipe.expire(key, cls.SESSION_TTL)
+            pipe.execute()
         
         # İzlenme sayacını artır
         cls.increment_view_count(video_id, user_id)
@@ -328,6 +404,9 @@ class VideoAnalyticsService:
         """
         İzleme oturumunu günceller.
         
+        Her heartbeat O(1): sabit alanlı hash okunur, skalerler HSET/HINCRBY
+        ile güncellenir ve olay MAXLEN'li stream'e eklenir.
+        
         Args:
             session_id: Oturum ID
             position: Video pozisyonu (saniye)
@@ -343,40 +422,51 @@ class VideoAnalyticsService:
             return None
         
         key = cls.WATCH_SESSION_KEY.format(session_id=session_id)
-        session_json = redis.get(key)
+        raw = redis.hgetall(key)
         
-        if not session_json:
+        if not raw:
             return None
         
-        session_data = json.loads(session_json)
+        session_data = cls._decode_session(raw)
         now = datetime.utcnow()
+        position = int(position or 0)
         
         # Pozisyon farkını hesapla (gerçek izleme süresi için)
-        old_position = session_data.get('current_position', 0)
-        if position > old_position:
-            session_data['total_watched'] += (position - old_position)
-        
-        session_data['current_position'] = position
-        session_data['last_activity'] = now.isoformat()
+        watched_delta = max(0, position - session_data['current_position'])
+        is_completed = session_data['is_completed'] or event_type == WatchEventType.COMPLETE
         
-        # Event kaydet
         event = {
-            'type': event_type.value,
-            'position': position,
-            'timestamp': now.isoformat()
+            't': event_type.value,
+            'p': position,
+            'ts': int(now.timestamp() * 1000),
         }
         if extra_data:
-            event['data'] = extra_data
+            event['d'] = json.dumps(extra_data)
         
-        session_data['events'].append(event)
+        events_key = cls.WATCH_EVENTS_KEY.format(session_id=session_id)
+        pipe = redis.pipeline(transaction=False)
+        pipe.hset(key, mapping={
+            'current_position': position,
+            'last_activity': now.isoformat(),
+            'is_completed': int(is_completed),
+        })
+        pipe.hincrby(key, 'total_watched', watched_delta)
+        pipe.expire(key, cls.SESSION_TTL)
+        pipe.xadd(events_key, event, maxlen=cls.SESSION_EVENTS_MAXLEN, approximate=True)
+        pipe.expire(events_key, cls.SESSION_TTL)
+        total_watched = pipe.execute()[1]
+        
+        session_data.update(
+            current_position=position,
+            total_watched=int(total_watched),
+            last_activity=now.isoformat(),
+            is_completed=is_completed,
+        )
         
-        # Tamamlanma kontrolü
-        if event_type == WatchEventType.COMPLETE:
-            session_data['is_completed'] = True
+        # Tamamlanma kontrolü (yalnızca ilk COMPLETE olayında)
+        if event_type == WatchEventType.COMPLETE and raw.get('is_completed') != '1':
             cls._on_video_completed(session_data)
         
-        redis.setex(key, cls.SESSION_TTL, json.dumps(session_data))
-        
         return session_data
     
     @classmethod
@@ -384,8 +474,11 @@ class VideoAnalyticsService:
         """
         İzleme oturumunu sonlandırır.
         
+        Hash ve olay stream'i tek transaction'da okunup silinir; ilerleme
+        ve geçmiş bu toplu veriden yazılır.
+        
         Returns:
-            Final oturum verileri
+            Final oturum verileri (`events` dahil)
         """
         redis = cls._get_redis()
         
@@ -393,12 +486,19 @@ class VideoAnalyticsService:
             return None
         
         key = cls.WATCH_SESSION_KEY.format(session_id=session_id)
-        session_json = redis.get(key)
+        events_key = cls.WATCH_EVENTS_KEY.format(session_id=session_id)
+        
+        pipe = redis.pipeline(transaction=True)
+        pipe.hgetall(key)
+        pipe.xrange(events_key)
+        pipe.delete(key, events_key)
+        raw, entries, _ = pipe.execute()
         
-        if not session_json:
+        if not raw:
             return None
         
-        session_data = json.loads(session_json)
+        session_data = cls._decode_session(raw)
+        session_data['events'] = cls._decode_events(entries)
         
         # Real-time viewers'dan çıkar
         video_id = session_data.get('video_id')
@@ -411,11 +511,99 @@ class VideoAnalyticsService:
         # Kullanıcı geçmişine ekle
         cls._add_to_user_history(session_data)
         
-        # Session'ı sil
-        redis.delete(key)
+        # Isı haritası için izlenen aralıkları kuyruğa al
+        cls._queue_engagement(session_data)
         
         return session_data
     
+    @classmethod
+    def _decode_session(cls, raw: Dict[str, str]) -> Dict[str, Any]:
+        """Redis hash alanlarını oturum sözlüğüne çevirir."""
+        def as_int(value):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return value
+        
+        return {
+            'session_id': raw.get('session_id'),
+            'video_id': as_int(raw.get('video_id')),
+            'user_id': as_int(raw.get('user_id')),
+            'youtube_video_id': raw.get('youtube_video_id', ''),
+            'started_at': raw.get('started_at'),
+            'last_activity': raw.get('last_activity'),
+            'current_position': int(raw.get('current_position') or 0),
+            'total_watched': int(raw.get('total_watched') or 0),
+            'is_completed': raw.get('is_completed') == '1',
+        }
+    
+    @classmethod
+    def _decode_events(cls, entries: List[Tuple[str, Dict[str, str]]]) -> List[Dict]:
+        """Stream kayıtlarını sıralı olay listesine çevirir."""
+        events = []
+        for _, fields in entries or ():
+            event = {
+                'type': fields.get('t'),
+                'position': int(fields.get('p') or 0),
+                'timestamp': datetime.utcfromtimestamp(int(fields.get('ts') or 0) / 1000).isoformat(),
+            }
+            if fields.get('d'):
+                event['data'] = json.loads(fields['d'])
+            events.append(event)
+        return events
+    
+    @classmethod
+    def _watched_segments(cls, events: List[Dict]) -> List[List[int]]:
+        """
+        Olay dizisinden gerçekten oynatılan [başlangıç, bitiş] aralıklarını çıkarır.
+        
+        Oynatma durumundaki bir olaydan sonraki olaya kadar ilerleyen pozisyon
+        izlenmiş sayılır; duraklatma, geri sarma ve oynatma hızını aşan
+        sıçramalar (seek) aralık üretmez.
+        """
+        segments = []
+        previous = None
+        previous_at = None
+        
+        for event in events:
+            try:
+                at = datetime.fromisoformat(event['timestamp'])
+            except (KeyError, TypeError, ValueError):
+                at = None
+            
+            if (
+                previous is not None
+                and previous['type'] in cls.PLAYING_EVENTS
+                and event['type'] != WatchEventType.SEEK.value
+            ):
+                start, end = previous['position'], event['position']
+                elapsed = (at - previous_at).total_seconds() if at and previous_at else None
+                if end > start and (elapsed is None or end - start <= elapsed * cls.MAX_PLAYBACK_RATE + 5):
+                    if segments and segments[-1][1] == start:
+                        segments[-1][1] = end
+                    else:
+                        segments.append([start, end])
+            
+            previous, previous_at = event, at
+        
+        return segments
+    
+    @classmethod
+    def _queue_engagement(cls, session_data: Dict) -> None:
+        """Biten oturumun özetini ısı haritası kuyruğuna ekler (ham olaylar değil)."""
+        redis = cls._get_redis()
+        events = session_data.get('events') or []
+        
+        if not redis or not events:
+            return
+        
+        redis.rpush(cls.ENGAGEMENT_PENDING_KEY, json.dumps({
+            'v': session_data.get('video_id'),
+            's': cls._watched_segments(events),
+            'e': events[-1]['position'],
+            'c': int(bool(session_data.get('is_completed'))),
+        }))
+    
     @classmethod
     def _on_video_completed(cls, session_data: Dict):
         """Video tamamlandığında çağrılır."""
@@ -460,7 +648,8 @@ class VideoAnalyticsService:
                 user_id=user_id,
                 video_id=video_id,
                 position=position,
-                progress_percentage=progress
+                progress_percentage=progress,
+                force=True
             )
         except Exception as e:
             current_app.logger.error(f'Progress save error: {str(e)}')
@@ -500,9 +689,171 @@ class VideoAnalyticsService:
             'unique_views': cls.get_unique_view_count(video_id),
             'realtime_viewers': cls.get_realtime_viewers(video_id),
             'daily_views': cls.get_daily_views(video_id, 7),
-            'hourly_views': cls.get_hourly_views(video_id)
+            'hourly_views': cls.get_hourly_views(video_id),
+            'engagement': cls.get_retention_curve(video_id)
+        }
+    
+    @classmethod
+    def get_retention_curve(cls, video_id: int) -> Dict[str, Any]:
+        """
+        Videonun birleştirilmiş ısı haritası ve izleyici tutma eğrisi.
+        
+        Tek HGETALL; ham olaylar okunmaz.
+        
+        Returns:
+            sessions, completions, heatmap (bin başına izleyen oturum),
+            retention (heatmap / sessions), drop_offs (bin başına ayrılma)
+        """
+        redis = cls._get_redis()
+        raw = redis.hgetall(cls.ENGAGEMENT_KEY.format(video_id=video_id)) if redis else {}
+        
+        bins = int(raw.get('bins') or cls.ENGAGEMENT_BINS)
+        sessions = int(raw.get('sessions') or 0)
+        heatmap = [int(raw.get(f'w:{i}') or 0) for i in range(bins)]
+        
+        return {
+            'bins': bins,
+            'sessions': sessions,
+            'completions': int(raw.get('completions') or 0),
+            'heatmap': heatmap,
+            'retention': [round(count / sessions, 4) if sessions else 0.0 for count in heatmap],
+            'drop_offs': [int(raw.get(f'd:{i}') or 0) for i in range(bins)],
         }
     
+    @classmethod
+    def _bin_session(
+        cls,
+        entry: Dict[str, Any],
+        duration: int,
+        watched: List[int],
+        drops: List[int]
+    ) -> None:
+        """Tek oturumu bin dizilerine ekler (her bin oturum başına en fazla bir kez)."""
+        bins = len(watched)
+        
+        def to_bin(position):
+            return min(bins - 1, max(0, int(position * bins / duration)))
+        
+        covered = bytearray(bins)
+        for start, end in entry.get('s') or ():
+            for i in range(to_bin(start), to_bin(end) + 1):
+                covered[i] = 1
+        for i in range(bins):
+            watched[i] += covered[i]
+        
+        if not entry.get('c'):
+            drops[to_bin(entry.get('e') or 0)] += 1
+    
+    @classmethod
+    def merge_engagement(cls, batch_size: int = 1000, max_batches: int = None) -> Dict[str, Any]:
+        """
+        Kuyruktaki oturum özetlerini video ısı haritalarına birleştirir.
+        
+        Her batch: kuyruktan tek transaction'da alınır, video süreleri tek
+        sorguyla okunur, bin sayaçları bellekte toplanır ve sıfır olmayan
+        binler tek pipeline'da HINCRBY ile eklenir (eşzamanlı
+        birleştirmeler birbirini ezmez). DB okuması dahil herhangi bir adımda
+        hata olursa batch kuyruğa geri konur.
+        
+        Returns:
+            sessions, videos, skipped (süresi bilinmeyen), batches, duration_ms
+        """
+        redis = cls._get_redis()
+        result = {'sessions': 0, 'videos': 0, 'skipped': 0, 'batches': 0, 'duration_ms': 0.0}
+        
+        if not redis:
+            return result
+        
+        started = time.perf_counter()
+        while max_batches is None or result['batches'] < max_batches:
+            pipe = redis.pipeline(transaction=True)
+            pipe.lrange(cls.ENGAGEMENT_PENDING_KEY, 0, batch_size - 1)
+            pipe.ltrim(cls.ENGAGEMENT_PENDING_KEY, batch_size, -1)
+            items = pipe.execute()[0]
+            if not items:
+                break
+            
+            # Batch kuyruktan alındı; DB okuması, binleme veya yazma
+            # başarısız olursa tamamı geri konur (hiçbir oturum kaybolmaz)
+            try:
+                aggregates, skipped = cls._merge_engagement_batch(redis, items)
+            except Exception as e:
+                db.session.rollback()
+                redis.rpush(cls.ENGAGEMENT_PENDING_KEY, *items)
+                current_app.logger.error(f'Engagement merge error: {str(e)}')
+                break
+            
+            result['skipped'] += skipped
+            result['batches'] += 1
+            result['sessions'] += sum(a['sessions'] for a in aggregates.values())
+            result['videos'] += len(aggregates)
+            
+            if len(items) < batch_size:
+                break
+        
+        result['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+    
+    @classmethod
+    def _merge_engagement_batch(cls, redis, items: List[str]):
+        """
+        Bir batch'i video başına bin sayaçlarına toplar ve tek MULTI ile yazar.
+        
+        Returns:
+            (video_id -> özet, süresi bilinmeyen oturum sayısı)
+        """
+        from app.modules.contents.models import Video
+        
+        entries = []
+        for item in items:
+            try:
+                entry = json.loads(item)
+                entry['v'] = int(entry['v'])
+            except (TypeError, ValueError, KeyError):
+                continue
+            entries.append(entry)
+        
+        durations = dict(
+            db.session.query(Video.id, Video.duration)
+            .filter(Video.id.in_({entry['v'] for entry in entries}))
+            .all()
+        )
+        
+        aggregates = {}
+        skipped = 0
+        for entry in entries:
+            duration = durations.get(entry['v'])
+            if not duration:
+                skipped += 1
+                continue
+            
+            aggregate = aggregates.setdefault(entry['v'], {
+                'sessions': 0,
+                'completions': 0,
+                'watched': [0] * cls.ENGAGEMENT_BINS,
+                'drops': [0] * cls.ENGAGEMENT_BINS,
+            })
+            aggregate['sessions'] += 1
+            aggregate['completions'] += int(bool(entry.get('c')))
+            cls._bin_session(entry, duration, aggregate['watched'], aggregate['drops'])
+        
+        # MULTI: batch ya tamamen eklenir ya hiç (geri koymada çift sayım olmaz)
+        pipe = redis.pipeline(transaction=True)
+        for video_id, aggregate in aggregates.items():
+            key = cls.ENGAGEMENT_KEY.format(video_id=video_id)
+            pipe.hset(key, mapping={'bins': cls.ENGAGEMENT_BINS})
+            pipe.hincrby(key, 'sessions', aggregate['sessions'])
+            if aggregate['completions']:
+                pipe.hincrby(key, 'completions', aggregate['completions'])
+            for i, count in enumerate(aggregate['watched']):
+                if count:
+                    pipe.hincrby(key, f'w:{i}', count)
+            for i, count in enumerate(aggregate['drops']):
+                if count:
+                    pipe.hincrby(key, f'd:{i}', count)
+        pipe.execute()
+        return aggregates, skipped
+    
     @classmethod
     def get_user_watch_history(
         cls,
@@ -556,21 +907,101 @@ class VideoAnalyticsService:
         ]
     
     @classmethod
-    def sync_all_to_database(cls):
-        """Tüm Redis view count'larını DB'ye senkronize eder."""
+    def sync_all_to_database(cls, batch_size: int = 500, max_batches: int = None) -> Dict[str, Any]:
+        """
+        Dirty videoların Redis sayaçlarını toplu olarak DB'ye yazar.
+        
+        Her batch: ZPOPMIN ile en eski işaretlenen ID'ler alınır, sayaçlar
+        tek MGET ile okunur ve tek bir toplu UPDATE ile yazılır
+        (PostgreSQL'de UPDATE ... FROM (VALUES ...)). Yazılamayan batch
+        ilk işaretlenme zamanıyla kümeye geri konur.
+        
+        Returns:
+            synced, batches (batch başına süreler), max_lag_seconds
+            (en eski bekleyen artışın yaşı), duration_ms
+        """
         redis = cls._get_redis()
+        result = {'synced': 0, 'batches': [], 'max_lag_seconds': 0.0, 'duration_ms': 0.0}
         
         if not redis:
-            return
-        
-        # Tüm view count anahtarlarını bul
-        pattern = cls.VIEW_COUNT_KEY.format(video_id='*')
-        keys = redis.keys(pattern)
+            return result
         
-        for key in keys:
+        started = time.perf_counter()
+        while max_batches is None or len(result['batches']) < max_batches:
+            batch_started = time.perf_counter()
+            popped = redis.zpopmin(cls.DIRTY_VIDEOS_KEY, batch_size)
+            if not popped:
+                break
+            
+            now = time.time()
+            video_ids = [member for member, _ in popped]
             try:
-                video_id = int(key.split(':')[-1])
-                count = int(redis.get(key) or 0)
-                cls._sync_to_database(video_id, count)
+                counts = redis.mget([cls.VIEW_COUNT_KEY.format(video_id=v) for v in video_ids])
+                mget_done = time.perf_counter()
+                
+                rows = [
+                    {'video_id': int(video_id), 'view_count': int(count)}
+                    for video_id, count in zip(video_ids, counts)
+                    if count is not None
+                ]
+                cls._bulk_update_view_counts(rows)
             except Exception as e:
-                current_app.logger.error(f'Sync error for {key}: {str(e)}')
+                db.session.rollback()
+                # İlk işaretlenme zamanı korunur (gecikme ölçümü doğru kalır)
+                redis.zadd(cls.DIRTY_VIDEOS_KEY, dict(popped))
+                current_app.logger.error(f'View count bulk sync error: {str(e)}')
+                break
+            
+            batch_done = time.perf_counter()
+            lag = max(now - score for _, score in popped)
+            result['synced'] += len(rows)
+            result['max_lag_seconds'] = round(max(result['max_lag_seconds'], lag), 3)
+            result['batches'].append({
+                'size': len(rows),
+                'mget_ms': round((mget_done - batch_started) * 1000, 2),
+                'update_ms': round((batch_done - mget_done) * 1000, 2),
+                'duration_ms': round((batch_done - batch_started) * 1000, 2),
+                'lag_seconds': round(lag, 3),
+            })
+            
+            if len(popped) < batch_size:
+                break
+        
+        result['duration_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return result
+    
+    @classmethod
+    def _bulk_update_view_counts(cls, rows: List[Dict[str, int]]) -> None:
+        """video_id -> view_count satırlarını tek deyimle yazar."""
+        if not rows:
+            return
+        
+        from app.modules.contents.models import Video
+        
+        if db.session.get_bind().dialect.name == 'postgresql':
+            values = ', '.join(
+                f'(:id_{i}, :count_{i})' for i in range(len(rows))
+            )
+            params = {}
+            for i, row in enumerate(rows):
+                params[f'id_{i}'] = row['video_id']
+                params[f'count_{i}'] = row['view_count']
+            db.session.execute(
+                db.text(
+                    f'UPDATE {Video.__tablename__} AS v '
+                    f'SET view_count = data.view_count '
+                    f'FROM (VALUES {values}) AS data (id, view_count) '
+                    f'WHERE v.id = data.id'
+                ),
+                params
+            )
+        else:
+            # Diğer veritabanları: tek executemany
+            db.session.execute(
+                db.text(
+                    f'UPDATE {Video.__tablename__} SET view_count = :view_count '
+                    f'WHERE id = :video_id'
+                ),
+                rows
+            )
+        db.session.commit()
@@ -43,3 +43,4 @@ from app.tasks.email_tasks import *
 from app.tasks.video_tasks import *
 from app.tasks.report_tasks import *
 from app.tasks.ai_tasks import *
+from app.tasks.notification_tasks import *
@@ -48,6 +48,7 @@ def process_ai_request(
     from app.modules.ai.providers import provider_factory
     from app.modules.ai.quota import RedisQuotaManager
     from app.modules.ai.prompts import prompt_manager
+    from app.services.cache_service import CacheService
     
     start_time = time.time()
     
@@ -86,8 +87,8 @@ def process_ai_request(
         provider = provider_factory.get_default()
         response = provider.complete(ai_request)
         
-        # Kota tüket
-        quota_manager = RedisQuotaManager()
+        # Kota tüket (toplu işlemdeki paralel istekler aynı Redis sayaçlarını artırır)
+        quota_manager = RedisQuotaManager(CacheService._redis)
         quota_manager.consume_quota(user_id, ai_feature, response.tokens_used)
         
         processing_time = int((time.time() - start_time) * 1000)
@@ -116,6 +117,31 @@ def process_ai_request(
         }
 
 
+def _batch_settings() -> Dict[str, int]:
+    """Toplu işleme paralellik ve sağlayıcı hız limiti ayarları."""
+    from flask import current_app, has_app_context
+    
+    config = current_app.config if has_app_context() else {}
+    return {
+        'concurrency': int(config.get('AI_BATCH_CONCURRENCY', 4)),
+        'provider_rpm': int(config.get('AI_PROVIDER_MAX_RPM', 60)),
+    }
+
+
+def _acquire_provider_slot(limiter, provider_rpm: int) -> None:
+    """Sağlayıcı dakikalık limitine göre sıradaki isteğe izin çıkana kadar bekle."""
+    from app.utils.rate_limiter import RateLimit
+    
+    if provider_rpm <= 0:
+        return
+    limit = [RateLimit('rate:ai_provider:batch', provider_rpm, 60)]
+    while True:
+        allowed, decisions = limiter.check(limit)
+        if allowed:
+            return
+        time.sleep(max(decisions[0].retry_after or 1, 0.05))
+
+
 @shared_task(
     bind=True,
     name='ai.batch_process',
@@ -125,53 +151,123 @@ def batch_process_ai_requests(
     self,
     requests: list[Dict[str, Any]],
     user_id: int,
-    role: str
+    role: str,
+    concurrency: Optional[int] = None
 ) -> Dict[str, Any]:
     """
     Birden fazla AI isteğini toplu işle.
     
+    İstekler worker içinde sınırlı bir thread havuzunda paralel işlenir;
+    toplam süre en yavaş isteklerin süresine yaklaşır. Yeni istekler
+    sağlayıcı dakikalık limitine (AI_PROVIDER_MAX_RPM) göre gönderilir ve
+    kullanıcının kotası dolduğunda sağlayıcıya gitmeden başarısız sayılır.
+    Kota tüketimi her istekte process_ai_request içinde yapılır.
+    
     Args:
         requests: İstek listesi
         user_id: Kullanıcı ID
         role: Kullanıcı rolü
+        concurrency: Eşzamanlı istek sayısı (None ise AI_BATCH_CONCURRENCY; 1 = sıralı)
         
     Returns:
-        Toplu sonuçlar
+        Toplu sonuçlar (istek sırasıyla)
     """
-    results = []
-    total_tokens = 0
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+    from flask import current_app, has_app_context
+    from app.modules.ai.core import AIFeature
+    from app.modules.ai.quota import RedisQuotaManager
+    from app.services.cache_service import CacheService
+    from app.utils.rate_limiter import GCRALimiter
+    
+    settings = _batch_settings()
+    concurrency = max(1, min(concurrency or settings['concurrency'], len(requests) or 1))
+    app = current_app._get_current_object() if has_app_context() else None
+    limiter = GCRALimiter(lambda: CacheService._redis)
+    quota_manager = RedisQuotaManager(CacheService._redis)
+    # Proxy thread'lerde farklı Celery app'e çözülebilir; görevi burada sabitle
+    process_task = self.app.tasks[process_ai_request.name]
+    total = len(requests)
+    
+    def run_one(req: Dict[str, Any]) -> Dict[str, Any]:
+        args = [
+            user_id,
+            req.get('feature'),
+            req.get('prompt'),
+            req.get('context', {}),
+            role,
+            req.get('request_id')
+        ]
+        if app is None:
+            return process_task.apply(args=args).get()
+        with app.app_context():
+            return process_task.apply(args=args).get()
     
-    for i, req in enumerate(requests):
+    def quota_error(req: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        try:
+            allowed, message = quota_manager.check_quota(
+                user_id, AIFeature(req.get('feature')), 0, role
+            )
+        except ValueError as e:
+            allowed, message = False, str(e)
+        if allowed:
+            return None
+        return {
+            'success': False,
+            'error': message,
+            'feature': req.get('feature'),
+            'request_id': req.get('request_id'),
+            'failed_at': datetime.utcnow().isoformat()
+        }
+    
+    results: list = [None] * total
+    done = 0
+    
+    def report_progress():
         self.update_state(
             state='PROGRESS',
             meta={
-                'current': i + 1,
-                'total': len(requests),
-                'status': f'Processing request {i + 1}/{len(requests)}'
+                'current': done,
+                'total': total,
+                'status': f'Processed {done}/{total} requests'
             }
         )
+    
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix='ai-batch') as pool:
+        pending = {}
+        for i, req in enumerate(requests):
+            # Havuz doluysa bir isteğin bitmesini bekle
+            while len(pending) >= concurrency:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    results[pending.pop(future)] = future.result()
+                    done += 1
+                report_progress()
+            
+            error = quota_error(req)
+            if error is not None:
+                results[i] = error
+                done += 1
+                continue
+            
+            _acquire_provider_slot(limiter, settings['provider_rpm'])
+            pending[pool.submit(run_one, req)] = i
         
-        result = process_ai_request.apply(
-            args=[
-                user_id,
-                req.get('feature'),
-                req.get('prompt'),
-                req.get('context', {}),
-                role,
-                req.get('request_id')
-            ]
-        ).get()
-        
-        results.append(result)
-        if result.get('success'):
-            total_tokens += result.get('tokens_used', 0)
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results[pending.pop(future)] = future.result()
+                done += 1
+            report_progress()
+    
+    total_tokens = sum(r.get('tokens_used', 0) for r in results if r.get('success'))
     
     return {
         'success': True,
-        'total_requests': len(requests),
+        'total_requests': total,
         'successful': sum(1 for r in results if r.get('success')),
         'failed': sum(1 for r in results if not r.get('success')),
         'total_tokens': total_tokens,
+        'concurrency': concurrency,
         'results': results,
         'completed_at': datetime.utcnow().isoformat()
     }
@@ -248,13 +344,16 @@ def generate_daily_ai_report(date: Optional[str] = None) -> Dict[str, Any]:
 
 
 @shared_task(
+    bind=True,
     name='ai.cleanup_old_logs',
     ignore_result=True
 )
-def cleanup_old_ai_logs(days: int = 90) -> Dict[str, Any]:
+def cleanup_old_ai_logs(self, days: int = 90) -> Dict[str, Any]:
     """
     Eski AI log kayıtlarını temizle.
     
+    Zaman bütçesi dolarsa checkpoint'ten devam etmek üzere yeniden kuyruğa alınır.
+    
     Args:
         days: Kaç günden eski loglar silinsin
         
@@ -262,20 +361,21 @@ def cleanup_old_ai_logs(days: int = 90) -> Dict[str, Any]:
         Temizlik sonucu
     """
     from app.models.ai import AIUsageLog
+    from app.services.retention_service import RetentionService
     from datetime import timedelta
     
     cutoff_date = datetime.utcnow() - timedelta(days=days)
     
-    with db.session() as session:
-        deleted_count = session.query(AIUsageLog).filter(
-            AIUsageLog.created_at < cutoff_date
-        ).delete(synchronize_session=False)
-        
-        session.commit()
+    result = RetentionService.delete(
+        f'ai_usage_logs:delete:older_than_{days}d', AIUsageLog, [AIUsageLog.created_at < cutoff_date]
+    )
+    if not result['completed']:
+        self.apply_async(kwargs={'days': days}, countdown=60)
     
     return {
         'success': True,
-        'deleted_count': deleted_count,
+        'deleted_count': result['affected'],
+        'completed': result['completed'],
         'cutoff_date': cutoff_date.isoformat(),
         'cleaned_at': datetime.utcnow().isoformat()
     }
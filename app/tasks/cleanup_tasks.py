@@ -285,28 +285,17 @@ def cleanup_old_ai_usage_logs(self, retention_days: int = 365):
     try:
         from app.models.ai import AIUsageLog
         from app.models.ai_chat import AIDataRetentionLog
+        from app.services.retention_service import RetentionService
         
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
-        # Eski logları bul
-        old_logs = AIUsageLog.query.filter(
-            AIUsageLog.created_at < cutoff_date
-        ).all()
-        
-        anonymized_count = 0
-        for log in old_logs:
-            # Request data'yı temizle (PII içerebilir)
-            if log.request_data:
-                log.request_data = {
-                    'anonymized': True,
-                    'original_keys': list(log.request_data.keys()) if isinstance(log.request_data, dict) else []
-                }
-            
-            # Response summary'yi kısalt
-            if log.response_summary and len(log.response_summary) > 50:
-                log.response_summary = f"[Anonimleştirildi - {len(log.response_summary)} karakter]"
-            
-            anonymized_count += 1
+        result = RetentionService.run(
+            f'ai_usage_logs:anonymize:older_than_{retention_days}d',
+            AIUsageLog,
+            [AIUsageLog.created_at < cutoff_date],
+            _anonymize_ai_usage_chunk
+        )
+        anonymized_count = result['affected']
         
         # Loglama
         if anonymized_count > 0:
@@ -316,11 +305,12 @@ def cleanup_old_ai_usage_logs(self, retention_days: int = 365):
                 legal_basis=f'KVKK - {retention_days} günlük log saklama süresi'
             )
         
-        db.session.commit()
+        _resume_if_incomplete(self, result, retention_days=retention_days)
         
         return {
             'success': True,
             'anonymized_logs': anonymized_count,
+            'completed': result['completed'],
             'retention_days': retention_days,
             'executed_at': datetime.utcnow().isoformat()
         }
@@ -333,6 +323,72 @@ def cleanup_old_ai_usage_logs(self, retention_days: int = 365):
         }
 
 
+def _anonymize_ai_usage_chunk(range_clause) -> int:
+    """
+    Bir id aralığındaki AI kullanım loglarını anonimleştirir.
+    
+    Yalnızca id, request_data ve response_summary uzunluğu okunur; request_data
+    tek executemany, response_summary tek set-based UPDATE ile yazılır.
+    Daha önce anonimleştirilmiş satırlar atlanır.
+    
+    - request_data içindeki PII temizlenir (yalnızca anahtar listesi kalır)
+    - response_summary kısaltılır
+    """
+    from sqlalchemy import String, bindparam, cast
+    from app.models.ai import AIUsageLog
+    
+    table = AIUsageLog.__table__
+    rows = db.session.execute(
+        db.select(
+            table.c.id,
+            table.c.request_data,
+            db.func.length(table.c.response_summary)
+        ).where(range_clause)
+    ).all()
+    
+    affected = set()
+    updates = []
+    for row_id, data, summary_length in rows:
+        if data and not (isinstance(data, dict) and data.get('anonymized')):
+            updates.append({
+                'row_id': row_id,
+                'anonymized_data': {
+                    'anonymized': True,
+                    'original_keys': list(data.keys()) if isinstance(data, dict) else []
+                }
+            })
+            affected.add(row_id)
+        if summary_length and summary_length > 50:
+            affected.add(row_id)
+    
+    if updates:
+        db.session.execute(
+            table.update().where(
+                table.c.id == bindparam('row_id')
+            ).values(request_data=bindparam('anonymized_data')),
+            updates
+        )
+    
+    # Response summary'yi kısalt (set-based)
+    summary_length = db.func.length(table.c.response_summary)
+    db.session.execute(
+        table.update().where(
+            range_clause,
+            summary_length > 50
+        ).values(
+            response_summary='[Anonimleştirildi - ' + cast(summary_length, String) + ' karakter]'
+        )
+    )
+    
+    return len(affected)
+
+
+def _resume_if_incomplete(task, result, **kwargs):
+    """Zaman bütçesi dolan temizlik işini checkpoint'ten devam etmek üzere yeniden kuyruğa alır."""
+    if not result['completed']:
+        task.apply_async(kwargs=kwargs, countdown=60)
+
+
 @shared_task(bind=True)
 def generate_ai_usage_report(self, period: str = 'daily'):
     """
@@ -436,18 +492,23 @@ def cleanup_old_request_logs(self, retention_days: int = 30):
     """
     try:
         from app.models.audit import RequestLog
+        from app.services.partition_service import PartitionService
+        from app.services.retention_service import RetentionService
         
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
-        deleted = RequestLog.query.filter(
-            RequestLog.created_at < cutoff_date
-        ).delete(synchronize_session=False)
-        
-        db.session.commit()
+        # Bölümlü tabloda tamamen eski bölümler tek DROP ile gider
+        dropped = PartitionService.drop_before(RequestLog.__tablename__, cutoff_date)
+        result = RetentionService.delete(
+            f'request_logs:older_than_{retention_days}d', RequestLog, [RequestLog.created_at < cutoff_date]
+        )
+        _resume_if_incomplete(self, result, retention_days=retention_days)
         
         return {
             'success': True,
-            'deleted_request_logs': deleted,
+            'deleted_request_logs': result['affected'],
+            'dropped_partitions': dropped,
+            'completed': result['completed'],
             'retention_days': retention_days,
             'executed_at': datetime.utcnow().isoformat()
         }
@@ -472,18 +533,23 @@ def cleanup_old_performance_metrics(self, retention_days: int = 90):
     """
     try:
         from app.models.audit import PerformanceMetric
+        from app.services.partition_service import PartitionService
+        from app.services.retention_service import RetentionService
         
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
-        deleted = PerformanceMetric.query.filter(
-            PerformanceMetric.created_at < cutoff_date
-        ).delete(synchronize_session=False)
-        
-        db.session.commit()
+        dropped = PartitionService.drop_before(PerformanceMetric.__tablename__, cutoff_date)
+        result = RetentionService.delete(
+            f'performance_metrics:older_than_{retention_days}d', PerformanceMetric,
+            [PerformanceMetric.created_at < cutoff_date]
+        )
+        _resume_if_incomplete(self, result, retention_days=retention_days)
         
         return {
             'success': True,
-            'deleted_performance_metrics': deleted,
+            'deleted_performance_metrics': result['affected'],
+            'dropped_partitions': dropped,
+            'completed': result['completed'],
             'retention_days': retention_days,
             'executed_at': datetime.utcnow().isoformat()
         }
@@ -507,19 +573,22 @@ def cleanup_resolved_errors(self, days_after_resolution: int = 60):
     """
     try:
         from app.models.audit import ErrorLog
+        from app.services.retention_service import RetentionService
         
         cutoff_date = datetime.utcnow() - timedelta(days=days_after_resolution)
         
-        deleted = ErrorLog.query.filter(
-            ErrorLog.is_resolved == True,
-            ErrorLog.resolved_at < cutoff_date
-        ).delete(synchronize_session=False)
-        
-        db.session.commit()
+        result = RetentionService.delete(
+            f'error_logs:resolved_{days_after_resolution}d', ErrorLog, [
+                ErrorLog.is_resolved == True,
+                ErrorLog.resolved_at < cutoff_date
+            ]
+        )
+        _resume_if_incomplete(self, result, days_after_resolution=days_after_resolution)
         
         return {
             'success': True,
-            'deleted_error_logs': deleted,
+            'deleted_error_logs': result['affected'],
+            'completed': result['completed'],
             'days_after_resolution': days_after_resolution,
             'executed_at': datetime.utcnow().isoformat()
         }
@@ -544,6 +613,7 @@ def cleanup_resolved_security_events(self, days_after_resolution: int = 90):
     """
     try:
         from app.models.audit import SecurityEvent, SecuritySeverity
+        from app.services.retention_service import RetentionService
         
         # Normal olaylar için cutoff
         normal_cutoff = datetime.utcnow() - timedelta(days=days_after_resolution)
@@ -551,25 +621,33 @@ def cleanup_resolved_security_events(self, days_after_resolution: int = 90):
         critical_cutoff = datetime.utcnow() - timedelta(days=days_after_resolution * 2)
         
         # Normal severity olayları sil
-        deleted_normal = SecurityEvent.query.filter(
-            SecurityEvent.is_resolved == True,
-            SecurityEvent.resolved_at < normal_cutoff,
-            SecurityEvent.severity.notin_([SecuritySeverity.HIGH, SecuritySeverity.CRITICAL])
-        ).delete(synchronize_session=False)
+        normal = RetentionService.delete(
+            f'security_events:normal:resolved_{days_after_resolution}d', SecurityEvent, [
+                SecurityEvent.is_resolved == True,
+                SecurityEvent.resolved_at < normal_cutoff,
+                SecurityEvent.severity.notin_([SecuritySeverity.HIGH, SecuritySeverity.CRITICAL])
+            ]
+        )
         
         # Kritik olayları sil (daha uzun saklama sonrası)
-        deleted_critical = SecurityEvent.query.filter(
-            SecurityEvent.is_resolved == True,
-            SecurityEvent.resolved_at < critical_cutoff,
-            SecurityEvent.severity.in_([SecuritySeverity.HIGH, SecuritySeverity.CRITICAL])
-        ).delete(synchronize_session=False)
-        
-        db.session.commit()
+        critical = RetentionService.delete(
+            f'security_events:critical:resolved_{days_after_resolution * 2}d', SecurityEvent, [
+                SecurityEvent.is_resolved == True,
+                SecurityEvent.resolved_at < critical_cutoff,
+                SecurityEvent.severity.in_([SecuritySeverity.HIGH, SecuritySeverity.CRITICAL])
+            ]
+        )
+        
+        completed = normal['completed'] and critical['completed']
+        _resume_if_incomplete(
+            self, {'completed': completed}, days_after_resolution=days_after_resolution
+        )
         
         return {
             'success': True,
-            'deleted_normal_events': deleted_normal,
-            'deleted_critical_events': deleted_critical,
+            'deleted_normal_events': normal['affected'],
+            'deleted_critical_events': critical['affected'],
+            'completed': completed,
             'days_after_resolution': days_after_resolution,
             'executed_at': datetime.utcnow().isoformat()
         }
@@ -594,18 +672,23 @@ def cleanup_old_audit_logs(self, retention_days: int = 365):
     """
     try:
         from app.models.audit import AuditLog
+        from app.services.partition_service import PartitionService
+        from app.services.retention_service import RetentionService
         
         cutoff_date = datetime.utcnow() - timedelta(days=retention_days)
         
-        deleted = AuditLog.query.filter(
-            AuditLog.created_at < cutoff_date
-        ).delete(synchronize_session=False)
-        
-        db.session.commit()
+        dropped = PartitionService.drop_before(AuditLog.__tablename__, cutoff_date)
+        result = RetentionService.delete(
+            f'audit_logs:older_than_{retention_days}d', AuditLog,
+            [AuditLog.created_at < cutoff_date]
+        )
+        _resume_if_incomplete(self, result, retention_days=retention_days)
         
         return {
             'success': True,
-            'deleted_audit_logs': deleted,
+            'deleted_audit_logs': result['affected'],
+            'dropped_partitions': dropped,
+            'completed': result['completed'],
             'retention_days': retention_days,
             'executed_at': datetime.utcnow().isoformat()
         }
@@ -703,6 +786,72 @@ def aggregate_performance_metrics(self):
         }
 
 
+@shared_task(bind=True, max_retries=2)
+def rollup_request_logs(self, max_batches: int = 10):
+    """
+    Request loglarını dakikalık/saatlik rollup tablosuna artımlı işle.
+    
+    En son işlenen RequestLog.id checkpoint'ten devam eder; her turda
+    en fazla BATCH_SIZE satır işlenir. Dashboard istatistikleri
+    (p50/p95/p99 dahil) bu tablodan okunur.
+    
+    Runs: Dakikalık
+    
+    Args:
+        max_batches: Bir çalıştırmada en fazla işlenecek parti sayısı
+    """
+    try:
+        from app.services.rollup_service import RequestRollupService
+        
+        processed = 0
+        result = {}
+        for _ in range(max_batches):
+            result = RequestRollupService.run()
+            processed += result['processed']
+            if result['caught_up']:
+                break
+        
+        pruned = RequestRollupService.prune()
+        
+        return {
+            'success': True,
+            'processed_request_logs': processed,
+            'last_id': result.get('last_id'),
+            'caught_up': result.get('caught_up', True),
+            'pruned_rollups': pruned,
+            'executed_at': datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        db.session.rollback()
+        self.retry(exc=e, countdown=30)
+
+
+@shared_task(bind=True, max_retries=2)
+def maintain_log_partitions(self):
+    """
+    Bölümlü log tabloları için ileri tarihli bölümleri önceden oluştur.
+    
+    PostgreSQL dışında (SQLite) etkisizdir.
+    
+    Runs: Günlük (00:15)
+    """
+    try:
+        from app.services.partition_service import PartitionService
+        
+        created = PartitionService.maintain()
+        
+        return {
+            'success': True,
+            'created_partitions': created,
+            'executed_at': datetime.utcnow().isoformat()
+        }
+        
+    except Exception as e:
+        db.session.rollback()
+        self.retry(exc=e, countdown=300)
+
+
 @shared_task(bind=True)
 def generate_daily_log_report(self):
     """
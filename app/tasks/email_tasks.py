@@ -41,16 +41,86 @@ def send_email_task(self, to: str, subject: str, template_name: str, context: di
         self.retry(exc=e, countdown=60 * (2 ** self.request.retries))
 
 
+BULK_EMAIL_CHUNK_SIZE = 100
+
+
 @shared_task
-def send_bulk_email_task(recipients: list, subject: str, template_name: str, context: dict):
-    """Send bulk emails to multiple recipients."""
-    results = []
+def send_bulk_email_task(
+    recipients: list,
+    subject: str,
+    template_name: str,
+    context: dict,
+    chunk_size: int = None
+):
+    """
+    Send bulk emails to multiple recipients.
+    
+    Recipients are split into chunks; each chunk is one task that renders
+    the template once and sends over a single SMTP connection.
+    """
+    chunk_size = chunk_size or current_app.config.get('BULK_EMAIL_CHUNK_SIZE', BULK_EMAIL_CHUNK_SIZE)
+    batches = []
+    
+    for start in range(0, len(recipients), chunk_size):
+        chunk = recipients[start:start + chunk_size]
+        result = send_email_batch_task.delay(chunk, subject, template_name, context)
+        batches.append({'recipients': len(chunk), 'task_id': result.id})
     
-    for recipient in recipients:
-        result = send_email_task.delay(recipient, subject, template_name, context)
-        results.append({'recipient': recipient, 'task_id': result.id})
+    return {
+        'total_recipients': len(recipients),
+        'batches': batches
+    }
+
+
+@shared_task(bind=True, max_retries=3)
+def send_email_batch_task(self, recipients: list, subject: str, template_name: str, context: dict):
+    """
+    Send one chunk of a bulk email over a reused SMTP connection.
     
-    return results
+    Only recipients that hit transient errors are retried (with backoff);
+    rejected addresses are reported and dropped. Per-batch throughput is
+    recorded as a task metric.
+    """
+    from app.services.email_service import EmailService
+    from app.services.log_service import PerformanceService
+    from app.models.audit import MetricType
+    
+    result = EmailService.send_batch(
+        recipients,
+        subject,
+        template_string=get_email_template(template_name),
+        context=context
+    )
+    
+    PerformanceService.record_metric(
+        MetricType.TASK,
+        'email.batch',
+        result['duration_ms'],
+        details={
+            'recipients': len(recipients),
+            'sent': result['sent'],
+            'failed': len(result['failed']),
+            'deferred': len(result['retry']),
+            'connections': result['connections'],
+            'per_second': result['per_second'],
+            'attempt': self.request.retries,
+        }
+    )
+    
+    if result['retry'] and self.request.retries < self.max_retries:
+        # Yalnızca geçici hata alan alıcılarla yeniden dene
+        raise self.retry(
+            args=[result['retry'], subject, template_name, context],
+            countdown=60 * (2 ** self.request.retries)
+        )
+    
+    return {
+        'sent': result['sent'],
+        'failed': result['failed'] + result['retry'],
+        'duration_ms': result['duration_ms'],
+        'per_second': result['per_second'],
+        'connections': result['connections']
+    }
 
 
 @shared_task
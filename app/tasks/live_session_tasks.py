@@ -4,12 +4,21 @@ Live Session Tasks.
 Canlı ders hatırlatma ve temizlik görevleri.
 """
 
+import logging
 from datetime import datetime, timedelta
 from celery import shared_task
 
 from app.extensions import db
 from app.modules.live_classes.models import LiveSession, SessionStatus, SessionAttendance
 
+logger = logging.getLogger(__name__)
+
+# Hatırlatma türü -> (bayrak kolonu, planlanan başlangıç penceresi)
+REMINDER_WINDOWS = {
+    '24h': ('reminder_24h_sent', timedelta(hours=23, minutes=30), timedelta(hours=24, minutes=30)),
+    '1h': ('reminder_1h_sent', timedelta(minutes=55), timedelta(minutes=65)),
+}
+
 
 @shared_task(name='live_sessions.send_reminders')
 def send_session_reminders():
@@ -18,94 +27,127 @@ def send_session_reminders():
     
     - 24 saat önce
     - 1 saat önce
+    
+    Tüm vadesi gelen oturumlar ve katılımcıları tek sorguyla okunur.
+    Oturumlar `UPDATE ... WHERE id IN (...) AND <bayrak> = false` ile
+    sahiplenilir ve bildirimler aynı transaction'da toplu yazılır: yeniden
+    deneme veya eşzamanlı çalışma aynı hatırlatmayı iki kez göndermez.
+    Her bildirim `live_session:<id>:reminder_<tür>` idempotency anahtarı taşır.
     """
+    from sqlalchemy import and_, or_
     from app.services.notification_service import NotificationService
     
     now = datetime.utcnow()
     
-    # 24 saat hatırlatması
-    reminder_24h_start = now + timedelta(hours=23, minutes=30)
-    reminder_24h_end = now + timedelta(hours=24, minutes=30)
+    windows = {
+        kind: (getattr(LiveSession, flag), now + start, now + end)
+        for kind, (flag, start, end) in REMINDER_WINDOWS.items()
+    }
     
-    sessions_24h = LiveSession.query.filter(
+    rows = db.session.query(
+        LiveSession.id,
+        LiveSession.title,
+        LiveSession.host_id,
+        LiveSession.scheduled_start,
+        SessionAttendance.user_id
+    ).outerjoin(
+        SessionAttendance, SessionAttendance.session_id == LiveSession.id
+    ).filter(
         LiveSession.status == SessionStatus.SCHEDULED,
-        LiveSession.scheduled_start >= reminder_24h_start,
-        LiveSession.scheduled_start <= reminder_24h_end,
-        LiveSession.reminder_24h_sent == False,
-        LiveSession.is_deleted == False
+        LiveSession.is_deleted == False,
+        or_(*(
+            and_(
+                LiveSession.scheduled_start >= start,
+                LiveSession.scheduled_start <= end,
+                flag == False
+            )
+            for flag, start, end in windows.values()
+        ))
     ).all()
     
-    for session in sessions_24h:
-        try:
-            # Kayıtlı öğrencilere bildirim gönder
-            attendances = SessionAttendance.query.filter_by(session_id=session.id).all()
+    # tür -> oturum ID -> (başlık, host, başlangıç, katılımcılar)
+    due = {kind: {} for kind in windows}
+    for session_id, title, host_id, scheduled_start, user_id in rows:
+        for kind, (_, start, end) in windows.items():
+            if start <= scheduled_start <= end:
+                session = due[kind].setdefault(session_id, (title, host_id, scheduled_start, []))
+                if user_id is not None:
+                    session[3].append(user_id)
+    
+    notifications = []
+    for session_id, (title, host_id, scheduled_start, user_ids) in due['24h'].items():
+        data = {
+            'session_id': session_id,
+            'scheduled_start': scheduled_start.isoformat(),
+            'idempotency_key': f'live_session:{session_id}:reminder_24h',
+        }
+        notifications.extend({
+            'user_id': user_id,
+            'title': 'Yarın Canlı Ders Var!',
+            'message': f'"{title}" dersi yarın {scheduled_start.strftime("%H:%M")} saatinde başlayacak.',
+            'notification_type': 'live_session_reminder',
+            'data': data,
+        } for user_id in user_ids)
+    
+    for session_id, (title, host_id, scheduled_start, user_ids) in due['1h'].items():
+        data = {
+            'session_id': session_id,
+            'scheduled_start': scheduled_start.isoformat(),
+            'priority': 'high',
+            'idempotency_key': f'live_session:{session_id}:reminder_1h',
+        }
+        notifications.extend({
+            'user_id': user_id,
+            'title': 'Canlı Ders 1 Saat Sonra!',
+            'message': f'"{title}" dersi 1 saat sonra başlayacak. Hazırlanın!',
+            'notification_type': 'live_session_reminder',
+            'data': data,
+        } for user_id in user_ids)
+        
+        # Host'a da hatırlatma
+        notifications.append({
+            'user_id': host_id,
+            'title': 'Dersiniz 1 Saat Sonra!',
+            'message': f'"{title}" dersiniz 1 saat sonra başlayacak.',
+            'notification_type': 'live_session_host_reminder',
+            'data': {
+                'session_id': session_id,
+                'priority': 'high',
+                'idempotency_key': f'live_session:{session_id}:host_reminder_1h',
+            },
+        })
+    
+    try:
+        for kind, sessions in due.items():
+            if not sessions:
+                continue
+            flag = windows[kind][0]
+            claimed = LiveSession.query.filter(
+                LiveSession.id.in_(list(sessions)),
+                flag == False
+            ).update({flag: True}, synchronize_session=False)
             
-            for attendance in attendances:
-                NotificationService.send(
-                    user_id=attendance.user_id,
-                    title='Yarın Canlı Ders Var!',
-                    message=f'"{session.title}" dersi yarın {session.scheduled_start.strftime("%H:%M")} saatinde başlayacak.',
-                    notification_type='live_session_reminder',
-                    data={
-                        'session_id': session.id,
-                        'scheduled_start': session.scheduled_start.isoformat()
-                    }
+            if claimed != len(sessions):
+                # Başka bir çalışma bu oturumların bir kısmını sahiplendi
+                db.session.rollback()
+                logger.warning(
+                    "Hatırlatmalar atlandı: %s oturumları başka bir çalışmada işleniyor", kind
                 )
-            
-            session.reminder_24h_sent = True
-            db.session.commit()
-            
-        except Exception as e:
-            print(f"24h hatırlatma hatası (session {session.id}): {e}")
-    
-    # 1 saat hatırlatması
-    reminder_1h_start = now + timedelta(minutes=55)
-    reminder_1h_end = now + timedelta(minutes=65)
-    
-    sessions_1h = LiveSession.query.filter(
-        LiveSession.status == SessionStatus.SCHEDULED,
-        LiveSession.scheduled_start >= reminder_1h_start,
-        LiveSession.scheduled_start <= reminder_1h_end,
-        LiveSession.reminder_1h_sent == False,
-        LiveSession.is_deleted == False
-    ).all()
+                return {'sent_24h': 0, 'sent_1h': 0, 'notifications': 0}
+        
+        NotificationService.create_many(notifications, commit=False)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        logger.exception("Hatırlatma hatası: %s", e)
+        raise
     
-    for session in sessions_1h:
-        try:
-            attendances = SessionAttendance.query.filter_by(session_id=session.id).all()
-            
-            for attendance in attendances:
-                NotificationService.send(
-                    user_id=attendance.user_id,
-                    title='Canlı Ders 1 Saat Sonra!',
-                    message=f'"{session.title}" dersi 1 saat sonra başlayacak. Hazırlanın!',
-                    notification_type='live_session_reminder',
-                    priority='high',
-                    data={
-                        'session_id': session.id,
-                        'scheduled_start': session.scheduled_start.isoformat()
-                    }
-                )
-            
-            # Host'a da hatırlatma
-            NotificationService.send(
-                user_id=session.host_id,
-                title='Dersiniz 1 Saat Sonra!',
-                message=f'"{session.title}" dersiniz 1 saat sonra başlayacak.',
-                notification_type='live_session_host_reminder',
-                priority='high',
-                data={'session_id': session.id}
-            )
-            
-            session.reminder_1h_sent = True
-            db.session.commit()
-            
-        except Exception as e:
-            print(f"1h hatırlatma hatası (session {session.id}): {e}")
+    NotificationService.publish_created(notifications)
     
     return {
-        'sent_24h': len(sessions_24h),
-        'sent_1h': len(sessions_1h)
+        'sent_24h': len(due['24h']),
+        'sent_1h': len(due['1h']),
+        'notifications': len(notifications)
     }
 
 
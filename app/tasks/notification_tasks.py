@@ -0,0 +1,48 @@
+"""
+Notification task workers for bulk fan-out.
+"""
+
+from celery import shared_task
+
+
+@shared_task(bind=True, max_retries=3)
+def send_notification_batch_task(
+    self,
+    user_ids: list,
+    title: str,
+    message: str,
+    notification_type: str = 'info',
+    action_url: str = None,
+    data: dict = None
+):
+    """
+    Write one chunk of a bulk notification.
+    
+    The chunk is a single multi-row INSERT committed once, so a retry
+    never duplicates rows from a failed attempt.
+    """
+    import time
+    
+    from app.extensions import db
+    from app.models.audit import MetricType
+    from app.services.log_service import PerformanceService
+    from app.services.notification_service import NotificationService
+    
+    started = time.perf_counter()
+    try:
+        created = NotificationService.bulk_create(
+            user_ids, title, message, notification_type, action_url, data
+        )
+    except Exception as e:
+        db.session.rollback()
+        raise self.retry(exc=e, countdown=30 * (2 ** self.request.retries))
+    
+    duration_ms = round((time.perf_counter() - started) * 1000, 2)
+    PerformanceService.record_metric(
+        MetricType.TASK,
+        'notification.batch',
+        duration_ms,
+        details={'recipients': len(user_ids), 'created': created}
+    )
+    
+    return {'created': created, 'duration_ms': duration_ms}
@@ -232,6 +232,80 @@ def generate_weekly_summary_task():
         return {'total_courses': len(courses), 'tasks_queued': results}
 
 
+@shared_task
+def rebuild_performance_aggregates_task(user_ids: list = None):
+    """
+    Rebuild per-student performance aggregates from question attempts.
+    
+    Used to backfill the aggregate table after deploy or to repair drift.
+    
+    Args:
+        user_ids: Students to rebuild (default: everyone with attempts)
+    """
+    from app import create_app
+    from app.extensions import db
+    from app.models.question import QuestionAttempt
+    from app.services.performance_aggregate_service import PerformanceAggregateService
+    
+    app = create_app()
+    with app.app_context():
+        if user_ids is None:
+            user_ids = [
+                row[0] for row in db.session.query(QuestionAttempt.user_id).distinct()
+            ]
+        
+        processed = 0
+        for user_id in user_ids:
+            processed += PerformanceAggregateService.rebuild_for_user(user_id)
+        
+        return {'users': len(user_ids), 'attempts_processed': processed}
+
+
+@shared_task
+def refresh_peer_percentiles_task(max_batches: int = 10):
+    """
+    Apply score changes of students with new attempts to peer indexes.
+    
+    Args:
+        max_batches: Maximum dirty batches to process per run
+    """
+    from app import create_app
+    from app.services.peer_percentile_service import PeerPercentileService
+    
+    app = create_app()
+    with app.app_context():
+        users = 0
+        for _ in range(max_batches):
+            result = PeerPercentileService.refresh_dirty()
+            if not result['users'] and not result['courses']:
+                break
+            users += result['users']
+        
+        return {'users_refreshed': users}
+
+
+@shared_task
+def rebuild_peer_percentiles_task():
+    """Rebuild peer percentile indexes for active courses (sliding window)."""
+    from app import create_app
+    from app.models.course import Course
+    from app.services.peer_percentile_service import PeerPercentileService
+    
+    app = create_app()
+    with app.app_context():
+        course_ids = [
+            row[0] for row in Course.query.with_entities(Course.id).filter_by(
+                is_published=True, is_active=True
+            )
+        ]
+        
+        indexed = 0
+        for course_id in course_ids:
+            indexed += PeerPercentileService.rebuild(course_id)
+        
+        return {'courses': len(course_ids), 'students_indexed': indexed}
+
+
 @shared_task
 def export_report_to_file_task(report_type: str, report_data: dict, format: str = 'json'):
     """Export report data to file."""
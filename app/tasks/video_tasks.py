@@ -163,3 +163,82 @@ def cleanup_incomplete_progress_task(days_old: int = 30):
         db.session.commit()
         
         return {'deleted_entries': deleted}
+
+
+@shared_task(bind=True, max_retries=2)
+def flush_video_view_counts_task(self):
+    """
+    Redis'te biriken izlenme sayaçlarını DB'ye yazar (write-behind).
+    
+    Runs: Her dakika
+    """
+    from app.extensions import db
+    from app.models.audit import MetricType
+    from app.services.log_service import PerformanceService
+    from app.services.video_analytics_service import VideoAnalyticsService
+    
+    try:
+        result = VideoAnalyticsService.sync_all_to_database()
+        
+        if result['batches']:
+            PerformanceService.record_metric(
+                MetricType.TASK,
+                'video.view_flush',
+                result['duration_ms'],
+                details={
+                    'synced': result['synced'],
+                    'batches': result['batches'],
+                    'max_lag_seconds': result['max_lag_seconds'],
+                }
+            )
+        
+        return result
+    except Exception as e:
+        db.session.rollback()
+        self.retry(exc=e, countdown=60)
+
+
+@shared_task
+def migrate_unique_views_task():
+    """
+    Eski tekil izleyici SET'lerini HyperLogLog'a taşır.
+    
+    Runs: Elle, deploy sonrası bir kez
+    """
+    from app.services.video_analytics_service import VideoAnalyticsService
+    
+    return VideoAnalyticsService.migrate_legacy_unique_views()
+
+
+@shared_task(bind=True, max_retries=2)
+def merge_video_engagement_task(self):
+    """
+    Biten izleme oturumlarını video ısı haritalarına birleştirir.
+    
+    Runs: Her 5 dakikada
+    """
+    from app.extensions import db
+    from app.models.audit import MetricType
+    from app.services.log_service import PerformanceService
+    from app.services.video_analytics_service import VideoAnalyticsService
+    
+    try:
+        result = VideoAnalyticsService.merge_engagement()
+        
+        if result['batches']:
+            PerformanceService.record_metric(
+                MetricType.TASK,
+                'video.engagement_merge',
+                result['duration_ms'],
+                details={
+                    'sessions': result['sessions'],
+                    'videos': result['videos'],
+                    'skipped': result['skipped'],
+                    'batches': result['batches'],
+                }
+            )
+        
+        return result
+    except Exception as e:
+        db.session.rollback()
+        self.retry(exc=e, countdown=60)
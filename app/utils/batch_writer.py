@@ -0,0 +1,243 @@
+"""
+Batch Writer - Arka planda toplu INSERT yapan sınırlı halka tampon.
+
+İstek yolunda satır başına `db.session.add` + `commit` yapmak yerine
+kayıtlar süreç içi bir halka tampona eklenir; arka plandaki flusher
+tamponu her `flush_interval` saniyede bir ya da `flush_size` satır
+biriktiğinde tek bir çok satırlı INSERT ile boşaltır.
+
+PostgreSQL'de SQLAlchemy 2.0 executemany çağrısını "insertmanyvalues"
+ile çok satırlı INSERT ... VALUES deyimlerine dönüştürür.
+
+Tampon doluysa en eski kayıt düşürülür ve `dropped` sayacı artar.
+`important=True` ile eklenen kayıtlar (yavaş/hatalı istekler) kapasitenin
+onda biri kadar ayrı bir tamponda tutulur; sıradan kayıt seli onları
+tampondan itemez. Sayaçlar `get_stats()` ile izlenebilir.
+
+Gunicorn preload_app ile fork sonrası master'daki thread çocuk süreçte
+yaşamaz; flusher her süreçte ilk kayıtta yeniden başlatılır.
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import Table
+
+logger = logging.getLogger(__name__)
+
+
+class BatchWriter:
+    """
+    Tek tabloya toplu yazan, thread-safe halka tampon.
+
+    Usage:
+        writer = BatchWriter(RequestLog.__table__, name='request_logs')
+        writer.start(app)
+        writer.enqueue({'endpoint': '/api', ...})
+    """
+
+    def __init__(
+        self,
+        table: Table,
+        name: str = None,
+        capacity: int = 10000,
+        flush_size: int = 500,
+        flush_interval: float = 1.0
+    ):
+        self.table = table
+        self.name = name or table.name
+        self.capacity = capacity
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+
+        self._buffer: deque = deque(maxlen=capacity)
+        self._important: deque = deque(maxlen=self._important_capacity(capacity))
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._start_lock = threading.Lock()
+        self._atexit_registered = False
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pid: Optional[int] = None
+        self._app = None
+
+        self._counters = {
+            'enqueued': 0,
+            'written': 0,
+            'dropped': 0,
+            'dropped_important': 0,
+            'sampled_out': 0,
+            'flushes': 0,
+            'errors': 0,
+        }
+        self._last_flush_ms = 0.0
+        self._last_flush_at: Optional[float] = None
+
+    @staticmethod
+    def _important_capacity(capacity: int) -> int:
+        return max(1, capacity // 10)
+
+    def configure(
+        self,
+        capacity: int = None,
+        flush_size: int = None,
+        flush_interval: float = None
+    ) -> None:
+        """Tampon boyutlarını günceller (mevcut kayıtlar korunur)."""
+        with self._lock:
+            if capacity and capacity != self.capacity:
+                self.capacity = capacity
+                self._buffer = deque(self._buffer, maxlen=capacity)
+                self._important = deque(
+                    self._important, maxlen=self._important_capacity(capacity)
+                )
+            if flush_size:
+                self.flush_size = flush_size
+            if flush_interval:
+                self.flush_interval = flush_interval
+
+    @property
+    def running(self) -> bool:
+        return (
+            self._thread is not None
+            and self._pid == os.getpid()
+            and self._thread.is_alive()
+        )
+
+    def start(self, app) -> None:
+        """Arka plan flusher'ını başlatır (idempotent)."""
+        self._app = app
+        with self._start_lock:
+            if self.running:
+                return
+
+            self._stop.clear()
+            self._pid = os.getpid()
+            self._thread = threading.Thread(
+                target=self._run,
+                name=f'batch-writer-{self.name}',
+                daemon=True
+            )
+            self._thread.start()
+
+            if not self._atexit_registered:
+                atexit.register(self.stop)
+                self._atexit_registered = True
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Flusher'ı durdurur ve kalan kayıtları yazar."""
+        self._stop.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+        self.flush()
+
+    def enqueue(self, row: Dict[str, Any], important: bool = False) -> None:
+        """
+        Kaydı tampona ekler; istek yolunda DB'ye dokunmaz.
+
+        Args:
+            important: Kayıt ayrı tamponda tutulur, sıradan kayıtlar yüzünden düşmez
+        """
+        if self._app is not None and not self.running and not self._stop.is_set():
+            self.start(self._app)
+
+        with self._lock:
+            buffer = self._important if important else self._buffer
+            if len(buffer) >= buffer.maxlen:
+                # deque(maxlen) en eskiyi atar; düşürüleni say
+                self._counters['dropped'] += 1
+                if important:
+                    self._counters['dropped_important'] += 1
+            buffer.append(row)
+            self._counters['enqueued'] += 1
+            pending = len(self._buffer) + len(self._important)
+
+        if pending >= self.flush_size:
+            self._wakeup.set()
+
+    def record_sampled_out(self) -> None:
+        """Örneklemede atlanan (tampona hiç girmeyen) kaydı sayar."""
+        with self._lock:
+            self._counters['sampled_out'] += 1
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = list(self._important) + list(self._buffer)
+            self._important.clear()
+            self._buffer.clear()
+        return rows
+
+    def flush(self) -> int:
+        """
+        Tampondaki tüm kayıtları yazar.
+
+        Returns:
+            int: Yazılan satır sayısı
+        """
+        with self._flush_lock:
+            rows = self._drain()
+            if not rows:
+                return 0
+
+            start = time.perf_counter()
+            written = 0
+            try:
+                for i in range(0, len(rows), self.flush_size):
+                    chunk = rows[i:i + self.flush_size]
+                    self._write(chunk)
+                    written += len(chunk)
+            except Exception as e:
+                with self._lock:
+                    self._counters['errors'] += 1
+                    self._counters['dropped'] += len(rows) - written
+                logger.error(f'{self.name} batch write error: {e}')
+
+            with self._lock:
+                self._counters['written'] += written
+                self._counters['flushes'] += 1
+                self._last_flush_ms = (time.perf_counter() - start) * 1000
+                self._last_flush_at = time.time()
+            return written
+
+    def _write(self, rows: List[Dict[str, Any]]) -> None:
+        """Tek işlemde çok satırlı INSERT (session'dan bağımsız bağlantı)."""
+        from app.extensions import db
+
+        if self._app is not None:
+            with self._app.app_context():
+                with db.engine.begin() as conn:
+                    conn.execute(self.table.insert(), rows)
+        else:
+            with db.engine.begin() as conn:
+                conn.execute(self.table.insert(), rows)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            try:
+                self.flush()
+            except Exception as e:  # flusher thread asla ölmemeli
+                logger.error(f'{self.name} flusher error: {e}')
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Tampon doluluğu ve sayaçlar."""
+        with self._lock:
+            return {
+                'name': self.name,
+                'running': self.running,
+                'pending': len(self._buffer) + len(self._important),
+                'capacity': self.capacity,
+                'important_capacity': self._important.maxlen,
+                **self._counters,
+                'last_flush_ms': round(self._last_flush_ms, 2),
+                'last_flush_at': self._last_flush_at,
+            }
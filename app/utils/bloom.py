@@ -0,0 +1,62 @@
+"""
+Bloom Filter - Süreç içi olasılıksal üyelik kümesi.
+
+"Kesinlikle yok" cevabı yanlış olamaz; "olabilir" cevabı `error_rate`
+olasılıkla yanlış pozitiftir ve kesin kaynaktan doğrulanmalıdır.
+Eleman silinemez; büyüyen kümeler için filtre periyodik yeniden kurulur.
+"""
+
+import hashlib
+import math
+import threading
+
+
+class BloomFilter:
+    """
+    Sabit boyutlu bit dizisi üzerinde çift hash'li Bloom filtresi.
+
+    Usage:
+        bloom = BloomFilter(capacity=100000, error_rate=0.001)
+        bloom.add('jti-1')
+        'jti-1' in bloom  # True
+    """
+
+    def __init__(self, capacity: int = 100000, error_rate: float = 0.001):
+        capacity = max(int(capacity), 1)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+        self._lock = threading.Lock()
+
+    def _positions(self, item: str):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return [(h1 + i * h2) % self.size for i in range(self.hash_count)]
+
+    def add(self, item: str) -> None:
+        positions = self._positions(item)
+        # Byte üzerinde oku-değiştir-yaz; eşzamanlı eklemede bit kaybolmamalı
+        with self._lock:
+            for position in positions:
+                self._bits[position >> 3] |= 1 << (position & 7)
+            self._count += 1
+
+    def __contains__(self, item: str) -> bool:
+        bits = self._bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def __len__(self) -> int:
+        """Eklenen eleman sayısı (tekrarlar dahil)."""
+        return self._count
+
+    @property
+    def saturated(self) -> bool:
+        """Kapasite aşıldı mı (yanlış pozitif oranı hedefin üstünde)."""
+        return self._count > self.capacity
@@ -4,10 +4,18 @@ Provides caching layer for high-performance data access.
 """
 
 import json
+import fnmatch
 import functools
 import hashlib
+import itertools
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict, defaultdict, deque
+from contextlib import contextmanager
 from datetime import timedelta
-from typing import Any, Callable, Optional, Union
+from typing import Any, Callable, Dict, Optional, Union
 
 from flask import current_app, request
 import redis
@@ -15,16 +23,621 @@ import redis
 from app.utils.helpers import JSONEncoder
 
 
+logger = logging.getLogger(__name__)
+
+_MISSING = object()
+
+
+class LocalCache:
+    """
+    Bounded in-process LRU cache with per-entry TTL (L1 tier).
+    
+    Entries are stored as decoded values and must be treated as read-only
+    by callers, since the same object is returned on every hit.
+    """
+    
+    def __init__(self, max_size: int = 2048, default_ttl: int = 30):
+        self.max_size = max_size
+        self.default_ttl = default_ttl
+        self._data: 'OrderedDict[str, tuple]' = OrderedDict()
+        self._lock = threading.RLock()
+    
+    def get(self, key: str, default: Any = _MISSING) -> Any:
+        """Return cached value or ``default`` when missing/expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """Store value, evicting least recently used entries when full."""
+        ttl = self.default_ttl if ttl is None else ttl
+        if ttl <= 0 or self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+    
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._data.pop(key, None) is not None
+    
+    def delete_pattern(self, pattern: str) -> int:
+        """Delete all local keys matching a glob pattern."""
+        with self._lock:
+            matched = [k for k in self._data if fnmatch.fnmatchcase(k, pattern)]
+            for key in matched:
+                del self._data[key]
+            return len(matched)
+    
+    def delete_where(self, predicate: Callable[[str, Any], bool]) -> int:
+        """Delete entries for which ``predicate(key, value)`` is true."""
+        with self._lock:
+            matched = [k for k, (_, v) in self._data.items() if predicate(k, v)]
+            for key in matched:
+                del self._data[key]
+            return len(matched)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+    
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not _MISSING
+    
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheStats:
+    """Thread-safe hit/miss counters grouped by key prefix."""
+    
+    EVENTS = ('l1_hits', 'l2_hits', 'misses', 'fills', 'stale_fills', 'errors')
+    
+    def __init__(self):
+        self._counters: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: dict.fromkeys(self.EVENTS, 0)
+        )
+        self._lock = threading.Lock()
+    
+    @staticmethod
+    def prefix_of(key: str) -> str:
+        return key.split(':', 1)[0] or key
+    
+    def record(self, key: str, event: str) -> None:
+        with self._lock:
+            self._counters[self.prefix_of(key)][event] += 1
+    
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return a copy of the counters with hit ratios per prefix."""
+        with self._lock:
+            result = {prefix: dict(counts) for prefix, counts in self._counters.items()}
+        for counts in result.values():
+            lookups = counts['l1_hits'] + counts['l2_hits'] + counts['misses']
+            hits = counts['l1_hits'] + counts['l2_hits']
+            counts['hit_ratio'] = round(hits / lookups, 4) if lookups else 0.0
+        return result
+    
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+class SingleFlight:
+    """
+    Per-key in-process locks.
+    
+    Only one thread per process computes a missing value; the others wait
+    for it and then read the freshly cached result.
+    """
+    
+    def __init__(self):
+        self._locks: Dict[str, list] = {}
+        self._guard = threading.Lock()
+    
+    @contextmanager
+    def acquire(self, key: str):
+        with self._guard:
+            entry = self._locks.get(key)
+            if entry is None:
+                entry = self._locks[key] = [threading.Lock(), 0]
+            entry[1] += 1
+        entry[0].acquire()
+        try:
+            yield
+        finally:
+            entry[0].release()
+            with self._guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    self._locks.pop(key, None)
+
+
+# Compare-and-delete so a worker never releases a lock it no longer owns.
+_RELEASE_LOCK_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+# Key namespaces tracked by generation counters: 'course', 'course:5', ...
+GENERATION_DEPTH = 3
+
+# Envelope field holding the tag generations a value was stored under.
+_TAGS_FIELD = '__cache_tags__'
+
+
+def key_namespaces(key: str) -> list:
+    """
+    Return the generation namespaces a key belongs to.
+    
+    'course:5:detail' -> ['course', 'course:5']
+    """
+    parts = key.split(':')
+    return [':'.join(parts[:i]) for i in range(1, min(len(parts), GENERATION_DEPTH + 1))]
+
+
+def pattern_namespace(pattern: str) -> Optional[str]:
+    """
+    Map a ``<namespace>:*`` pattern to its namespace, or None if the
+    pattern cannot be expressed as a generation bump.
+    """
+    if not pattern.endswith(':*'):
+        return None
+    namespace = pattern[:-2]
+    if not namespace or any(ch in namespace for ch in '*?[]'):
+        return None
+    if namespace.count(':') + 1 > GENERATION_DEPTH:
+        return None
+    return namespace
+
+
+class TieredCache:
+    """
+    Two-tier cache: bounded local LRU (L1) in front of Redis (L2).
+    
+    - Reads hit L1 first, then Redis; Redis hits are promoted to L1 with a
+      short TTL so cross-process staleness stays bounded.
+    - ``get_or_set`` is stampede-safe: one thread per process (SingleFlight)
+      and one process cluster-wide (Redis ``SET NX`` lock) runs the factory,
+      the others wait for the filled value.
+    - When Redis is unreachable it is skipped for ``l2_retry_after`` seconds
+      and L1 keeps serving with the full TTL.
+    
+    Invalidation uses generation counters instead of ``KEYS``: every key is
+    stored under the current generation of its namespaces (``course``,
+    ``course:5``) and of its tags, so ``invalidate('course:5')`` is a single
+    ``INCR`` that makes all old entries unreachable; they then expire by TTL.
+    Other processes notice a bump within ``generation_ttl`` seconds.
+    """
+    
+    def __init__(
+        self,
+        client_getter: Callable[[], Optional[redis.Redis]],
+        namespace: str = '',
+        local_max_size: int = 2048,
+        local_ttl: int = 30,
+        json_encoder: type = None,
+        lock_ttl: int = 10,
+        lock_wait: float = 5.0,
+        l2_retry_after: float = 5.0,
+        generation_ttl: int = 5,
+        generation_key_ttl: int = 7 * 24 * 3600,
+        scan_batch_size: int = 500
+    ):
+        self._client_getter = client_getter
+        self.namespace = namespace
+        self.local = LocalCache(max_size=local_max_size, default_ttl=local_ttl)
+        self.local_ttl = local_ttl
+        self.stats = CacheStats()
+        self.json_encoder = json_encoder
+        self.lock_ttl = lock_ttl
+        self.lock_wait = lock_wait
+        self.l2_retry_after = l2_retry_after
+        self.generation_ttl = generation_ttl
+        self.generation_key_ttl = generation_key_ttl
+        self.scan_batch_size = scan_batch_size
+        self._generations = LocalCache(max_size=local_max_size, default_ttl=generation_ttl)
+        self._flight = SingleFlight()
+        self._l2_down_until = 0.0
+        # (sequence, namespace) of recent invalidations in this process, so
+        # get_or_set can drop a value computed across an invalidation.
+        self._invalidation_seq = itertools.count(1)
+        self._recent_invalidations = deque(maxlen=1024)
+        self._last_invalidation = 0
+    
+    def configure(self, local_max_size: int = None, local_ttl: int = None) -> None:
+        """Adjust L1 limits (e.g. from app config at startup)."""
+        if local_max_size is not None:
+            self.local.max_size = local_max_size
+            self._generations.max_size = local_max_size
+        if local_ttl is not None:
+            self.local_ttl = local_ttl
+            self.local.default_ttl = local_ttl
+    
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+    
+    def full_key(self, key: str) -> str:
+        return f'{self.namespace}{key}'
+    
+    def client(self) -> Optional[redis.Redis]:
+        """Return the Redis client, or None while L2 is unavailable."""
+        if self._l2_down_until and time.monotonic() < self._l2_down_until:
+            return None
+        try:
+            return self._client_getter()
+        except Exception:
+            return None
+    
+    def _l2_failed(self, key: str, error: Exception) -> None:
+        self.stats.record(key, 'errors')
+        self._l2_down_until = time.monotonic() + self.l2_retry_after
+        logger.warning(f'Cache L2 error for {key}: {error}')
+    
+    def _encode(self, value: Any) -> str:
+        return json.dumps(value, cls=self.json_encoder)
+    
+    def _local_ttl_for(self, ttl: int, has_l2: bool) -> int:
+        # Without Redis, L1 is the only tier and keeps the full TTL.
+        return min(ttl, self.local_ttl) if has_l2 else ttl
+    
+    def generations(self, namespaces: list) -> list:
+        """Current generation of each namespace (locally cached, one MGET on miss)."""
+        found = {}
+        missing = []
+        for ns in namespaces:
+            generation = self._generations.get(ns)
+            if generation is _MISSING:
+                missing.append(ns)
+            else:
+                found[ns] = generation
+        
+        if missing:
+            values = [None] * len(missing)
+            client = self.client()
+            if client is not None:
+                try:
+                    values = client.mget([self.full_key(f'gen:{ns}') for ns in missing])
+                except redis.RedisError as e:
+                    self._l2_failed(missing[0], e)
+            for ns, value in zip(missing, values):
+                found[ns] = int(value) if value else 0
+                self._generations.set(ns, found[ns])
+        
+        return [found[ns] for ns in namespaces]
+    
+    def physical_key(self, key: str) -> str:
+        """Key with the generations of its namespaces appended (if any bumped)."""
+        generations = self.generations(key_namespaces(key))
+        if not any(generations):
+            return key
+        return f"{key}|g{'.'.join(str(g) for g in generations)}"
+    
+    def _wrap(self, value: Any, tags: Optional[list]) -> Any:
+        if not tags:
+            return value
+        tag_generations = self.generations([f'tag:{tag}' for tag in tags])
+        return {_TAGS_FIELD: dict(zip(tags, tag_generations)), 'value': value}
+    
+    def _unwrap(self, value: Any) -> Any:
+        """Strip the tag envelope; _MISSING if any tag was invalidated since."""
+        if not (isinstance(value, dict) and _TAGS_FIELD in value):
+            return value
+        stored = value[_TAGS_FIELD]
+        current = self.generations([f'tag:{tag}' for tag in stored])
+        if list(stored.values()) != current:
+            return _MISSING
+        return value['value']
+    
+    def _read_l2(self, client: redis.Redis, key: str, pkey: str) -> Any:
+        """Read and decode a physical key from Redis, promoting it to L1."""
+        try:
+            raw = client.get(self.full_key(pkey))
+        except redis.RedisError as e:
+            self._l2_failed(key, e)
+            return _MISSING
+        if raw is None:
+            return _MISSING
+        try:
+            stored = json.loads(raw)
+        except (TypeError, ValueError):
+            return _MISSING
+        value = self._unwrap(stored)
+        if value is not _MISSING and value is not None:
+            self.local.set(pkey, stored, self.local_ttl)
+            return value
+        return _MISSING
+    
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from L1, falling back to Redis."""
+        pkey = self.physical_key(key)
+        stored = self.local.get(pkey)
+        if stored is not _MISSING:
+            value = self._unwrap(stored)
+            if value is not _MISSING:
+                self.stats.record(key, 'l1_hits')
+                return value
+            self.local.delete(pkey)
+        
+        client = self.client()
+        if client is not None:
+            value = self._read_l2(client, key, pkey)
+            if value is not _MISSING:
+                self.stats.record(key, 'l2_hits')
+                return value
+        
+        self.stats.record(key, 'misses')
+        return None
+    
+    def set(self, key: str, value: Any, ttl: int = 300, tags: list = None) -> bool:
+        """Write value to both tiers under the current generations."""
+        pkey = self.physical_key(key)
+        try:
+            serialized = self._encode(self._wrap(value, tags))
+        except (TypeError, ValueError) as e:
+            logger.warning(f'Cache serialize error for {key}: {e}')
+            return False
+        
+        client = self.client()
+        # Store the decoded copy so L1 matches what Redis readers would get
+        # and callers mutating their own object cannot corrupt the cache.
+        self.local.set(pkey, json.loads(serialized), self._local_ttl_for(ttl, client is not None))
+        if client is None:
+            return True
+        try:
+            client.setex(self.full_key(pkey), ttl, serialized)
+            return True
+        except redis.RedisError as e:
+            self._l2_failed(key, e)
+            return False
+    
+    def delete(self, key: str) -> bool:
+        """Delete value from both tiers."""
+        pkey = self.physical_key(key)
+        deleted = self.local.delete(pkey)
+        client = self.client()
+        if client is not None:
+            try:
+                deleted = bool(client.delete(self.full_key(pkey))) or deleted
+            except redis.RedisError as e:
+                self._l2_failed(key, e)
+        return deleted
+    
+    def exists(self, key: str) -> bool:
+        return self.get(key) is not None
+    
+    def invalidate(self, namespace: str) -> int:
+        """
+        Logically invalidate every key under ``namespace`` (or a ``tag:<name>``)
+        with a single INCR. Returns the new generation.
+        
+        Namespaces deeper than ``GENERATION_DEPTH`` are clamped to their
+        deepest tracked prefix (over-invalidating), since no key reads a
+        generation below that depth.
+        """
+        tag = namespace[4:] if namespace.startswith('tag:') else None
+        if tag is None and namespace.count(':') + 1 > GENERATION_DEPTH:
+            namespace = ':'.join(namespace.split(':')[:GENERATION_DEPTH])
+        prefix = f'{namespace}:'
+        
+        def belongs(local_key: str, stored: Any) -> bool:
+            if tag is not None:
+                return isinstance(stored, dict) and tag in stored.get(_TAGS_FIELD, ())
+            return local_key.startswith(prefix)
+        
+        # Local entries are dropped eagerly; this is also the only
+        # invalidation needed when running without Redis.
+        self.local.delete_where(belongs)
+        sequence = next(self._invalidation_seq)
+        self._recent_invalidations.append((sequence, namespace))
+        self._last_invalidation = sequence
+        
+        client = self.client()
+        if client is None:
+            return 0
+        gen_key = self.full_key(f'gen:{namespace}')
+        try:
+            pipe = client.pipeline()
+            pipe.incr(gen_key)
+            pipe.expire(gen_key, self.generation_key_ttl)
+            generation = pipe.execute()[0]
+        except redis.RedisError as e:
+            self._l2_failed(namespace, e)
+            return 0
+        self._generations.set(namespace, generation)
+        return generation
+    
+    def _invalidated_since(self, sequence: int, key: str, tags: Optional[list]) -> bool:
+        """Was a namespace or tag of ``key`` invalidated after ``sequence``?"""
+        if self._last_invalidation <= sequence:
+            return False
+        recent = list(self._recent_invalidations)
+        if not recent or recent[0][0] > sequence + 1:
+            # History overflowed; assume the worst
+            return True
+        watched = set(key_namespaces(key)) | {f'tag:{tag}' for tag in tags or ()}
+        return any(seq > sequence and ns in watched for seq, ns in recent)
+    
+    def delete_pattern(self, pattern: str) -> int:
+        """
+        Invalidate keys matching a glob pattern.
+        
+        ``<namespace>:*`` patterns become an O(1) generation bump; any other
+        pattern falls back to SCAN + UNLINK in batches (never ``KEYS``).
+        """
+        namespace = pattern_namespace(pattern)
+        if namespace is not None:
+            self.invalidate(namespace)
+            return 1
+        return self.scan_delete(pattern)
+    
+    def scan_delete(self, pattern: str) -> int:
+        """Physically delete keys matching ``pattern`` using SCAN/UNLINK batches."""
+        def logical(local_key: str) -> str:
+            return local_key.split('|g', 1)[0]
+        
+        deleted = self.local.delete_where(
+            lambda local_key, _: fnmatch.fnmatchcase(logical(local_key), pattern)
+        )
+        client = self.client()
+        if client is None:
+            return deleted
+        
+        deleted = 0
+        batch = []
+        try:
+            # Trailing '*' also matches generation-suffixed physical keys.
+            for raw_key in client.scan_iter(
+                match=self.full_key(pattern) + '*',
+                count=self.scan_batch_size
+            ):
+                if isinstance(raw_key, bytes):
+                    raw_key = raw_key.decode()
+                if not fnmatch.fnmatchcase(logical(raw_key[len(self.namespace):]), pattern):
+                    continue
+                batch.append(raw_key)
+                if len(batch) >= self.scan_batch_size:
+                    deleted += client.unlink(*batch)
+                    batch = []
+            if batch:
+                deleted += client.unlink(*batch)
+        except redis.RedisError as e:
+            self._l2_failed(pattern, e)
+        return deleted
+    
+    def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Any],
+        ttl: int = 300,
+        tags: list = None
+    ) -> Any:
+        """
+        Return cached value or compute it once via ``factory``.
+        
+        Concurrent misses for the same key run the factory only once per
+        cluster; ``None`` results are not cached. A value whose namespaces
+        or tags were invalidated while the factory ran is returned but not
+        stored, so a slow fill cannot resurrect data an invalidation dropped.
+        """
+        value = self.get(key)
+        if value is not None:
+            return value
+        
+        with self._flight.acquire(key):
+            # Another thread may have filled it while we waited.
+            stored = self.local.get(self.physical_key(key))
+            if stored is not _MISSING:
+                value = self._unwrap(stored)
+                if value is not _MISSING:
+                    return value
+            
+            token = self._acquire_fill_lock(key)
+            if token is False:
+                value = self._wait_for_fill(key)
+                if value is not None:
+                    return value
+            try:
+                sequence = self._last_invalidation
+                pkey = self.physical_key(key)
+                value = factory()
+                stale = (
+                    self.physical_key(key) != pkey
+                    or self._invalidated_since(sequence, key, tags)
+                )
+                if value is not None and stale:
+                    self.stats.record(key, 'stale_fills')
+                elif value is not None:
+                    self.set(key, value, ttl, tags)
+                    self.stats.record(key, 'fills')
+            finally:
+                if token:
+                    self._release_fill_lock(key, token)
+        return value
+    
+    def _acquire_fill_lock(self, key: str):
+        """
+        Try to take the cluster-wide fill lock.
+        
+        Returns a token when acquired, False when another process holds it
+        and None when Redis is not available (compute locally).
+        """
+        client = self.client()
+        if client is None:
+            return None
+        token = uuid.uuid4().hex
+        try:
+            if client.set(self.full_key(f'lock:{key}'), token, nx=True, ex=self.lock_ttl):
+                return token
+            return False
+        except redis.RedisError as e:
+            self._l2_failed(key, e)
+            return None
+    
+    def _release_fill_lock(self, key: str, token: str) -> None:
+        client = self.client()
+        if client is None:
+            return
+        try:
+            client.eval(_RELEASE_LOCK_SCRIPT, 1, self.full_key(f'lock:{key}'), token)
+        except redis.RedisError as e:
+            self._l2_failed(key, e)
+    
+    def _wait_for_fill(self, key: str) -> Optional[Any]:
+        """Poll Redis until the lock holder fills the key or we time out."""
+        deadline = time.monotonic() + self.lock_wait
+        delay = 0.02
+        pkey = self.physical_key(key)
+        client = self.client()
+        while client is not None and time.monotonic() < deadline:
+            time.sleep(delay)
+            delay = min(delay * 2, 0.2)
+            value = self._read_l2(client, key, pkey)
+            if value is not _MISSING:
+                self.stats.record(key, 'l2_hits')
+                return value
+        return None
+    
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'local_size': len(self.local),
+            'local_max_size': self.local.max_size,
+            'prefixes': self.stats.snapshot(),
+        }
+
+
 class CacheManager:
     """
     Redis cache manager for application-wide caching.
-    Supports Cache-Aside pattern with TTL.
+    Supports Cache-Aside pattern with TTL, backed by a TieredCache
+    (local LRU in front of Redis).
     """
     
     def __init__(self, redis_client: redis.Redis = None):
         self._client = redis_client
         self.default_ttl = 300  # 5 minutes
         self.prefix = 'sc:'  # student coaching prefix
+        self.tiered = TieredCache(
+            lambda: self.client,
+            namespace=self.prefix,
+            json_encoder=JSONEncoder
+        )
     
     @property
     def client(self) -> redis.Redis:
@@ -45,16 +658,8 @@ class CacheManager:
         return f"{self.prefix}{key}"
     
     def get(self, key: str) -> Optional[Any]:
-        """Get value from cache."""
-        try:
-            cached_key = self._make_key(key)
-            data = self.client.get(cached_key)
-            if data:
-                return json.loads(data)
-            return None
-        except (redis.RedisError, json.JSONDecodeError) as e:
-            current_app.logger.warning(f"Cache get error: {e}")
-            return None
+        """Get value from cache (L1, then Redis)."""
+        return self.tiered.get(key)
     
     def set(
         self, 
@@ -63,43 +668,41 @@ class CacheManager:
         ttl: Optional[int] = None
     ) -> bool:
         """Set value in cache with TTL."""
-        try:
-            cached_key = self._make_key(key)
-            ttl = ttl or self.default_ttl
-            serialized = json.dumps(value, cls=JSONEncoder)
-            return self.client.setex(cached_key, ttl, serialized)
-        except (redis.RedisError, TypeError) as e:
-            current_app.logger.warning(f"Cache set error: {e}")
-            return False
+        return self.tiered.set(key, value, ttl or self.default_ttl)
+    
+    def get_or_set(
+        self,
+        key: str,
+        factory: Callable[[], Any],
+        ttl: Optional[int] = None
+    ) -> Any:
+        """Get value or compute it once (stampede protected)."""
+        return self.tiered.get_or_set(key, factory, ttl or self.default_ttl)
     
     def delete(self, key: str) -> bool:
         """Delete value from cache."""
-        try:
-            cached_key = self._make_key(key)
-            return bool(self.client.delete(cached_key))
-        except redis.RedisError as e:
-            current_app.logger.warning(f"Cache delete error: {e}")
-            return False
+        return self.tiered.delete(key)
     
     def delete_pattern(self, pattern: str) -> int:
-        """Delete all keys matching pattern."""
-        try:
-            full_pattern = self._make_key(pattern)
-            keys = self.client.keys(full_pattern)
-            if keys:
-                return self.client.delete(*keys)
-            return 0
-        except redis.RedisError as e:
-            current_app.logger.warning(f"Cache delete pattern error: {e}")
-            return 0
+        """
+        Delete all keys matching pattern.
+        
+        ``prefix:*`` patterns are an O(1) generation bump; other patterns
+        are removed with batched SCAN/UNLINK.
+        """
+        return self.tiered.delete_pattern(pattern)
+    
+    def invalidate(self, namespace: str) -> int:
+        """Invalidate every key under a namespace, e.g. ``course:5``."""
+        return self.tiered.invalidate(namespace)
+    
+    def get_stats(self) -> dict:
+        """L1 size and hit/miss counters per key prefix."""
+        return self.tiered.get_stats()
     
     def exists(self, key: str) -> bool:
         """Check if key exists in cache."""
-        try:
-            cached_key = self._make_key(key)
-            return bool(self.client.exists(cached_key))
-        except redis.RedisError:
-            return False
+        return self.tiered.exists(key)
     
     def increment(self, key: str, amount: int = 1) -> Optional[int]:
         """Increment a counter in cache."""
@@ -160,16 +763,12 @@ def cached(
                 key_parts.extend(f"{k}={v}" for k, v in sorted(kwargs.items()))
                 cache_key = ':'.join(key_parts)
             
-            # Try to get from cache
-            cached_value = cache_manager.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-            
-            # Call function and cache result
-            result = func(*args, **kwargs)
-            cache_manager.set(cache_key, result, ttl)
-            
-            return result
+            # Single-flight: concurrent misses run func only once
+            return cache_manager.get_or_set(
+                cache_key,
+                lambda: func(*args, **kwargs),
+                ttl
+            )
         return wrapper
     return decorator
 
@@ -239,6 +838,9 @@ def invalidate_cache(*patterns: str):
     """
     Decorator to invalidate cache patterns after function execution.
     
+    Patterns of the form ``prefix:*`` only bump a generation counter
+    (O(1)); exact keys are deleted; anything else uses SCAN/UNLINK.
+    
     Usage:
         @invalidate_cache('courses:*', 'user:123:enrollments')
         def enroll_user(user_id, course_id):
@@ -251,7 +853,10 @@ def invalidate_cache(*patterns: str):
             
             # Invalidate cache patterns
             for pattern in patterns:
-                cache_manager.delete_pattern(pattern)
+                if any(ch in pattern for ch in '*?['):
+                    cache_manager.delete_pattern(pattern)
+                else:
+                    cache_manager.delete(pattern)
             
             return result
         return wrapper
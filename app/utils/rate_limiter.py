@@ -1,12 +1,14 @@
 """
 Rate limiting middleware for API protection.
-Implements Token Bucket algorithm with Redis backend.
+Implements GCRA (a token-bucket equivalent) with an atomic Redis Lua script.
 """
 
+import logging
+import math
 import time
+from dataclasses import dataclass
 from functools import wraps
-from typing import Callable, Optional, Tuple
-from collections import defaultdict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
 import threading
 
 from flask import request, g, current_app
@@ -15,6 +17,8 @@ from redis import ConnectionPool
 
 from app.utils.helpers import get_client_ip
 
+logger = logging.getLogger(__name__)
+
 
 # Global connection pool for Redis (singleton pattern)
 _redis_pool: Optional[ConnectionPool] = None
@@ -48,67 +52,281 @@ def get_redis_pool() -> ConnectionPool:
     return _redis_pool
 
 
+# =============================================================================
+# GCRA (Generic Cell Rate Algorithm)
+# =============================================================================
+#
+# Her anahtar için yalnızca bir "teorik varış zamanı" (TAT, ms) saklanır:
+# O(1) bellek, reddedilen istekler durum büyütmez. `limit` istek / `period`
+# saniye için emisyon aralığı T = period / limit; bir istek TAT + cost*T -
+# period <= now ise kabul edilir (tam `limit` kadar burst'e izin verir).
+#
+# Çoklu limitler (ör. IP + kullanıcı + endpoint) tek script çağrısında
+# birlikte değerlendirilir; biri reddederse hiçbiri tüketilmez.
+
+MODE_CONSUME = 'consume'   # Hepsi izinliyse tüket
+MODE_PEEK = 'peek'         # Yalnızca kontrol et
+MODE_FORCE = 'force'       # Sonuçtan bağımsız tüket (gerçekleşen kullanımı kaydet)
+
+GCRA_SCRIPT = """
+if redis.replicate_commands then
+    redis.replicate_commands()
+end
+local now_parts = redis.call('TIME')
+local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+local mode = ARGV[1]
+local allowed = 1
+local new_tats = {}
+local result = {}
+
+for i = 1, #KEYS do
+    local base = 1 + (i - 1) * 3
+    local interval = tonumber(ARGV[base + 1])
+    local period = tonumber(ARGV[base + 2])
+    local cost = tonumber(ARGV[base + 3])
+
+    local tat = tonumber(redis.call('GET', KEYS[i]) or now)
+    if tat < now then
+        tat = now
+    end
+
+    local new_tat = tat + cost * interval
+    local allow_at = new_tat - period
+    local ok = 1
+    local retry_after = 0
+    if allow_at > now then
+        ok = 0
+        retry_after = allow_at - now
+        allowed = 0
+    end
+    new_tats[i] = new_tat
+
+    local effective = tat
+    if ok == 1 and cost > 0 then
+        effective = new_tat
+    end
+    local remaining = math.floor((period - (effective - now)) / interval)
+    if remaining < 0 then
+        remaining = 0
+    end
+
+    table.insert(result, ok)
+    table.insert(result, remaining)
+    table.insert(result, math.ceil(retry_after))
+    table.insert(result, math.ceil(effective - now))
+end
+
+if mode == 'force' or (mode == 'consume' and allowed == 1) then
+    for i = 1, #KEYS do
+        local ttl = math.ceil(new_tats[i] - now)
+        if ttl > 0 then
+            redis.call('SET', KEYS[i], string.format('%.3f', new_tats[i]), 'PX', ttl)
+        end
+    end
+end
+
+table.insert(result, 1, allowed)
+return result
+"""
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Tek bir limit: `limit` birim / `period` saniye."""
+    key: str
+    limit: int
+    period: int
+    cost: int = 1
+
+
+@dataclass
+class RateLimitDecision:
+    """Bir limitin değerlendirme sonucu."""
+    key: str
+    limit: int
+    allowed: bool
+    remaining: int
+    retry_after: Optional[int]
+    reset: int
+
+    def to_info(self) -> dict:
+        """Yanıt başlıkları için sözlük (eski `info` biçimi)."""
+        return {
+            'limit': self.limit,
+            'remaining': self.remaining,
+            'reset': self.reset,
+            'retry_after': self.retry_after
+        }
+
+
+def _script_args(limits: Sequence[RateLimit], mode: str) -> List:
+    args = [mode]
+    for item in limits:
+        period_ms = item.period * 1000
+        args.extend([period_ms / item.limit, period_ms, item.cost])
+    return args
+
+
+def _build_decisions(
+    limits: Sequence[RateLimit],
+    raw: Sequence[int],
+    now: float
+) -> Tuple[bool, List[RateLimitDecision]]:
+    """Script/yerel değerlendirme çıktısını kararlara çevirir."""
+    decisions = []
+    for i, item in enumerate(limits):
+        ok, remaining, retry_ms, reset_ms = raw[1 + i * 4:5 + i * 4]
+        decisions.append(RateLimitDecision(
+            key=item.key,
+            limit=item.limit,
+            allowed=bool(ok),
+            remaining=int(remaining),
+            retry_after=None if ok else max(1, math.ceil(int(retry_ms) / 1000)),
+            reset=int(now + math.ceil(int(reset_ms) / 1000))
+        ))
+    return bool(raw[0]), decisions
+
+
 class InMemoryRateLimiter:
     """
-    In-memory fallback rate limiter when Redis is unavailable.
-    Uses sliding window algorithm.
+    Redis yokken kullanılan yerel GCRA.
+    
+    Lua script'i ile birebir aynı algoritma ve sonuçlar.
     """
     
     def __init__(self):
-        self._requests: defaultdict = defaultdict(list)
+        self._tats: Dict[str, float] = {}  # key -> TAT (ms)
         self._lock = threading.Lock()
     
-    def is_allowed(self, key: str, limit: int, period: int) -> Tuple[bool, dict]:
-        """Check if request is allowed using in-memory storage."""
-        now = time.time()
+    def evaluate(self, limits: Sequence[RateLimit], mode: str = MODE_CONSUME) -> List:
+        """Script ile aynı biçimde ham sonuç döner."""
+        now = math.floor(time.time() * 1000)
         
         with self._lock:
-            # Clean old entries
-            self._requests[key] = [
-                ts for ts in self._requests[key]
-                if ts > now - period
-            ]
+            allowed = 1
+            new_tats = []
+            result = []
             
-            current_count = len(self._requests[key])
+            for item in limits:
+                period = item.period * 1000
+                interval = period / item.limit
+                tat = max(self._tats.get(item.key, now), now)
+                
+                new_tat = tat + item.cost * interval
+                allow_at = new_tat - period
+                ok = 1
+                retry_after = 0
+                if allow_at > now:
+                    ok = 0
+                    retry_after = allow_at - now
+                    allowed = 0
+                new_tats.append(new_tat)
+                
+                effective = new_tat if ok and item.cost > 0 else tat
+                remaining = max(0, math.floor((period - (effective - now)) / interval))
+                result.extend([ok, remaining, math.ceil(retry_after), math.ceil(effective - now)])
             
-            if current_count < limit:
-                self._requests[key].append(now)
-                remaining = limit - current_count - 1
-                allowed = True
-            else:
-                remaining = 0
-                allowed = False
+            if mode == MODE_FORCE or (mode == MODE_CONSUME and allowed):
+                for item, new_tat in zip(limits, new_tats):
+                    if new_tat > now:
+                        self._tats[item.key] = new_tat
             
-            return allowed, {
-                'limit': limit,
-                'remaining': remaining,
-                'reset': int(now + period),
-                'retry_after': period if not allowed else None
-            }
+            return [allowed] + result
+    
+    def is_allowed(self, key: str, limit: int, period: int) -> Tuple[bool, dict]:
+        """Check if request is allowed using in-memory storage."""
+        limits = [RateLimit(key, limit, period)]
+        allowed, decisions = _build_decisions(limits, self.evaluate(limits), time.time())
+        return allowed, decisions[0].to_info()
+    
+    def reset(self, keys: Iterable[str]) -> None:
+        """Anahtarları sıfırlar."""
+        with self._lock:
+            for key in keys:
+                self._tats.pop(key, None)
     
     def cleanup(self, max_age: int = 3600):
-        """Remove old entries to prevent memory bloat."""
-        now = time.time()
+        """Remove expired entries to prevent memory bloat."""
+        now = time.time() * 1000
         with self._lock:
-            keys_to_remove = []
-            for key, timestamps in self._requests.items():
-                self._requests[key] = [ts for ts in timestamps if ts > now - max_age]
-                if not self._requests[key]:
-                    keys_to_remove.append(key)
-            
-            for key in keys_to_remove:
-                del self._requests[key]
+            for key in [k for k, tat in self._tats.items() if tat <= now]:
+                del self._tats[key]
 
 
 # Global in-memory fallback
 _memory_limiter = InMemoryRateLimiter()
 
 
+class GCRALimiter:
+    """
+    Çoklu limitleri tek round trip'te değerlendiren GCRA limiter.
+    
+    Redis varsa Lua script'i (EVALSHA) kullanılır; istemci yoksa veya
+    Redis hata verirse aynı algoritmanın yerel kopyasına düşülür.
+    
+    Usage:
+        limiter = GCRALimiter(lambda: redis_client)
+        allowed, decisions = limiter.check([
+            RateLimit('rl:ip:1.2.3.4', 100, 60),
+            RateLimit('rl:user:42', 30, 60),
+        ])
+    """
+    
+    def __init__(
+        self,
+        client_getter: Callable[[], Optional[redis.Redis]],
+        fallback: InMemoryRateLimiter = None
+    ):
+        self._client_getter = client_getter
+        self._fallback = fallback or InMemoryRateLimiter()
+        self._scripts: Dict[int, Any] = {}
+    
+    def _script(self, client: redis.Redis):
+        script = self._scripts.get(id(client))
+        if script is None:
+            script = self._scripts[id(client)] = client.register_script(GCRA_SCRIPT)
+        return script
+    
+    def evaluate(self, limits: Sequence[RateLimit], mode: str = MODE_CONSUME) -> List:
+        """Ham sonuç: [allowed, (ok, remaining, retry_ms, reset_ms) * n]."""
+        client = self._client_getter()
+        if client is not None:
+            try:
+                return self._script(client)(
+                    keys=[item.key for item in limits],
+                    args=_script_args(limits, mode)
+                )
+            except redis.RedisError as e:
+                logger.warning(f'GCRA script error, using local fallback: {e}')
+        return self._fallback.evaluate(limits, mode)
+    
+    def check(
+        self,
+        limits: Sequence[RateLimit],
+        mode: str = MODE_CONSUME
+    ) -> Tuple[bool, List[RateLimitDecision]]:
+        """Tüm limitleri birlikte değerlendirir."""
+        if not limits:
+            return True, []
+        return _build_decisions(limits, self.evaluate(limits, mode), time.time())
+    
+    def reset(self, keys: Iterable[str]) -> None:
+        """Anahtarları sıfırlar (admin)."""
+        keys = list(keys)
+        self._fallback.reset(keys)
+        client = self._client_getter()
+        if client is not None and keys:
+            try:
+                client.delete(*keys)
+            except redis.RedisError as e:
+                logger.warning(f'GCRA reset error: {e}')
+
+
 class RateLimiter:
     """
-    Token Bucket rate limiter with Redis backend.
-    Supports per-IP and per-user rate limiting.
-    Falls back to in-memory limiter when Redis is unavailable.
+    GCRA rate limiter with Redis backend.
+    Supports per-IP, per-user and per-endpoint rate limiting.
+    Falls back to an identical in-memory limiter when Redis is unavailable.
     """
     
     def __init__(self, redis_client: redis.Redis = None):
@@ -117,6 +335,7 @@ class RateLimiter:
         self._redis_healthy = True
         self._last_health_check = 0
         self._health_check_interval = 30  # seconds
+        self._gcra = GCRALimiter(self._healthy_client, fallback=_memory_limiter)
     
     @property
     def client(self) -> Optional[redis.Redis]:
@@ -156,10 +375,42 @@ class RateLimiter:
         
         return self._redis_healthy
     
+    def _healthy_client(self) -> Optional[redis.Redis]:
+        """Sağlıklıysa Redis istemcisi, değilse None (yerel fallback)."""
+        if not self._check_redis_health():
+            return None
+        return self.client
+    
     def _get_key(self, identifier: str, limit_type: str) -> str:
         """Generate rate limit key."""
         return f"{self.prefix}{limit_type}:{identifier}"
     
+    def check_limits(
+        self,
+        limits: Sequence[Tuple[str, int, int, str]],
+        mode: str = MODE_CONSUME
+    ) -> Tuple[bool, List[RateLimitDecision]]:
+        """
+        Birden çok limiti (ör. IP + kullanıcı + endpoint) tek çağrıda kontrol eder.
+        
+        Args:
+            limits: (identifier, limit, period, limit_type) demetleri
+            mode: consume / peek / force
+        
+        Returns:
+            Tuple of (is_allowed, decisions)
+        """
+        specs = [
+            RateLimit(self._get_key(identifier, limit_type), limit, period)
+            for identifier, limit, period, limit_type in limits
+        ]
+        try:
+            return self._gcra.check(specs, mode)
+        except redis.RedisError as e:
+            current_app.logger.error(f"Rate limiter Redis error: {e}")
+            self._redis_healthy = False
+            return _build_decisions(specs, _memory_limiter.evaluate(specs, mode), time.time())
+    
     def is_allowed(
         self,
         identifier: str,
@@ -179,77 +430,52 @@ class RateLimiter:
         Returns:
             Tuple of (is_allowed, rate_limit_info)
         """
-        key = self._get_key(identifier, limit_type)
-        now = time.time()
-        
-        # Check Redis health first
-        if not self._check_redis_health():
-            # Use in-memory fallback
-            current_app.logger.warning("Redis unavailable, using in-memory rate limiter")
-            return _memory_limiter.is_allowed(key, limit, period)
-        
-        try:
-            client = self.client
-            if client is None:
-                return _memory_limiter.is_allowed(key, limit, period)
-            
-            pipe = client.pipeline()
-            
-            # Remove old entries outside the window
-            pipe.zremrangebyscore(key, 0, now - period)
-            
-            # Count current requests in window
-            pipe.zcard(key)
-            
-            # Add current request
-            pipe.zadd(key, {str(now): now})
-            
-            # Set expiry on the key
-            pipe.expire(key, period)
-            
-            results = pipe.execute()
-            current_count = results[1]
-            
-            remaining = max(0, limit - current_count - 1)
-            reset_time = int(now + period)
-            
-            info = {
-                'limit': limit,
-                'remaining': remaining,
-                'reset': reset_time,
-                'retry_after': period if current_count >= limit else None
-            }
-            
-            return current_count < limit, info
-            
-        except redis.RedisError as e:
-            current_app.logger.error(f"Rate limiter Redis error: {e}")
-            self._redis_healthy = False
-            # Use in-memory fallback instead of fail-open
-            return _memory_limiter.is_allowed(key, limit, period)
+        allowed, decisions = self.check_limits([(identifier, limit, period, limit_type)])
+        return allowed, decisions[0].to_info()
     
-    def get_usage(self, identifier: str, limit_type: str = 'ip') -> int:
-        """Get current usage count for identifier."""
-        key = self._get_key(identifier, limit_type)
-        now = time.time()
-        
-        try:
-            # Count requests in last minute
-            return self.client.zcount(key, now - 60, now)
-        except redis.RedisError:
-            return 0
+    def get_usage(
+        self,
+        identifier: str,
+        limit_type: str = 'ip',
+        limit: int = 100,
+        period: int = 60
+    ) -> int:
+        """Get current usage (consumed capacity) for identifier."""
+        allowed, decisions = self.check_limits(
+            [(identifier, limit, period, limit_type)], mode=MODE_PEEK
+        )
+        return limit - decisions[0].remaining
 
 
 # Global rate limiter instance
 rate_limiter = RateLimiter()
 
 
+def _limit_identifier(by: str) -> str:
+    """'ip', 'user' veya 'endpoint' için istek tanımlayıcısı."""
+    if by == 'endpoint':
+        return 'all'
+    
+    if by == 'user':
+        from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+        try:
+            verify_jwt_in_request(optional=True)
+            identifier = get_jwt_identity()
+            if identifier:
+                return identifier
+        except:
+            pass
+    
+    return get_client_ip(request)
+
+
 def rate_limit(
     limit: int = 100,
     period: int = 60,
     by: str = 'ip',
     scope: str = None,
-    error_message: str = None
+    error_message: str = None,
+    extra_limits: List[dict] = None
 ):
     """
     Rate limiting decorator for Flask routes.
@@ -257,16 +483,25 @@ def rate_limit(
     Args:
         limit: Maximum requests allowed
         period: Time period in seconds (default: 60 = 1 minute)
-        by: Rate limit by 'ip' or 'user'
+        by: Rate limit by 'ip', 'user' or 'endpoint' (shared by all callers)
         scope: Custom scope for grouping endpoints
         error_message: Custom error message
+        extra_limits: Additional limits ({'limit', 'period', 'by'}) checked
+            atomically together with the main one
     
     Usage:
         @app.route('/api/login')
         @rate_limit(limit=5, period=60, by='ip')  # 5 attempts per minute
         def login():
             ...
+        
+        @rate_limit(limit=30, period=60, by='user',
+                    extra_limits=[{'limit': 100, 'period': 60, 'by': 'ip'}])
+        def search():
+            ...
     """
+    specs = [{'limit': limit, 'period': period, 'by': by}] + list(extra_limits or [])
+    
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -274,29 +509,24 @@ def rate_limit(
             if not current_app.config.get('RATELIMIT_ENABLED', True):
                 return func(*args, **kwargs)
             
-            # Determine identifier
-            if by == 'user':
-                from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
-                try:
-                    verify_jwt_in_request(optional=True)
-                    identifier = get_jwt_identity()
-                    if not identifier:
-                        identifier = get_client_ip(request)
-                except:
-                    identifier = get_client_ip(request)
-            else:
-                identifier = get_client_ip(request)
-            
             # Add scope to identifier if provided
             limit_scope = scope or func.__name__
-            full_identifier = f"{identifier}:{limit_scope}"
+            limits = [
+                (
+                    f"{_limit_identifier(spec['by'])}:{limit_scope}",
+                    spec['limit'],
+                    spec['period'],
+                    spec['by']
+                )
+                for spec in specs
+            ]
             
-            # Check rate limit
-            allowed, info = rate_limiter.is_allowed(
-                full_identifier, limit, period, by
-            )
+            # Check all limits in a single round trip
+            allowed, decisions = rate_limiter.check_limits(limits)
             
-            # Add rate limit headers to response
+            # Most restrictive limit goes into response headers
+            decision = min(decisions, key=lambda d: (d.allowed, d.remaining))
+            info = decision.to_info()
             g.rate_limit_info = info
             
             if not allowed:
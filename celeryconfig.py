@@ -100,6 +100,7 @@ task_routes = {
     # Default priority - regular background tasks
     'app.tasks.video_tasks.*': {'queue': 'default'},
     'app.tasks.email_tasks.send_weekly_summary': {'queue': 'default'},
+    'app.tasks.notification_tasks.*': {'queue': 'default'},
     
     # Low priority - reports and analytics
     'app.tasks.report_tasks.*': {'queue': 'low'},
@@ -140,6 +141,45 @@ beat_schedule = {
         'options': {'queue': 'low'}
     },
     
+    # Akran yüzdelik indekslerini yeniden kur (kayan 30 günlük pencere)
+    'rebuild-peer-percentiles': {
+        'task': 'app.tasks.report_tasks.rebuild_peer_percentiles_task',
+        'schedule': timedelta(hours=1),
+        'options': {'queue': 'low'}
+    },
+    
+    # =========================================================================
+    # EVERY MINUTE
+    # =========================================================================
+    
+    # Request log rollups (dakikalık/saatlik özet + gecikme histogramı)
+    'rollup-request-logs': {
+        'task': 'app.tasks.cleanup_tasks.rollup_request_logs',
+        'schedule': timedelta(minutes=1),
+        'options': {'queue': 'low', 'expires': 55}
+    },
+    
+    # Redis video izlenme sayaçlarını DB'ye yaz (write-behind)
+    'flush-video-view-counts': {
+        'task': 'app.tasks.video_tasks.flush_video_view_counts_task',
+        'schedule': timedelta(minutes=1),
+        'options': {'queue': 'default', 'expires': 55}
+    },
+    
+    # Biten izleme oturumlarını video ısı haritalarına birleştir
+    'merge-video-engagement': {
+        'task': 'app.tasks.video_tasks.merge_video_engagement_task',
+        'schedule': timedelta(minutes=5),
+        'options': {'queue': 'low', 'expires': 290}
+    },
+    
+    # Yeni attempt'i olan öğrencilerin akran indeksi skorları
+    'refresh-peer-percentiles': {
+        'task': 'app.tasks.report_tasks.refresh_peer_percentiles_task',
+        'schedule': timedelta(minutes=1),
+        'options': {'queue': 'low', 'expires': 55}
+    },
+    
     # =========================================================================
     # EVERY 15 MINUTES
     # =========================================================================
@@ -170,6 +210,13 @@ beat_schedule = {
         'options': {'queue': 'low'}
     },
     
+    # Log tablosu bölümlerini önceden oluştur (00:15)
+    'maintain-log-partitions': {
+        'task': 'app.tasks.cleanup_tasks.maintain_log_partitions',
+        'schedule': crontab(hour=0, minute=15),
+        'options': {'queue': 'low'}
+    },
+    
     # Request logs cleanup (03:00)
     'cleanup-request-logs': {
         'task': 'app.tasks.cleanup_tasks.cleanup_old_request_logs',
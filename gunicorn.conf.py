@@ -191,8 +191,12 @@ def child_exit(server, worker):
 
 def worker_exit(server, worker):
     """Called in the worker process just after exiting."""
-    # Cleanup resources
-    pass
+    # Tamponda bekleyen istek/metrik loglarını yaz
+    try:
+        from app.services.log_service import PerformanceService
+        PerformanceService.flush()
+    except Exception:
+        pass
 
 
 def nworkers_changed(server, new_value, old_value):
@@ -0,0 +1,49 @@
+"""Add enrollments.completed_lessons counter
+
+Revision ID: add_enrollment_completed_lessons
+Revises: partition_log_tables
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_enrollment_completed_lessons'
+down_revision = 'partition_log_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Kayıt başına tamamlanan video sayacı.
+
+    İlerleme güncellemelerinde artımlı tutulur; mevcut kayıtlar yayındaki,
+    silinmemiş videolar üzerinden bir kez doldurulur.
+    """
+    op.add_column(
+        'enrollments',
+        sa.Column('completed_lessons', sa.Integer(), nullable=False, server_default='0')
+    )
+    op.execute(
+        """
+        UPDATE enrollments SET completed_lessons = (
+            SELECT COUNT(*)
+            FROM content_progress cp
+            JOIN videos v ON v.id = cp.content_id
+            JOIN topics t ON t.id = v.topic_id
+            WHERE cp.user_id = enrollments.user_id
+              AND t.course_id = enrollments.course_id
+              AND cp.content_type = 'VIDEO'
+              AND cp.is_completed = TRUE
+              AND v.is_deleted = FALSE
+              AND v.content_status = 'PUBLISHED'
+        )
+        """
+    )
+
+
+def downgrade():
+    op.drop_column('enrollments', 'completed_lessons')
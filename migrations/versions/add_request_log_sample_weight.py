@@ -0,0 +1,32 @@
+"""Add request_logs.sample_weight
+
+Revision ID: add_request_log_sample_weight
+Revises: add_enrollment_completed_lessons
+Create Date: 2026-10-16 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_request_log_sample_weight'
+down_revision = 'add_enrollment_completed_lessons'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Örneklenen request log satırlarının ağırlığı.
+
+    Mevcut satırlar örneklemesiz yazıldığı için 1 ile doldurulur.
+    """
+    op.add_column(
+        'request_logs',
+        sa.Column('sample_weight', sa.Float(), nullable=False, server_default='1')
+    )
+
+
+def downgrade():
+    op.drop_column('request_logs', 'sample_weight')
@@ -0,0 +1,61 @@
+"""Add request_rollups and job_checkpoints tables
+
+Revision ID: add_request_rollups
+Revises: 0a84bddb1563
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_request_rollups'
+down_revision = '0a84bddb1563'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Dakikalık/saatlik request rollup tablosu ve artımlı işler için
+    checkpoint tablosu.
+    """
+    op.create_table('request_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('granularity', sa.String(length=10), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(), nullable=False),
+        sa.Column('endpoint', sa.String(length=200), nullable=False),
+        sa.Column('http_method', sa.String(length=10), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('sum_ms', sa.Float(), nullable=False),
+        sa.Column('min_ms', sa.Float(), nullable=True),
+        sa.Column('max_ms', sa.Float(), nullable=True),
+        sa.Column('slow_count', sa.Integer(), nullable=False),
+        sa.Column('histogram', sa.JSON(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'granularity', 'bucket_start', 'endpoint', 'http_method', 'status_code',
+            name='uq_request_rollup_bucket'
+        )
+    )
+    op.create_index(
+        'ix_request_rollup_granularity_bucket', 'request_rollups',
+        ['granularity', 'bucket_start'], unique=False
+    )
+
+    op.create_table('job_checkpoints',
+        sa.Column('name', sa.String(length=100), nullable=False),
+        sa.Column('last_id', sa.BigInteger(), nullable=False),
+        sa.Column('state', sa.JSON(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade():
+    op.drop_table('job_checkpoints')
+    op.drop_index('ix_request_rollup_granularity_bucket', table_name='request_rollups')
+    op.drop_table('request_rollups')
@@ -0,0 +1,55 @@
+"""Add student_performance_aggregates table
+
+Revision ID: add_student_perf_aggregates
+Revises: add_request_rollups
+Create Date: 2026-10-16 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_student_perf_aggregates'
+down_revision = 'add_request_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    """
+    Öğrenci x konu x boyut x gün performans özetleri.
+
+    Mevcut veriler için `rebuild_performance_aggregates_task` çalıştırılmalı.
+    """
+    op.create_table('student_performance_aggregates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('topic_id', sa.Integer(), nullable=False),
+        sa.Column('dimension', sa.String(length=20), nullable=False),
+        sa.Column('dimension_value', sa.String(length=50), nullable=False),
+        sa.Column('day', sa.Date(), nullable=False),
+        sa.Column('attempt_count', sa.Integer(), nullable=False),
+        sa.Column('correct_count', sa.Integer(), nullable=False),
+        sa.Column('time_spent_sum', sa.Integer(), nullable=False),
+        sa.Column('correct_time_sum', sa.Integer(), nullable=False),
+        sa.Column('timed_count', sa.Integer(), nullable=False),
+        sa.Column('timed_correct_count', sa.Integer(), nullable=False),
+        sa.Column('recent_results', sa.String(length=50), nullable=False),
+        sa.Column('last_attempt_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint(
+            'user_id', 'topic_id', 'dimension', 'dimension_value', 'day',
+            name='uq_student_performance_aggregate'
+        )
+    )
+    op.create_index(
+        'ix_student_performance_user_day', 'student_performance_aggregates',
+        ['user_id', 'dimension', 'day'], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_student_performance_user_day', table_name='student_performance_aggregates')
+    op.drop_table('student_performance_aggregates')
@@ -0,0 +1,148 @@
+"""Range-partition append-only log tables by created_at (PostgreSQL)
+
+Revision ID: partition_log_tables
+Revises: add_student_perf_aggregates
+Create Date: 2026-10-16 14:00:00.000000
+
+"""
+from datetime import datetime, timedelta
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'partition_log_tables'
+down_revision = 'add_student_perf_aggregates'
+branch_labels = None
+depends_on = None
+
+
+# Tablo -> bölüm aralığı (PartitionService.TABLES ile aynı)
+TABLES = {
+    'request_logs': 'day',
+    'performance_metrics': 'day',
+    'audit_logs': 'month',
+    'ai_usage_logs': 'month',
+}
+
+PRECREATE = {'day': 7, 'month': 2}
+
+
+def _period_start(moment, interval):
+    if interval == 'month':
+        return datetime(moment.year, moment.month, 1)
+    return datetime(moment.year, moment.month, moment.day)
+
+
+def _next_period(start, interval):
+    if interval == 'month':
+        return datetime(start.year + (start.month == 12), start.month % 12 + 1, 1)
+    return start + timedelta(days=1)
+
+
+def _partition_name(table, start, interval):
+    return f"{table}_p{start.strftime('%Y%m' if interval == 'month' else '%Y%m%d')}"
+
+
+def _partition_table(bind, table, interval):
+    """
+    Mevcut tabloyu bölümlü bir üst tablonun ilk bölümü yapar.
+
+    Veri kopyalanmaz: eski tablo `<tablo>_legacy` adıyla
+    (MINVALUE, sonraki periyot) aralığına ATTACH edilir; saklama süresi
+    dolunca tek DROP ile gider. Yeni satırlar periyot bölümlerine yazılır.
+    """
+    legacy = f'{table}_legacy'
+    inspector = sa.inspect(bind)
+    indexes = inspector.get_indexes(table)
+    foreign_keys = inspector.get_foreign_keys(table)
+
+    # Bölüm anahtarı NOT NULL olmalı
+    op.execute(f"UPDATE {table} SET created_at = now() WHERE created_at IS NULL")
+    op.execute(f"ALTER TABLE {table} ALTER COLUMN created_at SET NOT NULL")
+
+    latest = bind.execute(sa.text(f'SELECT max(created_at) FROM {table}')).scalar()
+    now = datetime.utcnow()
+    legacy_until = _next_period(_period_start(max(now, latest or now), interval), interval)
+
+    op.execute(f'ALTER TABLE {table} RENAME TO {legacy}')
+    op.execute(
+        f'CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) '
+        f'PARTITION BY RANGE (created_at)'
+    )
+    # id dizisi eski tablo düşürülünce silinmesin
+    op.execute(
+        f"ALTER SEQUENCE IF EXISTS {table}_id_seq OWNED BY {table}.id"
+    )
+    op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)')
+
+    op.execute(
+        f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+        f"FOR VALUES FROM (MINVALUE) TO ('{legacy_until.isoformat(' ')}')"
+    )
+
+    # Üst tablo indeksleri; eşleşen eski indeksler yeniden kurulmadan bağlanır
+    for index in indexes:
+        columns = list(index['column_names'])
+        if index['unique'] and 'created_at' not in columns:
+            columns.append('created_at')  # Bölümlü tabloda tekillik anahtarı içermeli
+        unique = 'UNIQUE ' if index['unique'] else ''
+        op.execute(f"CREATE {unique}INDEX ON {table} ({', '.join(columns)})")
+
+    for fk in foreign_keys:
+        ondelete = fk.get('options', {}).get('ondelete')
+        op.create_foreign_key(
+            None, table, fk['referred_table'],
+            fk['constrained_columns'], fk['referred_columns'],
+            ondelete=ondelete
+        )
+
+    start = legacy_until
+    for _ in range(PRECREATE[interval]):
+        end = _next_period(start, interval)
+        op.execute(
+            f"CREATE TABLE {_partition_name(table, start, interval)} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat(' ')}') TO ('{end.isoformat(' ')}')"
+        )
+        start = end
+
+    # Bakım görevi geride kalırsa INSERT'ler hata vermek yerine buraya düşer;
+    # PartitionService.ensure_partitions satırları yeni bölümlere taşır
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+
+
+def upgrade():
+    """
+    request_logs / performance_metrics günlük, audit_logs / ai_usage_logs
+    aylık RANGE bölümlü hale getirilir.
+
+    Yalnızca PostgreSQL; SQLite'ta tablolar olduğu gibi kalır. Sonraki
+    bölümleri `maintain_log_partitions` görevi önceden oluşturur.
+    """
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    for table, interval in TABLES.items():
+        _partition_table(bind, table, interval)
+
+
+def downgrade():
+    """Bölümlü tabloları veriyi kopyalayarak düz tabloya geri çevirir."""
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+
+    for table in TABLES:
+        plain = f'{table}_plain'
+        op.execute(
+            f'CREATE TABLE {plain} (LIKE {table} INCLUDING DEFAULTS '
+            f'INCLUDING CONSTRAINTS INCLUDING INDEXES)'
+        )
+        op.execute(f'INSERT INTO {plain} SELECT * FROM {table}')
+        op.execute(f'ALTER SEQUENCE IF EXISTS {table}_id_seq OWNED BY {plain}.id')
+        op.execute(f'DROP TABLE {table} CASCADE')
+        op.execute(f'ALTER TABLE {plain} RENAME TO {table}')
+        op.execute(f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {plain}_pkey')
+        op.execute(f'ALTER TABLE {table} ADD PRIMARY KEY (id)')
@@ -3,6 +3,8 @@ Test configuration and fixtures.
 """
 
 import pytest
+from flask import Flask
+
 from app import create_app
 from app.extensions import db
 from app.models.user import User, Role, Permission
@@ -22,6 +24,41 @@ def app():
         db.drop_all()
 
 
+@pytest.fixture
+def sqlite_app():
+    """
+    Standalone in-memory SQLite app with only the given tables created.
+    
+    Usage: ``sqlite_app(Model.__table__, ..., SOME_CONFIG=value)`` returns the
+    Flask app with its app context pushed; the context is popped on teardown.
+    Tables from other MetaData objects (ad-hoc test tables) are supported.
+    """
+    contexts = []
+    
+    def factory(*tables, **config):
+        flask_app = Flask(__name__)
+        flask_app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://', SECRET_KEY='test')
+        flask_app.config.update(config)
+        db.init_app(flask_app)
+        
+        context = flask_app.app_context()
+        context.push()
+        contexts.append(context)
+        
+        by_metadata = {}
+        for table in tables:
+            by_metadata.setdefault(table.metadata, []).append(table)
+        for metadata, group in by_metadata.items():
+            metadata.create_all(db.engine, tables=group)
+        return flask_app
+    
+    yield factory
+    
+    for context in reversed(contexts):
+        db.session.remove()
+        context.pop()
+
+
 @pytest.fixture
 def client(app):
     """Create test client."""
@@ -0,0 +1,71 @@
+"""
+AI Batch Task Tests.
+
+Toplu AI isteklerinin paralel işlenmesi için test senaryoları.
+"""
+
+import threading
+import time
+
+import pytest
+
+from app.tasks import ai_tasks
+
+
+class FakeResult:
+    def __init__(self, value):
+        self._value = value
+
+    def get(self):
+        return self._value
+
+
+@pytest.fixture
+def fake_ai(monkeypatch):
+    """Sağlayıcıyı taklit eden, eşzamanlılığı ölçen process_ai_request."""
+    state = {'active': 0, 'peak': 0}
+    lock = threading.Lock()
+
+    def apply(args=None):
+        with lock:
+            state['active'] += 1
+            state['peak'] = max(state['peak'], state['active'])
+        time.sleep(0.05)
+        with lock:
+            state['active'] -= 1
+        return FakeResult({'success': True, 'tokens_used': 10, 'request_id': args[5]})
+
+    monkeypatch.setattr(ai_tasks.process_ai_request, 'apply', apply)
+    monkeypatch.setattr(ai_tasks.batch_process_ai_requests, 'update_state', lambda **kw: None)
+    return state
+
+
+class TestBatchProcessAIRequests:
+    """batch_process_ai_requests testleri."""
+
+    def test_parallel_results_keep_request_order(self, fake_ai):
+        """İstekler sınırlı paralellikte işlenmeli, sonuç sırası korunmalı."""
+        requests = [
+            {'feature': 'question_hint', 'prompt': 'p', 'request_id': str(i)}
+            for i in range(8)
+        ]
+
+        result = ai_tasks.batch_process_ai_requests(requests, 1, 'student', concurrency=4)
+
+        assert result['successful'] == 8
+        assert result['total_tokens'] == 80
+        assert [r['request_id'] for r in result['results']] == [str(i) for i in range(8)]
+        assert 1 < fake_ai['peak'] <= 4
+
+    def test_disallowed_feature_fails_without_provider_call(self, fake_ai):
+        """Kota/rol kontrolünü geçemeyen istek sağlayıcıya gitmemeli."""
+        requests = [
+            {'feature': 'question_hint', 'prompt': 'p', 'request_id': 'ok'},
+            {'feature': 'unknown_feature', 'prompt': 'p', 'request_id': 'bad'},
+        ]
+
+        result = ai_tasks.batch_process_ai_requests(requests, 1, 'student', concurrency=2)
+
+        assert (result['successful'], result['failed']) == (1, 1)
+        assert result['results'][1]['request_id'] == 'bad'
+        assert fake_ai['peak'] == 1
@@ -0,0 +1,136 @@
+"""
+Answer Key Tests.
+
+Derlenmiş sınav cevap anahtarı ve anahtarla deterministik puanlama testleri.
+"""
+
+import inspect
+from types import SimpleNamespace
+
+import pytest
+from flask import g
+
+from app.api.v1.exams import ExamQuestionDetail
+from app.extensions import db
+from app.modules.exams.answer_key import AnswerKeyService, ExamAnswerKey, QuestionKey
+from app.modules.exams.grading_service import DeterministicGrader
+from app.modules.exams.models import (
+    Answer, AttemptAnswer, Exam, ExamAttempt, Question, QuestionType
+)
+from app.services.cache_service import CacheService
+
+
+def make_key():
+    """Üç soruluk örnek anahtar."""
+    return ExamAnswerKey.build(7, 50.0, [
+        QuestionKey(1, QuestionType.SINGLE_CHOICE, 2.0, correct_ids=(11,), option_ids=(10, 11, 12)),
+        QuestionKey(2, QuestionType.MULTIPLE_CHOICE, 4.0, correct_ids=(21, 22), option_ids=(20, 21, 22)),
+        QuestionKey(3, QuestionType.SHORT_ANSWER, 1.0, accepted_texts=('ankara', 'angora'), plain_text='ankara|angora'),
+    ])
+
+
+class TestExamAnswerKey:
+    """Anahtar serileştirme testleri."""
+
+    def test_round_trip_keeps_version(self):
+        """Redis'e yazılıp okunan anahtar aynı sürüm ve içerikle dönmeli."""
+        key = make_key()
+        restored = ExamAnswerKey.from_dict(key.to_dict())
+
+        assert restored == key
+        assert restored.version == key.version
+        assert restored.by_id[2].correct_ids == (21, 22)
+        assert restored.total_points == 7.0
+        assert restored.has_essay is False
+
+    def test_version_changes_with_content(self):
+        """Puan değişince sürüm değişmeli."""
+        key = make_key()
+        changed = ExamAnswerKey.build(7, 50.0, [
+            QuestionKey(1, QuestionType.SINGLE_CHOICE, 3.0, correct_ids=(11,), option_ids=(10, 11, 12)),
+        ])
+
+        assert changed.version != key.version
+
+
+class TestGradingWithAnswerKey:
+    """Anahtar üzerinden (DB'siz) puanlama testleri."""
+
+    def test_grades_choice_and_text_from_key(self):
+        """Seçmeli ve kısa cevaplı sorular anahtardan puanlanmalı."""
+        key = make_key()
+        single = DeterministicGrader._grade_question(
+            key.by_id[1], SimpleNamespace(selected_answer_ids=[11], answer_text=None)
+        )
+        multiple = DeterministicGrader._grade_question(
+            key.by_id[2], SimpleNamespace(selected_answer_ids=[21], answer_text=None)
+        )
+        text = DeterministicGrader._grade_question(
+            key.by_id[3], SimpleNamespace(selected_answer_ids=None, answer_text='  Angora ')
+        )
+
+        assert single['points_earned'] == 2.0
+        assert multiple['is_partial'] is True
+        assert multiple['points_earned'] == 2.0
+        assert text['is_correct'] is True
+
+
+@pytest.fixture
+def exam_db(sqlite_app):
+    """Sınav tabloları; anahtar önbellekleri her testte boş başlar."""
+    app = sqlite_app(
+        Exam.__table__, Question.__table__, Answer.__table__,
+        ExamAttempt.__table__, AttemptAnswer.__table__,
+    )
+    CacheService.clear()
+    AnswerKeyService._compiled.clear()
+    yield app
+    CacheService.clear()
+    AnswerKeyService._compiled.clear()
+
+
+class TestAnswerKeyInvalidation:
+    """Sınav içeriğini değiştiren v1 route'larının anahtarı yenilemesi."""
+
+    def test_v1_question_update_regrades_with_new_key(self, exam_db):
+        """v1 route'u ile doğru seçenek değişince yeniden puanlama yeni anahtarı kullanmalı."""
+        exam = Exam(title='Deneme', created_by=1, pass_score=50.0)
+        db.session.add(exam)
+        db.session.flush()
+        question = Question(
+            exam_id=exam.id, question_text='?', points=2.0,
+            question_type=QuestionType.SINGLE_CHOICE
+        )
+        db.session.add(question)
+        db.session.flush()
+        option_a = Answer(question_id=question.id, answer_text='A', is_correct=True, order=0)
+        option_b = Answer(question_id=question.id, answer_text='B', is_correct=False, order=1)
+        db.session.add_all([option_a, option_b])
+        attempt = ExamAttempt(exam_id=exam.id, user_id=2)
+        db.session.add(attempt)
+        db.session.flush()
+        answer = AttemptAnswer(
+            attempt_id=attempt.id, question_id=question.id, selected_answer_ids=[option_b.id]
+        )
+        db.session.add(answer)
+        db.session.commit()
+
+        # Anahtar derlenip önbelleğe alınır
+        assert DeterministicGrader.grade_attempt(attempt)['earned_points'] == 0.0
+
+        update = inspect.unwrap(ExamQuestionDetail.put)
+        with exam_db.test_request_context(json={'answers': [
+            {'answer_text': 'A', 'is_correct': False},
+            {'answer_text': 'B', 'is_correct': True},
+        ]}):
+            g.current_user = SimpleNamespace(id=1, is_admin=True)
+            assert update(ExamQuestionDetail(), exam.id, question.id)[1] == 200
+
+        # Seçenekler yeniden oluşturulur; öğrencinin seçimi yeni B'yi gösterir
+        new_b = Answer.query.filter_by(question_id=question.id, answer_text='B').one()
+        answer.selected_answer_ids = [new_b.id]
+        db.session.commit()
+
+        result = DeterministicGrader.grade_attempt(attempt)
+        assert result['earned_points'] == 2.0
+        assert result['passed'] is True
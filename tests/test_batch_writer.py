@@ -0,0 +1,85 @@
+"""
+Batch Writer Tests.
+
+Arka planda toplu INSERT yapan halka tampon için test senaryoları.
+"""
+
+import time
+
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, func, select
+
+from app.extensions import db
+from app.utils.batch_writer import BatchWriter
+
+
+@pytest.fixture
+def log_table(sqlite_app):
+    """Örnek log tablosu ve uygulaması."""
+    table = Table(
+        'sample_logs', MetaData(),
+        Column('id', Integer, primary_key=True),
+        Column('endpoint', String(50)),
+    )
+    return sqlite_app(table), table
+
+
+def count_rows(table) -> int:
+    with db.engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(table)).scalar()
+
+
+class TestBatchWriter:
+    """Toplu yazım ve düşürme sayaçları testleri."""
+
+    def test_flush_writes_all_rows(self, log_table):
+        """flush() tampondaki tüm satırları parça parça yazmalı."""
+        app, table = log_table
+        writer = BatchWriter(table, flush_size=3)
+        for i in range(7):
+            writer.enqueue({'endpoint': f'/e{i}'})
+
+        assert writer.flush() == 7
+        assert count_rows(table) == 7
+        assert writer.get_stats()['pending'] == 0
+
+    def test_full_buffer_counts_drops(self, log_table):
+        """Kapasite aşılınca en eski kayıtlar düşürülmeli ve sayılmalı."""
+        app, table = log_table
+        writer = BatchWriter(table, capacity=5)
+        for i in range(8):
+            writer.enqueue({'endpoint': f'/e{i}'})
+
+        stats = writer.get_stats()
+        assert stats['dropped'] == 3
+        assert stats['pending'] == 5
+
+    def test_important_rows_survive_full_buffer(self, log_table):
+        """Sıradan kayıt seli önemli kayıtları tampondan itmemeli."""
+        app, table = log_table
+        writer = BatchWriter(table, capacity=20)
+        writer.enqueue({'endpoint': '/slow'}, important=True)
+        for i in range(50):
+            writer.enqueue({'endpoint': f'/e{i}'})
+
+        stats = writer.get_stats()
+        assert (stats['dropped'], stats['dropped_important']) == (30, 0)
+        assert writer.flush() == 21
+        with db.engine.connect() as conn:
+            assert conn.execute(
+                select(func.count()).select_from(table).where(table.c.endpoint == '/slow')
+            ).scalar() == 1
+
+    def test_background_flusher(self, log_table):
+        """Başlatılan flusher aralık dolunca kendiliğinden yazmalı."""
+        app, table = log_table
+        writer = BatchWriter(table, flush_interval=0.05)
+        writer.start(app)
+        writer.enqueue({'endpoint': '/bg'})
+
+        deadline = time.time() + 2
+        while writer.get_stats()['written'] < 1 and time.time() < deadline:
+            time.sleep(0.02)
+        writer.stop()
+
+        assert count_rows(table) == 1
@@ -0,0 +1,125 @@
+"""
+Cache Tests.
+
+İki katmanlı önbellek (L1 LRU + Redis L2) için test senaryoları.
+"""
+
+import threading
+import time
+
+from app.utils.cache import LocalCache, TieredCache
+
+
+class TestLocalCache:
+    """Süreç içi LRU önbellek testleri."""
+
+    def test_evicts_least_recently_used(self):
+        """Kapasite aşılınca en eski kullanılan anahtar atılmalı."""
+        cache = LocalCache(max_size=2, default_ttl=60)
+        cache.set('a', 1)
+        cache.set('b', 2)
+        cache.get('a')
+        cache.set('c', 3)
+
+        assert 'a' in cache
+        assert 'b' not in cache
+        assert 'c' in cache
+
+    def test_entries_expire(self):
+        """TTL dolan kayıtlar dönmemeli."""
+        cache = LocalCache(max_size=10)
+        cache.set('a', 1, ttl=0.01)
+        time.sleep(0.02)
+
+        assert 'a' not in cache
+
+
+class TestTieredCache:
+    """Redis olmadan (yalnızca L1) tiered cache testleri."""
+
+    def test_get_or_set_runs_factory_once(self):
+        """Eşzamanlı cache miss'lerde factory bir kez çalışmalı."""
+        cache = TieredCache(lambda: None)
+        calls = []
+
+        def factory():
+            calls.append(1)
+            time.sleep(0.05)
+            return {'value': 42}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_set('course:1', factory)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [{'value': 42}] * 8
+
+    def test_stats_grouped_by_prefix(self):
+        """Hit/miss sayaçları anahtar önekine göre tutulmalı."""
+        cache = TieredCache(lambda: None)
+        cache.get('course:1')
+        cache.set('course:1', [1, 2], ttl=60)
+        cache.get('course:1')
+
+        stats = cache.get_stats()['prefixes']['course']
+        assert stats['misses'] == 1
+        assert stats['l1_hits'] == 1
+        assert stats['hit_ratio'] == 0.5
+
+
+class TestCacheInvalidation:
+    """Nesil (generation) tabanlı geçersiz kılma testleri."""
+
+    def test_namespace_pattern_invalidates_children(self):
+        """'course:5:*' kalıbı yalnızca o kursun anahtarlarını düşürmeli."""
+        cache = TieredCache(lambda: None)
+        cache.set('course:5:detail', {'id': 5}, ttl=60)
+        cache.set('course:6:detail', {'id': 6}, ttl=60)
+
+        cache.delete_pattern('course:5:*')
+
+        assert cache.get('course:5:detail') is None
+        assert cache.get('course:6:detail') == {'id': 6}
+
+    def test_tag_invalidation(self):
+        """Tag geçersiz kılınınca etiketli değerler dönmemeli."""
+        cache = TieredCache(lambda: None)
+        cache.set('report:1', [1], ttl=60, tags=['exam:3'])
+        cache.set('report:2', [2], ttl=60)
+
+        cache.invalidate('tag:exam:3')
+
+        assert cache.get('report:1') is None
+        assert cache.get('report:2') == [2]
+
+    def test_invalidation_during_fill_is_not_stored(self):
+        """Factory çalışırken geçersiz kılınan değer önbelleğe yazılmamalı."""
+        cache = TieredCache(lambda: None)
+
+        def factory():
+            cache.invalidate('exam:7')
+            return {'version': 'old'}
+
+        assert cache.get_or_set('exam:7:answer_key', factory) == {'version': 'old'}
+        assert cache.get('exam:7:answer_key') is None
+
+        assert cache.get_or_set('exam:7:answer_key', lambda: {'version': 'new'}) == {'version': 'new'}
+        assert cache.get('exam:7:answer_key') == {'version': 'new'}
+        assert cache.get_stats()['prefixes']['exam']['stale_fills'] == 1
+
+    def test_deep_namespace_clamped_to_tracked_depth(self):
+        """GENERATION_DEPTH'ten derin isim alanı izlenen en derin öneke indirgenmeli."""
+        cache = TieredCache(lambda: None)
+        cache.set('report:1:2:3:detail', [1], ttl=60)
+        cache.set('report:1:3:detail', [2], ttl=60)
+
+        cache.invalidate('report:1:2:3')
+
+        assert cache.get('report:1:2:3:detail') is None
+        assert cache.get('report:1:3:detail') == [2]
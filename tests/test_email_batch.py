@@ -0,0 +1,101 @@
+"""
+Email Batch Tests.
+
+Tek SMTP bağlantısıyla toplu e-posta gönderimi için test senaryoları.
+"""
+
+import smtplib
+
+import pytest
+from flask import Flask
+
+from app.services.email_service import EmailService
+
+
+class FakeSMTP:
+    """Gönderilen mesajları kaydeden, hata senaryoları üretebilen SMTP."""
+
+    opened = 0
+
+    def __init__(self, outbox, refuse=(), drop_once=()):
+        FakeSMTP.opened += 1
+        self.outbox = outbox
+        self.refuse = set(refuse)
+        self.drop_once = drop_once
+
+    def send_message(self, msg):
+        to = msg['To']
+        if to in self.refuse:
+            raise smtplib.SMTPRecipientsRefused({to: (550, b'No such user')})
+        if to in self.drop_once:
+            self.drop_once.remove(to)
+            raise smtplib.SMTPServerDisconnected('Connection lost')
+        self.outbox.append((to, msg['Subject'], msg.get_body(('html',)).get_content()))
+
+    def quit(self):
+        pass
+
+    close = quit
+
+
+@pytest.fixture
+def mail_app():
+    app = Flask(__name__)
+    app.config.update(MAIL_DEFAULT_SENDER='noreply@example.com')
+    with app.app_context():
+        yield
+
+
+class TestSendBatch:
+    """EmailService.send_batch testleri."""
+
+    def test_reuses_connection_and_retries_per_recipient(self, mail_app, monkeypatch):
+        """Tek bağlantı kullanılmalı; yalnızca kopan alıcı yeniden denenmeli."""
+        outbox = []
+        drop_once = ['c@x.com']
+        FakeSMTP.opened = 0
+        monkeypatch.setattr(EmailService, '_open_smtp', classmethod(
+            lambda cls: FakeSMTP(outbox, refuse={'bad@x.com'}, drop_once=drop_once)
+        ))
+
+        result = EmailService.send_batch(
+            ['a@x.com', 'bad@x.com', 'c@x.com', 'd@x.com'],
+            'Duyuru',
+            template_string='<p>{{ course }}</p>',
+            context={'course': 'Matematik'}
+        )
+
+        assert result['sent'] == 3
+        assert result['failed'] == ['bad@x.com']
+        assert result['retry'] == []
+        assert result['connections'] == 2
+        assert [to for to, _, _ in outbox] == ['a@x.com', 'c@x.com', 'd@x.com']
+        assert all('Matematik' in html for _, _, html in outbox)
+
+    def test_unreachable_server_defers_remaining(self, mail_app, monkeypatch):
+        """Sunucuya bağlanılamazsa kalan alıcılar sonraki denemeye bırakılmalı."""
+        def refuse(cls):
+            raise ConnectionRefusedError('down')
+
+        monkeypatch.setattr(EmailService, '_open_smtp', classmethod(refuse))
+
+        result = EmailService.send_batch(['a@x.com', 'b@x.com', 'c@x.com'], 'Duyuru', html='<p/>')
+
+        assert result['sent'] == 0
+        assert result['retry'] == ['a@x.com', 'b@x.com', 'c@x.com']
+
+    def test_auth_failure_defers_all_without_retry(self, mail_app, monkeypatch):
+        """Kimlik doğrulama reddi alıcıya yazılmamalı; parti tekrar denenmeden ertelenmeli."""
+        opened = []
+
+        def reject(cls):
+            opened.append(1)
+            raise smtplib.SMTPAuthenticationError(535, b'Authentication failed')
+
+        monkeypatch.setattr(EmailService, '_open_smtp', classmethod(reject))
+
+        result = EmailService.send_batch(['a@x.com', 'b@x.com'], 'Duyuru', html='<p/>')
+
+        assert result['failed'] == []
+        assert result['retry'] == ['a@x.com', 'b@x.com']
+        assert len(opened) == 1
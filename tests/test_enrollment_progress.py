@@ -0,0 +1,98 @@
+"""
+Enrollment Progress Tests.
+
+Video ilerlemesinin debounce edilmesi ve kayıt ilerlemesinin artımlı
+güncellenmesi için test senaryoları.
+"""
+
+import pytest
+
+from app.extensions import db
+from app.models.course import Course, Enrollment, Topic
+from app.modules.contents.models import ContentProgress, ContentStatus, ContentType, Video
+from app.modules.contents.services import ProgressService
+
+
+@pytest.fixture
+def course_db(sqlite_app):
+    """2 yayında + 1 taslak videolu kurs ve kayıt."""
+    sqlite_app(
+        Course.__table__, Topic.__table__, Video.__table__,
+        ContentProgress.__table__, Enrollment.__table__,
+        PROGRESS_COMMIT_INTERVAL_SECONDS=30,
+    )
+    db.session.add(Course(id=1, title='Matematik', teacher_id=1))
+    db.session.add(Topic(id=1, course_id=1, title='Sayılar'))
+    for video_id, status in ((1, ContentStatus.PUBLISHED), (2, ContentStatus.PUBLISHED),
+                             (3, ContentStatus.DRAFT)):
+        db.session.add(Video(id=video_id, title=f'Video {video_id}', topic_id=1, content_status=status))
+    db.session.add(Enrollment(id=1, user_id=10, course_id=1))
+    db.session.commit()
+    ProgressService.invalidate_course_videos()
+
+
+def stored_progress(video_id: int) -> ContentProgress:
+    db.session.rollback()
+    return ContentProgress.query.filter_by(
+        user_id=10, content_type=ContentType.VIDEO, content_id=video_id
+    ).one()
+
+
+class TestVideoProgress:
+    """ProgressService.update_video_progress testleri."""
+
+    def test_heartbeats_are_debounced(self, course_db):
+        """Aralık dolmadan gelen heartbeat'ler commit edilmemeli; force edilenler edilmeli."""
+        ProgressService.update_video_progress(10, 1, position=10, progress_percentage=5)
+        progress = ProgressService.update_video_progress(10, 1, position=20, progress_percentage=10)
+
+        assert progress.last_position == 20
+        assert progress not in db.session.dirty
+        db.session.commit()
+        assert stored_progress(1).last_position == 10
+
+        ProgressService.update_video_progress(10, 1, position=30, progress_percentage=15, force=True)
+        assert stored_progress(1).last_position == 30
+
+    def test_completion_transitions_update_enrollment_incrementally(self, course_db):
+        """Sayaç yalnızca yayındaki videonun ilk tamamlanmasında artmalı."""
+        ProgressService.update_video_progress(10, 1, position=100, progress_percentage=100)
+        ProgressService.update_video_progress(10, 1, position=100, progress_percentage=100, force=True)
+        ProgressService.update_video_progress(10, 3, position=100, progress_percentage=100)
+
+        enrollment = db.session.get(Enrollment, 1)
+        assert (enrollment.completed_lessons, float(enrollment.progress_percent)) == (1, 50.0)
+
+        ProgressService.update_video_progress(10, 2, position=100, progress_percentage=96)
+
+        db.session.refresh(enrollment)
+        assert enrollment.completed_lessons == 2
+        assert enrollment.status == 'completed'
+
+    def test_concurrent_completion_counted_once(self, course_db):
+        """Başka istek satırı tamamladıysa bayat okuma sayacı artırmamalı."""
+        ProgressService.update_video_progress(10, 1, position=50, progress_percentage=50)
+        progress = stored_progress(1)
+        assert progress.is_completed is False
+
+        # Eşzamanlı bir heartbeat geçişi bizden önce commit etti
+        db.session.execute(
+            ContentProgress.__table__.update()
+            .where(ContentProgress.id == progress.id)
+            .values(is_completed=True)
+        )
+        progress = ProgressService.update_video_progress(10, 1, position=100, progress_percentage=100)
+
+        assert progress.is_completed is True
+        assert db.session.get(Enrollment, 1).completed_lessons == 0
+
+    def test_course_video_set_is_cached_until_invalidated(self, course_db):
+        """Yayındaki video kümesi içerik değişikliğine kadar önbellekten okunmalı."""
+        assert ProgressService.get_course_video_ids(1) == {1, 2}
+
+        db.session.get(Video, 3).content_status = ContentStatus.PUBLISHED
+        db.session.commit()
+        assert ProgressService.get_course_video_ids(1) == {1, 2}
+
+        ProgressService.invalidate_course_videos()
+        assert ProgressService.get_course_video_ids(1) == {1, 2, 3}
@@ -0,0 +1,204 @@
+"""
+Grading Tests.
+
+Toplu yüklenen cevaplarla deterministik puanlama ve manuel değerlendirme
+tamamlama için test senaryoları.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.modules.exams.answer_key import AnswerKeyService
+from app.modules.exams.grading_service import DeterministicGrader, ManualGrader
+from app.modules.exams.models import (
+    Answer, AttemptAnswer, AttemptStatus, Exam, ExamAttempt, Question, QuestionType
+)
+from app.services.cache_service import CacheService
+
+
+@pytest.fixture
+def exam_db(sqlite_app):
+    """Sınav tabloları; anahtar önbellekleri her testte boş başlar."""
+    sqlite_app(
+        Exam.__table__, Question.__table__, Answer.__table__,
+        ExamAttempt.__table__, AttemptAnswer.__table__,
+    )
+    CacheService.clear()
+    AnswerKeyService._compiled.clear()
+    yield
+    CacheService.clear()
+    AnswerKeyService._compiled.clear()
+
+
+def add_question(exam, question_type, points, options=(), correct_text=None):
+    """Soru ve (doğru, metin) çiftlerinden seçenekleri ekler."""
+    question = Question(
+        exam_id=exam.id, question_text='?', question_type=question_type,
+        points=points, correct_answer_text=correct_text
+    )
+    db.session.add(question)
+    db.session.flush()
+    answers = [
+        Answer(question_id=question.id, answer_text=text, is_correct=is_correct, order=i)
+        for i, (is_correct, text) in enumerate(options)
+    ]
+    db.session.add_all(answers)
+    db.session.flush()
+    return question, answers
+
+
+def make_attempt(*question_types):
+    """İstenen soru tiplerinden sınav ve boş giriş oluşturur."""
+    exam = Exam(title='Deneme', created_by=1, pass_score=50.0)
+    db.session.add(exam)
+    db.session.flush()
+
+    questions = {}
+    for question_type in question_types:
+        if question_type == QuestionType.SINGLE_CHOICE:
+            questions[question_type] = add_question(
+                exam, question_type, 2.0, [(True, 'A'), (False, 'B')]
+            )
+        elif question_type == QuestionType.MULTIPLE_CHOICE:
+            questions[question_type] = add_question(
+                exam, question_type, 4.0, [(True, 'A'), (True, 'B'), (False, 'C')]
+            )
+        elif question_type == QuestionType.SHORT_ANSWER:
+            questions[question_type] = add_question(
+                exam, question_type, 1.0, correct_text='Ankara|Angora'
+            )
+        else:
+            questions[question_type] = add_question(exam, question_type, 3.0)
+
+    exam.total_points = sum(question.points for question, _ in questions.values())
+    attempt = ExamAttempt(exam_id=exam.id, user_id=2)
+    db.session.add(attempt)
+    db.session.flush()
+    return attempt, questions
+
+
+def answer(attempt, question, selected=None, text=None):
+    row = AttemptAnswer(
+        attempt_id=attempt.id, question_id=question.id,
+        selected_answer_ids=selected, answer_text=text
+    )
+    db.session.add(row)
+    return row
+
+
+class TestDeterministicGrader:
+    """grade_attempt toplu yükleme/yazma testleri."""
+
+    def test_grades_with_one_answers_query_and_one_bulk_update(self, exam_db, monkeypatch):
+        """Cevaplar tek sorguda okunmalı, sonuçlar tek toplu güncellemeyle yazılmalı."""
+        attempt, questions = make_attempt(
+            QuestionType.SINGLE_CHOICE, QuestionType.MULTIPLE_CHOICE,
+            QuestionType.SHORT_ANSWER, QuestionType.ESSAY,
+        )
+        single, single_options = questions[QuestionType.SINGLE_CHOICE]
+        multiple, multiple_options = questions[QuestionType.MULTIPLE_CHOICE]
+        short, _ = questions[QuestionType.SHORT_ANSWER]
+        answer(attempt, single, selected=[single_options[0].id])
+        answer(attempt, multiple, selected=[multiple_options[0].id])
+        answer(attempt, short, text='  angora ')
+        db.session.commit()
+        AnswerKeyService.get(attempt.exam_id)
+
+        answer_selects = []
+        event.listen(
+            db.engine, 'before_cursor_execute',
+            lambda conn, cursor, statement, *args: answer_selects.append(statement)
+            if statement.startswith('SELECT') and 'FROM attempt_answers' in statement else None
+        )
+        bulk_calls = []
+        bulk_update = db.session.bulk_update_mappings
+        monkeypatch.setattr(
+            db.session, 'bulk_update_mappings',
+            lambda mapper, mappings: bulk_calls.append(len(mappings)) or bulk_update(mapper, mappings),
+            raising=False
+        )
+
+        result = DeterministicGrader.grade_attempt(attempt)
+        db.session.commit()
+
+        assert len(answer_selects) == 1
+        assert bulk_calls == [3]
+        assert result['total_points'] == 10.0
+        assert result['earned_points'] == 5.0
+        assert result['percentage'] == 50.0
+        assert result['passed'] is True
+
+        by_question = {r['question_id']: r for r in result['question_results']}
+        assert by_question[multiple.id]['is_partial'] is True
+        assert by_question[questions[QuestionType.ESSAY][0].id]['feedback'] == 'Cevap verilmedi'
+
+        stored = {
+            row.question_id: (row.is_correct, row.points_earned)
+            for row in AttemptAnswer.query.filter_by(attempt_id=attempt.id)
+        }
+        assert stored == {
+            single.id: (True, 2.0),
+            multiple.id: (False, 2.0),
+            short.id: (True, 1.0),
+        }
+
+    def test_essay_answer_is_left_for_teacher(self, exam_db):
+        """Essay cevabı puanlanmamalı, manuel değerlendirme beklemeli."""
+        attempt, questions = make_attempt(QuestionType.ESSAY)
+        essay, _ = questions[QuestionType.ESSAY]
+        answer(attempt, essay, text='Uzun cevap')
+        db.session.commit()
+
+        result = DeterministicGrader.grade_attempt(attempt)
+
+        essay_result = result['question_results'][0]
+        assert essay_result['requires_manual_grading'] is True
+        assert essay_result['is_correct'] is None
+        assert result['earned_points'] == 0.0
+
+
+class TestManualGrader:
+    """finalize_grading testleri."""
+
+    def test_ungraded_essay_blocks_finalize(self, exam_db):
+        """Değerlendirilmemiş essay varken tamamlama reddedilmeli."""
+        attempt, questions = make_attempt(QuestionType.SINGLE_CHOICE, QuestionType.ESSAY)
+        answer(attempt, questions[QuestionType.ESSAY][0], text='Cevap')
+        db.session.commit()
+
+        with pytest.raises(ValueError):
+            ManualGrader.finalize_grading(attempt, grader_id=1)
+        assert attempt.status == AttemptStatus.IN_PROGRESS
+
+    def test_finalize_sums_automatic_and_manual_points(self, exam_db):
+        """Essay öğretmence puanlanınca otomatik ve manuel puanlar toplanmalı."""
+        attempt, questions = make_attempt(QuestionType.SINGLE_CHOICE, QuestionType.ESSAY)
+        single, single_options = questions[QuestionType.SINGLE_CHOICE]
+        answer(attempt, single, selected=[single_options[1].id])
+        essay_answer = answer(attempt, questions[QuestionType.ESSAY][0], text='Cevap')
+        db.session.commit()
+
+        DeterministicGrader.grade_attempt(attempt)
+        ManualGrader.grade_answer(essay_answer, 3.0, True, 'Güzel', grader_id=1)
+        result = ManualGrader.finalize_grading(attempt, grader_id=1)
+
+        assert result['score'] == 3.0
+        assert result['percentage'] == 60.0
+        assert result['passed'] is True
+        assert attempt.status == AttemptStatus.GRADED
+
+    def test_finalize_without_essays(self, exam_db):
+        """Essay içermeyen sınav manuel puan beklemeden tamamlanmalı."""
+        attempt, questions = make_attempt(QuestionType.SINGLE_CHOICE, QuestionType.SHORT_ANSWER)
+        single, single_options = questions[QuestionType.SINGLE_CHOICE]
+        answer(attempt, single, selected=[single_options[1].id])
+        answer(attempt, questions[QuestionType.SHORT_ANSWER][0], text='Ankara')
+        db.session.commit()
+
+        DeterministicGrader.grade_attempt(attempt)
+        result = ManualGrader.finalize_grading(attempt, grader_id=1)
+
+        assert result['score'] == 1.0
+        assert result['percentage'] == pytest.approx(33.33)
+        assert result['passed'] is False
@@ -0,0 +1,71 @@
+"""
+Live Session Reminder Tests.
+
+Küme tabanlı canlı ders hatırlatmaları (tek sorgu, toplu bildirim,
+idempotent sahiplenme) için test senaryoları.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.modules.live_classes.models import LiveSession, SessionAttendance
+from app.modules.users.models import Notification
+from app.tasks.live_session_tasks import send_session_reminders
+
+
+@pytest.fixture
+def live_db(sqlite_app):
+    """24h ve 1h penceresinde oturumlar ve katılımcıları."""
+    sqlite_app(LiveSession.__table__, SessionAttendance.__table__, Notification.__table__)
+
+    now = datetime.utcnow()
+    sessions = [
+        (1, timedelta(hours=24), False, [10, 11]),
+        (2, timedelta(hours=24), False, []),
+        (3, timedelta(hours=1), False, [12]),
+        (4, timedelta(hours=1), True, [13]),       # 1h hatırlatması gönderilmiş
+        (5, timedelta(hours=5), False, [14]),      # pencere dışında
+    ]
+    for session_id, offset, reminded, attendees in sessions:
+        db.session.add(LiveSession(
+            id=session_id, title=f'Ders {session_id}', course_id=1, host_id=99,
+            meeting_url='https://meet.example.com', scheduled_start=now + offset,
+            scheduled_end=now + offset + timedelta(hours=1), reminder_1h_sent=reminded
+        ))
+        for user_id in attendees:
+            db.session.add(SessionAttendance(session_id=session_id, user_id=user_id))
+    db.session.commit()
+
+
+class TestSendSessionReminders:
+    """send_session_reminders testleri."""
+
+    def test_single_query_bulk_insert_and_idempotent_rerun(self, live_db):
+        """Tek SELECT, tür başına tek UPDATE, tek INSERT; tekrar çalışma göndermemeli."""
+        statements = []
+        event.listen(
+            db.engine, 'before_cursor_execute',
+            lambda conn, cursor, statement, *args: statements.append(statement.split()[0])
+        )
+
+        result = send_session_reminders()
+
+        assert result == {'sent_24h': 2, 'sent_1h': 1, 'notifications': 4}
+        assert statements.count('SELECT') == 1
+        assert statements.count('UPDATE') == 2
+        assert statements.count('INSERT') == 1
+
+        notifications = Notification.query.order_by(Notification.user_id).all()
+        assert [n.user_id for n in notifications] == [10, 11, 12, 99]
+        assert json.loads(notifications[2].data)['idempotency_key'] == 'live_session:3:reminder_1h'
+
+        sessions = {s.id: s for s in LiveSession.query.all()}
+        assert sessions[1].reminder_24h_sent and sessions[2].reminder_24h_sent
+        assert sessions[3].reminder_1h_sent and not sessions[5].reminder_24h_sent
+
+        assert send_session_reminders() == {'sent_24h': 0, 'sent_1h': 0, 'notifications': 0}
+        assert Notification.query.count() == 4
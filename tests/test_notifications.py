@@ -0,0 +1,149 @@
+"""
+Notification Tests.
+
+Toplu bildirim (çok satırlı INSERT, okunmamış sayaç önbelleği) için test
+senaryoları.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.course import Enrollment
+from app.modules.users.models import Notification
+from app.services import notification_service
+from app.services.cache_service import CacheService
+from app.services.notification_service import NotificationService
+from app.tasks import notification_tasks
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def eval(self, *args):
+        self.commands.append(args)
+        return self
+
+    def execute(self):
+        self.redis.round_trips += 1
+        return [self.redis.eval(*args) for args in self.commands]
+
+
+class FakeRedis:
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def mget(self, *keys):
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.data:
+            return None
+        self.data[key] = str(value)
+        return True
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == notification_service._INVALIDATE_UNREAD_SCRIPT:
+            self.data[keys[1]] = str(int(self.data.get(keys[1], 0)) + 1)
+            return self.delete(keys[0])
+        # _FILL_IF_VERSION_SCRIPT
+        if self.data.get(keys[1], '') == argv[0]:
+            return self.set(keys[0], argv[1], ex=argv[2], nx=True)
+        return None
+
+
+@pytest.fixture
+def notification_db(sqlite_app, monkeypatch):
+    """Bildirim + kayıt tabloları ve sahte Redis."""
+    sqlite_app(Notification.__table__, Enrollment.__table__, NOTIFICATION_BULK_CHUNK_SIZE=2)
+    redis = FakeRedis()
+    monkeypatch.setattr(CacheService, '_redis', redis)
+    return redis
+
+
+def unread_key(user_id):
+    return NotificationService.UNREAD_COUNT_KEY.format(user_id=user_id)
+
+
+class TestBulkNotifications:
+    """notify_users / notify_course_students testleri."""
+
+    def test_chunks_use_one_insert_and_one_pipeline(self, notification_db):
+        """Her parça tek INSERT + tek pipeline olmalı; sayaç önbellekleri silinmeli."""
+        inserts = []
+        event.listen(
+            db.engine, 'before_cursor_execute',
+            lambda conn, cursor, statement, *args: inserts.append(statement)
+            if statement.startswith('INSERT') else None
+        )
+        notification_db.data[unread_key(1)] = '4'
+
+        count = NotificationService.notify_users([1, 2, 3, 1, 4, 5], 'Duyuru', 'Sınav tarihi değişti')
+
+        assert count == 5
+        assert len(inserts) == 3
+        assert notification_db.round_trips == 3
+        assert Notification.query.count() == 5
+        assert unread_key(1) not in notification_db.data
+        assert NotificationService.get_unread_count(1) == 1
+
+    def test_course_students_are_queued_by_id(self, notification_db, monkeypatch):
+        """Kurs bildirimi yalnızca aktif kayıtların ID'leriyle task'lara bölünmeli."""
+        queued = []
+
+        class Result:
+            id = 'task-id'
+
+        monkeypatch.setattr(
+            notification_tasks.send_notification_batch_task, 'delay',
+            lambda user_ids, *args: queued.append(user_ids) or Result()
+        )
+        for user_id, status in ((10, 'active'), (11, 'active'), (12, 'completed'), (13, 'active')):
+            db.session.add(Enrollment(user_id=user_id, course_id=1, status=status))
+        db.session.commit()
+
+        assert NotificationService.notify_course_students(1, 'Duyuru', 'Yeni ders eklendi') == 3
+        assert queued == [[10, 11], [13]]
+        assert Notification.query.count() == 0
+
+    def test_unread_count_is_cached_until_changed(self, notification_db):
+        """Okunmamış sayısı önbellekten okunmalı, yazma ve okundu işaretlemede yenilenmeli."""
+        NotificationService.notify_users([1], 'A', 'a')
+        assert NotificationService.get_unread_count(1) == 1
+        assert notification_db.data[unread_key(1)] == '1'
+
+        NotificationService.notify_users([1], 'B', 'b')
+        assert unread_key(1) not in notification_db.data
+        assert NotificationService.get_unread_count(1) == 2
+
+        NotificationService.mark_all_as_read(1)
+        assert NotificationService.get_unread_count(1) == 0
+
+    def test_stale_fill_is_rejected(self, notification_db, monkeypatch):
+        """Sayım ile önbellek doldurma arasında commit edilen bildirim kaybolmamalı."""
+        fill = notification_db.eval
+
+        def insert_then_fill(script, *args):
+            if script == notification_service._FILL_IF_VERSION_SCRIPT:
+                NotificationService.notify_users([1], 'A', 'a')
+            return fill(script, *args)
+
+        monkeypatch.setattr(notification_db, 'eval', insert_then_fill)
+        assert NotificationService.get_unread_count(1) == 0
+        assert unread_key(1) not in notification_db.data
+
+        monkeypatch.setattr(notification_db, 'eval', fill)
+        assert NotificationService.get_unread_count(1) == 1
@@ -0,0 +1,174 @@
+"""
+Pagination Tests.
+
+Keyset (cursor) sayfalama ve toplam sayı modları için test senaryoları.
+"""
+
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+from flask import Flask
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import aliased
+
+from app.core.exceptions import ValidationError
+from app.core.pagination import _keyset_columns, estimate_count, paginate_query
+
+
+@pytest.fixture
+def item_model():
+    """Bağımsız bir SQLite uygulaması ve örnek model."""
+    app = Flask(__name__)
+    app.config.update(SQLALCHEMY_DATABASE_URI='sqlite://', SECRET_KEY='test')
+    db = SQLAlchemy(app)
+
+    class Item(db.Model):
+        id = db.Column(db.Integer, primary_key=True)
+        created_at = db.Column(db.DateTime, nullable=False)
+        name = db.Column(db.String(20))
+
+    with app.app_context():
+        db.create_all()
+        base = datetime(2024, 1, 1)
+        for i in range(1, 26):
+            db.session.add(Item(id=i, created_at=base + timedelta(days=i // 3), name=f'n{i % 4}'))
+        db.session.commit()
+        yield Item
+
+
+class TestCursorPagination:
+    """Keyset cursor testleri."""
+
+    def test_cursor_walks_all_rows_once(self, item_model):
+        """Cursor ile gezinme tüm satırları tekrar etmeden sırayla dönmeli."""
+        Item = item_model
+        query = Item.query.order_by(Item.name, Item.created_at.desc())
+        expected = [item.id for item in query.order_by(Item.id.desc()).all()]
+
+        result = paginate_query(query, per_page=7, total='none')
+        seen = [item.id for item in result.items]
+        while result.next_cursor:
+            result = paginate_query(query, per_page=7, cursor=result.next_cursor)
+            seen.extend(item.id for item in result.items)
+
+        assert seen == expected
+        assert result.has_next is False
+        assert result.total is None
+
+    @pytest.mark.parametrize('descending', [False, True])
+    def test_cursor_walk_keeps_null_sort_values(self, item_model, descending):
+        """NULL değerli sıralama sütununda cursor ile gezinme satır kaybetmemeli."""
+        Item = item_model
+        Item.query.filter(Item.id % 3 == 0).update({'name': None})
+        order = Item.name.desc() if descending else Item.name
+        query = Item.query.order_by(order, Item.created_at)
+
+        # NULL en büyük değer sayılır: artanda sonda, azalanda başta
+        items = Item.query.all()
+        items.sort(key=lambda item: (item.created_at, item.id))
+        items.sort(key=lambda item: (item.name is None, item.name or ''), reverse=descending)
+        expected = [item.id for item in items]
+
+        result = paginate_query(query, per_page=4, total='none')
+        seen = [item.id for item in result.items]
+        while result.next_cursor:
+            result = paginate_query(query, per_page=4, cursor=result.next_cursor)
+            seen.extend(item.id for item in result.items)
+
+        assert seen == expected
+        assert result.has_next is False
+
+    def test_tampered_cursor_rejected(self, item_model):
+        """İmzası bozuk cursor reddedilmeli."""
+        Item = item_model
+        query = Item.query.order_by(Item.created_at.desc())
+        cursor = paginate_query(query, per_page=5).next_cursor
+
+        with pytest.raises(ValidationError):
+            paginate_query(query, per_page=5, cursor=cursor[:-2] + 'xx')
+
+    def test_joined_column_order_falls_back_to_offset(self, item_model):
+        """Join edilen tablonun sütunuyla sıralama offset sayfalamaya düşmeli."""
+        Item = item_model
+        other = aliased(Item)
+        query = Item.query.join(other, other.id == Item.id).order_by(other.name)
+
+        assert _keyset_columns(query) is None
+        result = paginate_query(query, per_page=10, total='none')
+        assert result.next_cursor is None
+        assert result.has_next is True
+
+
+class TestTotalModes:
+    """Toplam sayı modu testleri."""
+
+    def test_total_none_skips_count(self, item_model):
+        """total=none iken sayım yapılmamalı ama has_next doğru olmalı."""
+        result = paginate_query(item_model.query, page=1, per_page=10, total='none')
+
+        assert result.total is None
+        assert result.has_next is True
+
+    def test_estimate_falls_back_to_exact_on_sqlite(self, item_model):
+        """PostgreSQL dışında tahmin modu kesin sayıma düşmeli."""
+        result = paginate_query(item_model.query, page=3, per_page=10, total='estimate')
+
+        assert result.total == 25
+        assert len(result.items) == 5
+
+
+class FakePostgresSession:
+    """EXPLAIN'i kaydeden, savepoint geri alımlarını sayan PostgreSQL oturumu."""
+
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.statements = []
+        self.rolled_back_savepoints = 0
+
+    def get_bind(self):
+        return SimpleNamespace(dialect=postgresql.dialect())
+
+    @contextmanager
+    def begin_nested(self):
+        try:
+            yield
+        except Exception:
+            self.rolled_back_savepoints += 1
+            raise
+
+    def connection(self):
+        return self
+
+    def exec_driver_sql(self, statement, params):
+        self.statements.append((statement, params))
+        if self.fail:
+            raise RuntimeError('syntax error')
+        return SimpleNamespace(scalar=lambda: [{'Plan': {'Plan Rows': 5000}}])
+
+
+class TestEstimateCount:
+    """PostgreSQL planner tahmini testleri."""
+
+    def test_in_filter_is_expanded_for_explain(self, item_model):
+        """IN listesi EXPLAIN'e açılmış parametrelerle gitmeli."""
+        Item = item_model
+        session = FakePostgresSession()
+        query = Item.query.filter(Item.name.in_(['n1', 'n2'])).with_session(session)
+
+        assert estimate_count(query) == 5000
+        statement, params = session.statements[0]
+        assert statement.startswith('EXPLAIN (FORMAT JSON) SELECT')
+        assert 'POSTCOMPILE' not in statement
+        assert sorted(params.values()) == ['n1', 'n2']
+
+    def test_failed_explain_rolls_back_savepoint(self, item_model):
+        """EXPLAIN hatası yalnızca savepoint'i geri almalı ve None dönmeli."""
+        Item = item_model
+        session = FakePostgresSession(fail=True)
+        query = Item.query.filter(Item.id.in_([1, 2])).with_session(session)
+
+        assert estimate_count(query) is None
+        assert session.rolled_back_savepoints == 1
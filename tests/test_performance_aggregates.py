@@ -0,0 +1,263 @@
+"""
+Performance Aggregate Tests.
+
+Öğrenci x konu x boyut x gün özet tablosu, ondan okunan analizler ve
+akran yüzdelik indeksi için test senaryoları.
+"""
+
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+
+import pytest
+
+from app.extensions import db
+from app.models.course import Topic
+from app.models.evaluation import StudentPerformanceAggregate
+from app.services.cache_service import CacheService
+from app.services.peer_percentile_service import (
+    _APPLY_SCORES_SCRIPT, _RELEASE_LOCK_SCRIPT, PeerPercentileService
+)
+from app.services.performance_aggregate_service import PerformanceAggregateService
+from app.services.performance_analytics_service import (
+    PerformanceAnalyticsService, TrendDirection
+)
+
+
+@pytest.fixture
+def aggregate_db(sqlite_app):
+    """Özet ve konu tabloları; kurs 1'de tek konu."""
+    sqlite_app(StudentPerformanceAggregate.__table__, Topic.__table__)
+    db.session.add(Topic(id=3, course_id=1, title='Kesirler', total_questions=40))
+    db.session.commit()
+
+
+def record(is_correct, at, difficulty='easy', time_spent=30, user_id=7):
+    question = SimpleNamespace(
+        topic_id=3, difficulty=difficulty, question_type='single_choice', bloom_level=None
+    )
+    attempt = SimpleNamespace(
+        user_id=user_id, is_correct=is_correct, time_spent_seconds=time_spent,
+        created_at=at, question=question
+    )
+    PerformanceAggregateService.record_attempt(attempt)
+    db.session.commit()
+
+
+class FakePipeline:
+    """Komutları biriktirip execute'ta sırayla çalıştıran pipeline."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """İndeks inşası ve Lua betiklerini taklit eden bellek içi Redis."""
+
+    def __init__(self):
+        self.data = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.data:
+            return None
+        self.data[key] = value
+        return True
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def expire(self, key, ttl):
+        return True
+
+    def rename(self, src, dst):
+        self.data[dst] = self.data.pop(src)
+
+    def zadd(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update(mapping)
+
+    def sadd(self, key, *members):
+        self.data.setdefault(key, set()).update(members)
+
+    def spop(self, key, count):
+        bucket = self.data.get(key, set())
+        return [bucket.pop() for _ in range(min(count, len(bucket)))]
+
+    def smembers(self, key):
+        return set(self.data.get(key, set()))
+
+    def eval(self, script, numkeys, *args):
+        keys, argv = args[:numkeys], args[numkeys:]
+        if script == _RELEASE_LOCK_SCRIPT:
+            return self.delete(keys[0]) if self.get(keys[0]) == argv[0] else 0
+        assert script == _APPLY_SCORES_SCRIPT
+        index = self.data.setdefault(keys[0], {})
+        meta = self.data.setdefault(keys[1], {})
+        for user_id, score in zip(argv[:-1:2], argv[1:-1:2]):
+            if keys[2] in self.data:
+                self.sadd(keys[3], user_id)
+            old = index.pop(user_id, None)
+            meta['sum'] = float(meta.get('sum', 0)) - (old or 0)
+            if score != '':
+                index[user_id] = float(score)
+                meta['sum'] += float(score)
+
+
+class TestPerformanceAggregates:
+    """Artımlı özet güncelleme ve okuma testleri."""
+
+    def test_attempts_update_all_dimensions(self, aggregate_db, monkeypatch):
+        """Her attempt konu, zorluk, tip, Bloom ve saat satırlarını artırmalı."""
+        counted = []
+        monkeypatch.setattr(
+            PerformanceAnalyticsService, '_count_published_questions',
+            classmethod(lambda cls, ids: counted.append(set(ids)) or {3: 12})
+        )
+        now = datetime.utcnow()
+        record(True, now, time_spent=20)
+        record(False, now, difficulty='hard', time_spent=40)
+
+        start, end = now - timedelta(days=1), now + timedelta(days=1)
+        stats = PerformanceAnalyticsService._get_question_stats(7, None, start, end)
+        assert (stats['total_attempted'], stats['total_correct']) == (2, 1)
+        assert stats['total_time'] == 60
+
+        difficulty = PerformanceAnalyticsService._get_area_stats(7, 'difficulty', None, start, end)
+        assert difficulty['easy']['success_rate'] == 100
+        assert difficulty['hard']['success_rate'] == 0
+
+        topics = PerformanceAnalyticsService._get_topic_performances(7, 1, start, end)
+        assert len(topics) == 1
+        assert topics[0].total_questions == 12
+        assert counted == [{3}]
+        assert topics[0].question_type_breakdown == {'single_choice': 50.0}
+
+    def test_recent_window_spans_days(self, aggregate_db):
+        """Konu trendi günler arası son sonuçlardan hesaplanmalı."""
+        now = datetime.utcnow()
+        for _ in range(6):
+            record(False, now - timedelta(days=2))
+        for _ in range(6):
+            record(True, now)
+
+        recent = PerformanceAggregateService.recent_results_by_topic(
+            7, [3], now - timedelta(days=14), now
+        )
+        assert recent[3] == '0' * 6 + '1' * 6
+        assert PerformanceAnalyticsService._calculate_topic_trend(recent[3]) == TrendDirection.IMPROVING
+
+
+class TestPeerPercentiles:
+    """Akran yüzdelik indeksi testleri (Redis yok, süreç içi indeks)."""
+
+    def test_position_and_incremental_refresh(self, aggregate_db, monkeypatch):
+        """Konum sıralı indeksten okunmalı, yeni attempt'ler kirli olarak işlenmeli."""
+        monkeypatch.setattr(CacheService, '_redis', None)
+        monkeypatch.setattr(PeerPercentileService, '_local', {})
+        monkeypatch.setattr(PeerPercentileService, '_local_dirty', set())
+
+        now = datetime.utcnow()
+        for user_id, correct in ((1, 2), (2, 5), (3, 8)):
+            for i in range(10):
+                record(i < correct, now, user_id=user_id)
+
+        position = PeerPercentileService.get_position(1, 50.0)
+        assert (position['below'], position['total']) == (1, 3)
+        assert position['top'] == 80.0
+        assert position['average'] == 50.0
+
+        for _ in range(10):
+            record(True, now, user_id=1)
+        position = PeerPercentileService.get_position(1, 50.0)
+        assert position['below'] == 0
+        assert position['top'] == 80.0
+
+    def test_dirty_mark_waits_for_commit(self, aggregate_db, monkeypatch):
+        """Kirli işaret commit'ten sonra yazılmalı, rollback'te düşmeli."""
+        monkeypatch.setattr(CacheService, '_redis', None)
+        monkeypatch.setattr(PeerPercentileService, '_local_dirty', set())
+
+        db.session.add(Topic(id=4, course_id=1, title='Oranlar'))
+        db.session.flush()
+        PeerPercentileService.mark_dirty(5, 4)
+        assert PeerPercentileService._local_dirty == set()
+        db.session.rollback()
+        db.session.commit()
+        assert PeerPercentileService._local_dirty == set()
+
+        PeerPercentileService.mark_dirty(6, 3)
+        db.session.commit()
+        assert PeerPercentileService._local_dirty == {'6:3'}
+
+    def test_failed_refresh_requeues_dirty_members(self, aggregate_db, monkeypatch):
+        """Tazeleme başarısız olursa çekilen işaretler kümeye geri dönmeli."""
+        monkeypatch.setattr(CacheService, '_redis', None)
+        monkeypatch.setattr(PeerPercentileService, '_local', {})
+        monkeypatch.setattr(PeerPercentileService, '_local_dirty', {'6:3'})
+        PeerPercentileService.rebuild(1)
+
+        def fail(cls, course_id, days, user_ids=None):
+            raise RuntimeError('db down')
+
+        monkeypatch.setattr(PeerPercentileService, '_compute_scores', classmethod(fail))
+        assert PeerPercentileService.refresh_dirty()['users'] == 0
+        assert PeerPercentileService._local_dirty == {'6:3'}
+
+    def test_rebuild_is_locked(self, aggregate_db, monkeypatch):
+        """Başka süreç inşa ederken rebuild indekse dokunmamalı."""
+        redis = FakeRedis()
+        monkeypatch.setattr(CacheService, '_redis', redis)
+        lock_key, _ = PeerPercentileService._build_keys(1, 30)
+        redis.set(lock_key, 'other')
+
+        assert PeerPercentileService.rebuild(1) == 0
+        assert redis.data == {lock_key: 'other'}
+
+    def test_scores_applied_during_rebuild_survive_rename(self, aggregate_db, monkeypatch):
+        """İnşa sürerken yazılan skorlar RENAME sonrası yeniden uygulanmalı."""
+        redis = FakeRedis()
+        monkeypatch.setattr(CacheService, '_redis', redis)
+        now = datetime.utcnow()
+        for user_id, correct in ((1, 2), (2, 5)):
+            for i in range(10):
+                record(i < correct, now, user_id=user_id)
+        PeerPercentileService.rebuild(1)
+
+        for _ in range(10):
+            record(True, now, user_id=1)
+        compute = PeerPercentileService._compute_scores.__func__
+
+        def stale_snapshot(cls, course_id, days, user_ids=None):
+            if user_ids is not None:
+                return compute(cls, course_id, days, user_ids)
+            # Anlık görüntü okunduktan sonra eşzamanlı tazeleme eski indekse yazar
+            redis.sadd(PeerPercentileService.DIRTY_KEY, '1:3')
+            PeerPercentileService.refresh_dirty()
+            return {1: 20.0, 2: 50.0}
+
+        monkeypatch.setattr(PeerPercentileService, '_compute_scores', classmethod(stale_snapshot))
+        assert PeerPercentileService.rebuild(1) == 2
+
+        index_key, _ = PeerPercentileService._keys(1, 30)
+        assert redis.data[index_key] == {'1': 60.0, '2': 50.0}
+        assert not set(PeerPercentileService._build_keys(1, 30)) & set(redis.data)
@@ -0,0 +1,98 @@
+"""
+Permission Cache Tests.
+
+Önceden hesaplanan rol permission kümeleri ve istek başına kontrol için
+test senaryoları.
+"""
+
+from types import SimpleNamespace
+
+from flask import Flask, g
+
+from app.core import auth
+from app.core.permissions import (
+    Permission, ROLE_FLAT_PERMISSION_SETS, ROLE_PERMISSION_SETS, ROLE_PERMISSIONS,
+    check_permission, get_role_permissions, role_has_permission
+)
+
+
+def _legacy_has_permission(role, permission, user_permissions):
+    """Önbellek öncesi _has_permission mantığı (düz rol listesi)."""
+    if permission in user_permissions:
+        return True
+    if role == 'super_admin':
+        return True
+    return permission in [p.value for p in ROLE_PERMISSIONS.get(role, [])]
+
+
+class TestRolePermissionSets:
+    """ROLE_PERMISSION_SETS ve role_has_permission testleri."""
+
+    def test_sets_are_hierarchical_and_expand_manage(self):
+        """Üst rol alt rolün permission'larını ve manage kapsamını içermeli."""
+        student = ROLE_PERMISSION_SETS['student']
+        teacher = ROLE_PERMISSION_SETS['teacher']
+
+        assert student <= teacher <= ROLE_PERMISSION_SETS['admin']
+        assert ROLE_PERMISSION_SETS['super_admin'] == {p.value for p in Permission}
+        assert set(get_role_permissions('teacher')) >= set(get_role_permissions('student'))
+
+        for role, values in ROLE_PERMISSION_SETS.items():
+            for value in values:
+                if value.endswith(':manage'):
+                    resource = value.split(':')[0]
+                    assert {
+                        p.value for p in Permission if p.value.startswith(f'{resource}:')
+                    } <= values
+
+    def test_unknown_role_and_custom_permission(self):
+        """Bilinmeyen rol hiçbir şeye, manage sahibi özel permission'a erişmeli."""
+        assert role_has_permission('guest', Permission.COURSES_READ) is False
+        assert role_has_permission('super_admin', 'anything:custom') is True
+        assert role_has_permission('student', 'reports:export', frozenset({'reports:manage'}))
+
+
+class TestRequestPermissionChecks:
+    """check_permission ve auth._has_permission testleri."""
+
+    def test_check_permission_uses_current_user_role(self):
+        """check_permission mevcut kullanıcının rolüne göre karar vermeli."""
+        app = Flask(__name__)
+        with app.test_request_context():
+            g.current_user = SimpleNamespace(role_name='student')
+            assert check_permission(Permission.COURSES_READ) is True
+            assert check_permission(Permission.USERS_DELETE) is False
+
+    def test_has_permission_memoizes_context(self):
+        """Kullanıcıya özel permission'lar istek boyunca bir kez okunmalı."""
+        app = Flask(__name__)
+        with app.test_request_context():
+            g.user_role = 'student'
+            g.user_permissions = ['reports:manage']
+
+            assert auth._has_permission('reports:manage') is True
+            assert auth._has_permission('reports:export') is False
+            assert auth._has_permission(Permission.COURSES_READ.value) is True
+            assert auth._has_permission(Permission.USERS_DELETE.value) is False
+            assert g._permission_context == ('student', frozenset({'reports:manage'}))
+
+    def test_has_permission_keeps_flat_role_matrix(self):
+        """Decorator kontrolü hiyerarşi/manage genişletmesi olmadan eski matrisi korumalı."""
+        app = Flask(__name__)
+        values = [p.value for p in Permission] + ['reports:export', 'anything:custom']
+        granted_sets = ([], ['reports:manage'], [Permission.EXAMS_TAKE.value])
+
+        for role in list(ROLE_PERMISSIONS) + ['guest']:
+            for granted in granted_sets:
+                with app.test_request_context():
+                    g.user_role = role
+                    g.user_permissions = granted
+                    for value in values:
+                        assert auth._has_permission(value) is _legacy_has_permission(
+                            role, value, granted
+                        ), (role, granted, value)
+
+        teacher = ROLE_FLAT_PERMISSION_SETS['teacher']
+        assert not {'exams:take', 'ai:use', 'courses:read'} & teacher
+        assert len(teacher) == len(set(ROLE_PERMISSIONS['teacher']))
+        assert len(ROLE_FLAT_PERMISSION_SETS['admin']) == len(set(ROLE_PERMISSIONS['admin']))
@@ -0,0 +1,76 @@
+"""
+Rate Limiter Tests.
+
+GCRA limiter'ın yerel (Redis'siz) kopyası ve AI rate limiter entegrasyonu
+için test senaryoları.
+"""
+
+from app.modules.ai.rate_limiter import AIRateLimiter, LimitType, RateLimitConfig
+from app.services.cache_service import CacheService
+from app.utils.rate_limiter import (
+    GCRALimiter, InMemoryRateLimiter, RateLimit, MODE_FORCE, MODE_PEEK
+)
+
+
+def local_limiter() -> GCRALimiter:
+    return GCRALimiter(lambda: None, fallback=InMemoryRateLimiter())
+
+
+class TestGCRALimiter:
+    """GCRA burst, ret ve çoklu limit testleri."""
+
+    def test_burst_then_reject(self):
+        """Periyot içinde `limit` kadar istek geçmeli, sonrası retry_after ile reddedilmeli."""
+        limiter = local_limiter()
+        limits = [RateLimit('ip:1', 3, 60)]
+
+        results = [limiter.check(limits)[0] for _ in range(4)]
+        allowed, (decision,) = limiter.check(limits)
+
+        assert results == [True, True, True, False]
+        assert allowed is False
+        assert decision.remaining == 0
+        assert 1 <= decision.retry_after <= 20
+
+    def test_multi_limit_is_all_or_nothing(self):
+        """Bir limit reddederse diğerleri tüketilmemeli."""
+        limiter = local_limiter()
+        user = RateLimit('user:1', 10, 60)
+        endpoint = RateLimit('endpoint:search', 1, 60)
+
+        assert limiter.check([user, endpoint])[0] is True
+        allowed, decisions = limiter.check([user, endpoint])
+
+        assert allowed is False
+        assert [d.allowed for d in decisions] == [True, False]
+        _, (peek,) = limiter.check([RateLimit('user:1', 10, 60, cost=0)], mode=MODE_PEEK)
+        assert peek.remaining == 9
+
+    def test_force_records_over_limit(self):
+        """force modu reddedilse bile kullanımı kaydetmeli."""
+        limiter = local_limiter()
+        tokens = RateLimit('tokens', 100, 60, cost=150)
+
+        assert limiter.check([tokens], mode=MODE_PEEK)[0] is False
+        limiter.check([tokens], mode=MODE_FORCE)
+        assert limiter.check([RateLimit('tokens', 100, 60, cost=1)], mode=MODE_PEEK)[0] is False
+
+
+class TestAIRateLimiter:
+    """AIRateLimiter dakikalık limitleri testleri."""
+
+    def test_user_rpm_limit(self, monkeypatch):
+        """Kullanıcı RPM'i dolunca uygun limit tipiyle reddetmeli."""
+        monkeypatch.setattr(CacheService, '_redis', None)
+        limiter = AIRateLimiter(RateLimitConfig(rpm_per_user=2))
+
+        for _ in range(2):
+            assert limiter.check_all_limits(5).allowed
+            limiter.record_usage(5, tokens_used=10)
+
+        result = limiter.check_all_limits(5)
+        assert result.allowed is False
+        assert result.limit_type == LimitType.RPM
+        assert result.current_usage == 2
+        assert limiter.get_user_stats(5)['current_minute']['tokens'] == 20
+        assert limiter.check_all_limits(6).allowed
@@ -0,0 +1,103 @@
+"""
+Reporting Tests.
+
+Sınav madde analizi (ayırt edicilik, nokta-çift serili, çeldiriciler) testleri.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import event
+
+from app.extensions import db
+from app.models.exam import (
+    Answer, AttemptAnswer, AttemptStatus, Exam, ExamAttempt, Question
+)
+from app.services.reporting_service import ReportingService
+
+
+@pytest.fixture
+def exam_db(sqlite_app):
+    """Yalnızca sınav tabloları."""
+    sqlite_app(
+        Exam.__table__, Question.__table__, Answer.__table__,
+        ExamAttempt.__table__, AttemptAnswer.__table__,
+    )
+
+
+def make_exam(attempts: int = 12) -> int:
+    """İki seçenekli tek soruluk sınav; yüksek puanlılar doğru cevaplar."""
+    exam = Exam(title='Deneme', created_by=1)
+    db.session.add(exam)
+    db.session.flush()
+
+    question = Question(exam_id=exam.id, question_text='?', points=1.0, order=1)
+    db.session.add(question)
+    db.session.flush()
+
+    right = Answer(question_id=question.id, answer_text='A', is_correct=True, order=1)
+    wrong = Answer(question_id=question.id, answer_text='B', is_correct=False, order=2)
+    db.session.add_all([right, wrong])
+    db.session.flush()
+
+    for i in range(attempts):
+        is_correct = i >= attempts // 2
+        attempt = ExamAttempt(
+            exam_id=exam.id, user_id=i + 1, status=AttemptStatus.GRADED,
+            score=float(i), max_score=float(attempts)
+        )
+        db.session.add(attempt)
+        db.session.flush()
+        db.session.add(AttemptAnswer(
+            attempt_id=attempt.id, question_id=question.id, is_correct=is_correct,
+            selected_answer_ids=[right.id if is_correct else wrong.id]
+        ))
+
+    db.session.commit()
+    return exam.id
+
+
+class TestItemStatistics:
+    """Bellekte hesaplanan madde istatistikleri testleri."""
+
+    def test_discrimination_and_point_biserial(self):
+        """Üst grubun doğru, alt grubun yanlış yaptığı madde pozitif ayırt etmeli."""
+        pairs = [(i >= 5, i / 10) for i in range(10)]
+
+        assert ReportingService._calculate_discrimination_index(pairs) == 1.0
+        assert ReportingService._calculate_point_biserial(pairs) > 0.8
+        assert ReportingService._calculate_point_biserial([(True, 0.5)] * 10) is None
+
+    def test_distractor_frequencies(self):
+        """Seçenekler seçilme oranlarıyla raporlanmalı."""
+        options = [
+            SimpleNamespace(id=1, is_correct=True),
+            SimpleNamespace(id=2, is_correct=False),
+        ]
+        answers = [(True, 1.0, [1]), (False, 0.0, [2]), (False, 0.0, [])]
+
+        frequencies = ReportingService._get_distractor_frequencies(options, answers)
+
+        assert [f['count'] for f in frequencies] == [1, 1]
+        assert frequencies[0]['rate'] == 33.3
+
+
+class TestExamQuestionAnalysis:
+    """Tek sorguluk madde analizi testleri."""
+
+    def test_analysis_uses_constant_queries(self, exam_db):
+        """Cevap sayısından bağımsız olarak sabit sayıda sorgu çalışmalı."""
+        exam_id = make_exam()
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, 'before_cursor_execute', listener)
+        try:
+            analysis = ReportingService._get_exam_question_analysis(exam_id)
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', listener)
+
+        item = analysis[0]
+        assert len(statements) <= 4
+        assert (item['attempts'], item['correct'], item['success_rate']) == (12, 6, 50.0)
+        assert item['discrimination'] == 1.0
+        assert [d['count'] for d in item['distractors']] == [6, 6]
@@ -0,0 +1,135 @@
+"""
+Retention Tests.
+
+PK aralığında parçalı silme/anonimleştirme motoru için test senaryoları.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.audit import JobCheckpoint, RequestLog
+from app.services.partition_service import (
+    INTERVAL_DAY, INTERVAL_MONTH, PartitionService, missing_periods, next_period,
+    parse_upper_bound, partition_name, period_start
+)
+from app.services.retention_service import RetentionService
+
+
+@pytest.fixture
+def retention_db(sqlite_app):
+    """Log ve checkpoint tabloları; parçalar arası bekleme kapalı."""
+    sqlite_app(RequestLog.__table__, JobCheckpoint.__table__, RETENTION_PAUSE_SECONDS=0)
+
+
+def add_logs(created_at, count):
+    for _ in range(count):
+        db.session.add(RequestLog(
+            request_id='r', http_method='GET', endpoint='/api',
+            status_code=200, duration_ms=10, created_at=created_at
+        ))
+    db.session.commit()
+
+
+class TestRetentionService:
+    """Parçalı retention motoru testleri."""
+
+    def test_deletes_only_old_rows_in_chunks(self, retention_db):
+        """Yalnızca eski satırlar silinmeli, iş parça parça ilerlemeli."""
+        now = datetime.utcnow()
+        add_logs(now - timedelta(days=40), 25)
+        add_logs(now, 5)
+
+        result = RetentionService.delete(
+            'request_logs', RequestLog,
+            [RequestLog.created_at < now - timedelta(days=30)],
+            chunk_size=10
+        )
+
+        assert result['affected'] == 25
+        assert result['chunks'] == 3
+        assert result['completed'] is True
+        assert RequestLog.query.count() == 5
+        assert db.session.get(JobCheckpoint, 'retention:request_logs').last_id == 0
+
+    def test_resumes_from_checkpoint_after_time_budget(self, retention_db, monkeypatch):
+        """Zaman bütçesi dolunca durmalı, sonraki çalıştırma kaldığı yerden sürmeli."""
+        now = datetime.utcnow()
+        add_logs(now - timedelta(days=40), 25)
+        criteria = [RequestLog.created_at < now - timedelta(days=30)]
+        monkeypatch.setattr(RetentionService, '_throttle', classmethod(lambda cls, *a: False))
+
+        first = RetentionService.delete('request_logs', RequestLog, criteria, chunk_size=10)
+        assert (first['affected'], first['completed']) == (10, False)
+        assert db.session.get(JobCheckpoint, 'retention:request_logs').last_id == first['last_id']
+
+        monkeypatch.undo()
+        second = RetentionService.delete('request_logs', RequestLog, criteria, chunk_size=10)
+        assert (second['affected'], second['chunks'], second['completed']) == (15, 2, True)
+        assert RequestLog.query.count() == 0
+
+    def test_stale_checkpoint_beyond_range_completes(self, retention_db):
+        """Checkpoint MAX(id)'nin ötesindeyse tur tamamlanmış sayılıp sıfırlanmalı."""
+        now = datetime.utcnow()
+        add_logs(now - timedelta(days=40), 5)
+        db.session.add(JobCheckpoint(name='retention:request_logs', last_id=1000))
+        db.session.commit()
+
+        result = RetentionService.delete(
+            'request_logs', RequestLog,
+            [RequestLog.created_at < now - timedelta(days=30)],
+            chunk_size=10
+        )
+
+        assert (result['affected'], result['chunks'], result['completed']) == (0, 0, True)
+        assert db.session.get(JobCheckpoint, 'retention:request_logs').last_id == 0
+
+        again = RetentionService.delete(
+            'request_logs', RequestLog,
+            [RequestLog.created_at < now - timedelta(days=30)],
+            chunk_size=10
+        )
+        assert (again['affected'], again['completed']) == (5, True)
+
+
+class TestPartitionService:
+    """Zaman bölümü yardımcıları ve SQLite geri dönüşü testleri."""
+
+    def test_period_helpers(self):
+        """Bölüm sınırları ve adları periyoda hizalı olmalı."""
+        moment = datetime(2026, 12, 16, 13, 45)
+        start = period_start(moment, INTERVAL_MONTH)
+        assert next_period(start, INTERVAL_MONTH) == datetime(2027, 1, 1)
+        assert partition_name('audit_logs', start, INTERVAL_MONTH) == 'audit_logs_p202612'
+        assert partition_name(
+            'request_logs', period_start(moment, INTERVAL_DAY), INTERVAL_DAY
+        ) == 'request_logs_p20261216'
+
+        assert parse_upper_bound(
+            "FOR VALUES FROM (MINVALUE) TO ('2026-11-01 00:00:00')"
+        ) == datetime(2026, 11, 1)
+        assert parse_upper_bound('DEFAULT') is None
+
+    def test_missing_periods_cover_default_spill(self):
+        """Eksik dönemler kapsanan sınırdan başlamalı; DEFAULT'a düşen satırlar dahil edilmeli."""
+        now = datetime(2026, 10, 16, 9, 30)
+        ahead = missing_periods(INTERVAL_DAY, datetime(2026, 10, 20), now, 7)
+        assert [start.day for start, _ in ahead] == [20, 21, 22, 23]
+        assert missing_periods(INTERVAL_DAY, datetime(2026, 10, 24), now, 7) == []
+
+        # Görev bir hafta çalışmadı: satırlar 9'undan beri DEFAULT bölümde
+        spilled = missing_periods(
+            INTERVAL_DAY, datetime(2026, 10, 9), now, 7, spilled_from=datetime(2026, 10, 9, 0, 5)
+        )
+        assert spilled[0] == (datetime(2026, 10, 9), datetime(2026, 10, 10))
+        assert spilled[-1][1] == datetime(2026, 10, 24)
+
+        monthly = missing_periods(INTERVAL_MONTH, datetime.min, now, 2)
+        assert [start.month for start, _ in monthly] == [10, 11, 12]
+
+    def test_sqlite_is_noop(self, retention_db):
+        """SQLite'ta bölüm işlemleri etkisiz olmalı."""
+        assert PartitionService.is_partitioned('request_logs') is False
+        assert PartitionService.drop_before('request_logs', datetime.utcnow()) == []
+        assert PartitionService.maintain() == {table: [] for table in PartitionService.TABLES}
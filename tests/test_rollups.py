@@ -0,0 +1,105 @@
+"""
+Request Rollup Tests.
+
+Dakikalık/saatlik request özetleri ve histogram yüzdelikleri için test senaryoları.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.extensions import db
+from app.models.audit import JobCheckpoint, RequestLog, RequestRollup
+from app.services.rollup_service import (
+    RequestRollupService, bucket_index, empty_histogram, histogram_percentile
+)
+
+
+@pytest.fixture
+def rollup_db(sqlite_app):
+    """Request log, rollup ve checkpoint tabloları."""
+    sqlite_app(RequestLog.__table__, RequestRollup.__table__, JobCheckpoint.__table__)
+
+
+def add_log(created_at, duration_ms, status_code=200, endpoint='/api', sample_weight=1.0):
+    db.session.add(RequestLog(
+        request_id='r', http_method='GET', endpoint=endpoint,
+        status_code=status_code, duration_ms=duration_ms,
+        is_slow=duration_ms > 1000, created_at=created_at,
+        sample_weight=sample_weight
+    ))
+
+
+class TestHistogram:
+    """Sabit kovalı gecikme histogramı testleri."""
+
+    def test_percentile_within_bucket_bounds(self):
+        """Yüzdelik tahmini doğru kova aralığında kalmalı."""
+        histogram = empty_histogram()
+        for duration in [8] * 90 + [400] * 10:
+            histogram[bucket_index(duration)] += 1
+
+        assert 5 <= histogram_percentile(histogram, 0.5) <= 10
+        assert 300 <= histogram_percentile(histogram, 0.95, max_ms=400) <= 400
+        assert histogram_percentile(empty_histogram(), 0.5) is None
+
+
+class TestRequestRollups:
+    """Artımlı rollup işi testleri."""
+
+    def test_incremental_runs_merge_into_buckets(self, rollup_db):
+        """Checkpoint sonrası gelen satırlar mevcut kovalarla birleşmeli."""
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        bucket = now - timedelta(minutes=10)
+        add_log(bucket, 100)
+        add_log(bucket + timedelta(seconds=5), 300, status_code=500)
+        db.session.commit()
+        assert RequestRollupService.run(now=now)['processed'] == 2
+
+        add_log(bucket + timedelta(seconds=10), 200)
+        add_log(now - timedelta(seconds=1), 50)  # güvenlik gecikmesi içinde
+        db.session.commit()
+        assert RequestRollupService.run(now=now)['processed'] == 1
+
+        minute = RequestRollup.query.filter_by(
+            granularity='minute', status_code=200
+        ).one()
+        assert minute.count == 2
+        assert minute.sum_ms == 300
+        assert (minute.min_ms, minute.max_ms) == (100, 200)
+
+        stats = RequestRollupService.get_stats(hours=1, now=now)
+        assert stats['total_requests'] == 3
+        assert stats['error_count'] == 1
+        assert stats['status_distribution'] == {'200': 2, '500': 1}
+
+    def test_unavailable_until_backfill_catches_up(self, rollup_db):
+        """Geriye dönük işleme bitmeden rollup'lar kullanılmamalı."""
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        add_log(now - timedelta(hours=2), 100)
+        add_log(now - timedelta(hours=1), 200)
+        db.session.commit()
+
+        assert RequestRollupService.run(batch_size=1, now=now)['caught_up'] is False
+        assert RequestRollupService.is_available() is False
+
+        RequestRollupService.run(batch_size=1, now=now)
+        assert RequestRollupService.run(batch_size=1, now=now)['caught_up'] is True
+        assert RequestRollupService.is_available() is True
+
+    def test_sampled_rows_are_weighted(self, rollup_db):
+        """Örneklenen satırlar ağırlıklarıyla sayılmalı; oranlar yanlı olmamalı."""
+        now = datetime(2024, 1, 1, 12, 0, 0)
+        bucket = now - timedelta(minutes=10)
+        add_log(bucket, 20, sample_weight=10)  # %10 örneklenmiş hızlı istek
+        add_log(bucket, 30, sample_weight=10)
+        add_log(bucket, 400, status_code=500)  # hatalar her zaman tutulur
+        db.session.commit()
+
+        RequestRollupService.run(now=now)
+
+        stats = RequestRollupService.get_stats(hours=1, now=now)
+        assert stats['total_requests'] == 21
+        assert stats['error_count'] == 1
+        assert stats['error_rate'] == round(1 / 21 * 100, 2)
+        assert stats['avg_duration_ms'] == round((200 + 300 + 400) / 21, 2)
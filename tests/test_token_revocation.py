@@ -0,0 +1,135 @@
+"""
+Token Revocation Tests.
+
+Süreç içi iptal önbelleği (Bloom filtresi + token version) için test
+senaryoları.
+"""
+
+import os
+
+import pytest
+from flask import Flask
+
+from app.core.revocation_cache import RevocationCache
+from app.core.token_blacklist import TokenBlacklistService
+from app.utils.bloom import BloomFilter
+
+
+class FakeRedis:
+    """Blacklist anahtarlarını tutan, çağrıları sayan Redis."""
+
+    def __init__(self, keys=()):
+        self.keys = {key: '1' for key in keys}
+        self.calls = []
+        self.published = []
+
+    def scan_iter(self, match=None, count=None):
+        prefix = match.rstrip('*')
+        return [key for key in self.keys if key.startswith(prefix)]
+
+    def exists(self, key):
+        self.calls.append(('exists', key))
+        return int(key in self.keys)
+
+    def get(self, key):
+        self.calls.append(('get', key))
+        return self.keys.get(key)
+
+    def setex(self, key, ttl, value):
+        self.keys[key] = value
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+
+def synced_cache(client):
+    """Aboneliği kurulmuş gibi hazır bir önbellek."""
+    cache = RevocationCache(capacity=1000)
+    cache.rebuild(client)
+    cache._pid = os.getpid()
+    cache._ready = True
+    return cache
+
+
+@pytest.fixture
+def blacklist_app(monkeypatch):
+    app = Flask(__name__)
+    with app.app_context():
+        yield
+    monkeypatch.setattr(TokenBlacklistService, '_revocations', None)
+
+
+class TestBloomFilter:
+    """BloomFilter testleri."""
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        """Eklenen her eleman bulunmalı; yanlış pozitif oranı hedefe yakın olmalı."""
+        bloom = BloomFilter(capacity=2000, error_rate=0.01)
+        for i in range(2000):
+            bloom.add(f'jti-{i}')
+
+        assert all(f'jti-{i}' in bloom for i in range(2000))
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        assert false_positives < 300
+
+
+class TestRevocationCache:
+    """RevocationCache testleri."""
+
+    def test_negative_answers_only_when_ready(self):
+        """Hazır değilken her JTI şüpheli sayılmalı."""
+        client = FakeRedis(['token:blacklist:old'])
+        cache = RevocationCache(capacity=1000)
+        assert cache.might_be_revoked('fresh') is True
+
+        cache = synced_cache(client)
+        assert cache.might_be_revoked('old') is True
+        assert cache.might_be_revoked('fresh') is False
+
+        cache.apply(RevocationCache.revoked_event('fresh'))
+        assert cache.might_be_revoked('fresh') is True
+
+    def test_version_events_never_go_backwards(self):
+        """Version olayı önbelleği güncellemeli, eski okuma geri almamalı."""
+        cache = synced_cache(FakeRedis())
+        cache.store_version(7, 2)
+        cache.apply(RevocationCache.version_event(7, 3))
+        cache.store_version(7, 2)
+
+        assert cache.get_version(7) == 3
+
+
+class TestTokenBlacklistService:
+    """TokenBlacklistService'in önbellekle entegrasyonu."""
+
+    def test_is_revoked_skips_redis_for_unknown_jti(self, blacklist_app, monkeypatch):
+        """Filtrede olmayan JTI için Redis'e gidilmemeli; olanlar doğrulanmalı."""
+        client = FakeRedis(['token:blacklist:revoked'])
+        cache = synced_cache(client)
+        monkeypatch.setattr(TokenBlacklistService, '_revocations', cache)
+        monkeypatch.setattr(TokenBlacklistService, '_revocation_cache', classmethod(lambda cls: cache))
+        monkeypatch.setattr(TokenBlacklistService, '_get_redis', classmethod(lambda cls: client))
+
+        assert TokenBlacklistService.is_revoked('active') is False
+        assert client.calls == []
+        assert TokenBlacklistService.is_revoked('revoked') is True
+        assert client.calls == [('exists', 'token:blacklist:revoked')]
+
+        TokenBlacklistService.add('active', reason='logout')
+        assert TokenBlacklistService.is_revoked('active') is True
+        assert client.published[0][0] == RevocationCache.CHANNEL
+
+    def test_token_version_is_cached(self, blacklist_app, monkeypatch):
+        """Token version bir kez okunmalı, olayla güncellenmeli."""
+        client = FakeRedis()
+        client.keys['token:version:5'] = '2'
+        cache = synced_cache(client)
+        monkeypatch.setattr(TokenBlacklistService, '_revocation_cache', classmethod(lambda cls: cache))
+        monkeypatch.setattr(TokenBlacklistService, '_get_redis', classmethod(lambda cls: client))
+
+        assert TokenBlacklistService.get_token_version(5) == 2
+        assert TokenBlacklistService.get_token_version(5) == 2
+        assert client.calls == [('get', 'token:version:5')]
+
+        cache.apply(RevocationCache.version_event(5, 3))
+        assert TokenBlacklistService.get_token_version(5) == 3
@@ -0,0 +1,119 @@
+"""
+User Snapshot Tests.
+
+Kimlik doğrulama yolundaki önbellekli kullanıcı görüntüsü için test
+senaryoları.
+"""
+
+import pytest
+from flask import g
+
+from app.core import auth
+from app.extensions import db
+from app.models.organization import Organization
+from app.models.user import Permission, Role, RolePermission, User
+from app.modules.admin.models import AdminActionLog
+from app.modules.admin.services import AdminUserService
+from app.modules.users.services import RoleService
+from app.services.cache_service import CacheService
+from app.services.user_service import UserService
+from app.services.user_snapshot_service import UserSnapshot, UserSnapshotService
+
+
+@pytest.fixture
+def user_db(sqlite_app):
+    """Kullanıcı/rol tabloları ve bir öğretmen kullanıcısı."""
+    CacheService._tiered.local.clear()
+    app = sqlite_app(
+        Organization.__table__, Role.__table__, Permission.__table__,
+        RolePermission.__table__, User.__table__, AdminActionLog.__table__
+    )
+    role = Role(name='teacher')
+    role.permissions.append(Permission(name='courses:create', resource='courses', action='create'))
+    db.session.add(role)
+    db.session.add(User(
+        id=5, email='t@x.com', password_hash='x', first_name='A',
+        last_name='B', role=role, is_verified=True
+    ))
+    db.session.commit()
+    yield app
+    CacheService._tiered.local.clear()
+
+
+class TestUserSnapshotService:
+    """UserSnapshotService testleri."""
+
+    def test_snapshot_is_compact_and_cached(self, user_db):
+        """Görüntü slot'lu olmalı ve ikinci okumada veritabanına gitmemeli."""
+        snapshot = UserSnapshotService.get(5)
+
+        assert isinstance(snapshot, UserSnapshot)
+        assert not hasattr(snapshot, '__dict__')
+        assert (snapshot.role, snapshot.is_active) == ('teacher', True)
+        assert snapshot.permissions == frozenset({'courses:create'})
+
+        db.session.execute(db.text('UPDATE users SET is_active = 0 WHERE id = 5'))
+        assert UserSnapshotService.get(5).is_active is True
+
+    def test_user_service_invalidates(self, user_db):
+        """Deaktivasyon ve rol yetkisi değişikliği görüntüyü yenilemeli."""
+        UserSnapshotService.get(5)
+
+        UserService().deactivate_user(db.session.get(User, 5))
+        assert UserSnapshotService.get(5).is_active is False
+
+        db.session.add(Permission(name='courses:publish', resource='courses', action='publish'))
+        db.session.commit()
+        RoleService.assign_permission('teacher', 'courses:publish')
+        assert 'courses:publish' in UserSnapshotService.get(5).permissions
+
+
+    def test_admin_changes_invalidate_on_commit(self, user_db):
+        """Admin servisiyle deaktivasyon ve silme, commit sonrası görüntüyü yenilemeli."""
+        db.session.add(User(
+            id=6, email='a@x.com', password_hash='x', first_name='C',
+            last_name='D', role=Role(name='admin'), is_verified=True
+        ))
+        db.session.commit()
+        assert UserSnapshotService.get(5).is_active is True
+
+        AdminUserService.activate_user(5, admin_id=6, activate=False)
+        assert UserSnapshotService.get(5).is_active is False
+
+        AdminUserService.activate_user(5, admin_id=6)
+        assert UserSnapshotService.get(5).is_active is True
+
+        AdminUserService.delete_user(5, admin_id=6)
+        assert UserSnapshotService.get(5).is_active is False
+
+    def test_rolled_back_change_keeps_snapshot(self, user_db):
+        """Geri alınan değişiklik görüntüyü geçersiz kılmamalı."""
+        UserSnapshotService.get(5)
+        db.session.get(User, 5).is_active = False
+        db.session.flush()
+        db.session.rollback()
+
+        db.session.execute(db.text('UPDATE users SET is_verified = 0 WHERE id = 5'))
+        db.session.commit()
+        assert UserSnapshotService.get(5).is_verified is True
+
+
+class TestCurrentUserResolution:
+    """auth.get_current_user_snapshot / get_current_user testleri."""
+
+    def test_orm_user_loaded_only_on_demand(self, user_db, monkeypatch):
+        """Decorator yolu görüntüyü kullanmalı; ORM nesnesi istenince yüklenmeli."""
+        monkeypatch.setattr(auth, 'verify_jwt_in_request', lambda **kw: None)
+        monkeypatch.setattr(auth, 'get_jwt_identity', lambda: '5')
+
+        with user_db.app_context(), user_db.test_request_context():
+            assert auth.get_current_user_id() == 5
+            assert 'current_user' not in g
+
+            user = auth.get_current_user()
+            assert isinstance(user, User) and user.email == 't@x.com'
+
+        UserService().deactivate_user(db.session.get(User, 5))
+        with user_db.app_context(), user_db.test_request_context():
+            assert auth.get_current_user_snapshot() is None
+            assert auth.get_current_user() is None
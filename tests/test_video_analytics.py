@@ -0,0 +1,297 @@
+"""
+Video Analytics Tests.
+
+Redis izlenme sayaçları, DB'ye write-behind senkronizasyonu ve izleme
+ısı haritası için test senaryoları.
+"""
+
+import fnmatch
+import json
+
+import pytest
+
+from app.extensions import db
+from app.modules.contents.models import Video
+from app.services.cache_service import CacheService
+from app.services.video_analytics_service import VideoAnalyticsService, WatchEventType
+
+
+class FakePipeline:
+    """Komutları biriktirip execute'ta tek seferde çalıştıran pipeline."""
+
+    def __init__(self, redis):
+        self.redis = redis
+        self.commands = []
+
+    def __getattr__(self, name):
+        def queue(*args, **kwargs):
+            self.commands.append((name, args, kwargs))
+            return self
+        return queue
+
+    def execute(self):
+        self.redis.round_trips += 1
+        return [getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.commands]
+
+
+class FakeRedis:
+    """Testlerde kullanılan komutları destekleyen bellek içi Redis."""
+
+    def __init__(self):
+        self.data = {}
+        self.round_trips = 0
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def incr(self, key, amount=1):
+        self.data[key] = int(self.data.get(key, 0)) + amount
+        return self.data[key]
+
+    def expire(self, key, ttl):
+        return True
+
+    def get(self, key):
+        value = self.data.get(key)
+        return None if value is None else str(value)
+
+    def sadd(self, key, *members):
+        bucket = self.data.setdefault(key, set())
+        before = len(bucket)
+        bucket.update(str(m) for m in members)
+        return len(bucket) - before
+
+    pfadd = sadd
+
+    def pfcount(self, key):
+        return len(self.data.get(key, ()))
+
+    def delete(self, *keys):
+        return sum(self.data.pop(key, None) is not None for key in keys)
+
+    def hset(self, key, mapping):
+        self.data.setdefault(key, {}).update({k: str(v) for k, v in mapping.items()})
+
+    def hgetall(self, key):
+        return dict(self.data.get(key, {}))
+
+    def hincrby(self, key, field, amount):
+        bucket = self.data.setdefault(key, {})
+        bucket[field] = str(int(bucket.get(field, 0)) + amount)
+        return int(bucket[field])
+
+    def xadd(self, key, fields, maxlen=None, approximate=True):
+        stream = self.data.setdefault(key, [])
+        stream.append((f'{len(stream)}-0', {k: str(v) for k, v in fields.items()}))
+        if maxlen:
+            del stream[:-maxlen]
+
+    def xrange(self, key):
+        return list(self.data.get(key, []))
+
+    def srem(self, key, *members):
+        self.data.get(key, set()).difference_update(str(m) for m in members)
+
+    def lpush(self, key, value):
+        self.data.setdefault(key, []).insert(0, value)
+
+    def rpush(self, key, *values):
+        self.data.setdefault(key, []).extend(values)
+
+    def lrange(self, key, start, end):
+        items = self.data.get(key, [])
+        return items[start:] if end == -1 else items[start:end + 1]
+
+    def ltrim(self, key, start, end):
+        items = self.data.get(key, [])
+        self.data[key] = items[start:] if end == -1 else items[start:end + 1]
+
+    def mget(self, keys):
+        return [self.get(key) for key in keys]
+
+    def zadd(self, key, mapping, nx=False):
+        bucket = self.data.setdefault(key, {})
+        added = 0
+        for member, score in mapping.items():
+            member = str(member)
+            if nx and member in bucket:
+                continue
+            added += member not in bucket
+            bucket[member] = score
+        return added
+
+    def exists(self, key):
+        return int(key in self.data)
+
+    def sscan_iter(self, key, count=None):
+        return iter(list(self.data.get(key, ())))
+
+    def scan_iter(self, match='*', count=None):
+        return iter([key for key in list(self.data) if fnmatch.fnmatch(key, match)])
+
+    def zpopmin(self, key, count=1):
+        bucket = self.data.get(key, {})
+        popped = sorted(bucket.items(), key=lambda item: item[1])[:count]
+        for member, _ in popped:
+            del bucket[member]
+        return popped
+
+
+@pytest.fixture
+def analytics_db(sqlite_app, monkeypatch):
+    """İki videoluk tablo ve sahte Redis."""
+    sqlite_app(Video.__table__)
+    redis = FakeRedis()
+    monkeypatch.setattr(CacheService, '_redis', redis)
+    for video_id in (1, 2):
+        db.session.add(Video(id=video_id, title=f'Video {video_id}', topic_id=1))
+    db.session.commit()
+    return redis
+
+
+class TestViewCounters:
+    """increment_view_count ve write-behind senkronizasyon testleri."""
+
+    def test_single_round_trip_and_hyperloglog(self, analytics_db):
+        """Her izlenme tek pipeline olmalı; tekil izleyiciler HLL'de sayılmalı."""
+        for user_id in (10, 11, 10):
+            VideoAnalyticsService.increment_view_count(1, user_id)
+
+        assert analytics_db.round_trips == 3
+        assert VideoAnalyticsService.get_view_count(1) == 3
+        assert VideoAnalyticsService.get_unique_view_count(1) == 2
+        assert db.session.get(Video, 1).view_count == 0
+
+    def test_legacy_unique_set_is_migrated(self, analytics_db):
+        """Eski SET'teki tekil izleyiciler HLL'ye taşınmalı, sayı sıfırlanmamalı."""
+        legacy_key = VideoAnalyticsService.LEGACY_UNIQUE_VIEWS_KEY.format(video_id=1)
+        analytics_db.sadd(legacy_key, 10, 11, 12)
+        analytics_db.sadd(VideoAnalyticsService.LEGACY_UNIQUE_VIEWS_KEY.format(video_id=2), 10)
+        VideoAnalyticsService.increment_view_count(1, 12)
+        VideoAnalyticsService.increment_view_count(1, 13)
+
+        assert VideoAnalyticsService.get_unique_view_count(1) == 4
+        assert legacy_key not in analytics_db.data
+
+        assert VideoAnalyticsService.migrate_legacy_unique_views() == {'videos': 1, 'members': 1}
+        assert VideoAnalyticsService.get_unique_view_count(2) == 1
+
+    def test_sync_writes_dirty_videos_in_batches(self, analytics_db):
+        """Dirty videolar batch'ler halinde DB'ye yazılmalı, küme boşalmalı."""
+        VideoAnalyticsService.increment_view_count(1, 10)
+        VideoAnalyticsService.increment_view_count(1, 11)
+        VideoAnalyticsService.increment_view_count(2, 10)
+
+        result = VideoAnalyticsService.sync_all_to_database(batch_size=1)
+
+        assert result['synced'] == 2
+        assert [batch['size'] for batch in result['batches']] == [1, 1]
+        assert result['max_lag_seconds'] >= 0
+        db.session.expire_all()
+        assert (db.session.get(Video, 1).view_count, db.session.get(Video, 2).view_count) == (2, 1)
+        assert VideoAnalyticsService.sync_all_to_database()['synced'] == 0
+
+    def test_failed_batch_is_requeued(self, analytics_db, monkeypatch):
+        """Yazılamayan batch ilk işaretlenme zamanıyla kümeye geri dönmeli."""
+        VideoAnalyticsService.increment_view_count(1, 10)
+        marked_at = analytics_db.data[VideoAnalyticsService.DIRTY_VIDEOS_KEY]['1']
+
+        def fail(cls, rows):
+            raise RuntimeError('db down')
+
+        monkeypatch.setattr(VideoAnalyticsService, '_bulk_update_view_counts', classmethod(fail))
+        assert VideoAnalyticsService.sync_all_to_database()['synced'] == 0
+        assert analytics_db.data[VideoAnalyticsService.DIRTY_VIDEOS_KEY] == {'1': marked_at}
+
+    def test_failed_mget_is_requeued(self, analytics_db, monkeypatch):
+        """Sayaçlar okunamazsa çekilen ID'ler kümeye geri dönmeli."""
+        VideoAnalyticsService.increment_view_count(1, 10)
+        marked_at = analytics_db.data[VideoAnalyticsService.DIRTY_VIDEOS_KEY]['1']
+
+        def fail(keys):
+            raise ConnectionError('redis down')
+
+        monkeypatch.setattr(analytics_db, 'mget', fail, raising=False)
+        assert VideoAnalyticsService.sync_all_to_database()['synced'] == 0
+        assert analytics_db.data[VideoAnalyticsService.DIRTY_VIDEOS_KEY] == {'1': marked_at}
+
+
+class TestWatchSessions:
+    """Hash + stream tabanlı izleme oturumu testleri."""
+
+    def test_heartbeats_are_constant_cost_and_end_consumes_stream(self, analytics_db, monkeypatch):
+        """Heartbeat'ler O(1) olmalı; oturum sonu olayları toplu okumalı."""
+        saved = []
+        monkeypatch.setattr(VideoAnalyticsService, 'SESSION_EVENTS_MAXLEN', 3)
+        monkeypatch.setattr(
+            VideoAnalyticsService, '_save_watch_progress', classmethod(lambda cls, data: saved.append(data))
+        )
+
+        session_id = VideoAnalyticsService.start_watch_session(1, 10, 'yt')
+        trips = analytics_db.round_trips
+        for position in (10, 20, 15, 40):
+            session = VideoAnalyticsService.update_watch_session(
+                session_id, position, WatchEventType.PROGRESS
+            )
+        assert analytics_db.round_trips - trips == 4
+        assert (session['current_position'], session['total_watched']) == (40, 45)
+
+        final = VideoAnalyticsService.end_watch_session(session_id)
+
+        assert [event['position'] for event in final['events']] == [20, 15, 40]
+        assert saved[0]['total_watched'] == 45
+        assert VideoAnalyticsService.update_watch_session(session_id, 50, WatchEventType.PROGRESS) is None
+        assert not any(key.startswith(VideoAnalyticsService.PREFIX + 'watch') for key in analytics_db.data)
+
+
+class TestEngagement:
+    """Isı haritası / izleyici tutma eğrisi testleri."""
+
+    def test_segments_skip_seeks_and_pauses(self):
+        """Duraklatma ve atlamalar izlenmiş aralık sayılmamalı."""
+        events = [
+            {'type': t, 'position': p, 'timestamp': f'2026-01-01T10:00:{s:02d}'}
+            for t, p, s in [
+                ('play', 0, 0), ('progress', 30, 30), ('pause', 30, 35),
+                ('resume', 30, 40), ('seek', 80, 41), ('progress', 100, 59),
+            ]
+        ]
+
+        assert VideoAnalyticsService._watched_segments(events) == [[0, 30], [80, 100]]
+
+    def test_merge_builds_retention_curve(self, analytics_db):
+        """Kuyruktaki oturumlar bin sayaçlarına birleşmeli, kuyruk boşalmalı."""
+        db.session.get(Video, 1).duration = 100
+        db.session.commit()
+        for entry in (
+            {'v': 1, 's': [[0, 30], [80, 100]], 'e': 100, 'c': 1},
+            {'v': 1, 's': [[0, 50]], 'e': 50, 'c': 0},
+            {'v': 2, 's': [[0, 10]], 'e': 10, 'c': 0},  # süresi bilinmiyor
+        ):
+            analytics_db.rpush(VideoAnalyticsService.ENGAGEMENT_PENDING_KEY, json.dumps(entry))
+
+        result = VideoAnalyticsService.merge_engagement(batch_size=2)
+
+        assert (result['sessions'], result['skipped'], result['batches']) == (2, 1, 2)
+        assert analytics_db.data[VideoAnalyticsService.ENGAGEMENT_PENDING_KEY] == []
+
+        curve = VideoAnalyticsService.get_retention_curve(1)
+        assert (curve['sessions'], curve['completions']) == (2, 1)
+        assert [curve['heatmap'][i] for i in (0, 40, 60, 90)] == [2, 1, 0, 1]
+        assert curve['retention'][0] == 1.0
+        assert curve['drop_offs'][50] == 1 and sum(curve['drop_offs']) == 1
+
+    def test_failed_batch_is_requeued(self, analytics_db, monkeypatch):
+        """Süre sorgusu hata verirse batch kaybolmadan kuyruğa geri konmalı."""
+        entry = json.dumps({'v': 1, 's': [[0, 30]], 'e': 30, 'c': 0})
+        analytics_db.rpush(VideoAnalyticsService.ENGAGEMENT_PENDING_KEY, entry)
+
+        def broken_query(*args, **kwargs):
+            raise RuntimeError('db down')
+
+        with monkeypatch.context() as patch:
+            patch.setattr(db.session, 'query', broken_query)
+            result = VideoAnalyticsService.merge_engagement()
+
+        assert (result['sessions'], result['batches']) == (0, 0)
+        assert analytics_db.data[VideoAnalyticsService.ENGAGEMENT_PENDING_KEY] == [entry]